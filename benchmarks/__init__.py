@@ -0,0 +1 @@
+"""Offline benchmarks of ols-mcp against a local OLS stand-in server."""
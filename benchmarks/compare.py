@@ -0,0 +1,129 @@
+################################################################################
+# benchmarks/compare.py
+# This module compares two benchmark result files, e.g. from main and from a
+# branch, and reports the cases that got slower or make more OLS requests
+################################################################################
+import argparse
+import json
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Latency statistics where higher is worse
+LATENCY_KEYS = ("p50_ms", "p95_ms")
+
+
+@dataclass(frozen=True)
+class Change:
+    """How one benchmark case moved between a baseline and a current run."""
+
+    name: str
+    baseline: dict[str, Any]
+    current: dict[str, Any]
+    regressions: tuple[str, ...]
+
+    def ratio(self, key: str) -> float | None:
+        before = self.baseline.get(key) or 0.0
+        after = self.current.get(key) or 0.0
+        return after / before if before else None
+
+
+def compare(
+    baseline: dict[str, dict[str, Any]],
+    current: dict[str, dict[str, Any]],
+    threshold: float = 0.10,
+) -> list[Change]:
+    """
+    Compare the per-case statistics of two runs.
+
+    A case regresses when its p50 or p95 latency grows, or its throughput
+    drops, by more than the threshold, when it makes more OLS requests per
+    call, or when it starts failing.
+
+    Args:
+        baseline: The "results" of the reference run
+        current: The "results" of the run being checked
+        threshold: Relative change tolerated as noise (0.10 is 10%)
+
+    Returns:
+        A Change for every case present in both runs, in current-run order.
+    """
+    changes = []
+    for name, after in current.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        regressions = []
+        for key in LATENCY_KEYS:
+            if before[key] and after[key] > before[key] * (1 + threshold):
+                regressions.append(key)
+        if before["throughput"] and after["throughput"] < before["throughput"] * (
+            1 - threshold
+        ):
+            regressions.append("throughput")
+        if after["requests_per_call"] > before["requests_per_call"]:
+            regressions.append("requests_per_call")
+        if after["errors"] > before["errors"]:
+            regressions.append("errors")
+        changes.append(Change(name, before, after, tuple(regressions)))
+    return changes
+
+
+def _percent(ratio: float | None) -> str:
+    return "    n/a" if ratio is None else f"{(ratio - 1) * 100:+6.1f}%"
+
+
+def compare_files(baseline_path: Path, current_path: Path, threshold: float) -> int:
+    """
+    Print a comparison of two result files.
+
+    Returns:
+        The exit status: 1 when any case regressed, otherwise 0.
+    """
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    current = json.loads(Path(current_path).read_text(encoding="utf-8"))
+    if baseline.get("settings") != current.get("settings"):
+        print("warning: the runs used different settings", file=sys.stderr)
+
+    changes = compare(baseline["results"], current["results"], threshold)
+    print(
+        f"{baseline['label']} -> {current['label']}\n"
+        f"{'case':<42} {'p50':>7} {'p95':>7} {'throughput':>10}  regressions"
+    )
+    for change in changes:
+        print(
+            f"{change.name:<42} {_percent(change.ratio('p50_ms'))} "
+            f"{_percent(change.ratio('p95_ms'))} "
+            f"{_percent(change.ratio('throughput')):>10}  "
+            f"{', '.join(change.regressions)}"
+        )
+    regressed = [change.name for change in changes if change.regressions]
+    if regressed:
+        print(f"{len(regressed)} of {len(changes)} cases regressed")
+        return 1
+    print(f"No regressions in {len(changes)} cases")
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Compare two result files given on the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.compare",
+        description="Compare two ols-mcp benchmark result files.",
+    )
+    parser.add_argument("baseline", type=Path, help="results of the reference run")
+    parser.add_argument("current", type=Path, help="results of the run to check")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative slowdown reported as a regression (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+    return compare_files(args.baseline, args.current, args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
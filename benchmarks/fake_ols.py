@@ -0,0 +1,285 @@
+################################################################################
+# benchmarks/fake_ols.py
+# This module contains a local stand-in for the OLS API: a threaded HTTP server
+# answering /search, /ontologies/{id}, /ontologies/{id}/terms, /terms and the
+# v2 llm_similar endpoint with synthetic (or recorded) responses, after a
+# configurable latency
+################################################################################
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+# Path prefix the fake API is served under, as on www.ebi.ac.uk
+API_ROOT = "/ols/api"
+
+_ONTOLOGY = re.compile(r"^/ontologies/([^/]+)$")
+_ONTOLOGY_TERMS = re.compile(r"^/ontologies/([^/]+)/terms$")
+_SIMILAR = re.compile(r"^/v2/ontologies/([^/]+)/classes/([^/]+)/llm_similar$")
+
+
+@dataclass(frozen=True)
+class FakeOLSConfig:
+    """
+    Shape of the synthetic responses served by FakeOLS.
+
+    Attributes:
+        latency: Seconds every response is delayed by
+        jitter: Extra delay of up to this many seconds, drawn uniformly
+        terms_per_ontology: Terms listed by /ontologies/{id}/terms, which
+            together with the requested page size sets the page count
+        search_results: Documents a /search matches (capped by rows)
+        similar_results: Terms an llm_similar request ranks
+        description_bytes: Length of each term's description, to vary the
+            payload size
+        seed: Seed of the random jitter, so runs can be repeated
+    """
+
+    latency: float = 0.02
+    jitter: float = 0.0
+    terms_per_ontology: int = 100
+    search_results: int = 50
+    similar_results: int = 100
+    description_bytes: int = 200
+    seed: int = 0
+
+
+def load_recordings(path: str | Path) -> dict[str, Any]:
+    """
+    Load recorded OLS responses to serve instead of synthetic ones.
+
+    Args:
+        path: A JSON file mapping API paths (e.g. "/ontologies/go", without
+            the query string) to the response body to return for them
+
+    Returns:
+        The recordings, ready to pass to FakeOLS.
+    """
+    with open(path, encoding="utf-8") as recordings:
+        return json.load(recordings)
+
+
+def _term(ontology: str, number: int, config: FakeOLSConfig) -> dict[str, Any]:
+    prefix = ontology.upper()
+    short_form = f"{prefix}_{number:07d}"
+    return {
+        "iri": f"http://purl.obolibrary.org/obo/{short_form}",
+        "short_form": short_form,
+        "obo_id": f"{prefix}:{number:07d}",
+        "label": f"{ontology} term {number}",
+        "description": ["d" * config.description_bytes],
+        "synonyms": [f"{ontology} synonym {number}"],
+        "ontology_name": ontology,
+        "ontology_prefix": prefix,
+        "type": "class",
+        "is_obsolete": False,
+        "is_defining_ontology": True,
+        "has_children": number % 2 == 0,
+        "is_root": number == 0,
+    }
+
+
+def _page_bounds(params: dict[str, str], total: int) -> tuple[int, int, int]:
+    size = max(1, int(params.get("size", 20)))
+    page = int(params.get("page", 0))
+    return page, size, max(1, -(-total // size))
+
+
+class FakeOLS:
+    """
+    A local OLS stand-in; use it as a context manager or call start/stop.
+
+    Requests are answered on their own threads, so concurrent clients see the
+    configured latency in parallel as they would against the real service.
+    """
+
+    def __init__(
+        self,
+        config: FakeOLSConfig | None = None,
+        recordings: dict[str, Any] | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.config = config or FakeOLSConfig()
+        self.recordings = recordings or {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """The URL to use as the OLS client's base_url."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_ROOT}"
+
+    def start(self) -> "FakeOLS":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-ols", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeOLS":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def respond(self, path: str, params: dict[str, str]) -> tuple[int, Any]:
+        """Return the status and JSON body for a request to an API path."""
+        if path in self.recordings:
+            return 200, self.recordings[path]
+        if path == "/search":
+            return 200, self._search(params)
+        if path == "/terms":
+            return 200, self._lookup(params)
+        if match := _ONTOLOGY.match(path):
+            return 200, self._ontology(match.group(1))
+        if match := _ONTOLOGY_TERMS.match(path):
+            return 200, self._terms(match.group(1), params)
+        if match := _SIMILAR.match(path):
+            return 200, self._similar(match.group(1), params)
+        return 404, {"error": "Not Found", "path": path}
+
+    def _search(self, params: dict[str, str]) -> dict[str, Any]:
+        rows = int(params.get("rows", 10))
+        ontologies = params.get("ontology", "go").split(",")
+        docs = [
+            _term(ontologies[number % len(ontologies)], number, self.config)
+            for number in range(min(rows, self.config.search_results))
+        ]
+        return {
+            "response": {
+                "numFound": self.config.search_results,
+                "start": 0,
+                "docs": docs,
+            }
+        }
+
+    def _ontology(self, ontology: str) -> dict[str, Any]:
+        return {
+            "ontologyId": ontology,
+            "status": "LOADED",
+            "numberOfTerms": self.config.terms_per_ontology,
+            "numberOfProperties": 10,
+            "numberOfIndividuals": 0,
+            "loaded": "2024-01-01T00:00:00.000+0000",
+            "updated": "2024-01-01T00:00:00.000+0000",
+            "config": {
+                "title": f"{ontology} (synthetic)",
+                "description": "d" * self.config.description_bytes,
+                "version": "2024-01-01",
+                "homepage": "https://example.org",
+                "preferredLanguage": "en",
+                "fileLocation": f"https://example.org/{ontology}.owl",
+                "baseUris": [f"http://purl.obolibrary.org/obo/{ontology.upper()}_"],
+            },
+        }
+
+    def _terms(self, ontology: str, params: dict[str, str]) -> dict[str, Any]:
+        total = self.config.terms_per_ontology
+        for field in ("iri", "short_form", "obo_id"):
+            if field in params:
+                # A filtered lookup finds exactly one term
+                local_id = params[field].rsplit("/", 1)[-1]
+                number = int(re.sub(r"\D", "", local_id) or 0)
+                return {
+                    "_embedded": {"terms": [_term(ontology, number, self.config)]},
+                    "page": {
+                        "number": 0,
+                        "size": 1,
+                        "totalPages": 1,
+                        "totalElements": 1,
+                    },
+                }
+        page, size, pages = _page_bounds(params, total)
+        numbers = range(page * size, min((page + 1) * size, total))
+        return {
+            "_embedded": {
+                "terms": [_term(ontology, number, self.config) for number in numbers]
+            },
+            "page": {
+                "number": page,
+                "size": size,
+                "totalPages": pages,
+                "totalElements": total,
+            },
+        }
+
+    def _lookup(self, params: dict[str, str]) -> dict[str, Any]:
+        value = next(iter(params.values()), "")
+        prefix = re.sub(r"^.*/", "", value).split("_")[0].lower() or "efo"
+        return self._terms(prefix, {"short_form": value})
+
+    def _similar(self, ontology: str, params: dict[str, str]) -> dict[str, Any]:
+        total = self.config.similar_results
+        page, size, pages = _page_bounds(params, total)
+        numbers = range(page * size, min((page + 1) * size, total))
+        return {
+            "page": page,
+            "numElements": len(numbers),
+            "totalPages": pages,
+            "totalElements": total,
+            "elements": [
+                {
+                    "curie": f"{ontology.upper()}:{number:07d}",
+                    "iri": f"http://purl.obolibrary.org/obo/"
+                    f"{ontology.upper()}_{number:07d}",
+                    "label": [f"{ontology} term {number}"],
+                    "definition": ["d" * self.config.description_bytes],
+                    "score": round(0.98 - number / (total * 2), 6),
+                }
+                for number in numbers
+            ],
+        }
+
+    def _delay(self) -> float:
+        with self._lock:
+            self.requests += 1
+            jitter = self._random.uniform(0, self.config.jitter)
+        return self.config.latency + jitter
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, like OLS, so connection pooling is measured too
+            protocol_version = "HTTP/1.1"
+            # Send headers and body in one segment, without a delayed-ACK stall
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                url = urllib.parse.urlsplit(self.path)
+                params = dict(urllib.parse.parse_qsl(url.query))
+                path = url.path
+                if path.startswith(API_ROOT):
+                    path = path[len(API_ROOT):]
+                time.sleep(fake._delay())
+                status, payload = fake.respond(path, params)
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
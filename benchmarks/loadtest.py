@@ -0,0 +1,501 @@
+################################################################################
+# benchmarks/loadtest.py
+# This module contains the load-test harness for the MCP server itself: many
+# concurrent client sessions call a weighted mix of tools on ols_mcp.main.mcp
+# (in memory or over the streamable HTTP transport) at a target rate against
+# a FakeOLS server, reporting throughput, latency, errors and RSS over time
+################################################################################
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ols_mcp import cache, deadline
+
+from .fake_ols import FakeOLS, FakeOLSConfig
+from .run import RESULTS_DIR, default_label, percentile, prepare_client, save_results
+
+# Relative frequency of each tool in the default mix, roughly what agents send
+DEFAULT_MIX = {
+    "search_all_ontologies": 4.0,
+    "get_terms_from_ontology": 2.0,
+    "get_ontology_info": 2.0,
+    "resolve_ontology_terms": 1.0,
+    "get_similar_ontology_terms": 1.0,
+    "search_all_ontologies_batch": 1.0,
+}
+
+TRANSPORTS = ("memory", "http")
+
+
+@dataclass(frozen=True)
+class LoadSettings:
+    """
+    Shape of a load test.
+
+    Attributes:
+        sessions: Concurrent MCP client sessions (simulated agents)
+        rate: Tool calls per second offered across all sessions; calls are
+            scheduled on a fixed clock whether or not earlier ones finished,
+            and latency is measured from the scheduled time. 0 runs closed
+            loop instead: each session sends its next call as soon as the
+            previous one returns, measuring the most the server sustains
+        duration: Seconds calls are offered for
+        transport: "memory" for in-process sessions, "http" for sessions
+            over the streamable HTTP transport on a local port
+        mix: Relative weight of each tool name
+        distinct: Size of the pool of ontologies, queries and terms the
+            arguments are drawn from; smaller pools mean more cache hits
+        interval: Seconds between timeline samples
+        cache: Keep the in-memory response cache (off measures OLS round trips)
+        throttle: Keep the client's default rate and concurrency limits
+        tool_timeout: Time budget of every tool call, as --tool-timeout
+        latency: Seconds the fake OLS server delays every response by
+        jitter: Extra random delay of up to this many seconds
+        pages: Pages a paginated tool call fetches
+        page_size: Terms per page
+        payload_bytes: Length of each synthetic term description
+        seed: Seed for the tool and argument choices
+    """
+
+    sessions: int = 10
+    rate: float = 20.0
+    duration: float = 10.0
+    transport: str = "memory"
+    mix: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    distinct: int = 200
+    interval: float = 1.0
+    cache: bool = True
+    throttle: bool = False
+    tool_timeout: float = 30.0
+    latency: float = 0.05
+    jitter: float = 0.02
+    pages: int = 3
+    page_size: int = 20
+    payload_bytes: int = 200
+    seed: int = 0
+
+    def server_config(self) -> FakeOLSConfig:
+        return FakeOLSConfig(
+            latency=self.latency,
+            jitter=self.jitter,
+            terms_per_ontology=self.pages * self.page_size,
+            search_results=self.page_size,
+            similar_results=self.pages * self.page_size,
+            description_bytes=self.payload_bytes,
+            seed=self.seed,
+        )
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    """
+    Parse a tool mix such as "search_all_ontologies=3,get_ontology_info=1".
+
+    A tool given without a weight gets weight 1.
+
+    Raises:
+        ValueError: On a negative or non-numeric weight, or an empty mix
+    """
+    mix: dict[str, float] = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight) if weight else 1.0
+        if mix[name.strip()] < 0:
+            raise ValueError(f"negative weight for {name}")
+    if not any(mix.values()):
+        raise ValueError("the tool mix is empty")
+    return mix
+
+
+def tool_arguments(tool: str, rng: random.Random, settings: LoadSettings) -> dict:
+    """Draw arguments for a tool call from the shared pool of values."""
+    number = rng.randrange(settings.distinct)
+    terms = settings.pages * settings.page_size
+    if tool == "search_all_ontologies":
+        return {"query": f"query {number}", "max_results": settings.page_size}
+    if tool == "search_all_ontologies_batch":
+        queries = [f"query {rng.randrange(settings.distinct)}" for _ in range(5)]
+        return {"queries": queries, "max_results": settings.page_size}
+    if tool == "get_ontology_info":
+        return {"ontology_id": f"ont{number}"}
+    if tool == "get_terms_from_ontology":
+        return {"ontology_id": f"ont{number}", "max_results": terms}
+    if tool == "resolve_ontology_terms":
+        identifiers = [f"GO:{rng.randrange(settings.distinct):07d}" for _ in range(5)]
+        return {"identifiers": identifiers}
+    if tool == "get_similar_ontology_terms":
+        return {
+            "ontology_iri": f"http://purl.obolibrary.org/obo/GO_{number:07d}",
+            "ontology": "go",
+            "max_results": terms,
+            "page_size": settings.page_size,
+        }
+    raise ValueError(f"unknown tool: {tool}")
+
+
+def rss_bytes() -> int | None:
+    """Return this process's resident set size, or None where unknown."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Without /proc only the peak is available (in bytes on macOS, KiB elsewhere)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def latency_stats(latencies: Sequence[float]) -> dict[str, float]:
+    """Return mean and p50/p95/p99/max in milliseconds of call latencies."""
+    ordered = sorted(latencies)
+    return {
+        "mean_ms": round(1000 * sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        "p50_ms": round(1000 * percentile(ordered, 0.50), 3),
+        "p95_ms": round(1000 * percentile(ordered, 0.95), 3),
+        "p99_ms": round(1000 * percentile(ordered, 0.99), 3),
+        "max_ms": round(1000 * ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+class Recorder:
+    """Collects call outcomes for the totals and the per-interval timeline."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, float, bool]] = []
+        self.errors: dict[str, int] = {}
+        self.timeline: list[dict[str, Any]] = []
+        self._interval_start = 0
+        self._started = time.monotonic()
+
+    def record(self, tool: str, latency: float, error: str | None) -> None:
+        self.calls.append((tool, latency, error is None))
+        if error is not None:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def sample(self, backlog: int) -> dict[str, Any]:
+        """Close the current interval and return its timeline entry."""
+        window = self.calls[self._interval_start :]
+        self._interval_start = len(self.calls)
+        rss = rss_bytes()
+        entry = {
+            "elapsed": round(time.monotonic() - self._started, 3),
+            "completed": len(window),
+            "errors": sum(1 for _, _, ok in window if not ok),
+            "backlog": backlog,
+            "rss_mb": round(rss / 2**20, 1) if rss is not None else None,
+            **latency_stats([latency for _, latency, _ in window]),
+        }
+        self.timeline.append(entry)
+        return entry
+
+    def summary(self, seconds: float, offered: int) -> dict[str, Any]:
+        completed = len(self.calls)
+        failed = sum(1 for _, _, ok in self.calls if not ok)
+        per_tool: dict[str, list[tuple[float, bool]]] = {}
+        for tool, latency, ok in self.calls:
+            per_tool.setdefault(tool, []).append((latency, ok))
+        rss = [entry["rss_mb"] for entry in self.timeline if entry["rss_mb"]]
+        return {
+            "seconds": round(seconds, 3),
+            "offered": offered,
+            "completed": completed,
+            "errors": failed,
+            "error_rate": round(failed / completed, 4) if completed else 0.0,
+            "throughput": round(completed / seconds, 3) if seconds else 0.0,
+            **latency_stats([latency for _, latency, _ in self.calls]),
+            "rss_start_mb": rss[0] if rss else None,
+            "rss_peak_mb": max(rss) if rss else None,
+            "rss_end_mb": rss[-1] if rss else None,
+            "error_types": self.errors,
+            "tools": {
+                tool: {
+                    "calls": len(calls),
+                    "errors": sum(1 for _, ok in calls if not ok),
+                    **latency_stats([latency for latency, _ in calls]),
+                }
+                for tool, calls in sorted(per_tool.items())
+            },
+            "timeline": self.timeline,
+        }
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as probe:
+        probe.bind((host, 0))
+        return probe.getsockname()[1]
+
+
+@contextlib.contextmanager
+def http_server(host: str = "127.0.0.1") -> Iterator[str]:
+    """Serve ols_mcp.main.mcp over streamable HTTP on a thread; yield its URL."""
+    import uvicorn
+
+    from ols_mcp.main import mcp
+
+    port = _free_port(host)
+    server = uvicorn.Server(
+        uvicorn.Config(mcp.http_app(), host=host, port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, name="mcp-http", daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("the MCP HTTP server did not start")
+        time.sleep(0.01)
+    try:
+        yield f"http://{host}:{port}/mcp/"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+async def drive(
+    target: Any,
+    settings: LoadSettings,
+    progress: Callable[[dict[str, Any]], None] | None = None,
+    ready: Callable[[], Awaitable[None]] | None = None,
+) -> dict[str, Any]:
+    """
+    Offer tool calls to an MCP server at the target rate and record them.
+
+    Args:
+        target: What fastmcp.Client connects to: the FastMCP server itself
+            or the URL of its HTTP endpoint
+        settings: The load shape
+        progress: Called with each timeline entry as it is sampled
+        ready: Awaited once every session has connected, before the clock
+            starts, e.g. to line up several driver processes
+
+    Returns:
+        The summary of the run, including its timeline.
+    """
+    from fastmcp import Client
+
+    rng = random.Random(settings.seed)
+    tools = [tool for tool, weight in settings.mix.items() if weight > 0]
+    weights = [settings.mix[tool] for tool in tools]
+    queue: asyncio.Queue = asyncio.Queue()
+    offered = 0
+
+    def next_call(scheduled: float) -> tuple[float, str, dict]:
+        nonlocal offered
+        offered += 1
+        tool = rng.choices(tools, weights)[0]
+        return scheduled, tool, tool_arguments(tool, rng, settings)
+
+    async def next_item() -> tuple[float, str, dict] | None:
+        if settings.rate > 0:
+            return await queue.get()
+        now = time.monotonic()
+        return next_call(now) if now < end else None
+
+    async def session(mcp_client: Client) -> None:
+        while (item := await next_item()) is not None:
+            scheduled, tool, arguments = item
+            error = None
+            try:
+                result = await mcp_client.call_tool(
+                    tool, arguments, raise_on_error=False
+                )
+                if result.is_error:
+                    error = "tool_error"
+            except Exception as failure:
+                error = type(failure).__name__
+            recorder.record(tool, time.monotonic() - scheduled, error)
+
+    async def sampler() -> None:
+        while True:
+            await asyncio.sleep(settings.interval)
+            entry = recorder.sample(queue.qsize())
+            if progress is not None:
+                progress(entry)
+
+    async with contextlib.AsyncExitStack() as stack:
+        # Connect every session before the clock starts
+        clients = [
+            await stack.enter_async_context(Client(target))
+            for _ in range(settings.sessions)
+        ]
+        if ready is not None:
+            await ready()
+        recorder = Recorder()
+        started = time.monotonic()
+        end = started + settings.duration
+        sessions = [asyncio.create_task(session(each)) for each in clients]
+        sampling = asyncio.create_task(sampler())
+        if settings.rate > 0:
+            while (scheduled := started + offered / settings.rate) < end:
+                await asyncio.sleep(max(0.0, scheduled - time.monotonic()))
+                queue.put_nowait(next_call(scheduled))
+            for _ in sessions:
+                queue.put_nowait(None)
+        await asyncio.gather(*sessions)
+        seconds = time.monotonic() - started
+        sampling.cancel()
+    entry = recorder.sample(0)
+    if progress is not None:
+        progress(entry)
+    return recorder.summary(seconds, offered)
+
+
+def run_load(
+    settings: LoadSettings,
+    progress: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Start a FakeOLS server, point the client at it and run a load test.
+
+    The tools print progress to stdout, which is discarded during the run.
+    """
+    from ols_mcp import client
+    from ols_mcp.main import mcp
+
+    unknown = set(settings.mix) - set(DEFAULT_MIX)
+    if unknown:
+        raise ValueError(f"unknown tools in the mix: {', '.join(sorted(unknown))}")
+    if settings.transport not in TRANSPORTS:
+        raise ValueError(f"unknown transport: {settings.transport}")
+
+    saved_config = client.get_config()
+    saved_budget = deadline.get_default_budget()
+    with FakeOLS(settings.server_config()) as ols:
+        prepare_client(ols, settings.throttle)
+        if settings.cache:
+            cache.configure()
+        deadline.set_default_budget(settings.tool_timeout)
+        try:
+            with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet):
+                if settings.transport == "http":
+                    with http_server() as url:
+                        return asyncio.run(drive(url, settings, progress))
+                return asyncio.run(drive(mcp, settings, progress))
+        finally:
+            deadline.set_default_budget(saved_budget)
+            client.configure(saved_config)
+
+
+def _print_entry(entry: dict[str, Any]) -> None:
+    print(
+        f"{entry['elapsed']:>7.1f}s {entry['completed']:>6} {entry['errors']:>6} "
+        f"{entry['backlog']:>7} {entry['p50_ms']:>9.1f} {entry['p95_ms']:>9.1f} "
+        f"{entry['rss_mb'] or 0:>8.1f}",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser for python -m benchmarks.loadtest."""
+    defaults = LoadSettings()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.loadtest",
+        description="Load-test the ols-mcp MCP server against a local OLS "
+        "stand-in with many concurrent client sessions.",
+    )
+    parser.add_argument("--sessions", type=int, default=defaults.sessions)
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=defaults.rate,
+        help="tool calls per second across all sessions; 0 sends each "
+        "session's next call as soon as its last one returns (default: "
+        "%(default)s)",
+    )
+    parser.add_argument("--duration", type=float, default=defaults.duration)
+    parser.add_argument("--transport", choices=TRANSPORTS, default=defaults.transport)
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=defaults.mix,
+        help="weighted tools, e.g. search_all_ontologies=3,get_ontology_info=1",
+    )
+    parser.add_argument(
+        "--distinct",
+        type=int,
+        default=defaults.distinct,
+        help="distinct ontologies/queries/terms drawn from (default: %(default)s)",
+    )
+    parser.add_argument("--interval", type=float, default=defaults.interval)
+    parser.add_argument(
+        "--no-cache", action="store_true", help="turn the response cache off"
+    )
+    parser.add_argument(
+        "--throttle",
+        action="store_true",
+        help="keep the client's default rate and concurrency limits",
+    )
+    parser.add_argument("--tool-timeout", type=float, default=defaults.tool_timeout)
+    parser.add_argument("--latency", type=float, default=defaults.latency)
+    parser.add_argument("--jitter", type=float, default=defaults.jitter)
+    parser.add_argument("--pages", type=int, default=defaults.pages)
+    parser.add_argument("--page-size", type=int, default=defaults.page_size)
+    parser.add_argument("--payload-bytes", type=int, default=defaults.payload_bytes)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--label", help="name of the results file (default: the git branch)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=RESULTS_DIR,
+        help="directory results are written to (default: %(default)s)",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run a load test and store its summary and timeline."""
+    args = build_parser().parse_args(argv)
+    settings = LoadSettings(
+        sessions=args.sessions,
+        rate=args.rate,
+        duration=args.duration,
+        transport=args.transport,
+        mix=args.mix,
+        distinct=args.distinct,
+        interval=args.interval,
+        cache=not args.no_cache,
+        throttle=args.throttle,
+        tool_timeout=args.tool_timeout,
+        latency=args.latency,
+        jitter=args.jitter,
+        pages=args.pages,
+        page_size=args.page_size,
+        payload_bytes=args.payload_bytes,
+        seed=args.seed,
+    )
+
+    print(
+        f"{'elapsed':>8} {'calls':>6} {'errors':>6} {'backlog':>7} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'RSS MB':>8}",
+        file=sys.stderr,
+    )
+    summary = run_load(settings, progress=_print_entry)
+    label = f"loadtest-{args.label or default_label()}"
+    path = save_results(summary, settings, label, args.output)
+    print(
+        f"{summary['completed']} of {summary['offered']} calls in "
+        f"{summary['seconds']:.1f}s: {summary['throughput']:.1f}/s, "
+        f"p50 {summary['p50_ms']:.1f} ms, p95 {summary['p95_ms']:.1f} ms, "
+        f"p99 {summary['p99_ms']:.1f} ms, error rate {summary['error_rate']:.2%}, "
+        f"peak RSS {summary['rss_peak_mb']} MB\nResults written to {path}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
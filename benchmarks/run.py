@@ -0,0 +1,507 @@
+################################################################################
+# benchmarks/run.py
+# This module contains the benchmark runner: it starts a FakeOLS server, points
+# the client at it and measures throughput and latency percentiles of every
+# api.py function and MCP tool, then stores the results as JSON for comparison
+################################################################################
+import argparse
+import asyncio
+import contextlib
+import datetime
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from ols_mcp import api, cache, client, mirror, ratelimit, retry, snapshot, tools
+
+from .compare import compare_files
+from .fake_ols import FakeOLS, FakeOLSConfig, load_recordings
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Workload shape shared by every benchmark case.
+
+    Attributes:
+        iterations: Timed calls per case
+        warmup: Untimed calls per case made first (connections, imports)
+        concurrency: Calls in flight at once
+        latency: Seconds the fake server delays every response by
+        jitter: Extra random delay of up to this many seconds
+        pages: Pages a paginated call (terms, similar terms) fetches
+        page_size: Terms per page of a paginated call
+        payload_bytes: Length of each synthetic term description
+        batch: Queries or identifiers per batch call
+        throttle: Keep the client's default rate and concurrency limits
+    """
+
+    iterations: int = 30
+    warmup: int = 2
+    concurrency: int = 1
+    latency: float = 0.02
+    jitter: float = 0.0
+    pages: int = 5
+    page_size: int = 20
+    payload_bytes: int = 200
+    batch: int = 10
+    throttle: bool = False
+
+    def server_config(self) -> FakeOLSConfig:
+        return FakeOLSConfig(
+            latency=self.latency,
+            jitter=self.jitter,
+            terms_per_ontology=self.pages * self.page_size,
+            search_results=self.page_size,
+            similar_results=self.pages * self.page_size,
+            description_bytes=self.payload_bytes,
+        )
+
+
+@dataclass(frozen=True)
+class Case:
+    """A benchmarked call; it gets the iteration number to vary its arguments."""
+
+    name: str
+    call: Callable[[int], Any]
+    is_async: bool = False
+
+
+def build_cases(settings: Settings) -> list[Case]:
+    """
+    Return the benchmark cases for every api.py function and tool.
+
+    Each iteration asks for a different ontology, query or term, so identical
+    concurrent calls are not coalesced into one request.
+    """
+    terms = settings.pages * settings.page_size
+    size = settings.page_size
+
+    def queries(i: int) -> list[str]:
+        return [f"query {i} {n}" for n in range(settings.batch)]
+
+    def identifiers(i: int) -> list[str]:
+        return [f"GO:{i * settings.batch + n:07d}" for n in range(settings.batch)]
+
+    def iri(i: int) -> str:
+        return f"http://purl.obolibrary.org/obo/GO_{i:07d}"
+
+    def drain(iterator: Any) -> int:
+        return sum(1 for _ in iterator)
+
+    async def drain_async(iterator: Any) -> int:
+        return len([item async for item in iterator])
+
+    return [
+        Case("api.search_ontologies",
+             lambda i: api.search_ontologies(f"query {i}", max_results=size)),
+        Case("api.search_ontologies_async",
+             lambda i: api.search_ontologies_async(f"query {i}", max_results=size),
+             True),
+        Case("api.search_ontologies_many",
+             lambda i: api.search_ontologies_many(queries(i), max_results=size)),
+        Case("api.search_ontologies_many_async",
+             lambda i: api.search_ontologies_many_async(
+                 queries(i), max_results=size
+             ),
+             True),
+        Case("api.get_ontology_details",
+             lambda i: api.get_ontology_details(f"ont{i}")),
+        Case("api.get_ontology_details_async",
+             lambda i: api.get_ontology_details_async(f"ont{i}"), True),
+        Case("api.get_ontology_terms",
+             lambda i: api.get_ontology_terms(
+                 f"ont{i}", max_results=terms, page_size=size
+             )),
+        Case("api.get_ontology_terms_async",
+             lambda i: api.get_ontology_terms_async(
+                 f"ont{i}", max_results=terms, page_size=size
+             ),
+             True),
+        Case("api.iter_ontology_terms",
+             lambda i: drain(api.iter_ontology_terms(
+                 f"ont{i}", max_results=None, page_size=size
+             ))),
+        Case("api.iter_ontology_terms_async",
+             lambda i: drain_async(api.iter_ontology_terms_async(
+                 f"ont{i}", max_results=None, page_size=size
+             )),
+             True),
+        Case("api.iter_ontology_term_pages",
+             lambda i: drain(api.iter_ontology_term_pages(f"ont{i}", page_size=size))),
+        Case("api.iter_ontology_term_pages_async",
+             lambda i: drain_async(
+                 api.iter_ontology_term_pages_async(f"ont{i}", page_size=size)
+             ),
+             True),
+        Case("api.resolve_terms", lambda i: api.resolve_terms(identifiers(i))),
+        Case("api.resolve_terms_async",
+             lambda i: api.resolve_terms_async(identifiers(i)), True),
+        Case("api.get_similar_terms",
+             lambda i: api.get_similar_terms(
+                 iri(i), "go", max_results=terms, page_size=size
+             )),
+        Case("api.get_similar_terms_async",
+             lambda i: api.get_similar_terms_async(
+                 iri(i), "go", max_results=terms, page_size=size
+             ),
+             True),
+        Case("tools.search_all_ontologies",
+             lambda i: tools.search_all_ontologies(f"query {i}", max_results=size)),
+        Case("tools.search_all_ontologies_async",
+             lambda i: tools.search_all_ontologies_async(
+                 f"query {i}", max_results=size
+             ),
+             True),
+        Case("tools.search_all_ontologies_batch",
+             lambda i: tools.search_all_ontologies_batch(
+                 queries(i), max_results=size
+             )),
+        Case("tools.search_all_ontologies_batch_async",
+             lambda i: tools.search_all_ontologies_batch_async(
+                 queries(i), max_results=size
+             ),
+             True),
+        Case("tools.get_ontology_info", lambda i: tools.get_ontology_info(f"ont{i}")),
+        Case("tools.get_ontology_info_async",
+             lambda i: tools.get_ontology_info_async(f"ont{i}"), True),
+        Case("tools.get_terms_from_ontology",
+             lambda i: tools.get_terms_from_ontology(f"ont{i}", max_results=terms)),
+        Case("tools.get_terms_from_ontology_async",
+             lambda i: tools.get_terms_from_ontology_async(
+                 f"ont{i}", max_results=terms
+             ),
+             True),
+        Case("tools.resolve_ontology_terms",
+             lambda i: tools.resolve_ontology_terms(identifiers(i))),
+        Case("tools.resolve_ontology_terms_async",
+             lambda i: tools.resolve_ontology_terms_async(identifiers(i)), True),
+        Case("tools.get_similar_ontology_terms",
+             lambda i: tools.get_similar_ontology_terms(
+                 iri(i), "go", max_results=terms, page_size=size
+             )),
+        Case("tools.get_similar_ontology_terms_async",
+             lambda i: tools.get_similar_ontology_terms_async(
+                 iri(i), "go", max_results=terms, page_size=size
+             ),
+             True),
+    ]
+
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    """Return the q-quantile of sorted samples, interpolating between ranks."""
+    if not ordered:
+        return 0.0
+    rank = q * (len(ordered) - 1)
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(
+    latencies: list[float], errors: list[str], seconds: float, requests: int
+) -> dict[str, Any]:
+    """Turn the per-call latencies of a case into its stored statistics."""
+    ordered = sorted(latencies)
+    calls = len(ordered) + len(errors)
+    return {
+        "calls": calls,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "seconds": round(seconds, 6),
+        "throughput": round(calls / seconds, 3) if seconds else 0.0,
+        "requests_per_call": round(requests / calls, 3) if calls else 0.0,
+        "mean_ms": round(1000 * sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        "p50_ms": round(1000 * percentile(ordered, 0.50), 3),
+        "p95_ms": round(1000 * percentile(ordered, 0.95), 3),
+        "p99_ms": round(1000 * percentile(ordered, 0.99), 3),
+        "max_ms": round(1000 * ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+def _run_sync(case: Case, numbers: range, concurrency: int) -> tuple[list, list]:
+    latencies: list[float] = []
+    errors: list[str] = []
+
+    def timed(i: int) -> None:
+        started = time.perf_counter()
+        try:
+            case.call(i)
+        except Exception as error:
+            errors.append(f"{type(error).__name__}: {error}")
+        else:
+            latencies.append(time.perf_counter() - started)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed, numbers))
+    return latencies, errors
+
+
+async def _run_async(case: Case, numbers: range, concurrency: int) -> tuple[list, list]:
+    latencies: list[float] = []
+    errors: list[str] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await case.call(i)
+            except Exception as error:
+                errors.append(f"{type(error).__name__}: {error}")
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(timed(i) for i in numbers))
+    return latencies, errors
+
+
+def measure(case: Case, server: FakeOLS, settings: Settings) -> dict[str, Any]:
+    """Run a case's warm-up and timed calls and return its statistics."""
+    concurrency = max(1, settings.concurrency)
+    timed = range(settings.iterations)
+    warmup = range(settings.iterations, settings.iterations + settings.warmup)
+
+    def run_sync() -> tuple[list, list, float, int]:
+        _run_sync(case, warmup, concurrency)
+        requests_before = server.requests
+        started = time.perf_counter()
+        latencies, errors = _run_sync(case, timed, concurrency)
+        seconds = time.perf_counter() - started
+        return latencies, errors, seconds, server.requests - requests_before
+
+    async def run_async() -> tuple[list, list, float, int]:
+        # One event loop for warm-up and timed calls, so they share the
+        # async client and its pooled connections
+        try:
+            await _run_async(case, warmup, concurrency)
+            requests_before = server.requests
+            started = time.perf_counter()
+            latencies, errors = await _run_async(case, timed, concurrency)
+            seconds = time.perf_counter() - started
+        finally:
+            await client.aclose()
+        return latencies, errors, seconds, server.requests - requests_before
+
+    if case.is_async:
+        return summarize(*asyncio.run(run_async()))
+    return summarize(*run_sync())
+
+
+def prepare_client(server: FakeOLS, throttle: bool) -> None:
+    """Point the client at the fake server and turn off caching and mirrors."""
+    client.configure(base_url=server.base_url)
+    cache.set_cache(None)
+    mirror.set_mirror(None)
+    snapshot.set_snapshots({})
+    retry.set_retrier(None)
+    ratelimit.set_limiter(ratelimit.RateLimiter() if throttle else None)
+
+
+def git_info() -> dict[str, Any]:
+    """Return the commit, branch and dirty state of the working tree, if any."""
+
+    def git(*args: str) -> str | None:
+        try:
+            return subprocess.run(
+                ["git", *args], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "branch": git("rev-parse", "--abbrev-ref", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+    }
+
+
+def run_benchmarks(
+    settings: Settings,
+    only: Sequence[str] = (),
+    recordings: dict[str, Any] | None = None,
+    progress: Callable[[str, dict[str, Any]], None] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Measure every case whose name contains one of the given filters.
+
+    Args:
+        settings: The workload shape
+        only: Substrings of the case names to run (default: all cases)
+        recordings: Recorded responses the fake server serves as they are
+        progress: Called with each case's name and statistics as it finishes
+
+    Returns:
+        The statistics of each case, keyed by case name.
+    """
+    results: dict[str, dict[str, Any]] = {}
+    cases = [
+        case
+        for case in build_cases(settings)
+        if not only or any(pattern in case.name for pattern in only)
+    ]
+    saved_config = client.get_config()
+    with FakeOLS(settings.server_config(), recordings) as server:
+        prepare_client(server, settings.throttle)
+        try:
+            # Tools report progress with print(); keep it out of the results
+            with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet):
+                for case in cases:
+                    results[case.name] = stats = measure(case, server, settings)
+                    if progress is not None:
+                        progress(case.name, stats)
+        finally:
+            client.configure(saved_config)
+    return results
+
+
+def save_results(
+    results: dict[str, dict[str, Any]],
+    settings: Settings,
+    label: str,
+    output: Path,
+) -> Path:
+    """Write a run's results with its settings and environment to a JSON file."""
+    output.mkdir(parents=True, exist_ok=True)
+    path = output / f"{label}.json"
+    document = {
+        "label": label,
+        "created": datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds"),
+        "git": git_info(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": asdict(settings),
+        "results": results,
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+def default_label() -> str:
+    """Name results after the current git branch, or "local" outside git."""
+    branch = git_info()["branch"] or "local"
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", branch)
+
+
+def _print_row(name: str, stats: dict[str, Any]) -> None:
+    errors = f"  {stats['errors']} errors" if stats["errors"] else ""
+    print(
+        f"{name:<42} {stats['throughput']:>9.1f}/s {stats['requests_per_call']:>7.1f} "
+        f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+        f"{errors}",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser for python -m benchmarks.run."""
+    defaults = Settings()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmark ols-mcp against a local OLS stand-in server.",
+    )
+    parser.add_argument("only", nargs="*", help="run only cases containing these")
+    parser.add_argument(
+        "--label", help="name of the results file (default: the git branch)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=RESULTS_DIR,
+        help="directory results are written to (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        metavar="BASELINE",
+        help="compare with an earlier results file and exit 1 on a regression",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative slowdown reported as a regression (default: %(default)s)",
+    )
+    parser.add_argument("--iterations", type=int, default=defaults.iterations)
+    parser.add_argument("--warmup", type=int, default=defaults.warmup)
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=defaults.latency,
+        help="seconds the server waits before each response (default: %(default)s)",
+    )
+    parser.add_argument("--jitter", type=float, default=defaults.jitter)
+    parser.add_argument(
+        "--pages",
+        type=int,
+        default=defaults.pages,
+        help="pages per paginated call (default: %(default)s)",
+    )
+    parser.add_argument("--page-size", type=int, default=defaults.page_size)
+    parser.add_argument(
+        "--payload-bytes",
+        type=int,
+        default=defaults.payload_bytes,
+        help="length of each term description (default: %(default)s)",
+    )
+    parser.add_argument("--batch", type=int, default=defaults.batch)
+    parser.add_argument(
+        "--throttle",
+        action="store_true",
+        help="keep the client's default rate and concurrency limits",
+    )
+    parser.add_argument(
+        "--recordings",
+        type=Path,
+        help="JSON file of recorded responses keyed by API path",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the benchmarks, store the results and optionally compare them."""
+    args = build_parser().parse_args(argv)
+    settings = Settings(
+        iterations=args.iterations,
+        warmup=args.warmup,
+        concurrency=args.concurrency,
+        latency=args.latency,
+        jitter=args.jitter,
+        pages=args.pages,
+        page_size=args.page_size,
+        payload_bytes=args.payload_bytes,
+        batch=args.batch,
+        throttle=args.throttle,
+    )
+    recordings = load_recordings(args.recordings) if args.recordings else None
+
+    print(
+        f"{'case':<42} {'throughput':>11} {'req/call':>7} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}",
+        file=sys.stderr,
+    )
+    results = run_benchmarks(settings, args.only, recordings, progress=_print_row)
+    path = save_results(results, settings, args.label or default_label(), args.output)
+    print(f"Results written to {path}", file=sys.stderr)
+
+    if args.compare is not None:
+        return compare_files(args.compare, path, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
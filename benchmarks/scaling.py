@@ -0,0 +1,334 @@
+################################################################################
+# benchmarks/scaling.py
+# This module contains the multi-process scaling benchmark: it starts ols-mcp
+# with a growing number of HTTP workers sharing one disk cache, warms the cache
+# and drives each server closed loop from several client processes, reporting
+# throughput per worker count and how many requests still reached the fake OLS
+################################################################################
+import argparse
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from .fake_ols import FakeOLS, FakeOLSConfig
+from .loadtest import DEFAULT_MIX, LoadSettings, _free_port, drive, parse_mix
+from .run import RESULTS_DIR, default_label, save_results
+
+# Seconds a server gets to answer /health after it is started
+STARTUP_TIMEOUT = 60.0
+
+
+@dataclass(frozen=True)
+class ScalingSettings:
+    """
+    Shape of a scaling run.
+
+    Attributes:
+        workers: Worker counts to measure, each with a fresh server and cache
+        drivers: Client processes generating load, so the load generator is
+            not the bottleneck
+        sessions: Concurrent MCP sessions in each driver process, each
+            sending its next call as soon as the previous one returns
+        duration: Seconds every worker count is measured for
+        warmup: Length of a warm-up round; rounds of sequential calls repeat
+            until one no longer reaches OLS, so the timed run is all cache hits
+        mix: Relative weight of each tool name
+        distinct: Size of the pool of arguments the calls are drawn from
+        latency: Seconds the fake OLS server delays every response by
+        pages: Pages a paginated tool call fetches
+        page_size: Terms per page
+        seed: Seed for the tool and argument choices
+    """
+
+    workers: tuple[int, ...] = (1, 2, 4)
+    drivers: int = 4
+    sessions: int = 8
+    duration: float = 10.0
+    warmup: float = 2.0
+    mix: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    distinct: int = 20
+    latency: float = 0.05
+    pages: int = 3
+    page_size: int = 20
+    seed: int = 0
+
+    def load_settings(self, sessions: int, duration: float, seed: int) -> LoadSettings:
+        return LoadSettings(
+            sessions=sessions,
+            rate=0,
+            duration=duration,
+            transport="http",
+            mix=self.mix,
+            distinct=self.distinct,
+            interval=duration,
+            latency=self.latency,
+            jitter=0.0,
+            pages=self.pages,
+            page_size=self.page_size,
+            seed=seed,
+        )
+
+    def server_config(self) -> FakeOLSConfig:
+        return self.load_settings(1, self.duration, self.seed).server_config()
+
+
+def _wait_until_healthy(url: str, process: subprocess.Popen) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"ols-mcp exited with status {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"ols-mcp did not answer {url} within {STARTUP_TIMEOUT:g}s")
+
+
+@contextlib.contextmanager
+def worker_server(
+    workers: int, ols_url: str, cache_path: Path, host: str = "127.0.0.1"
+) -> Iterator[str]:
+    """Run ols-mcp with the given number of HTTP workers; yield its MCP URL."""
+    port = _free_port(host)
+    command = [
+        sys.executable, "-m", "ols_mcp.main",
+        "--transport", "http", "--host", host, "--port", str(port),
+        "--workers", str(workers), "--ols-url", ols_url,
+        "--cache-path", str(cache_path), "--no-mirror", "--no-snapshots",
+        "--max-concurrent-calls", "0",
+    ]
+    process = subprocess.Popen(
+        command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        _wait_until_healthy(f"http://{host}:{port}/health", process)
+        yield f"http://{host}:{port}/mcp/"
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def _driver(url: str, settings: LoadSettings, barrier: Any, results: Any) -> None:
+    async def ready() -> None:
+        await asyncio.to_thread(barrier.wait, STARTUP_TIMEOUT)
+
+    try:
+        results.put(asyncio.run(drive(url, settings, ready=ready)))
+    except BaseException as error:
+        barrier.abort()
+        results.put({"failure": f"{type(error).__name__}: {error}"})
+
+
+def drive_processes(url: str, settings: ScalingSettings) -> list[dict[str, Any]]:
+    """Drive a server from settings.drivers processes that start together."""
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(settings.drivers)
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=_driver,
+            args=(
+                url,
+                settings.load_settings(
+                    settings.sessions, settings.duration, settings.seed + index
+                ),
+                barrier,
+                results,
+            ),
+        )
+        for index in range(settings.drivers)
+    ]
+    for process in processes:
+        process.start()
+    summaries = [
+        results.get(timeout=STARTUP_TIMEOUT + 4 * settings.duration)
+        for _ in processes
+    ]
+    for process in processes:
+        process.join()
+    failures = [summary["failure"] for summary in summaries if "failure" in summary]
+    if failures:
+        raise RuntimeError(f"a load driver failed: {failures[0]}")
+    return summaries
+
+
+def warm_up(url: str, ols: FakeOLS, settings: ScalingSettings) -> int:
+    """
+    Send sequential calls in rounds until a round no longer reaches OLS.
+
+    Returns:
+        The number of requests the warm-up sent to OLS.
+    """
+    started = ols.requests
+    for round_number in range(100):
+        before = ols.requests
+        load = settings.load_settings(1, settings.warmup, settings.seed + round_number)
+        asyncio.run(drive(url, load))
+        if ols.requests == before:
+            break
+    return ols.requests - started
+
+
+def run_scaling(
+    settings: ScalingSettings,
+    progress: Callable[[str, dict[str, Any]], None] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Measure cached-workload throughput of ols-mcp for every worker count.
+
+    Returns:
+        Results keyed "workers-N", with throughput, the speedup and
+        efficiency relative to the first worker count, the worst driver's
+        latency percentiles and the OLS requests made during the warm-up and
+        the timed run.
+    """
+    unknown = set(settings.mix) - set(DEFAULT_MIX)
+    if unknown:
+        raise ValueError(f"unknown tools in the mix: {', '.join(sorted(unknown))}")
+    results: dict[str, dict[str, Any]] = {}
+    baseline: tuple[int, float] | None = None
+    with FakeOLS(settings.server_config()) as ols:
+        for workers in settings.workers:
+            with tempfile.TemporaryDirectory() as tmp, worker_server(
+                workers, ols.base_url, Path(tmp) / "responses.sqlite3"
+            ) as url:
+                warmup_requests = warm_up(url, ols, settings)
+                before = ols.requests
+                summaries = drive_processes(url, settings)
+                upstream = ols.requests - before
+            calls = sum(summary["completed"] for summary in summaries)
+            throughput = sum(summary["throughput"] for summary in summaries)
+            baseline = baseline or (workers, throughput)
+            speedup = throughput / baseline[1] if baseline[1] else 0.0
+            name = f"workers-{workers}"
+            results[name] = {
+                "workers": workers,
+                "calls": calls,
+                "errors": sum(summary["errors"] for summary in summaries),
+                "throughput": round(throughput, 3),
+                "speedup": round(speedup, 3),
+                "efficiency": round(speedup * baseline[0] / workers, 3),
+                "p50_ms": max(summary["p50_ms"] for summary in summaries),
+                "p95_ms": max(summary["p95_ms"] for summary in summaries),
+                "p99_ms": max(summary["p99_ms"] for summary in summaries),
+                "warmup_requests": warmup_requests,
+                "upstream_requests": upstream,
+                "requests_per_call": round(upstream / calls, 4) if calls else 0.0,
+            }
+            if progress is not None:
+                progress(name, results[name])
+    return results
+
+
+def _print_row(name: str, stats: dict[str, Any]) -> None:
+    print(
+        f"{stats['workers']:>7} {stats['throughput']:>10.1f} {stats['speedup']:>8.2f} "
+        f"{stats['efficiency']:>10.0%} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} "
+        f"{stats['upstream_requests']:>8} {stats['errors']:>6}",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def _parse_workers(text: str) -> tuple[int, ...]:
+    counts = tuple(int(part) for part in text.split(",") if part.strip())
+    if not counts or min(counts) < 1:
+        raise ValueError("worker counts must be positive integers")
+    return counts
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser for python -m benchmarks.scaling."""
+    defaults = ScalingSettings()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.scaling",
+        description="Measure how ols-mcp --workers scales on a cached workload "
+        "against a local OLS stand-in.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=_parse_workers,
+        default=defaults.workers,
+        help="comma-separated worker counts (default: 1,2,4)",
+    )
+    parser.add_argument(
+        "--drivers",
+        type=int,
+        default=os.cpu_count() or defaults.drivers,
+        help="load-generating client processes (default: the number of CPUs)",
+    )
+    parser.add_argument("--sessions", type=int, default=defaults.sessions)
+    parser.add_argument("--duration", type=float, default=defaults.duration)
+    parser.add_argument("--warmup", type=float, default=defaults.warmup)
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=defaults.mix,
+        help="weighted tools, e.g. search_all_ontologies=3,get_ontology_info=1",
+    )
+    parser.add_argument("--distinct", type=int, default=defaults.distinct)
+    parser.add_argument("--latency", type=float, default=defaults.latency)
+    parser.add_argument("--pages", type=int, default=defaults.pages)
+    parser.add_argument("--page-size", type=int, default=defaults.page_size)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--label", help="name of the results file (default: the git branch)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=RESULTS_DIR,
+        help="directory results are written to (default: %(default)s)",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the scaling benchmark and store its results."""
+    args = build_parser().parse_args(argv)
+    settings = ScalingSettings(
+        workers=args.workers,
+        drivers=args.drivers,
+        sessions=args.sessions,
+        duration=args.duration,
+        warmup=args.warmup,
+        mix=args.mix,
+        distinct=args.distinct,
+        latency=args.latency,
+        pages=args.pages,
+        page_size=args.page_size,
+        seed=args.seed,
+    )
+
+    print(
+        f"{'workers':>7} {'calls/s':>10} {'speedup':>8} {'efficiency':>10} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'upstream':>8} {'errors':>6}",
+        file=sys.stderr,
+    )
+    results = run_scaling(settings, progress=_print_row)
+    label = f"scaling-{args.label or default_label()}"
+    path = save_results(results, settings, label, args.output)
+    print(f"Results written to {path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,338 @@
+################################################################################
+# benchmarks/startup.py
+# This module contains the start-up benchmark: it spawns ols-mcp as an agent
+# framework would for every conversation, speaks MCP over its stdio and times
+# the initialize handshake and the first tool response, cold and through the
+# pre-forked launcher, failing when either got slower than a baseline
+################################################################################
+import argparse
+import contextlib
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+from ols_mcp.launcher import SOCKET_ENV
+
+from .compare import compare_files
+from .fake_ols import FakeOLS, FakeOLSConfig
+from .loadtest import latency_stats
+from .run import RESULTS_DIR, default_label, save_results
+
+# Seconds a server gets to answer one message before the run counts as failed
+RESPONSE_TIMEOUT = 60.0
+
+CASES = ("stdio", "launcher")
+
+
+@dataclass(frozen=True)
+class StartupSettings:
+    """
+    Shape of a start-up run.
+
+    Attributes:
+        runs: Sessions started and timed per case
+        warmup: Sessions started first and discarded, so the OS file cache
+            holds the interpreter and packages as it would on a busy machine
+        cases: "stdio" spawns ols-mcp itself; "launcher" spawns
+            ols-mcp-launch against a running 'ols-mcp launcher' daemon
+        tool: Tool called once the session is initialised
+        arguments: Arguments of that call
+        latency: Seconds the fake OLS server delays every response by
+    """
+
+    runs: int = 10
+    warmup: int = 1
+    cases: tuple[str, ...] = CASES
+    tool: str = "get_ontology_info"
+    arguments: dict[str, Any] = field(default_factory=lambda: {"ontology_id": "go"})
+    latency: float = 0.0
+
+
+def _message(method: str, params: dict, number: int | None = None) -> bytes:
+    message: dict[str, Any] = {"jsonrpc": "2.0", "method": method, "params": params}
+    if number is not None:
+        message["id"] = number
+    return (json.dumps(message) + "\n").encode()
+
+
+def _response(stdout: IO[bytes], number: int) -> dict[str, Any]:
+    # Stray output that is not a JSON-RPC message is skipped
+    for line in stdout:
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(message, dict) and message.get("id") == number:
+            return message
+    raise RuntimeError("the server closed its stdout before answering")
+
+
+def time_session(
+    command: Sequence[str],
+    settings: StartupSettings,
+    env: dict[str, str] | None = None,
+) -> dict[str, float]:
+    """
+    Start one stdio session and time it up to its first tool response.
+
+    Returns:
+        Seconds from spawning the process until the initialize response
+        ("ready") and until the tool response ("first_call").
+
+    Raises:
+        RuntimeError: When the session fails or the tool call returns an error
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+    )
+    assert process.stdin is not None and process.stdout is not None
+    timer = _kill_after(process, RESPONSE_TIMEOUT)
+    try:
+        process.stdin.write(_message("initialize", {
+            "protocolVersion": "2025-06-18",
+            "capabilities": {},
+            "clientInfo": {"name": "ols-mcp-startup-benchmark", "version": "0"},
+        }, 1))
+        process.stdin.flush()
+        _response(process.stdout, 1)
+        ready = time.perf_counter() - started
+        process.stdin.write(_message("notifications/initialized", {}))
+        process.stdin.write(_message(
+            "tools/call", {"name": settings.tool, "arguments": settings.arguments}, 2
+        ))
+        process.stdin.flush()
+        result = _response(process.stdout, 2)
+        first_call = time.perf_counter() - started
+        if "error" in result or result["result"].get("isError"):
+            raise RuntimeError(f"the tool call failed: {result}")
+    finally:
+        timer()
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+    return {"ready": ready, "first_call": first_call}
+
+
+def _kill_after(process: subprocess.Popen, seconds: float) -> Callable[[], None]:
+    """Kill process if it is still running after seconds; return a canceller."""
+    timer = threading.Timer(seconds, process.kill)
+    timer.daemon = True
+    timer.start()
+    return timer.cancel
+
+
+@contextlib.contextmanager
+def launcher_daemon(server_args: Sequence[str], socket_path: Path) -> Iterator[None]:
+    """Run 'ols-mcp launcher' on socket_path until the block exits."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "ols_mcp.main", *server_args,
+         "launcher", "--socket", str(socket_path)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + RESPONSE_TIMEOUT
+        while not socket_path.exists():
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("the launcher daemon did not start")
+            time.sleep(0.05)
+        yield
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def _summarize(timings: list[dict[str, float]], errors: int, requests: int) -> dict:
+    first_calls = [timing["first_call"] for timing in timings]
+    stats = latency_stats(first_calls)
+    ready = latency_stats([timing["ready"] for timing in timings])
+    mean = sum(first_calls) / len(first_calls) if first_calls else 0.0
+    return {
+        "runs": len(timings),
+        "errors": errors,
+        **stats,
+        "min_ms": round(1000 * min(first_calls), 3) if first_calls else 0.0,
+        "ready_p50_ms": ready["p50_ms"],
+        "ready_p95_ms": ready["p95_ms"],
+        # Sessions started back to back per second
+        "throughput": round(1 / mean, 3) if mean else 0.0,
+        "requests_per_call": round(requests / len(timings), 4) if timings else 0.0,
+    }
+
+
+def run_startup(
+    settings: StartupSettings,
+    progress: Callable[[str, dict[str, Any]], None] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Time stdio sessions of ols-mcp from spawn to first tool response.
+
+    Every session gets an empty response cache, so its tool call reaches the
+    local OLS stand-in as a first call after a deploy would.
+
+    Returns:
+        Results keyed by case, with p50/p95/p99 of the time to the first tool
+        response, the time to the initialize response, and the OLS requests
+        each session made.
+    """
+    unknown = set(settings.cases) - set(CASES)
+    if unknown:
+        raise ValueError(f"unknown cases: {', '.join(sorted(unknown))}")
+    results: dict[str, dict[str, Any]] = {}
+    with FakeOLS(FakeOLSConfig(latency=settings.latency)) as ols, \
+            tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "responses.sqlite3"
+        server_args = [
+            "--ols-url", ols.base_url, "--cache-path", str(cache_path),
+            "--no-mirror", "--no-snapshots",
+        ]
+        socket_path = Path(tmp) / "launcher.sock"
+        commands = {
+            "stdio": [sys.executable, "-m", "ols_mcp.main", *server_args],
+            "launcher": [sys.executable, "-m", "ols_mcp.launcher"],
+        }
+        env = {**os.environ, SOCKET_ENV: str(socket_path)}
+        for case in settings.cases:
+            with contextlib.ExitStack() as stack:
+                if case == "launcher":
+                    stack.enter_context(launcher_daemon(server_args, socket_path))
+                timings, errors, requests = [], 0, 0
+                for number in range(settings.warmup + settings.runs):
+                    cache_path.unlink(missing_ok=True)
+                    before = ols.requests
+                    try:
+                        timing = time_session(commands[case], settings, env)
+                    except RuntimeError:
+                        errors += number >= settings.warmup
+                        continue
+                    if number >= settings.warmup:
+                        timings.append(timing)
+                        requests += ols.requests - before
+            results[case] = _summarize(timings, errors, requests)
+            if progress is not None:
+                progress(case, results[case])
+    return results
+
+
+def _print_row(name: str, stats: dict[str, Any]) -> None:
+    errors = f"  {stats['errors']} errors" if stats["errors"] else ""
+    print(
+        f"{name:<10} {stats['ready_p50_ms']:>10.1f} {stats['p50_ms']:>10.1f} "
+        f"{stats['p95_ms']:>10.1f} {stats['min_ms']:>10.1f}{errors}",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser for python -m benchmarks.startup."""
+    defaults = StartupSettings()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.startup",
+        description="Time ols-mcp stdio sessions from spawn to the first tool "
+        "response, cold and through the pre-forked launcher.",
+    )
+    parser.add_argument(
+        "cases",
+        nargs="*",
+        metavar="case",
+        help=f"cases to run: {', '.join(CASES)} (default: all)",
+    )
+    parser.add_argument("--runs", type=int, default=defaults.runs)
+    parser.add_argument("--warmup", type=int, default=defaults.warmup)
+    parser.add_argument("--latency", type=float, default=defaults.latency)
+    parser.add_argument(
+        "--label", help="name of the results file (default: the git branch)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=RESULTS_DIR,
+        help="directory results are written to (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        metavar="BASELINE",
+        help="compare with an earlier results file and exit 1 on a regression",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.20,
+        help="relative slowdown reported as a regression; process start-up "
+        "is noisy (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        help="also exit 1 when a case's median time to first tool response "
+        "exceeds this many milliseconds",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the start-up benchmark, store the results and check for regressions."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    settings = StartupSettings(
+        runs=args.runs,
+        warmup=args.warmup,
+        cases=tuple(args.cases) or CASES,
+        latency=args.latency,
+    )
+
+    print(
+        f"{'case':<10} {'ready p50':>10} {'first p50':>10} {'first p95':>10} "
+        f"{'first min':>10}",
+        file=sys.stderr,
+    )
+    results = run_startup(settings, progress=_print_row)
+    label = f"startup-{args.label or default_label()}"
+    path = save_results(results, settings, label, args.output)
+    print(f"Results written to {path}", file=sys.stderr)
+
+    status = 0
+    if args.compare is not None:
+        status = compare_files(args.compare, path, args.threshold)
+    if args.max_ms is not None:
+        slow = [
+            name for name, stats in results.items() if stats["p50_ms"] > args.max_ms
+        ]
+        for name in slow:
+            print(f"{name}: median {results[name]['p50_ms']:.1f} ms exceeds "
+                  f"{args.max_ms:g} ms")
+        status = status or int(bool(slow))
+    if any(stats["errors"] for stats in results.values()):
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
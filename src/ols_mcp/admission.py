@@ -0,0 +1,208 @@
+################################################################################
+# ols_mcp/admission.py
+# This module contains the server-side admission control for tool calls: a
+# bound on how many run at once, a bounded queue behind it that turns calls
+# away as soon as it is full, and a drain that lets admitted calls finish
+# while new ones are refused at shutdown
+################################################################################
+import asyncio
+import contextlib
+import functools
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class ServerBusy(RuntimeError):
+    """Raised when a tool call is refused because the server is full or draining."""
+
+
+@dataclass(frozen=True)
+class AdmissionLimits:
+    """
+    Limits on the tool calls a server runs.
+
+    Attributes:
+        max_concurrent: Tool calls executing at once; None for no limit
+        max_queue: Calls that may wait for a slot; any more are refused at once
+        queue_timeout: Seconds a queued call waits for a slot before it is
+            refused
+    """
+
+    max_concurrent: int | None = None
+    max_queue: int = 0
+    queue_timeout: float = 10.0
+
+
+class AdmissionController:
+    """
+    Admits tool calls up to a concurrency limit, queueing a bounded number.
+
+    Slots are handed to queued calls in arrival order. All methods must be
+    called from the event loop serving the tools.
+    """
+
+    def __init__(self, limits: AdmissionLimits | None = None):
+        self.limits = limits or AdmissionLimits()
+        self.running = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.closed = False
+        self._waiters: deque[asyncio.Future] = deque()
+        self._idle: asyncio.Future | None = None
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    @property
+    def busy(self) -> bool:
+        return self.running > 0 or self.queued > 0
+
+    def _refuse(self, reason: str) -> ServerBusy:
+        self.rejected += 1
+        return ServerBusy(reason)
+
+    async def acquire(self) -> None:
+        """
+        Wait for a slot to run a tool call in.
+
+        Raises:
+            ServerBusy: When the server is draining, the queue is full, or no
+                slot freed up within the queue timeout
+        """
+        if self.closed:
+            raise self._refuse("Server is shutting down; retry on another server")
+        limit = self.limits.max_concurrent
+        if limit is None or (self.running < limit and not self.queued):
+            self.running += 1
+            self.admitted += 1
+            return
+        if self.queued >= self.limits.max_queue:
+            raise self._refuse(
+                f"Server busy: {self.running} tool calls running and "
+                f"{self.queued} queued; retry later"
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            async with asyncio.timeout(self.limits.queue_timeout):
+                await waiter
+        except (TimeoutError, asyncio.CancelledError) as error:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait ended; pass it on
+                self.release()
+            else:
+                waiter.cancel()
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+                self._notify_idle()
+            if isinstance(error, TimeoutError):
+                raise self._refuse(
+                    f"Server busy: no tool slot freed up within "
+                    f"{self.limits.queue_timeout:g}s; retry later"
+                ) from None
+            raise
+        self.admitted += 1
+
+    def release(self) -> None:
+        """Free a slot, handing it straight to the longest-waiting call."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.running -= 1
+        self._notify_idle()
+
+    def close(self) -> None:
+        """Refuse new calls; those already running or queued still finish."""
+        self.closed = True
+
+    async def drain(self, timeout: float | None = None) -> bool:
+        """
+        Refuse new calls and wait for the admitted ones to finish.
+
+        Args:
+            timeout: Seconds to wait at most; None waits as long as it takes
+
+        Returns:
+            Whether every admitted call finished in time.
+        """
+        self.close()
+        try:
+            async with asyncio.timeout(timeout):
+                while self.busy:
+                    self._idle = asyncio.get_running_loop().create_future()
+                    await self._idle
+        except TimeoutError:
+            return False
+        return True
+
+    def _notify_idle(self) -> None:
+        if not self.busy and self._idle is not None and not self._idle.done():
+            self._idle.set_result(None)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "max_concurrent": self.limits.max_concurrent,
+            "max_queue": self.limits.max_queue,
+            "draining": self.closed,
+        }
+
+
+_controller: AdmissionController | None = AdmissionController()
+
+
+def get_controller() -> AdmissionController | None:
+    """Return the admission controller tool calls pass through, if any."""
+    return _controller
+
+
+def set_controller(controller: AdmissionController | None) -> None:
+    """Install an admission controller; None admits every call unconditionally."""
+    global _controller
+    _controller = controller
+
+
+def configure(
+    max_concurrent: int | None = None,
+    max_queue: int = 0,
+    queue_timeout: float = 10.0,
+) -> AdmissionController:
+    """
+    Replace the shared admission controller with one using the given limits.
+
+    Returns:
+        The newly installed controller.
+    """
+    controller = AdmissionController(
+        AdmissionLimits(max_concurrent, max(max_queue, 0), queue_timeout)
+    )
+    set_controller(controller)
+    return controller
+
+
+def limit_tool(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """Wrap an async tool so every call first takes a slot from the controller."""
+
+    @functools.wraps(fn)
+    async def limited(*args: Any, **kwargs: Any) -> T:
+        controller = _controller
+        if controller is None:
+            return await fn(*args, **kwargs)
+        await controller.acquire()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            controller.release()
+
+    return limited
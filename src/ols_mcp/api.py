@@ -2,10 +2,480 @@
 # ols_mcp/api.py
 # This module contains wrapper functions that interact with the OLS API endpoints
 ################################################################################
+import asyncio
+import contextvars
+import json
+import math
+import re
+import sqlite3
+import sys
 import urllib.parse
-from typing import Any
+from collections import deque
+from collections.abc import (
+    AsyncGenerator,
+    Callable,
+    Coroutine,
+    Generator,
+    Iterator,
+    Sequence,
+)
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import aclosing
+from itertools import islice
+from typing import TYPE_CHECKING, Any, TypeVar
 
-import requests
+import httpx
+
+from . import (
+    cache,
+    client,
+    deadline,
+    metrics,
+    mirror,
+    ratelimit,
+    retry,
+    singleflight,
+    snapshot,
+    tracing,
+)
+
+if TYPE_CHECKING:
+    # Only the sync functions use requests; they import it on first call
+    import requests
+
+T = TypeVar("T")
+
+# Pages fetched in parallel after the first page reveals the page count
+DEFAULT_PAGE_CONCURRENCY = 4
+
+# Queries or lookups run at once by the batch functions
+DEFAULT_BATCH_CONCURRENCY = 8
+
+# PREFIX:LOCAL_ID or PREFIX_LOCAL_ID, as in GO:0008150 or NCBITaxon_9606
+_OBO_ID = re.compile(r"^([A-Za-z][A-Za-z0-9.\-]*)[:_]([A-Za-z0-9_.\-]+)$")
+_OBO_PURL = "http://purl.obolibrary.org/obo/"
+
+
+def _ols_url(path: str) -> str:
+    """Join an API path onto the configured OLS base URL."""
+    return client.get_config().base_url.rstrip("/") + path
+
+
+def _get_offline(url: str, key: str) -> Any:
+    """Serve a request from the cache only, stale entries included."""
+    store = cache.get_cache()
+    body = store.get(key, allow_stale=True) if store is not None else None
+    if body is None:
+        raise cache.OfflineCacheMiss(f"Offline mode: no cached response for {url}")
+    return _loads(body)
+
+
+def _loads(body: bytes) -> Any:
+    """Decode a JSON body, traced as its own step."""
+    with tracing.span("ols.decode", **{"ols.bytes": len(body)}):
+        return json.loads(body)
+
+
+def _get_json(
+    url: str, params: dict[str, Any] | None = None, use_cache: bool = True
+) -> Any:
+    """
+    Issue a GET through the shared pooled session and decode the JSON body.
+
+    Args:
+        url: The endpoint to request
+        params: Query parameters to send with the request
+        use_cache: If False, bypass the shared response cache for this call
+            (ignored in offline mode, where the cache is the only source)
+
+    Returns:
+        The decoded JSON payload. Concurrent callers for the same URL and
+        parameters may receive the same object, so treat it as read-only.
+
+    Raises:
+        cache.OfflineCacheMiss: In offline mode, when nothing is cached
+    """
+    with tracing.span("ols.request", **tracing.request_attributes(url, params)) as span:
+        key = cache.cache_key(url, params)
+        if client.get_config().offline:
+            span.set_attribute("ols.cache", "offline")
+            return _get_offline(url, key)
+
+        store = cache.get_cache() if use_cache else None
+        entry = store.lookup(key) if store is not None else None
+        if entry is not None and store is not None and store.is_fresh(entry):
+            span.set_attribute("ols.cache", "hit")
+            return _loads(entry.body)
+        span.set_attribute("ols.cache", "miss" if entry is None else "stale")
+
+        def fetch() -> Any:
+            import requests
+
+            # An expired entry is revalidated rather than downloaded again
+            headers = entry.validators if entry is not None else {}
+
+            def attempt() -> "requests.Response":
+                with (
+                    tracing.span("ols.http", **{"http.request.method": "GET"}) as http,
+                    ratelimit.request(url) as permit,
+                    metrics.track_request(url) as probe,
+                ):
+                    response = client.get_session().get(
+                        url,
+                        params=params,
+                        headers=headers,
+                        timeout=deadline.clip(client.get_config().timeout),
+                    )
+                    permit.record(response.status_code)
+                    probe.record(response)
+                    http.set_attribute(
+                        "http.response.status_code", response.status_code
+                    )
+                return response
+
+            try:
+                response = retry.call(url, attempt)
+            except requests.Timeout as error:
+                _raise_if_expired(error)
+                raise
+            return _decode_response(response, url, key, store, entry)
+
+        # Identical requests already in flight share that request and its result
+        return singleflight.get_group().do(key, fetch)
+
+
+async def _get_json_async(
+    url: str, params: dict[str, Any] | None = None, use_cache: bool = True
+) -> Any:
+    """Async counterpart of _get_json using the shared httpx client."""
+    with tracing.span("ols.request", **tracing.request_attributes(url, params)) as span:
+        key = cache.cache_key(url, params)
+        if client.get_config().offline:
+            span.set_attribute("ols.cache", "offline")
+            return await asyncio.to_thread(_get_offline, url, key)
+
+        # The disk tier is SQLite and may wait on another process's write
+        # lock, so it is only ever touched from a worker thread
+        store = cache.get_cache() if use_cache else None
+        entry = (
+            await asyncio.to_thread(store.lookup, key) if store is not None else None
+        )
+        if entry is not None and store is not None and store.is_fresh(entry):
+            span.set_attribute("ols.cache", "hit")
+            return _loads(entry.body)
+        span.set_attribute("ols.cache", "miss" if entry is None else "stale")
+
+        async def fetch() -> Any:
+            headers = entry.validators if entry is not None else {}
+
+            async def attempt() -> httpx.Response:
+                connect, read = deadline.clip(client.get_config().timeout)
+                with tracing.span("ols.http", **{"http.request.method": "GET"}) as http:
+                    async with ratelimit.request_async(url) as permit:
+                        with metrics.track_request(url) as probe:
+                            response = await client.get_async_client().get(
+                                url,
+                                params=params,
+                                headers=headers,
+                                timeout=httpx.Timeout(read, connect=connect),
+                            )
+                            permit.record(response.status_code)
+                            probe.record(response)
+                    http.set_attribute(
+                        "http.response.status_code", response.status_code
+                    )
+                return response
+
+            try:
+                response = await retry.call_async(url, attempt)
+            except httpx.TimeoutException as error:
+                _raise_if_expired(error)
+                raise
+            return await asyncio.to_thread(
+                _decode_response, response, url, key, store, entry
+            )
+
+        return await singleflight.get_async_group().do(key, fetch)
+
+
+def _raise_if_expired(error: Exception) -> None:
+    """Report a request timeout caused by the caller's time budget as such."""
+    if deadline.expired():
+        raise deadline.DeadlineExceeded(
+            "Time budget exhausted before OLS answered"
+        ) from error
+
+
+def _submit(
+    executor: ThreadPoolExecutor, fn: Callable[..., T], *args: Any
+) -> Future[T]:
+    """Submit fn to a worker thread that sees the caller's deadline."""
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+def _decode_response(
+    response: Any,
+    url: str,
+    key: str,
+    store: cache.ResponseCache | None,
+    entry: cache.CacheEntry | None,
+) -> Any:
+    """
+    Decode a requests or httpx response, keeping the cache in step with it.
+
+    A 304 answer to a conditional request reuses the cached body; any other
+    successful answer replaces it along with its ETag/Last-Modified.
+    """
+    if response.status_code == 304 and store is not None and entry is not None:
+        store.revalidated(key, entry, store.ttl_for(url))
+        return _loads(entry.body)
+
+    response.raise_for_status()
+
+    if store is not None:
+        store.set(
+            key,
+            response.content,
+            store.ttl_for(url),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+    return _loads(response.content)
+
+
+def _fetch_pages(
+    fetch: Callable[[int], T], pages: Sequence[int], concurrency: int
+) -> Generator[T, None, None]:
+    """
+    Fetch pages on a bounded thread pool, yielding responses in page order.
+
+    At most `concurrency` pages are downloading or waiting to be consumed at
+    any time, so a slow consumer never buffers more than that many pages.
+    Pages that have not started yet are cancelled as soon as the caller stops
+    iterating, so an early break does not keep downloading.
+    """
+    if concurrency <= 1 or len(pages) <= 1:
+        for page in pages:
+            yield fetch(page)
+        return
+
+    pending = iter(pages)
+    executor = ThreadPoolExecutor(max_workers=min(concurrency, len(pages)))
+    window: deque[Future[T]] = deque(
+        _submit(executor, fetch, page) for page in islice(pending, concurrency)
+    )
+    try:
+        while window:
+            data = window.popleft().result()
+            # Keep reading ahead while the caller works on this page
+            for page in islice(pending, 1):
+                window.append(_submit(executor, fetch, page))
+            yield data
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _fetch_pages_async(
+    fetch: Callable[[int], Coroutine[Any, Any, T]],
+    pages: Sequence[int],
+    concurrency: int,
+) -> AsyncGenerator[T, None]:
+    """Async counterpart of _fetch_pages with the same read-ahead window."""
+    pending = iter(pages)
+    window: deque[asyncio.Task[T]] = deque(
+        asyncio.create_task(fetch(page))
+        for page in islice(pending, max(concurrency, 1))
+    )
+    try:
+        while window:
+            data = await window[0]
+            window.popleft()
+            for page in islice(pending, 1):
+                window.append(asyncio.create_task(fetch(page)))
+            yield data
+    finally:
+        for task in window:
+            task.cancel()
+        # Wait for the cancellations to land so no request outlives the caller
+        await asyncio.gather(*window, return_exceptions=True)
+
+
+def _search_request(
+    query: str, ontologies: list[str] | None, max_results: int, exact: bool
+) -> tuple[str, dict[str, Any]]:
+    base_url = _ols_url("/search")
+
+    params: dict[str, Any] = {"q": query, "rows": max_results, "exact": exact}
+
+    if ontologies:
+        params["ontology"] = ",".join(ontologies)
+
+    return base_url, params
+
+
+def _search_mirror(
+    query: str, ontologies: list[str] | None, max_results: int, exact: bool
+) -> list[dict[str, Any]] | None:
+    """Answer a search from the local mirror, or return None to ask OLS."""
+    store = mirror.get_mirror()
+    # Only searches limited to named ontologies can be answered locally
+    if store is None or not ontologies:
+        return None
+    # A broken mirror file falls back to OLS instead of failing the search
+    try:
+        if not store.covers(ontologies):
+            return None
+        return store.search(query, ontologies, max_results=max_results, exact=exact)
+    except sqlite3.Error:
+        return None
+
+
+def _snapshot_terms(
+    ontology_id: str,
+    max_results: int | None,
+    iri: str | None,
+    short_form: str | None,
+    obo_id: str | None,
+) -> Iterator[dict[str, Any]] | None:
+    """Terms from a loaded snapshot of the ontology, or None to ask OLS."""
+    mapped = snapshot.get_snapshot(ontology_id)
+    if mapped is None:
+        return None
+    if iri or short_form or obo_id:
+        number = mapped.find(iri=iri, short_form=short_form, obo_id=obo_id)
+        return iter([] if number is None else [mapped.term(number)])
+    return mapped.terms(max_results)
+
+
+def _terms_request(
+    ontology_id: str,
+    max_results: int | None,
+    page_size: int,
+    iri: str | None,
+    short_form: str | None,
+    obo_id: str | None,
+) -> tuple[str, dict[str, Any]]:
+    base_url = _ols_url(f"/ontologies/{ontology_id}/terms")
+
+    size = page_size if max_results is None else min(page_size, max_results)
+    params: dict[str, Any] = {"size": size}
+
+    if iri:
+        params["iri"] = iri
+    if short_form:
+        params["short_form"] = short_form
+    if obo_id:
+        params["obo_id"] = obo_id
+
+    return base_url, params
+
+
+def _remaining_term_pages(
+    data: dict[str, Any], max_results: int | None, page_size: int
+) -> range:
+    """Pages still needed after the first /terms response, given its metadata."""
+    page_info = data.get("page", {})
+    first_page = page_info.get("number", 0)
+    last_page = page_info.get("totalPages", 0)
+    if max_results is not None:
+        last_page = min(last_page, first_page + math.ceil(max_results / page_size))
+    return range(first_page + 1, last_page)
+
+
+def _take_terms(
+    data: dict[str, Any], max_results: int | None, count: int
+) -> list[dict[str, Any]]:
+    """The terms on a /terms page that still fit under max_results."""
+    terms = data.get("_embedded", {}).get("terms", [])
+    if max_results is None:
+        return terms
+    return terms[: max_results - count]
+
+
+def parse_term_identifier(identifier: str) -> tuple[str | None, str, str] | None:
+    """
+    Work out how to look up a term from an OBO ID, short form or IRI.
+
+    CURIEs, short forms and OBO PURLs for the same term all map to the same
+    lookup, so they can share one request.
+
+    Args:
+        identifier: e.g. 'GO:0008150', 'GO_0008150' or
+            'http://purl.obolibrary.org/obo/GO_0008150'
+
+    Returns:
+        An (ontology_id, filter, value) tuple where ontology_id is None for
+        IRIs that must be looked up across all ontologies, or None when the
+        identifier is not recognised.
+    """
+    identifier = identifier.strip()
+    if identifier.startswith(("http://", "https://")):
+        if not identifier.startswith(_OBO_PURL):
+            return None, "iri", identifier
+        identifier = identifier[len(_OBO_PURL) :]
+
+    match = _OBO_ID.match(identifier)
+    if match is None:
+        return None
+    prefix, local_id = match.groups()
+    return prefix.lower(), "short_form", f"{prefix}_{local_id}"
+
+
+def _is_not_found(error: Exception) -> bool:
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code == 404
+
+
+def _pick_defining_term(terms: list[dict[str, Any]]) -> dict[str, Any] | None:
+    # /terms?iri= lists the term once per ontology that imports it
+    for term in terms:
+        if term.get("is_defining_ontology"):
+            return term
+    return terms[0] if terms else None
+
+
+def _similar_url(iri: str, ontology: str) -> tuple[str, str]:
+    iri = urllib.parse.quote(urllib.parse.quote(iri, safe=""), safe="")
+    base_url = (
+        _ols_url(f"/v2/ontologies/{ontology.lower()}/classes/{iri}/llm_similar")
+    )
+    return base_url, iri
+
+
+def _similar_page_info(data: dict[str, Any]) -> tuple[int, int]:
+    """Return (current_page, total_pages) from an llm_similar response."""
+    page_info = data.get("page", {})
+    if isinstance(page_info, dict):
+        current_page = page_info.get("number", 0)
+        total_pages = page_info.get("totalPages", 1)
+    else:
+        # Handle case where page is a simple integer
+        current_page = page_info
+        total_pages = data.get("totalPages", 1)
+    return current_page, total_pages
+
+
+def _remaining_similar_pages(
+    data: dict[str, Any], max_results: int, page_size: int
+) -> range:
+    """Pages still needed after the first llm_similar response."""
+    current_page, total_pages = _similar_page_info(data)
+    wanted_pages = math.ceil(max_results / page_size)
+    return range(current_page + 1, min(total_pages, wanted_pages))
+
+
+def _filter_similar(
+    all_terms: list[dict[str, Any]], quoted_iri: str, max_results: int
+) -> list[dict[str, Any]]:
+    # Filter out exact curies from results
+    all_terms = [
+        term
+        for term in all_terms
+        if not term.get("score", 0) >= 0.99
+        or term.get("curie", "NONE:999").replace(":", "_") not in quoted_iri
+    ]
+    # Truncate to max_results
+    return all_terms[:max_results]
 
 
 def search_ontologies(
@@ -14,6 +484,7 @@ def search_ontologies(
     max_results: int = 20,
     exact: bool = False,
     verbose: bool = False,
+    use_cache: bool = True,
 ) -> list[dict[str, Any]]:
     """
     Search across all ontologies in the OLS.
@@ -24,57 +495,505 @@ def search_ontologies(
         max_results: Maximum number of results to return
         exact: Whether to perform exact matching
         verbose: If True, print progress information during retrieval
+        use_cache: If False, always fetch a fresh response from OLS
 
     Returns:
         A list of dictionaries, where each dictionary represents a search result.
     """
-    base_url = "https://www.ebi.ac.uk/ols/api/search"
+    if verbose:
+        print(f"Searching OLS for: {query}", file=sys.stderr)
 
-    params: dict[str, Any] = {"q": query, "rows": max_results, "exact": exact}
+    results = _search_mirror(query, ontologies, max_results, exact)
+    if results is not None:
+        if verbose:
+            print(f"Found {len(results)} results in the local mirror", file=sys.stderr)
+        return results
 
-    if ontologies:
-        params["ontology"] = ",".join(ontologies)
+    base_url, params = _search_request(query, ontologies, max_results, exact)
+    data = _get_json(base_url, params=params, use_cache=use_cache)
+
+    # Extract the docs from the response
+    results = data.get("response", {}).get("docs", [])
 
     if verbose:
-        print(f"Searching OLS for: {query}")
+        print(f"Found {len(results)} results", file=sys.stderr)
 
-    response = requests.get(base_url, params=params)
-    response.raise_for_status()
-    data = response.json()
+    return results
+
+
+async def search_ontologies_async(
+    query: str,
+    ontologies: list[str] | None = None,
+    max_results: int = 20,
+    exact: bool = False,
+    verbose: bool = False,
+    use_cache: bool = True,
+) -> list[dict[str, Any]]:
+    """Async counterpart of search_ontologies; takes the same arguments."""
+    if verbose:
+        print(f"Searching OLS for: {query}", file=sys.stderr)
+
+    # The mirror is SQLite too, so like the disk cache it is only ever
+    # searched from a worker thread
+    results = (
+        await asyncio.to_thread(_search_mirror, query, ontologies, max_results, exact)
+        if mirror.get_mirror() is not None and ontologies
+        else None
+    )
+    if results is not None:
+        if verbose:
+            print(f"Found {len(results)} results in the local mirror", file=sys.stderr)
+        return results
+
+    base_url, params = _search_request(query, ontologies, max_results, exact)
+    data = await _get_json_async(base_url, params=params, use_cache=use_cache)
 
-    # Extract the docs from the response
     results = data.get("response", {}).get("docs", [])
 
     if verbose:
-        print(f"Found {len(results)} results")
+        print(f"Found {len(results)} results", file=sys.stderr)
 
     return results
 
-def get_ontology_details(ontology_id: str, verbose: bool = False) -> dict[str, Any]:
+
+def search_ontologies_many(
+    queries: Sequence[str],
+    ontologies: list[str] | None = None,
+    max_results: int = 20,
+    exact: bool = False,
+    verbose: bool = False,
+    use_cache: bool = True,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+) -> dict[str, list[dict[str, Any]] | dict[str, str]]:
+    """
+    Run many searches with shared options, concurrently.
+
+    Identical queries are searched once, and a search that fails does not
+    fail the others.
+
+    Args:
+        queries: The search terms
+        ontologies: List of specific ontology IDs to search within (optional)
+        max_results: Maximum number of results to return per query
+        exact: Whether to perform exact matching
+        verbose: If True, print progress information during retrieval
+        use_cache: If False, always fetch fresh responses from OLS
+        concurrency: Maximum number of searches in flight at once
+
+    Returns:
+        A dictionary mapping each distinct query to its list of results, in
+        the order the queries were first given, or to a failed_entry() when
+        its search failed or was still unanswered when the deadline passed;
+        that cut-off is also reported with deadline.report_cutoff().
+    """
+    unique_queries = list(dict.fromkeys(queries))
+    if not unique_queries:
+        return {}
+    unfinished: list[str] = []
+
+    def search(query: str) -> list[dict[str, Any]] | dict[str, str]:
+        try:
+            return search_ontologies(
+                query,
+                ontologies=ontologies,
+                max_results=max_results,
+                exact=exact,
+                verbose=verbose,
+                use_cache=use_cache,
+            )
+        except deadline.DeadlineExceeded:
+            unfinished.append(query)
+            return failed_entry("deadline_exceeded", _UNANSWERED_SEARCH)
+        except Exception as error:
+            return failed_entry("request_failed", _describe_error(error))
+
+    workers = max(1, min(concurrency, len(unique_queries)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [_submit(executor, search, query) for query in unique_queries]
+        results = [future.result() for future in futures]
+
+    _report_unfinished(len(unfinished), len(unique_queries), "searches")
+    return dict(zip(unique_queries, results, strict=True))
+
+
+async def search_ontologies_many_async(
+    queries: Sequence[str],
+    ontologies: list[str] | None = None,
+    max_results: int = 20,
+    exact: bool = False,
+    verbose: bool = False,
+    use_cache: bool = True,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+) -> dict[str, list[dict[str, Any]] | dict[str, str]]:
+    """Async counterpart of search_ontologies_many; takes the same arguments."""
+    unique_queries = list(dict.fromkeys(queries))
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    unfinished: list[str] = []
+
+    async def search(query: str) -> list[dict[str, Any]] | dict[str, str]:
+        async with semaphore:
+            try:
+                return await search_ontologies_async(
+                    query,
+                    ontologies=ontologies,
+                    max_results=max_results,
+                    exact=exact,
+                    verbose=verbose,
+                    use_cache=use_cache,
+                )
+            except deadline.DeadlineExceeded:
+                unfinished.append(query)
+                return failed_entry("deadline_exceeded", _UNANSWERED_SEARCH)
+            except Exception as error:
+                return failed_entry("request_failed", _describe_error(error))
+
+    # A task group cancels the other searches if one is cancelled or crashes,
+    # so no request outlives the call
+    async with asyncio.TaskGroup() as group:
+        tasks = [group.create_task(search(query)) for query in unique_queries]
+    results = [task.result() for task in tasks]
+
+    _report_unfinished(len(unfinished), len(unique_queries), "searches")
+    return dict(zip(unique_queries, results, strict=True))
+
+
+def failed_entry(kind: str, message: str) -> dict[str, str]:
+    """
+    Return the entry a batch result holds for an item it could not answer.
+
+    Args:
+        kind: Why the item has no answer; "request_failed" when OLS could not
+            be reached or answered with an error, "deadline_exceeded" when
+            the call's deadline passed first
+        message: A description of the failure
+    """
+    return {"error": kind, "message": message}
+
+
+_UNANSWERED_SEARCH = "Time budget ran out before this search finished"
+_UNANSWERED_LOOKUP = "Time budget ran out before this identifier was looked up"
+
+
+def is_failed_entry(entry: Any) -> bool:
+    """Return whether an entry of a batch result marks an item that failed."""
+    return isinstance(entry, dict) and "error" in entry
+
+
+def _describe_error(error: Exception) -> str:
+    return f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+
+
+def _report_unfinished(unfinished: int, total: int, calls: str) -> None:
+    if unfinished:
+        deadline.report_cutoff(
+            f"Time budget ran out before {unfinished} of {total} {calls} finished"
+        )
+
+
+def get_ontology_details(
+    ontology_id: str, verbose: bool = False, use_cache: bool = True
+) -> dict[str, Any]:
     """
     Get details about a specific ontology.
 
     Args:
         ontology_id: The ID of the ontology (e.g., 'go', 'uberon')
         verbose: If True, print progress information
+        use_cache: If False, always fetch a fresh response from OLS
 
     Returns:
         A dictionary containing ontology details.
     """
-    base_url = f"https://www.ebi.ac.uk/ols/api/ontologies/{ontology_id}"
+    base_url = _ols_url(f"/ontologies/{ontology_id}")
 
     if verbose:
-        print(f"Fetching details for ontology: {ontology_id}")
+        print(f"Fetching details for ontology: {ontology_id}", file=sys.stderr)
 
-    response = requests.get(base_url)
-    response.raise_for_status()
-    data = response.json()
+    data = _get_json(base_url, use_cache=use_cache)
+
+    if verbose:
+        print(f"Retrieved details for {ontology_id}", file=sys.stderr)
+
+    return data
+
+
+async def get_ontology_details_async(
+    ontology_id: str, verbose: bool = False, use_cache: bool = True
+) -> dict[str, Any]:
+    """Async counterpart of get_ontology_details; takes the same arguments."""
+    base_url = _ols_url(f"/ontologies/{ontology_id}")
+
+    if verbose:
+        print(f"Fetching details for ontology: {ontology_id}", file=sys.stderr)
+
+    data = await _get_json_async(base_url, use_cache=use_cache)
 
     if verbose:
-        print(f"Retrieved details for {ontology_id}")
+        print(f"Retrieved details for {ontology_id}", file=sys.stderr)
 
     return data
 
+
+def iter_ontology_terms(
+    ontology_id: str,
+    max_results: int | None = None,
+    page_size: int = 20,
+    iri: str | None = None,
+    short_form: str | None = None,
+    obo_id: str | None = None,
+    verbose: bool = False,
+    concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    use_cache: bool = True,
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream classes/terms from a specific ontology one page at a time.
+
+    Only the page being consumed and the pages read ahead of it are held in
+    memory, so a whole ontology can be walked without collecting it. When a
+    snapshot of the ontology is loaded (see ols_mcp/snapshot.py), terms come
+    from it instead, unless use_cache is False.
+
+    Args:
+        ontology_id: The ID of the ontology (e.g., 'go', 'uberon')
+        max_results: Maximum number of terms to yield (None for all of them)
+        page_size: Number of results per page
+        iri: Filter by specific IRI
+        short_form: Filter by short form
+        obo_id: Filter by OBO ID
+        verbose: If True, print progress information
+        concurrency: Maximum number of pages fetched or buffered ahead of
+            the caller
+        use_cache: If False, always fetch fresh responses from OLS
+
+    Yields:
+        Dictionaries, each representing a term, in OLS page order.
+    """
+    if max_results is not None and max_results <= 0:
+        return
+
+    # A memory-mapped snapshot answers without contacting OLS
+    local = (
+        _snapshot_terms(ontology_id, max_results, iri, short_form, obo_id)
+        if use_cache
+        else None
+    )
+    if local is not None:
+        yield from local
+        return
+
+    base_url, params = _terms_request(
+        ontology_id, max_results, page_size, iri, short_form, obo_id
+    )
+
+    if verbose:
+        print(f"Fetching terms from ontology: {ontology_id}", file=sys.stderr)
+
+    def fetch(page: int) -> dict[str, Any]:
+        return _get_json(
+            base_url, params={**params, "page": page}, use_cache=use_cache
+        )
+
+    # The first page tells us how many pages exist; the rest are read ahead
+    # concurrently and yielded in page order
+    data = fetch(0)
+    remaining = _remaining_term_pages(data, max_results, params["size"])
+    metrics.observe("ols_pagination_pages", 1 + len(remaining), endpoint="terms")
+    pages = _fetch_pages(fetch, remaining, concurrency)
+    count = 0
+    try:
+        while True:
+            terms = _take_terms(data, max_results, count)
+            if not terms:
+                break
+
+            yield from terms
+            count += len(terms)
+
+            if verbose:
+                page = data.get("page", {}).get("number", 0)
+                print(
+                    f"Fetched page {page + 1}, total terms so far: {count}",
+                    file=sys.stderr,
+                )
+
+            if max_results is not None and count >= max_results:
+                break
+
+            following = next(pages, None)
+            if following is None:
+                break
+            data = following
+    finally:
+        pages.close()
+
+
+async def iter_ontology_terms_async(
+    ontology_id: str,
+    max_results: int | None = None,
+    page_size: int = 20,
+    iri: str | None = None,
+    short_form: str | None = None,
+    obo_id: str | None = None,
+    verbose: bool = False,
+    concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    use_cache: bool = True,
+) -> AsyncGenerator[dict[str, Any], None]:
+    """Async counterpart of iter_ontology_terms; takes the same arguments."""
+    if max_results is not None and max_results <= 0:
+        return
+
+    local = (
+        _snapshot_terms(ontology_id, max_results, iri, short_form, obo_id)
+        if use_cache
+        else None
+    )
+    if local is not None:
+        for term in local:
+            yield term
+        return
+
+    base_url, params = _terms_request(
+        ontology_id, max_results, page_size, iri, short_form, obo_id
+    )
+
+    if verbose:
+        print(f"Fetching terms from ontology: {ontology_id}", file=sys.stderr)
+
+    async def fetch(page: int) -> dict[str, Any]:
+        return await _get_json_async(
+            base_url, params={**params, "page": page}, use_cache=use_cache
+        )
+
+    data = await fetch(0)
+    remaining = _remaining_term_pages(data, max_results, params["size"])
+    metrics.observe("ols_pagination_pages", 1 + len(remaining), endpoint="terms")
+    count = 0
+    async with aclosing(_fetch_pages_async(fetch, remaining, concurrency)) as pages:
+        while True:
+            terms = _take_terms(data, max_results, count)
+            if not terms:
+                break
+
+            for term in terms:
+                yield term
+            count += len(terms)
+
+            if verbose:
+                page = data.get("page", {}).get("number", 0)
+                print(
+                    f"Fetched page {page + 1}, total terms so far: {count}",
+                    file=sys.stderr,
+                )
+
+            if max_results is not None and count >= max_results:
+                break
+
+            following = await anext(pages, None)
+            if following is None:
+                break
+            data = following
+
+
+def iter_ontology_term_pages(
+    ontology_id: str,
+    page_size: int = 20,
+    start_page: int = 0,
+    verbose: bool = False,
+    concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    use_cache: bool = True,
+) -> Generator[tuple[int, list[dict[str, Any]]], None, None]:
+    """
+    Stream every /terms page of an ontology, starting from a given page.
+
+    Yielding page numbers lets a long crawl record how far it got and resume
+    from there after an interruption.
+
+    Args:
+        ontology_id: The ID of the ontology (e.g., 'go', 'chebi')
+        page_size: Number of terms per page; resuming needs the same size
+        start_page: Zero-based number of the first page to fetch
+        verbose: If True, print progress information
+        concurrency: Maximum number of pages fetched or buffered ahead of
+            the caller
+        use_cache: If False, always fetch fresh responses from OLS
+
+    Yields:
+        (page number, terms on that page) tuples in page order.
+    """
+    base_url, params = _terms_request(ontology_id, None, page_size, None, None, None)
+
+    def fetch(page: int) -> dict[str, Any]:
+        return _get_json(
+            base_url, params={**params, "page": page}, use_cache=use_cache
+        )
+
+    data = fetch(start_page)
+    remaining = _remaining_term_pages(data, None, params["size"])
+    total_pages = data.get("page", {}).get("totalPages", 0)
+    pages = _fetch_pages(fetch, remaining, concurrency)
+    page = start_page
+    try:
+        while True:
+            terms = data.get("_embedded", {}).get("terms", [])
+            if not terms:
+                break
+
+            if verbose:
+                print(
+                    f"Fetched page {page + 1} of {total_pages} from {ontology_id}",
+                    file=sys.stderr,
+                )
+
+            yield page, terms
+            page += 1
+            following = next(pages, None)
+            if following is None:
+                break
+            data = following
+    finally:
+        pages.close()
+
+
+async def iter_ontology_term_pages_async(
+    ontology_id: str,
+    page_size: int = 20,
+    start_page: int = 0,
+    verbose: bool = False,
+    concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    use_cache: bool = True,
+) -> AsyncGenerator[tuple[int, list[dict[str, Any]]], None]:
+    """Async counterpart of iter_ontology_term_pages; takes the same arguments."""
+    base_url, params = _terms_request(ontology_id, None, page_size, None, None, None)
+
+    async def fetch(page: int) -> dict[str, Any]:
+        return await _get_json_async(
+            base_url, params={**params, "page": page}, use_cache=use_cache
+        )
+
+    data = await fetch(start_page)
+    remaining = _remaining_term_pages(data, None, params["size"])
+    total_pages = data.get("page", {}).get("totalPages", 0)
+    page = start_page
+    async with aclosing(_fetch_pages_async(fetch, remaining, concurrency)) as pages:
+        while True:
+            terms = data.get("_embedded", {}).get("terms", [])
+            if not terms:
+                break
+
+            if verbose:
+                print(
+                    f"Fetched page {page + 1} of {total_pages} from {ontology_id}",
+                    file=sys.stderr,
+                )
+
+            yield page, terms
+            page += 1
+            following = await anext(pages, None)
+            if following is None:
+                break
+            data = following
+
+
 def get_ontology_terms(
     ontology_id: str,
     max_results: int = 20,
@@ -83,6 +1002,8 @@ def get_ontology_terms(
     short_form: str | None = None,
     obo_id: str | None = None,
     verbose: bool = False,
+    concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    use_cache: bool = True,
 ) -> list[dict[str, Any]]:
     """
     Get classes/terms from a specific ontology.
@@ -95,109 +1016,475 @@ def get_ontology_terms(
         short_form: Filter by short form
         obo_id: Filter by OBO ID
         verbose: If True, print progress information
+        concurrency: Maximum number of pages fetched at once after the first
+        use_cache: If False, always fetch fresh responses from OLS
 
     Returns:
         A list of dictionaries, where each dictionary represents a term.
     """
-    base_url = f"https://www.ebi.ac.uk/ols/api/ontologies/{ontology_id}/terms"
+    result = list(
+        iter_ontology_terms(
+            ontology_id,
+            max_results=max_results,
+            page_size=page_size,
+            iri=iri,
+            short_form=short_form,
+            obo_id=obo_id,
+            verbose=verbose,
+            concurrency=concurrency,
+            use_cache=use_cache,
+        )
+    )
 
-    params: dict[str, Any] = {"size": min(page_size, max_results)}
+    if verbose:
+        print(f"Retrieved {len(result)} terms from {ontology_id}", file=sys.stderr)
 
-    if iri:
-        params["iri"] = iri
-    if short_form:
-        params["short_form"] = short_form
-    if obo_id:
-        params["obo_id"] = obo_id
+    return result
 
-    all_terms: list[dict[str, Any]] = []
-    page = 0
+
+async def get_ontology_terms_async(
+    ontology_id: str,
+    max_results: int = 20,
+    page_size: int = 20,
+    iri: str | None = None,
+    short_form: str | None = None,
+    obo_id: str | None = None,
+    verbose: bool = False,
+    concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    use_cache: bool = True,
+) -> list[dict[str, Any]]:
+    """Async counterpart of get_ontology_terms; takes the same arguments."""
+    terms = iter_ontology_terms_async(
+        ontology_id,
+        max_results=max_results,
+        page_size=page_size,
+        iri=iri,
+        short_form=short_form,
+        obo_id=obo_id,
+        verbose=verbose,
+        concurrency=concurrency,
+        use_cache=use_cache,
+    )
+    result = [term async for term in terms]
 
     if verbose:
-        print(f"Fetching terms from ontology: {ontology_id}")
+        print(f"Retrieved {len(result)} terms from {ontology_id}", file=sys.stderr)
 
-    while len(all_terms) < max_results:
-        params["page"] = page
+    return result
 
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        data = response.json()
 
-        terms = data.get("_embedded", {}).get("terms", [])
-        if not terms:
-            break
+def _mirror_store(store: mirror.OntologyMirror | None) -> mirror.OntologyMirror:
+    store = store or mirror.get_mirror()
+    if store is None:
+        raise ValueError("No ontology mirror configured; call mirror.configure()")
+    return store
 
-        all_terms.extend(terms)
 
+def _crawl_into_mirror(
+    store: mirror.OntologyMirror,
+    ontology_id: str,
+    state: mirror.OntologyState,
+    page_size: int,
+    concurrency: int,
+    verbose: bool,
+) -> int:
+    # Resume an interrupted crawl only if OLS has not reloaded the ontology
+    # since it started and the pages line up
+    crawl = store.crawl(ontology_id)
+    if crawl is not None and crawl.state == state and crawl.page_size == page_size:
+        start_page = crawl.next_page
         if verbose:
-            print(f"Fetched page {page + 1}, total terms so far: {len(all_terms)}")
+            print(
+                f"Resuming crawl of {ontology_id} at page {start_page + 1}",
+                file=sys.stderr,
+            )
+    else:
+        store.start_crawl(ontology_id, state, page_size)
+        start_page = 0
 
-        # Check if we have more pages
-        if (
-            not data.get("page", {}).get("number", 0)
-            < data.get("page", {}).get("totalPages", 0) - 1
-        ):
-            break
+    pages = iter_ontology_term_pages(
+        ontology_id,
+        page_size=page_size,
+        start_page=start_page,
+        verbose=verbose,
+        concurrency=concurrency,
+        use_cache=False,
+    )
+    for page, terms in pages:
+        store.stage_page(ontology_id, page, terms)
 
-        page += 1
+    return store.finish_crawl(ontology_id)
 
-    # Truncate to max_results
-    result = all_terms[:max_results]
+
+def mirror_ontology(
+    ontology_id: str,
+    page_size: int = 500,
+    concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    verbose: bool = False,
+    store: mirror.OntologyMirror | None = None,
+) -> int:
+    """
+    Crawl every term of an ontology into the local search mirror.
+
+    Pages are staged in the mirror file as they arrive, bypassing the
+    response cache, so even large ontologies load in flat memory and an
+    interrupted crawl picks up from the last completed page.
+
+    Args:
+        ontology_id: The ID of the ontology (e.g., 'go', 'chebi')
+        page_size: Number of terms per /terms page
+        concurrency: Maximum number of pages fetched at once
+        verbose: If True, print progress information
+        store: The mirror to load into (defaults to mirror.get_mirror())
+
+    Returns:
+        The number of terms mirrored.
+    """
+    store = _mirror_store(store)
+    details = get_ontology_details(ontology_id, use_cache=False)
+    state = mirror.OntologyState.from_details(details)
+
+    count = _crawl_into_mirror(
+        store, ontology_id, state, page_size, concurrency, verbose
+    )
 
     if verbose:
-        print(f"Retrieved {len(result)} terms from {ontology_id}")
+        print(f"Mirrored {count} terms from {ontology_id}", file=sys.stderr)
+
+    return count
+
+
+def sync_ontology(
+    ontology_id: str,
+    page_size: int = 500,
+    concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    force: bool = False,
+    verbose: bool = False,
+    store: mirror.OntologyMirror | None = None,
+) -> dict[str, Any]:
+    """
+    Bring the mirrored copy of an ontology up to date, re-crawling only if needed.
+
+    The ontology's version, updated and loaded values in OLS are compared
+    with those recorded when it was mirrored; an unchanged ontology costs
+    one metadata request. Unfinished crawls are resumed.
+
+    Args:
+        ontology_id: The ID of the ontology (e.g., 'go', 'chebi')
+        page_size: Number of terms per /terms page when re-crawling
+        concurrency: Maximum number of pages fetched at once
+        force: If True, re-crawl even when nothing changed
+        verbose: If True, print progress information
+        store: The mirror to update (defaults to mirror.get_mirror())
+
+    Returns:
+        A dictionary with the ontology ID, a status of "unchanged", "added",
+        "updated" or "resumed", and the number of mirrored terms.
+    """
+    store = _mirror_store(store)
+    details = get_ontology_details(ontology_id, use_cache=False)
+    state = mirror.OntologyState.from_details(details)
+    recorded = store.state(ontology_id)
+    crawl = store.crawl(ontology_id)
+
+    if recorded == state and crawl is None and not force:
+        terms = store.stats()[ontology_id.lower()]["terms"]
+        if verbose:
+            print(f"{ontology_id} is up to date ({terms} terms)", file=sys.stderr)
+        return {"ontology": ontology_id, "status": "unchanged", "terms": terms}
+
+    if crawl is not None and crawl.state == state and crawl.page_size == page_size:
+        status = "resumed"
+    else:
+        status = "added" if recorded is None else "updated"
+
+    terms = _crawl_into_mirror(
+        store, ontology_id, state, page_size, concurrency, verbose
+    )
+
+    if verbose:
+        print(f"Mirrored {terms} terms from {ontology_id} ({status})", file=sys.stderr)
+
+    return {"ontology": ontology_id, "status": status, "terms": terms}
+
+
+def _group_identifiers(
+    identifiers: Sequence[str],
+) -> tuple[list[str], dict[tuple[str | None, str, str], list[str]]]:
+    """De-duplicate identifiers and group them by the lookup that resolves them."""
+    unique = list(dict.fromkeys(identifiers))
+    groups: dict[tuple[str | None, str, str], list[str]] = {}
+    for identifier in unique:
+        lookup = parse_term_identifier(identifier)
+        if lookup is not None:
+            groups.setdefault(lookup, []).append(identifier)
+    # Keep each ontology's lookups together
+    ordered = sorted(groups.items(), key=lambda item: item[0][0] or "")
+    return unique, dict(ordered)
+
+
+def _collect_resolved(
+    unique: list[str],
+    groups: dict[tuple[str | None, str, str], list[str]],
+    terms: list[dict[str, Any] | None],
+) -> dict[str, dict[str, Any] | None]:
+    resolved: dict[str, dict[str, Any] | None] = dict.fromkeys(unique)
+    for identifiers, term in zip(groups.values(), terms, strict=True):
+        for identifier in identifiers:
+            resolved[identifier] = term
+    return resolved
+
+
+def resolve_terms(
+    identifiers: Sequence[str],
+    use_cache: bool = True,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+) -> dict[str, dict[str, Any] | None]:
+    """
+    Resolve many term identifiers (OBO IDs, short forms or IRIs) at once.
+
+    Identifiers are grouped by ontology prefix, equivalent forms of the same
+    term are looked up once, and the lookups run concurrently; a lookup that
+    fails does not fail the others.
+
+    Args:
+        identifiers: Term identifiers in any mix of supported forms
+        use_cache: If False, always fetch fresh responses from OLS
+        concurrency: Maximum number of lookups in flight at once
+
+    Returns:
+        A dictionary mapping each identifier to its term, to None when OLS
+        has no such term or the identifier is not recognised, or to a
+        failed_entry() when its lookup failed or the deadline passed before
+        it was looked up; that cut-off is also reported with
+        deadline.report_cutoff().
+    """
+    unique, groups = _group_identifiers(identifiers)
+    if not groups:
+        return dict.fromkeys(unique)
+    unfinished: list[tuple[str | None, str, str]] = []
+
+    def resolve(lookup: tuple[str | None, str, str]) -> dict[str, Any] | None:
+        ontology_id, field, value = lookup
+        try:
+            if ontology_id is None:
+                # /terms looks a term up across every ontology that contains it
+                terms_url = _ols_url("/terms")
+                data = _get_json(terms_url, {field: value}, use_cache=use_cache)
+                return _pick_defining_term(data.get("_embedded", {}).get("terms", []))
+            terms = get_ontology_terms(
+                ontology_id,
+                max_results=1,
+                iri=value if field == "iri" else None,
+                short_form=value if field == "short_form" else None,
+                obo_id=value if field == "obo_id" else None,
+                use_cache=use_cache,
+            )
+        except deadline.DeadlineExceeded:
+            unfinished.append(lookup)
+            return failed_entry("deadline_exceeded", _UNANSWERED_LOOKUP)
+        except Exception as error:
+            if _is_not_found(error):
+                return None
+            return failed_entry("request_failed", _describe_error(error))
+        return terms[0] if terms else None
+
+    workers = max(1, min(concurrency, len(groups)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [_submit(executor, resolve, group) for group in groups]
+        terms = [future.result() for future in futures]
+
+    _report_unfinished(len(unfinished), len(groups), "lookups")
+    return _collect_resolved(unique, groups, terms)
+
+
+async def resolve_terms_async(
+    identifiers: Sequence[str],
+    use_cache: bool = True,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+) -> dict[str, dict[str, Any] | None]:
+    """Async counterpart of resolve_terms; takes the same arguments."""
+    unique, groups = _group_identifiers(identifiers)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    unfinished: list[tuple[str | None, str, str]] = []
+
+    async def resolve(lookup: tuple[str | None, str, str]) -> dict[str, Any] | None:
+        ontology_id, field, value = lookup
+        async with semaphore:
+            try:
+                if ontology_id is None:
+                    data = await _get_json_async(
+                        _ols_url("/terms"), {field: value}, use_cache=use_cache
+                    )
+                    return _pick_defining_term(
+                        data.get("_embedded", {}).get("terms", [])
+                    )
+                terms = await get_ontology_terms_async(
+                    ontology_id,
+                    max_results=1,
+                    iri=value if field == "iri" else None,
+                    short_form=value if field == "short_form" else None,
+                    obo_id=value if field == "obo_id" else None,
+                    use_cache=use_cache,
+                )
+            except deadline.DeadlineExceeded:
+                unfinished.append(lookup)
+                return failed_entry("deadline_exceeded", _UNANSWERED_LOOKUP)
+            except Exception as error:
+                if _is_not_found(error):
+                    return None
+                return failed_entry("request_failed", _describe_error(error))
+        return terms[0] if terms else None
+
+    # A task group cancels the other lookups if one is cancelled or crashes,
+    # so no request outlives the call
+    async with asyncio.TaskGroup() as group:
+        tasks = [group.create_task(resolve(lookup)) for lookup in groups]
+    terms = [task.result() for task in tasks]
+
+    _report_unfinished(len(unfinished), len(groups), "lookups")
+    return _collect_resolved(unique, groups, terms)
+
+
+def _report_similar_cutoff(terms: list[dict[str, Any]]) -> None:
+    deadline.report_cutoff(
+        f"Time budget ran out after {len(terms)} similar terms were fetched"
+    )
 
-    return result
 
 def get_similar_terms(iri: str,
     ontology: str,
     max_results: int = 20,
     page_size: int = 20,
-    verbose: bool = False):
-    iri = urllib.parse.quote(urllib.parse.quote(iri, safe=''), safe='')
-    base_url = f"https://www.ebi.ac.uk/ols/api/v2/ontologies/{ontology.lower()}/classes/{iri}/llm_similar"
+    verbose: bool = False,
+    concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    use_cache: bool = True):
+    """
+    Get terms similar to a class by LLM embedding similarity (OLS v2).
+
+    Args:
+        iri: The IRI of the class to compare against
+        ontology: The ID of the ontology the class belongs to
+        max_results: Maximum number of results to return
+        page_size: Number of results per page
+        verbose: If True, print progress information
+        concurrency: Maximum number of pages fetched at once after the first
+        use_cache: If False, always fetch fresh responses from OLS
+
+    Returns:
+        A list of similar terms in descending score order, excluding the
+        query class itself. When the deadline passes first, a
+        deadline.PartialList of the terms fetched so far, with the cut-off
+        reported through deadline.report_cutoff().
+    """
+    base_url, iri = _similar_url(iri, ontology)
 
     params: dict[str, Any] = {"size": min(page_size, max_results)}
 
     all_terms: list[dict[str, Any]] = []
-    page = 0
 
-    while len(all_terms) < max_results:
-        params["page"] = page
+    if max_results <= 0:
+        return all_terms
 
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        data = response.json()
+    def fetch(page: int) -> dict[str, Any]:
+        return _get_json(
+            base_url, params={**params, "page": page}, use_cache=use_cache
+        )
 
-        terms = data.get("elements", [])
-        if not terms:
-            break
+    # Pages arrive ranked by score, so merging them in page order (rather
+    # than completion order) keeps the overall ranking intact; once the
+    # deadline passes, the terms ranked so far are returned
+    try:
+        data = fetch(0)
+        remaining = _remaining_similar_pages(data, max_results, params["size"])
+        metrics.observe("ols_pagination_pages", 1 + len(remaining), endpoint="similar")
+        pages = _fetch_pages(fetch, remaining, concurrency)
+        try:
+            while True:
+                terms = data.get("elements", [])
+                if not terms:
+                    break
 
-        all_terms.extend(terms)
+                all_terms.extend(terms)
 
-        if verbose:
-            print(f"Fetched page {page + 1}, total terms so far: {len(all_terms)}")
+                if verbose:
+                    page, _ = _similar_page_info(data)
+                    print(
+                        f"Fetched page {page + 1}, "
+                        f"total terms so far: {len(all_terms)}",
+                        file=sys.stderr,
+                    )
 
-        # Check if we have more pages
-        page_info = data.get("page", {})
-        if isinstance(page_info, dict):
-            current_page = page_info.get("number", 0)
-            total_pages = page_info.get("totalPages", 1)
-        else:
-            # Handle case where page is a simple integer
-            current_page = page_info
-            total_pages = data.get("totalPages", 1)
+                if len(all_terms) >= max_results:
+                    break
 
-        if current_page >= total_pages - 1:
-            break
+                following = next(pages, None)
+                if following is None:
+                    break
+                data = following
+        finally:
+            # Stops any page requests that are no longer needed
+            pages.close()
+    except deadline.DeadlineExceeded:
+        _report_similar_cutoff(all_terms)
+        return deadline.PartialList(_filter_similar(all_terms, iri, max_results))
 
-        page += 1
+    return _filter_similar(all_terms, iri, max_results)
 
-    # Filter out exact curies from results
-    all_terms = [term for term in all_terms if not
-                 term.get("score", 0) >= .99 or
-                 term.get("curie", "NONE:999").replace(":", "_") not in iri]
-    # Truncate to max_results
-    result = all_terms[:max_results]
 
-    return result
+async def get_similar_terms_async(
+    iri: str,
+    ontology: str,
+    max_results: int = 20,
+    page_size: int = 20,
+    verbose: bool = False,
+    concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    use_cache: bool = True,
+) -> list[dict[str, Any]]:
+    """Async counterpart of get_similar_terms; takes the same arguments."""
+    base_url, iri = _similar_url(iri, ontology)
+
+    params: dict[str, Any] = {"size": min(page_size, max_results)}
+
+    all_terms: list[dict[str, Any]] = []
+
+    if max_results <= 0:
+        return all_terms
+
+    async def fetch(page: int) -> dict[str, Any]:
+        return await _get_json_async(
+            base_url, params={**params, "page": page}, use_cache=use_cache
+        )
+
+    try:
+        data = await fetch(0)
+        remaining = _remaining_similar_pages(data, max_results, params["size"])
+        metrics.observe("ols_pagination_pages", 1 + len(remaining), endpoint="similar")
+        async with aclosing(_fetch_pages_async(fetch, remaining, concurrency)) as pages:
+            while True:
+                terms = data.get("elements", [])
+                if not terms:
+                    break
+
+                all_terms.extend(terms)
+
+                if verbose:
+                    page, _ = _similar_page_info(data)
+                    print(
+                        f"Fetched page {page + 1}, "
+                        f"total terms so far: {len(all_terms)}",
+                        file=sys.stderr,
+                    )
+
+                if len(all_terms) >= max_results:
+                    break
+
+                following = await anext(pages, None)
+                if following is None:
+                    break
+                data = following
+    except deadline.DeadlineExceeded:
+        _report_similar_cutoff(all_terms)
+        return deadline.PartialList(_filter_similar(all_terms, iri, max_results))
+
+    return _filter_similar(all_terms, iri, max_results)
@@ -0,0 +1,360 @@
+################################################################################
+# ols_mcp/cache.py
+# This module contains the in-memory TTL + LRU cache for OLS responses used by
+# ols_mcp/api.py
+################################################################################
+import sqlite3
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .client import endpoint_for
+from .disk_cache import DiskCache, StoredResponse
+
+# Seconds a response stays fresh, per endpoint family (see client.endpoint_for).
+# Ontology metadata changes only when OLS reloads an ontology; search results
+# are ranked on the fly and go stale sooner.
+DEFAULT_TTLS: dict[str, float] = {
+    "ontology": 6 * 60 * 60,
+    "terms": 60 * 60,
+    "similar": 60 * 60,
+    "search": 5 * 60,
+    "other": 10 * 60,
+}
+
+# Default budget of the in-memory tier; server workers split it between them
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class OfflineCacheMiss(LookupError):
+    """Raised in offline mode when a request has no cached response."""
+
+
+def cache_key(url: str, params: Mapping[str, Any] | None = None) -> str:
+    """
+    Build a canonical cache key for a GET request.
+
+    Parameter order, host case, booleans rendered as True/true and parameters
+    set to None do not change the key.
+
+    Args:
+        url: The endpoint URL
+        params: Query parameters sent with the request
+
+    Returns:
+        A string uniquely identifying the request.
+    """
+    parts = urllib.parse.urlsplit(url)
+    query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+    for name, value in (params or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        query.append((name, str(value)))
+    return urllib.parse.urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path,
+            urllib.parse.urlencode(sorted(query)),
+            "",
+        )
+    )
+
+
+@dataclass
+class CacheEntry:
+    """
+    A cached response body, the moment it stops being fresh, and the HTTP
+    validators needed to revalidate it once it has.
+    """
+
+    body: bytes
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers that revalidate this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of raw OLS response bodies with per-endpoint TTLs.
+
+    Bodies are stored as bytes and decoded by the caller on every hit, so a
+    caller mutating its result can never corrupt the cache. Entries are
+    evicted least-recently-used first once either max_entries or max_bytes is
+    exceeded; expired entries stay until evicted so they can still be served
+    in offline mode.
+
+    When a DiskCache backend is given, memory misses fall through to it,
+    disk hits are promoted into memory, and every stored body is written
+    through to disk.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: Mapping[str, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        backend: DiskCache | None = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.backend = backend
+        self._clock = clock
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._disk_hits = 0
+        self._disk_errors = 0
+        self._revalidations = 0
+
+    def ttl_for(self, url: str) -> float:
+        """Return the freshness lifetime for a response from the given URL."""
+        return self.ttls.get(endpoint_for(url), self.ttls["other"])
+
+    def lookup(self, key: str) -> CacheEntry | None:
+        """
+        Find an entry, fresh or expired, in memory first and then on disk.
+
+        An expired entry is still returned so the caller can revalidate it
+        or, in offline mode, serve it anyway. Only fresh entries count as
+        hits.
+
+        Args:
+            key: A key built with cache_key()
+
+        Returns:
+            The entry, or None when nothing is cached under key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.is_fresh(entry):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry
+
+        # Another process may have refreshed the shared disk tier
+        stored = self._backend_get(key)
+        with self._lock:
+            if stored is not None and (
+                entry is None or stored.expires_at - time.time() > 0
+            ):
+                entry = self._promote(key, stored)
+            if entry is None:
+                self._misses += 1
+            elif self.is_fresh(entry):
+                self._hits += 1
+                self._disk_hits += 1
+            else:
+                self._expirations += 1
+                self._misses += 1
+            return entry
+
+    def get(self, key: str, allow_stale: bool = False) -> bytes | None:
+        """
+        Look up a response body.
+
+        Args:
+            key: A key built with cache_key()
+            allow_stale: If True, also return entries whose TTL has passed
+
+        Returns:
+            The cached body, or None when nothing usable is cached.
+        """
+        entry = self.lookup(key)
+        if entry is None or not (allow_stale or self.is_fresh(entry)):
+            return None
+        return entry.body
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Return whether an entry is still within its TTL."""
+        return entry.expires_at > self._clock()
+
+    def set(
+        self,
+        key: str,
+        body: bytes,
+        ttl: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """
+        Store a response body and its validators for ttl seconds.
+
+        Bodies larger than the whole byte budget are not kept in memory but
+        are still written to the disk backend.
+        """
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._store(
+                key, CacheEntry(body, self._clock() + ttl, etag, last_modified)
+            )
+        self._backend_call("set", key, body, ttl, etag, last_modified)
+
+    def revalidated(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        """Mark an entry fresh for another ttl seconds after OLS answered 304."""
+        with self._lock:
+            entry.expires_at = self._clock() + ttl
+            if self._entries.get(key) is entry:
+                self._entries.move_to_end(key)
+            self._revalidations += 1
+        self._backend_call("touch", key, ttl)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = self._expirations = 0
+            self._disk_hits = self._disk_errors = self._revalidations = 0
+
+    def stats(self, include_disk: bool = True) -> dict[str, Any]:
+        """
+        Return hit/miss/eviction counters and current occupancy.
+
+        Args:
+            include_disk: If False, skip the query of the disk backend, whose
+                entry is then None; the counters come from memory either way
+
+        Returns:
+            A dictionary with hits, misses, hit_rate, evictions, expirations,
+            revalidations (304 responses), entries, bytes, max_entries and
+            max_bytes, plus disk_hits, disk_errors and a "disk" sub-dictionary
+            when a backend is set.
+        """
+        disk = (
+            self.backend.stats()
+            if include_disk and self.backend is not None
+            else None
+        )
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "revalidations": self._revalidations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "disk_hits": self._disk_hits,
+                "disk_errors": self._disk_errors,
+                "disk": disk,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        if key in self._entries:
+            self._remove(key)
+        if entry.size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def _promote(self, key: str, stored: StoredResponse) -> CacheEntry:
+        # Disk expiry is wall-clock time; memory expiry uses self._clock
+        expires_at = self._clock() + stored.expires_at - time.time()
+        entry = CacheEntry(stored.body, expires_at, stored.etag, stored.last_modified)
+        self._store(key, entry)
+        return entry
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _backend_get(self, key: str) -> StoredResponse | None:
+        return self._backend_call("get", key, allow_stale=True)
+
+    def _backend_call(self, method: str, *args, **kwargs) -> Any:
+        # A failing disk tier degrades to a memory-only cache instead of
+        # failing the request
+        if self.backend is None:
+            return None
+        try:
+            return getattr(self.backend, method)(*args, **kwargs)
+        except sqlite3.Error:
+            with self._lock:
+                self._disk_errors += 1
+            return None
+
+
+_cache: ResponseCache | None = ResponseCache()
+
+
+def get_cache() -> ResponseCache | None:
+    """Return the shared response cache, or None when caching is disabled."""
+    return _cache
+
+
+def set_cache(cache: ResponseCache | None) -> None:
+    """Install a response cache for every API call; None disables caching."""
+    global _cache
+    _cache = cache
+
+
+def configure(
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    ttls: Mapping[str, float] | None = None,
+    disk_path: str | Path | None = None,
+    disk_max_bytes: int = 512 * 1024 * 1024,
+) -> ResponseCache:
+    """
+    Replace the shared cache with a new, empty one.
+
+    Args:
+        max_entries: Maximum number of cached responses
+        max_bytes: Maximum total size of cached response bodies
+        ttls: Per-endpoint freshness overrides merged over DEFAULT_TTLS
+        disk_path: SQLite file to persist responses in (optional)
+        disk_max_bytes: Maximum total size of the compressed bodies on disk
+
+    Returns:
+        The newly installed cache.
+    """
+    backend = None
+    if disk_path is not None:
+        backend = DiskCache(disk_path, max_bytes=disk_max_bytes)
+    cache = ResponseCache(
+        max_entries=max_entries, max_bytes=max_bytes, ttls=ttls, backend=backend
+    )
+    set_cache(cache)
+    return cache
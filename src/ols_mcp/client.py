@@ -0,0 +1,284 @@
+################################################################################
+# ols_mcp/client.py
+# This module owns the pooled, keep-alive HTTP client shared by every wrapper
+# function in ols_mcp/api.py
+################################################################################
+import asyncio
+import functools
+import ssl
+import threading
+import urllib.parse
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
+
+import httpx
+
+from . import __version__
+
+if TYPE_CHECKING:
+    # Imported on first use: the MCP server only ever needs the async client
+    import requests
+
+
+@dataclass(frozen=True)
+class ClientConfig:
+    """
+    Connection pool and timeout settings for the shared OLS client.
+
+    Attributes:
+        pool_connections: Number of per-host connection pools to keep
+        pool_maxsize: Maximum number of connections kept open per host
+        pool_block: If True, wait for a free connection instead of opening
+            an extra, non-pooled one when a host pool is exhausted
+        keep_alive: Whether to reuse connections between requests
+        keepalive_expiry: Seconds an idle async connection stays pooled
+        compression: Whether to negotiate gzip/deflate (and brotli/zstd when
+            the optional decoders are installed) response compression
+        connect_timeout: Seconds to wait for a TCP/TLS connection
+        read_timeout: Seconds to wait between bytes of a response
+        user_agent: Value sent in the User-Agent header
+        offline: If True, never touch the network and answer every request
+            from the response cache, failing fast on misses
+        base_url: Root of the OLS API that every request goes to (e.g. a
+            local stand-in server for benchmarks)
+    """
+
+    pool_connections: int = 4
+    pool_maxsize: int = 16
+    pool_block: bool = False
+    keep_alive: bool = True
+    keepalive_expiry: float = 30.0
+    compression: bool = True
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    user_agent: str = f"ols-mcp/{__version__}"
+    offline: bool = False
+    base_url: str = "https://www.ebi.ac.uk/ols/api"
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        """The (connect, read) timeout tuple understood by requests."""
+        return (self.connect_timeout, self.read_timeout)
+
+
+def endpoint_for(url: str) -> str:
+    """
+    Classify an OLS URL into the endpoint family that per-endpoint policies use.
+
+    Args:
+        url: A full OLS API URL
+
+    Returns:
+        One of "search", "ontology", "terms", "similar" or "other".
+    """
+    path = urllib.parse.urlsplit(url).path.rstrip("/")
+    if path.endswith("/llm_similar"):
+        return "similar"
+    if path.endswith("/search"):
+        return "search"
+    if path.endswith("/terms"):
+        return "terms"
+    if path.rsplit("/", 2)[-2:-1] == ["ontologies"]:
+        return "ontology"
+    return "other"
+
+
+_config = ClientConfig()
+_session: "requests.Session | None" = None
+_async_client: httpx.AsyncClient | None = None
+_async_client_loop: asyncio.AbstractEventLoop | None = None
+_lock = threading.Lock()
+
+
+def get_config() -> ClientConfig:
+    """Return the active client configuration."""
+    return _config
+
+
+def configure(config: ClientConfig | None = None, **overrides) -> ClientConfig:
+    """
+    Replace the client configuration and drop the current session.
+
+    Args:
+        config: A full configuration to install (defaults to the active one)
+        **overrides: Individual ClientConfig fields to change
+
+    Returns:
+        The configuration now in effect.
+    """
+    global _config
+    new_config = replace(config or _config, **overrides)
+    with _lock:
+        _config = new_config
+        _close_session()
+        _drop_async_client()
+    return new_config
+
+
+def build_session(config: ClientConfig) -> "requests.Session":
+    """
+    Build a requests session whose adapters honour the given pool settings.
+
+    Args:
+        config: The pool and header settings to apply
+
+    Returns:
+        A new, unshared requests.Session.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.request import ACCEPT_ENCODING
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=config.pool_block,
+        max_retries=0,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    session.headers["User-Agent"] = config.user_agent
+    session.headers["Accept"] = "application/json"
+    session.headers["Accept-Encoding"] = (
+        ACCEPT_ENCODING if config.compression else "identity"
+    )
+    session.headers["Connection"] = "keep-alive" if config.keep_alive else "close"
+
+    return session
+
+
+def get_session() -> "requests.Session":
+    """Return the shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = build_session(_config)
+    return _session
+
+
+def set_session(session: "requests.Session | None") -> None:
+    """
+    Install a session to be used by every API call (e.g. a stub in tests).
+
+    Passing None discards the current session so the next call builds a
+    fresh one from the active configuration.
+    """
+    global _session
+    with _lock:
+        if session is not _session:
+            _close_session()
+        _session = session
+
+
+def build_async_client(config: ClientConfig) -> httpx.AsyncClient:
+    """
+    Build an httpx async client whose pool mirrors the sync session settings.
+
+    Args:
+        config: The pool, timeout and header settings to apply
+
+    Returns:
+        A new, unshared httpx.AsyncClient.
+    """
+    limits = httpx.Limits(
+        max_connections=config.pool_connections * config.pool_maxsize,
+        max_keepalive_connections=config.pool_maxsize if config.keep_alive else 0,
+        keepalive_expiry=config.keepalive_expiry,
+    )
+    timeout = httpx.Timeout(config.read_timeout, connect=config.connect_timeout)
+    headers = {
+        "User-Agent": config.user_agent,
+        "Accept": "application/json",
+        "Connection": "keep-alive" if config.keep_alive else "close",
+    }
+    if not config.compression:
+        headers["Accept-Encoding"] = "identity"
+
+    return httpx.AsyncClient(
+        limits=limits, timeout=timeout, headers=headers, verify=_ssl_context()
+    )
+
+
+@functools.cache
+def _ssl_context() -> ssl.SSLContext:
+    # Loading the CA bundle takes tens of milliseconds; do it once per process
+    return httpx.create_ssl_context()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the shared async client, creating it on first use.
+
+    httpx pools are bound to the event loop that opened them, so a client
+    built here is replaced when called from a different running loop. A
+    client installed with set_async_client() is always returned as-is.
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    with _lock:
+        if _async_client is None or (
+            _async_client_loop is not None and _async_client_loop is not loop
+        ):
+            _async_client = build_async_client(_config)
+            _async_client_loop = loop
+        return _async_client
+
+
+def set_async_client(async_client: httpx.AsyncClient | None) -> None:
+    """
+    Install an async client to be used by every async API call.
+
+    Passing None discards the current client so the next call builds a
+    fresh one from the active configuration.
+    """
+    global _async_client, _async_client_loop
+    with _lock:
+        _async_client = async_client
+        _async_client_loop = None
+
+
+def preload() -> None:
+    """
+    Do the one-off work of the first API call ahead of it.
+
+    Imports the HTTP libraries both clients load on first use and reads the
+    CA bundle, without opening a connection; a process that forks sessions
+    (see ols_mcp.launcher) calls this so none of them pays for it.
+    """
+    import requests  # noqa: F401
+
+    build_async_client(_config)
+
+
+def close() -> None:
+    """Close the shared session and release its pooled connections."""
+    with _lock:
+        _close_session()
+
+
+async def aclose() -> None:
+    """Close the shared async client and release its pooled connections."""
+    global _async_client, _async_client_loop
+    with _lock:
+        async_client, _async_client = _async_client, None
+        _async_client_loop = None
+    if async_client is not None:
+        await async_client.aclose()
+
+
+def _close_session() -> None:
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
+
+def _drop_async_client() -> None:
+    # The async client can only be closed from its own event loop, so a
+    # reconfiguration just forgets it and lets the next caller rebuild it.
+    global _async_client, _async_client_loop
+    _async_client = None
+    _async_client_loop = None
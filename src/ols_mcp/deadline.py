@@ -0,0 +1,175 @@
+################################################################################
+# ols_mcp/deadline.py
+# This module contains the time budgets tools run under: a deadline set by a
+# tool is carried in a context variable to every OLS request it makes, which
+# clip their timeouts, retries and waits to the time that is left; calls that
+# return partial results when it runs out report the cut-off here too
+################################################################################
+import asyncio
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a time budget runs out before OLS has answered."""
+
+
+class PartialList(list[T]):
+    """
+    A list of results cut short because its deadline passed.
+
+    It is a plain list in every other respect, so callers that do not look
+    for the cut-off keep working; isinstance(results, PartialList) tells a
+    truncated list from a complete one.
+    """
+
+
+_deadline: ContextVar[float | None] = ContextVar("ols_mcp_deadline", default=None)
+_cutoffs: ContextVar[list[str] | None] = ContextVar("ols_mcp_cutoffs", default=None)
+_default_budget: float | None = None
+
+# How long after its deadline budget_async cancels a block; requests are
+# clipped to the deadline itself, so they end first and partial results stand
+CANCEL_GRACE = 0.25
+
+
+def get_default_budget() -> float | None:
+    """Return the budget in seconds tools get when none is given, if any."""
+    return _default_budget
+
+
+def set_default_budget(seconds: float | None) -> None:
+    """Set the budget in seconds tools get when none is given; None for no limit."""
+    global _default_budget
+    _default_budget = seconds if seconds else None
+
+
+@contextmanager
+def budget(seconds: float | None = None) -> Iterator[None]:
+    """
+    Run a block under a time budget.
+
+    A budget inside another one never extends it: the earlier deadline wins.
+
+    Args:
+        seconds: The budget; defaults to the one set with set_default_budget(),
+            and without either the block runs under the enclosing deadline only
+    """
+    if seconds is None:
+        seconds = _default_budget
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@asynccontextmanager
+async def budget_async(seconds: float | None = None) -> AsyncIterator[None]:
+    """
+    Async counterpart of budget that also cancels the block when time runs out.
+
+    The block is cancelled CANCEL_GRACE seconds after the deadline, as a
+    backstop for waits that do not check the deadline themselves.
+
+    Raises:
+        DeadlineExceeded: When the block is cancelled
+    """
+    with budget(seconds):
+        left = remaining()
+        try:
+            async with asyncio.timeout(None if left is None else left + CANCEL_GRACE):
+                yield
+        except TimeoutError as error:
+            if isinstance(error, DeadlineExceeded):
+                raise
+            raise DeadlineExceeded(
+                "Time budget exhausted before OLS answered"
+            ) from None
+
+
+def remaining() -> float | None:
+    """Return the seconds left before the current deadline, or None without one."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def expired() -> bool:
+    """Return whether the current deadline has passed."""
+    return remaining() == 0.0
+
+
+def check() -> None:
+    """
+    Raise if the current deadline has passed.
+
+    Raises:
+        DeadlineExceeded: When no time is left
+    """
+    if expired():
+        raise DeadlineExceeded("Time budget exhausted before OLS answered")
+
+
+def allows(seconds: float) -> bool:
+    """Return whether waiting the given seconds still ends before the deadline."""
+    left = remaining()
+    return left is None or seconds < left
+
+
+def clip(timeout: tuple[float, float]) -> tuple[float, float]:
+    """
+    Shorten a (connect, read) timeout to the time left before the deadline.
+
+    Raises:
+        DeadlineExceeded: When no time is left
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    check()
+    connect, read = timeout
+    return (min(connect, left), min(read, left))
+
+
+@contextmanager
+def collect_cutoffs() -> Iterator[list[str]]:
+    """
+    Collect the reports of results cut short by a deadline within a block.
+
+    A collection inside another one shares its list, so every layer of a
+    tool call sees the same reports.
+
+    Yields:
+        The list report_cutoff() appends to.
+    """
+    reports = _cutoffs.get()
+    if reports is not None:
+        yield reports
+        return
+    reports = []
+    token = _cutoffs.set(reports)
+    try:
+        yield reports
+    finally:
+        _cutoffs.reset(token)
+
+
+def report_cutoff(message: str) -> None:
+    """Report that a call returned partial results because its deadline passed."""
+    reports = _cutoffs.get()
+    if reports is not None:
+        reports.append(message)
@@ -0,0 +1,245 @@
+################################################################################
+# ols_mcp/disk_cache.py
+# This module contains the persistent, single-file SQLite store that backs the
+# in-memory response cache in ols_mcp/cache.py across process restarts
+################################################################################
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    stored_size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT
+);
+DROP INDEX IF EXISTS responses_accessed_at;
+CREATE INDEX IF NOT EXISTS responses_eviction ON responses (accessed_at, stored_size);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    entries INTEGER NOT NULL,
+    stored_bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals
+    SELECT 0, COUNT(*), COALESCE(SUM(stored_size), 0) FROM responses;
+CREATE TRIGGER IF NOT EXISTS responses_added AFTER INSERT ON responses BEGIN
+    UPDATE totals SET entries = entries + 1,
+        stored_bytes = stored_bytes + new.stored_size;
+END;
+CREATE TRIGGER IF NOT EXISTS responses_removed AFTER DELETE ON responses BEGIN
+    UPDATE totals SET entries = entries - 1,
+        stored_bytes = stored_bytes - old.stored_size;
+END;
+CREATE TRIGGER IF NOT EXISTS responses_resized
+AFTER UPDATE OF stored_size ON responses BEGIN
+    UPDATE totals SET stored_bytes = stored_bytes - old.stored_size + new.stored_size;
+END;
+"""
+
+# Columns added after the first release of the cache file format
+_ADDED_COLUMNS = {"etag": "TEXT", "last_modified": "TEXT"}
+
+
+class StoredResponse(NamedTuple):
+    """A response read back from disk; expires_at is wall-clock seconds."""
+
+    body: bytes
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def default_cache_path() -> Path:
+    """
+    Return the default location of the persistent cache file.
+
+    Honours OLS_MCP_CACHE_DIR, then XDG_CACHE_HOME, then ~/.cache.
+    """
+    cache_dir = os.environ.get("OLS_MCP_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir) / "responses.sqlite3"
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ols-mcp" / "responses.sqlite3"
+
+
+class DiskCache:
+    """
+    Persistent store of zlib-compressed response bodies in one SQLite file.
+
+    The file runs in WAL mode so several server processes can read and write
+    it at once; each thread gets its own connection, and a process forked
+    from the one that opened the cache opens connections of its own. Expiry
+    uses wall-clock time so entries written by one process are judged the
+    same way by another. Once the compressed payloads exceed max_bytes, the least
+    recently read entries are deleted. A read records its time only when the
+    stored one is more than touch_interval seconds old, so most cache hits
+    never take the write lock. Triggers keep the entry count and total size
+    in a one-row table, in the same transaction as each write, so neither
+    eviction nor stats() has to scan the stored bodies.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = 512 * 1024 * 1024,
+        compress_level: int = 6,
+        clock: Callable[[], float] = time.time,
+        touch_interval: float = 60.0,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.touch_interval = touch_interval
+        self._clock = clock
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connect()
+        # Seeding the totals of an older file must not race another writer
+        try:
+            connection.executescript(f"BEGIN IMMEDIATE;{_SCHEMA}COMMIT;")
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(responses)")}
+        for column, column_type in _ADDED_COLUMNS.items():
+            if column not in columns:
+                connection.execute(
+                    f"ALTER TABLE responses ADD COLUMN {column} {column_type}"
+                )
+
+    def get(self, key: str, allow_stale: bool = False) -> StoredResponse | None:
+        """
+        Look up a stored response.
+
+        Args:
+            key: A key built with cache.cache_key()
+            allow_stale: If True, return entries whose TTL has passed
+
+        Returns:
+            The stored response with its validators, or None when nothing
+            usable is stored.
+        """
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT body, expires_at, accessed_at, etag, last_modified "
+            "FROM responses WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        body, expires_at, accessed_at, etag, last_modified = row
+        now = self._clock()
+        if not allow_stale and expires_at <= now:
+            return None
+        if now - accessed_at >= self.touch_interval:
+            connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return StoredResponse(zlib.decompress(body), expires_at, etag, last_modified)
+
+    def set(
+        self,
+        key: str,
+        body: bytes,
+        ttl: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Store a response body for ttl seconds, evicting old entries if needed."""
+        compressed = zlib.compress(body, self.compress_level)
+        if len(compressed) > self.max_bytes:
+            return
+        now = self._clock()
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # An upsert, unlike INSERT OR REPLACE, fires the update trigger
+            connection.execute(
+                "INSERT INTO responses "
+                "(key, body, stored_size, expires_at, accessed_at, etag, "
+                "last_modified) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET body = excluded.body, "
+                "stored_size = excluded.stored_size, "
+                "expires_at = excluded.expires_at, "
+                "accessed_at = excluded.accessed_at, etag = excluded.etag, "
+                "last_modified = excluded.last_modified",
+                (key, compressed, len(compressed), now + ttl, now, etag, last_modified),
+            )
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def touch(self, key: str, ttl: float) -> None:
+        """Mark an entry fresh for another ttl seconds (after a 304)."""
+        now = self._clock()
+        self._connect().execute(
+            "UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?",
+            (now + ttl, now, key),
+        )
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry."""
+        self._connect().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._connect().execute("DELETE FROM responses")
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of stored entries and their compressed size."""
+        entries, stored_bytes = (
+            self._connect()
+            .execute("SELECT entries, stored_bytes FROM totals")
+            .fetchone()
+        )
+        return {"entries": entries, "bytes": stored_bytes, "max_bytes": self.max_bytes}
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        (total,) = connection.execute("SELECT stored_bytes FROM totals").fetchone()
+        if total <= self.max_bytes:
+            return
+        # Read through the covering index, away from the stored bodies
+        rows = connection.execute(
+            "SELECT key, stored_size FROM responses INDEXED BY responses_eviction "
+            "ORDER BY accessed_at"
+        )
+        doomed = []
+        for key, stored_size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= stored_size
+        connection.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # SQLite connections must not cross a fork; leave the parent's alone
+            self._local = threading.local()
+            self._pid = os.getpid()
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
@@ -0,0 +1,266 @@
+################################################################################
+# ols_mcp/launcher.py
+# This module contains the pre-forked launcher for stdio sessions: a daemon
+# imports and configures the server once, and every ols-mcp-launch process
+# hands it its stdin, stdout and stderr over a Unix socket to be served by a
+# freshly forked, already warm session process
+################################################################################
+import contextlib
+import os
+import signal
+import socket
+import struct
+import sys
+import traceback
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from types import FrameType
+
+# Only the standard library and this light module are imported here, so that
+# ols-mcp-launch starts in milliseconds; the server is imported by the daemon
+from .disk_cache import default_cache_path
+
+# Environment variable that overrides the daemon's socket path
+SOCKET_ENV = "OLS_MCP_LAUNCHER_SOCKET"
+
+# Seconds between the daemon's checks for stop requests and finished sessions
+POLL_INTERVAL = 0.5
+
+# A session's pid, then its exit status, are sent back as one of these each
+_STATUS = struct.Struct("!i")
+
+# The pid, uid and gid of a Unix socket's peer, as SO_PEERCRED reports them
+_PEER_CREDENTIALS = struct.Struct("3i")
+
+
+def default_socket_path() -> Path:
+    """
+    Return the daemon's socket path.
+
+    Honours OLS_MCP_LAUNCHER_SOCKET, then defaults to launcher.sock next to
+    the persistent response cache.
+    """
+    path = os.environ.get(SOCKET_ENV)
+    return Path(path) if path else default_cache_path().parent / "launcher.sock"
+
+
+class LauncherDaemon:
+    """
+    Forks a stdio session for every ols-mcp-launch process that connects.
+
+    The daemon runs in the process that already imported and configured the
+    server; each connection passes three file descriptors that the forked
+    session installs as its stdin, stdout and stderr before calling session.
+    The session reports its pid and later its exit status on the connection,
+    and keeps running if the daemon stops. Sessions run with the daemon's
+    rights, so the socket is only ever accessible to the daemon's user, and
+    where the system reports a peer's uid, connections from any other user
+    are refused.
+    """
+
+    def __init__(self, path: str | Path, session: Callable[[], int | None]):
+        self.path = Path(path)
+        self.session = session
+        self.started = 0
+        self.refused = 0
+        self.stopping = False
+        self._listener: socket.socket | None = None
+
+    def serve(self) -> None:
+        """Accept connections until SIGTERM or SIGINT."""
+        self._listener = self._bind()
+        previous = {
+            sig: signal.signal(sig, self._handle_exit)
+            for sig in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            while not self.stopping:
+                self._reap()
+                try:
+                    connection, _ = self._listener.accept()
+                except TimeoutError:
+                    continue
+                with connection:
+                    self._start(connection)
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+            self._listener.close()
+            self.path.unlink(missing_ok=True)
+
+    def _bind(self) -> socket.socket:
+        if self.path.exists():
+            if _is_listening(self.path):
+                raise RuntimeError(f"A launcher is already listening on {self.path}")
+            self.path.unlink()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Create the socket private, so no other user can connect to it in
+        # the moment before it could be chmod-ed
+        umask = os.umask(0o077)
+        try:
+            listener.bind(str(self.path))
+        finally:
+            os.umask(umask)
+        os.chmod(self.path, 0o600)
+        listener.listen()
+        listener.settimeout(POLL_INTERVAL)
+        return listener
+
+    def _handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        self.stopping = True
+
+    def _reap(self) -> None:
+        try:
+            while os.waitpid(-1, os.WNOHANG)[0]:
+                pass
+        except ChildProcessError:
+            pass
+
+    def _start(self, connection: socket.socket) -> None:
+        if _peer_uid(connection) not in (None, os.getuid()):
+            self.refused += 1
+            return
+        connection.settimeout(POLL_INTERVAL)
+        try:
+            _, fds, _, _ = socket.recv_fds(connection, 16, 3)
+        except OSError:
+            return
+        try:
+            if len(fds) != 3:
+                return
+            sys.stdout.flush()
+            sys.stderr.flush()
+            if os.fork() == 0:
+                self._run_session(connection, fds)
+            self.started += 1
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def _run_session(self, connection: socket.socket, fds: list[int]) -> None:
+        # In the session: never return into the daemon's loop
+        code = 1
+        try:
+            if self._listener is not None:
+                self._listener.close()
+            for target, fd in enumerate(fds):
+                os.dup2(fd, target)
+            for fd in fds:
+                if fd > 2:
+                    os.close(fd)
+            # The inherited stream objects cached facts about the daemon's
+            # own stdio, e.g. whether it could seek; open fresh ones
+            sys.stdin = open(0, encoding="utf-8", closefd=False)
+            sys.stdout = open(1, "w", encoding="utf-8", closefd=False)
+            sys.stderr = open(2, "w", encoding="utf-8", closefd=False)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            connection.settimeout(None)
+            connection.sendall(_STATUS.pack(os.getpid()))
+            code = self.session() or 0
+        except SystemExit as error:
+            code = error.code if isinstance(error.code, int) else 1
+        except KeyboardInterrupt:
+            code = 130
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            # The session may have closed its streams; nothing here may raise
+            for stream in (sys.stdout, sys.stderr):
+                with contextlib.suppress(Exception):
+                    stream.flush()
+            with contextlib.suppress(OSError):
+                connection.sendall(_STATUS.pack(code))
+            os._exit(code)
+
+
+def _peer_uid(connection: socket.socket) -> int | None:
+    """Return the uid of the process at the other end, or None if unknown."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        # E.g. macOS, where the socket's file mode alone keeps others out
+        return None
+    credentials = connection.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, _PEER_CREDENTIALS.size
+    )
+    _, uid, _ = _PEER_CREDENTIALS.unpack(credentials)
+    return uid
+
+
+def _is_listening(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def _read_status(connection: socket.socket) -> int | None:
+    data = b""
+    while len(data) < _STATUS.size:
+        try:
+            chunk = connection.recv(_STATUS.size - len(data))
+        except OSError:
+            chunk = b""
+        if not chunk:
+            return None
+        data += chunk
+    return _STATUS.unpack(data)[0]
+
+
+def connect(path: str | Path) -> int:
+    """
+    Have the daemon at path serve this process's stdio; wait for the session.
+
+    SIGTERM, SIGINT and SIGHUP received meanwhile are passed on to the
+    session.
+
+    Returns:
+        The session's exit status (1 if it died without reporting one).
+
+    Raises:
+        OSError: When no daemon accepts the connection; nothing has been
+            handed over yet, so the caller can serve the session itself
+    """
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with connection:
+        connection.connect(str(path))
+        socket.send_fds(connection, [b"stdio"], [0, 1, 2])
+        pid = _read_status(connection)
+        if pid is None:
+            return 1
+
+        def forward(sig: int, frame: FrameType | None) -> None:
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sig, forward)
+        code = _read_status(connection)
+    return 1 if code is None else code
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """
+    Entry point of ols-mcp-launch: a stdio server that starts in milliseconds.
+
+    The session is served by the daemon started with 'ols-mcp launcher' and
+    runs with that daemon's options. Without a daemon, this process becomes
+    an ordinary ols-mcp server, started with the given arguments.
+    """
+    try:
+        code = connect(default_socket_path())
+    except (OSError, AttributeError):
+        # No daemon, or no Unix sockets here: serve the session ourselves
+        from .main import main as serve
+
+        serve(argv)
+        return
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
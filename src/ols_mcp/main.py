@@ -3,13 +3,53 @@
 # This module sets up the FastMCP CLI interface
 ################################################################################
 
+import argparse
+import functools
+import inspect
+import os
+import sys
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
 from fastmcp import FastMCP
+from fastmcp.server.dependencies import get_context
+from fastmcp.tools.tool import ToolResult
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
 
+from ols_mcp import (
+    admission,
+    api,
+    cache,
+    client,
+    deadline,
+    launcher,
+    metrics,
+    mirror,
+    querylog,
+    ratelimit,
+    retry,
+    serve,
+    snapshot,
+    tracing,
+)
+from ols_mcp.disk_cache import default_cache_path
+from ols_mcp.mirror import default_mirror_path
+from ols_mcp.querylog import default_query_log_path
+from ols_mcp.snapshot import default_snapshot_dir
 from ols_mcp.tools import (
     get_ontology_info,
+    get_ontology_info_async,
     get_similar_ontology_terms,
+    get_similar_ontology_terms_async,
     get_terms_from_ontology,
+    get_terms_from_ontology_async,
+    resolve_ontology_terms,
+    resolve_ontology_terms_async,
     search_all_ontologies,
+    search_all_ontologies_async,
+    search_all_ontologies_batch,
+    search_all_ontologies_batch_async,
 )
 
 # Create the FastMCP instance at module level
@@ -21,14 +61,570 @@ mcp: FastMCP = FastMCP("Ontology Lookup Service (OLS) MCP" ,
                         Use the available commands to explore and retrieve data.
                     """)
 
-# Register all tools
-mcp.tool(search_all_ontologies)
-mcp.tool(get_ontology_info)
-mcp.tool(get_terms_from_ontology)
-mcp.tool(get_similar_ontology_terms)
+# Sync twins of the registered tools by name; warm-ups replay calls with them
+sync_tools: dict[str, Callable] = {}
+
+
+def warn_on_cutoff(fn: Callable) -> Callable:
+    """
+    Wrap an async tool so results cut short by its deadline say so.
+
+    Mappings already mark each query or identifier the deadline left
+    unanswered. A list cut short (a deadline.PartialList) is returned with
+    "deadline_exceeded": true next to it in the structured content and the
+    cut-off notes after it in the text content. Each cut-off is also
+    sent to the client as a warning log message.
+    """
+
+    @functools.wraps(fn)
+    async def warned(*args, **kwargs):
+        with deadline.collect_cutoffs() as cutoffs:
+            result = await fn(*args, **kwargs)
+        if not cutoffs:
+            return result
+        try:
+            context = get_context()
+        except RuntimeError:
+            # Called outside an MCP request, e.g. directly from Python
+            return result
+        for message in cutoffs:
+            await context.warning(message)
+        if not isinstance(result, deadline.PartialList):
+            return result
+        terms = list(result)
+        # The list keeps its usual text block, followed by one with the notes
+        content = ToolResult(content=terms).content
+        content += ToolResult(content="\n".join(cutoffs)).content
+        return ToolResult(
+            content=content,
+            structured_content={"result": terms, "deadline_exceeded": True},
+        )
+
+    return warned
+
+
+def register_async_tool(async_fn: Callable, sync_fn: Callable) -> None:
+    """
+    Register an async tool under the name and description of its sync twin.
+
+    Every call waits for a slot under the server's concurrency limit, is timed
+    and counted in the metrics exported at /metrics, is traced as a span
+    when tracing is enabled, and is added to the query log when recording.
+    Results cut short by the call's time budget are flagged as such.
+    """
+    name = sync_fn.__name__
+    sync_tools[name] = sync_fn
+    mcp.tool(
+        warn_on_cutoff(
+            metrics.instrument_tool(
+                admission.limit_tool(
+                    querylog.record_tool(tracing.trace_tool(async_fn, name), name)
+                ),
+                name,
+            )
+        ),
+        name=name,
+        description=inspect.getdoc(sync_fn),
+    )
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def prometheus_metrics(request: Request) -> PlainTextResponse:
+    """Serve the server's metrics in the Prometheus text format (HTTP transport)."""
+    return PlainTextResponse(
+        metrics.render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@mcp.custom_route("/health", methods=["GET"])
+async def health(request: Request) -> JSONResponse:
+    """Report readiness (HTTP transport): 503 once the server is draining."""
+    controller = admission.get_controller()
+    stats = controller.stats() if controller is not None else {"draining": False}
+    status = "draining" if stats["draining"] else "ok"
+    return JSONResponse(
+        {"status": status, "pid": os.getpid(), **stats},
+        status_code=503 if stats["draining"] else 200,
+    )
+
+
+# Register all tools; the async variants keep the event loop free while OLS
+# responds, and the sync functions remain available to library users
+register_async_tool(search_all_ontologies_async, search_all_ontologies)
+register_async_tool(search_all_ontologies_batch_async, search_all_ontologies_batch)
+register_async_tool(get_ontology_info_async, get_ontology_info)
+register_async_tool(get_terms_from_ontology_async, get_terms_from_ontology)
+register_async_tool(resolve_ontology_terms_async, resolve_ontology_terms)
+register_async_tool(get_similar_ontology_terms_async, get_similar_ontology_terms)
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser for the ols-mcp entry point."""
+    parser = argparse.ArgumentParser(
+        prog="ols-mcp",
+        description="MCP server for the Ontology Lookup Service (OLS).",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="answer only from the persistent response cache and fail fast on "
+        "misses instead of contacting OLS",
+    )
+    parser.add_argument(
+        "--cache-path",
+        type=Path,
+        default=None,
+        help=f"SQLite file for the persistent response cache "
+        f"(default: {default_cache_path()})",
+    )
+    parser.add_argument(
+        "--disk-cache-max-mb",
+        type=int,
+        default=512,
+        help="maximum size of the compressed responses kept on disk "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-disk-cache",
+        action="store_true",
+        help="keep responses in memory only",
+    )
+    parser.add_argument(
+        "--mirror-path",
+        type=Path,
+        default=None,
+        help=f"SQLite file holding the local ontology mirror "
+        f"(default: {default_mirror_path()})",
+    )
+    parser.add_argument(
+        "--no-mirror",
+        action="store_true",
+        help="send every search to OLS even for mirrored ontologies",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        type=Path,
+        default=None,
+        help=f"directory of memory-mapped ontology snapshots "
+        f"(default: {default_snapshot_dir()})",
+    )
+    parser.add_argument(
+        "--no-snapshots",
+        action="store_true",
+        help="fetch terms from OLS even for snapshotted ontologies",
+    )
+    parser.add_argument(
+        "--query-log",
+        type=Path,
+        default=None,
+        help=f"JSON lines file of past tool calls that warm-ups replay "
+        f"(default: {default_query_log_path()})",
+    )
+    parser.add_argument(
+        "--record-queries",
+        action="store_true",
+        help="append every tool call to the query log",
+    )
+    parser.add_argument(
+        "--warm",
+        type=int,
+        default=0,
+        metavar="N",
+        help="at start-up, replay the N most frequent calls in the query log "
+        "into the response cache (default: %(default)s, off)",
+    )
+    parser.add_argument(
+        "--warm-interval",
+        type=float,
+        default=0.0,
+        help="seconds between repeated warm-ups that keep those responses "
+        "fresh (default: %(default)s, only at start-up)",
+    )
+    parser.add_argument(
+        "--warm-concurrency",
+        type=int,
+        default=querylog.DEFAULT_CONCURRENCY,
+        help="calls a warm-up replays at once (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--ols-url",
+        default=client.ClientConfig.base_url,
+        help="base URL of the OLS API, e.g. a local mirror or proxy "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=retry.RetryPolicy.max_attempts,
+        help="requests sent at most for one OLS call when it times out or "
+        "fails with 429/5xx (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="send a duplicate request when OLS is slower than its recent p95 "
+        "latency and use whichever answers first",
+    )
+    parser.add_argument(
+        "--tool-timeout",
+        type=float,
+        default=30.0,
+        help="seconds a tool call may spend on OLS before it returns what it "
+        "has or fails; tools also accept their own timeout (default: "
+        "%(default)s, 0 for no limit)",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=("stdio", "http"),
+        default="stdio",
+        help="serve one client over stdio, or any number over streamable HTTP "
+        "at http://HOST:PORT/mcp/ (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="interface the HTTP transport listens on (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="port the HTTP transport listens on (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="HTTP server processes forked onto one port; they share the disk "
+        "cache and the OLS rate limits (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-concurrent-calls",
+        type=int,
+        default=32,
+        help="tool calls executing at once in each server process; 0 for no "
+        "limit (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=64,
+        help="tool calls waiting for a slot; further calls are refused at once "
+        "with a 'server busy' error (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--queue-timeout",
+        type=float,
+        default=10.0,
+        help="seconds a queued tool call waits for a slot before it is refused "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=30.0,
+        help="seconds running tool calls get to finish when the HTTP server "
+        "is stopped (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="DEST",
+        help="record a span for every tool call, OLS request, HTTP attempt, "
+        "JSON decode and simplification step: 'console' writes JSON lines to "
+        "stderr, 'otel' uses OpenTelemetry (needs ols-mcp[otel]), anything "
+        "else is a file to append JSON lines to",
+    )
+
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    mirror_parser = commands.add_parser(
+        "mirror",
+        help="crawl ontologies into the local search mirror and exit",
+        description="Crawl every term of the given ontologies into the local "
+        "full-text mirror; searches restricted to mirrored ontologies are then "
+        "answered locally.",
+    )
+    mirror_parser.add_argument(
+        "ontologies", nargs="+", help="ontology IDs to mirror (e.g. go uberon)"
+    )
+    mirror_parser.add_argument(
+        "--page-size",
+        type=int,
+        default=500,
+        help="terms requested per OLS page (default: %(default)s)",
+    )
+    sync_parser = commands.add_parser(
+        "sync",
+        help="re-crawl mirrored ontologies that changed in OLS and exit",
+        description="Compare each mirrored ontology's version, updated and "
+        "loaded values with OLS and re-crawl only those that changed; "
+        "interrupted crawls resume from the last completed page.",
+    )
+    sync_parser.add_argument(
+        "ontologies",
+        nargs="*",
+        help="ontology IDs to sync (default: every mirrored ontology)",
+    )
+    sync_parser.add_argument(
+        "--force", action="store_true", help="re-crawl even unchanged ontologies"
+    )
+    sync_parser.add_argument(
+        "--page-size",
+        type=int,
+        default=500,
+        help="terms requested per OLS page (default: %(default)s)",
+    )
+    snapshot_parser = commands.add_parser(
+        "snapshot",
+        help="write memory-mapped snapshots of mirrored ontologies and exit",
+        description="Write a compact, memory-mapped snapshot of each mirrored "
+        "ontology; the server maps them at startup and answers term lookups "
+        "from them.",
+    )
+    snapshot_parser.add_argument(
+        "ontologies",
+        nargs="*",
+        help="mirrored ontology IDs to snapshot (default: all of them)",
+    )
+    warm_parser = commands.add_parser(
+        "warm",
+        help="replay the most frequent logged calls into the cache and exit",
+        description="Replay the most frequent tool calls in the query log, "
+        "under the OLS rate limits, so their responses are in the persistent "
+        "cache before a server starts.",
+    )
+    warm_parser.add_argument(
+        "--top",
+        type=int,
+        default=querylog.DEFAULT_TOP,
+        help="number of calls to replay (default: %(default)s)",
+    )
+    warm_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=querylog.DEFAULT_CONCURRENCY,
+        help="calls replayed at once (default: %(default)s)",
+    )
+    launcher_parser = commands.add_parser(
+        "launcher",
+        help="serve stdio sessions for ols-mcp-launch from pre-forked processes",
+        description="Import and configure the server once, then fork a ready "
+        "stdio session for every ols-mcp-launch process that connects, so "
+        "each one answers its first tool call without paying for start-up. "
+        "The sessions use this command's options.",
+    )
+    launcher_parser.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help=f"Unix socket to listen on (default: {launcher.default_socket_path()})",
+    )
+    return parser
+
+
+def apply_options(args: argparse.Namespace) -> None:
+    """Configure the response cache and HTTP client from parsed options."""
+    workers = max(args.workers, 1)
+    if workers > 1 and args.transport != "http":
+        raise SystemExit("ols-mcp: --workers needs --transport http")
+    if args.warm_interval and (workers > 1 or args.command == "launcher"):
+        # Servers that fork warm up once beforehand; a warm-up thread would
+        # not survive the fork
+        raise SystemExit("ols-mcp: --warm-interval needs a single server process")
+    if args.no_disk_cache:
+        if args.offline:
+            raise SystemExit("ols-mcp: --offline needs the disk cache")
+        cache.configure()
+    else:
+        # Workers share the disk tier, so they split the memory budget
+        cache.configure(
+            max_entries=cache.DEFAULT_MAX_ENTRIES // workers,
+            max_bytes=cache.DEFAULT_MAX_BYTES // workers,
+            disk_path=args.cache_path or default_cache_path(),
+            disk_max_bytes=args.disk_cache_max_mb * 1024 * 1024,
+        )
+    client.configure(offline=args.offline, base_url=args.ols_url)
+    if workers > 1:
+        ratelimit.configure(shared=True)
+    retry.configure(
+        retry.RetryPolicy(max_attempts=max(args.max_attempts, 1), hedge=args.hedge)
+    )
+    deadline.set_default_budget(args.tool_timeout)
+    admission.configure(
+        max_concurrent=args.max_concurrent_calls or None,
+        max_queue=args.max_queue,
+        queue_timeout=args.queue_timeout,
+    )
+    try:
+        tracing.configure(args.trace)
+    except ImportError as error:
+        raise SystemExit(f"ols-mcp: {error}") from None
+    if args.record_queries:
+        querylog.configure(args.query_log)
+    else:
+        querylog.set_log(None)
 
-def main():
+    # The server only searches an existing mirror; "mirror" creates one
+    mirror_path = args.mirror_path or default_mirror_path()
+    if args.no_mirror:
+        mirror.set_mirror(None)
+    elif args.command in ("mirror", "sync", "snapshot") or mirror_path.exists():
+        mirror.configure(mirror_path)
+
+    snapshot_dir = args.snapshot_dir or default_snapshot_dir()
+    if args.no_snapshots or not snapshot_dir.is_dir():
+        snapshot.set_snapshots({})
+    else:
+        snapshot.configure(snapshot_dir)
+
+
+def run_mirror(args: argparse.Namespace) -> None:
+    """Crawl the ontologies named on the command line into the mirror."""
+    if mirror.get_mirror() is None:
+        raise SystemExit("ols-mcp: mirror cannot be used with --no-mirror")
+    for ontology_id in args.ontologies:
+        count = api.mirror_ontology(ontology_id, page_size=args.page_size)
+        print(f"Mirrored {count} terms from {ontology_id}")
+
+
+def run_sync(args: argparse.Namespace) -> None:
+    """Re-crawl the mirrored ontologies that changed since they were mirrored."""
+    store = mirror.get_mirror()
+    if store is None:
+        raise SystemExit("ols-mcp: sync cannot be used with --no-mirror")
+    ontologies = args.ontologies or sorted({*store.ontologies(), *store.crawls()})
+    if not ontologies:
+        print("Nothing to sync; add ontologies with 'ols-mcp mirror'")
+    for ontology_id in ontologies:
+        result = api.sync_ontology(
+            ontology_id, page_size=args.page_size, force=args.force
+        )
+        print(f"{ontology_id}: {result['status']} ({result['terms']} terms)")
+        # Keep an existing snapshot in step with the mirror
+        if result["status"] != "unchanged" and snapshot.get_snapshot(ontology_id):
+            snapshot.snapshot_from_mirror(store, ontology_id, args.snapshot_dir)
+
+
+def run_snapshot(args: argparse.Namespace) -> None:
+    """Write snapshots of the mirrored ontologies named on the command line."""
+    store = mirror.get_mirror()
+    if store is None:
+        raise SystemExit("ols-mcp: snapshot cannot be used with --no-mirror")
+    for ontology_id in args.ontologies or store.ontologies():
+        if store.state(ontology_id) is None:
+            raise SystemExit(
+                f"ols-mcp: {ontology_id} is not mirrored; run 'ols-mcp mirror' first"
+            )
+        path = snapshot.snapshot_from_mirror(store, ontology_id, args.snapshot_dir)
+        print(f"Wrote {path}")
+
+
+def _report_warmup(result: dict) -> None:
+    # stderr: stdout carries the stdio transport
+    print(
+        f"Warmed the cache with {result['queries'] - result['failed']} of "
+        f"{result['queries']} logged calls in {result['seconds']:.1f}s",
+        file=sys.stderr,
+    )
+
+
+def run_warm(args: argparse.Namespace) -> None:
+    """Replay the most frequent logged calls into the cache."""
+    log = querylog.QueryLog(args.query_log or default_query_log_path())
+    _report_warmup(
+        querylog.warm(log, sync_tools, top=args.top, concurrency=args.concurrency)
+    )
+
+
+def start_warmup(args: argparse.Namespace, forking: bool) -> querylog.Warmer | None:
+    """
+    Warm the cache from the query log when --warm is given.
+
+    A server that forks (--workers, launcher) warms up before it returns,
+    so every process it forks starts with the warm in-memory cache too;
+    otherwise the warm-up runs in the background while the server starts.
+    """
+    if args.warm <= 0:
+        return None
+    log = querylog.QueryLog(args.query_log or default_query_log_path())
+    if forking:
+        _report_warmup(querylog.warm(
+            log, sync_tools, top=args.warm, concurrency=args.warm_concurrency
+        ))
+        # Pooled connections must not be shared with the forked processes
+        client.close()
+        return None
+    warmer = querylog.Warmer(
+        log,
+        sync_tools,
+        top=args.warm,
+        concurrency=args.warm_concurrency,
+        interval=args.warm_interval or None,
+        report=_report_warmup,
+    )
+    warmer.start()
+    return warmer
+
+
+def run_launcher(args: argparse.Namespace) -> None:
+    """Fork a stdio session for every ols-mcp-launch process until stopped."""
+    client.preload()
+    path = args.socket or launcher.default_socket_path()
+    daemon = launcher.LauncherDaemon(path, session=mcp.run)
+    print(f"Serving ols-mcp-launch sessions from {path}", file=sys.stderr)
+    try:
+        daemon.serve()
+    except (RuntimeError, OSError) as error:
+        raise SystemExit(f"ols-mcp: {error}") from None
+    print(f"Started {daemon.started} sessions", file=sys.stderr)
+
+
+def main(argv: Sequence[str] | None = None):
     """Main entry point for the application."""
+    args = build_parser().parse_args(argv)
+    apply_options(args)
+    if args.command == "mirror":
+        run_mirror(args)
+        return
+    if args.command == "sync":
+        run_sync(args)
+        return
+    if args.command == "snapshot":
+        run_snapshot(args)
+        return
+    if args.command == "warm":
+        run_warm(args)
+        return
+    forking = args.command == "launcher" or args.workers > 1
+    warmer = start_warmup(args, forking)
+    try:
+        serve_forever(args)
+    finally:
+        if warmer is not None:
+            warmer.stop(timeout=0)
+
+
+def serve_forever(args: argparse.Namespace) -> None:
+    """Serve MCP over the transport the options ask for until stopped."""
+    if args.command == "launcher":
+        run_launcher(args)
+        return
+    if args.transport == "http" and args.workers > 1:
+        # Stateless sessions, since a client's requests may reach any worker
+        serve.serve_workers(
+            functools.partial(mcp.http_app, stateless_http=True),
+            workers=args.workers,
+            host=args.host,
+            port=args.port,
+            drain_timeout=args.drain_timeout,
+        )
+        return
+    if args.transport == "http":
+        serve.serve_http(
+            mcp.http_app(),
+            host=args.host,
+            port=args.port,
+            drain_timeout=args.drain_timeout,
+        )
+        return
     mcp.run()
 
 
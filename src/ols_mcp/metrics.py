@@ -0,0 +1,473 @@
+################################################################################
+# ols_mcp/metrics.py
+# This module contains the in-process metrics of the server: latency
+# histograms and counters recorded around OLS requests and tool calls, plus the
+# cache, rate limiter, retry and coalescing stats, exported as a snapshot or in
+# the Prometheus text format
+################################################################################
+import bisect
+import functools
+import math
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, NamedTuple, TypeVar
+
+from . import admission, cache, deadline, ratelimit, retry, singleflight
+from .client import endpoint_for
+
+T = TypeVar("T")
+
+# Latency buckets in seconds, from cache-speed answers up to OLS stalls
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+# Pages needed by one paginated call
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 500, 1000)
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    """The Prometheus type, help text and (for histograms) buckets of a metric."""
+
+    kind: str
+    help: str
+    buckets: tuple[float, ...] = ()
+
+
+METRICS: dict[str, MetricSpec] = {
+    "ols_http_requests_total": MetricSpec(
+        "counter", "HTTP requests sent to OLS by endpoint family and status"
+    ),
+    "ols_http_request_duration_seconds": MetricSpec(
+        "histogram", "Time from sending a request to OLS until its body arrived",
+        LATENCY_BUCKETS,
+    ),
+    "ols_http_response_bytes_total": MetricSpec(
+        "counter", "Decoded response body bytes received from OLS"
+    ),
+    "ols_pagination_pages": MetricSpec(
+        "histogram", "Pages a paginated OLS call needed", PAGE_BUCKETS
+    ),
+    "ols_tool_calls_total": MetricSpec(
+        "counter", "MCP tool calls by tool and outcome"
+    ),
+    "ols_tool_duration_seconds": MetricSpec(
+        "histogram", "Time spent answering an MCP tool call", LATENCY_BUCKETS
+    ),
+}
+
+
+class Sample(NamedTuple):
+    """One value of a metric read from another module's stats at export time."""
+
+    name: str
+    kind: str
+    help: str
+    labels: dict[str, str]
+    value: float
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style; not thread-safe."""
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add one observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Estimate a quantile by interpolating inside its bucket.
+
+        Returns:
+            The estimate, or None without observations. Observations above
+            the last bucket are reported as its upper bound.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return count, sum, p50/p95/p99 estimates and cumulative buckets."""
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip((*self.buckets, math.inf), self.counts, strict=True):
+            cumulative += count
+            buckets[_format_value(bound)] = cumulative
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+def _label_key(labels: dict[str, Any]) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Registry:
+    """Thread-safe store of counters and histograms plus stats collectors."""
+
+    def __init__(self, specs: dict[str, MetricSpec] | None = None):
+        self.specs = dict(specs if specs is not None else METRICS)
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, tuple], float] = {}
+        self._histograms: dict[tuple[str, tuple], Histogram] = {}
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+        self._constant_labels: dict[str, str] = {}
+
+    def set_constant_labels(self, **labels: Any) -> None:
+        """
+        Add labels to every series the registry exports.
+
+        A server with several worker processes labels each one's series with
+        its worker index, so the counters of different processes never land
+        in the same series.
+        """
+        with self._lock:
+            self._constant_labels = {name: str(value) for name, value in labels.items()}
+
+    def inc(self, name: str, amount: float = 1.0, **labels: Any) -> None:
+        """Add amount to a counter."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Add an observation to a histogram."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(
+                    self.specs[name].buckets
+                )
+            histogram.observe(value)
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Add a function whose samples are read at every export."""
+        self._collectors.append(collector)
+
+    def histogram(self, name: str, **labels: Any) -> Histogram | None:
+        """Return the histogram recorded under name and labels, if any."""
+        with self._lock:
+            return self._histograms.get((name, _label_key(labels)))
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        """
+        Return every metric as plain data.
+
+        Returns:
+            A dictionary mapping metric names to lists of series, each with
+            its labels and either a value or a histogram snapshot.
+        """
+        result: dict[str, list[dict[str, Any]]] = {}
+        with self._lock:
+            constant = self._constant_labels
+            for (name, labels), value in sorted(self._counters.items()):
+                result.setdefault(name, []).append(
+                    {"labels": {**constant, **dict(labels)}, "value": value}
+                )
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                result.setdefault(name, []).append(
+                    {"labels": {**constant, **dict(labels)}, **histogram.snapshot()}
+                )
+        for sample in self._collect():
+            result.setdefault(sample.name, []).append(
+                {"labels": {**constant, **sample.labels}, "value": sample.value}
+            )
+        return result
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        families: dict[str, tuple[str, str, list[str]]] = {}
+
+        def family(name: str, kind: str, help_text: str) -> list[str]:
+            return families.setdefault(name, (kind, help_text, []))[2]
+
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                labels = self._with_constant_labels(labels)
+                spec = self.specs[name]
+                family(name, spec.kind, spec.help).append(
+                    f"{name}{_format_labels(labels)} {_format_value(value)}"
+                )
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                labels = self._with_constant_labels(labels)
+                spec = self.specs[name]
+                lines = family(name, spec.kind, spec.help)
+                cumulative = 0
+                bounds = (*histogram.buckets, math.inf)
+                for bound, count in zip(bounds, histogram.counts, strict=True):
+                    cumulative += count
+                    le = (("le", _format_value(bound)),)
+                    lines.append(
+                        f"{name}_bucket{_format_labels(labels + le)} {cumulative}"
+                    )
+                lines.append(
+                    f"{name}_sum{_format_labels(labels)} "
+                    f"{_format_value(histogram.sum)}"
+                )
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        for sample in self._collect():
+            family(sample.name, sample.kind, sample.help).append(
+                f"{sample.name}"
+                f"{_format_labels(self._with_constant_labels(sample.labels.items()))} "
+                f"{_format_value(sample.value)}"
+            )
+
+        output = []
+        for name, (kind, help_text, lines) in families.items():
+            output.append(f"# HELP {name} {help_text}")
+            output.append(f"# TYPE {name} {kind}")
+            output.extend(lines)
+        return "\n".join(output) + "\n"
+
+    def _with_constant_labels(
+        self, labels: Iterable[tuple[str, Any]]
+    ) -> tuple[tuple[str, str], ...]:
+        return _label_key({**self._constant_labels, **dict(labels)})
+
+    def _collect(self) -> Iterator[Sample]:
+        for collector in list(self._collectors):
+            yield from collector()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class RequestProbe:
+    """Timing of one OLS request; record its response before the block ends."""
+
+    def __init__(self):
+        self.response: Any = None
+
+    def record(self, response: Any) -> None:
+        """Record the requests or httpx response the request got."""
+        self.response = response
+
+
+def _client_samples() -> Iterator[Sample]:
+    """Read the cache, rate limiter, retry, coalescing and admission stats."""
+    store = cache.get_cache()
+    if store is not None:
+        # Only the in-memory counters; a scrape never waits on SQLite
+        stats = store.stats(include_disk=False)
+        for name, key in (
+            ("hits", "hits"),
+            ("misses", "misses"),
+            ("revalidations", "revalidations"),
+            ("evictions", "evictions"),
+        ):
+            yield Sample(
+                f"ols_cache_{name}_total", "counter",
+                f"Response cache {name.replace('_', ' ')}", {}, stats[key],
+            )
+        yield Sample(
+            "ols_cache_hit_ratio", "gauge",
+            "Share of response cache lookups that were fresh hits", {},
+            stats["hit_rate"],
+        )
+        yield Sample(
+            "ols_cache_entries", "gauge", "Responses held in memory", {},
+            stats["entries"],
+        )
+        yield Sample(
+            "ols_cache_bytes", "gauge", "Response bytes held in memory", {},
+            stats["bytes"],
+        )
+
+    limiter = ratelimit.get_limiter()
+    for endpoint, stats in (limiter.stats() if limiter else {}).items():
+        labels = {"endpoint": endpoint}
+        yield Sample(
+            "ols_concurrency_limit", "gauge",
+            "Adaptive limit on concurrent OLS requests", labels, stats["limit"],
+        )
+        yield Sample(
+            "ols_requests_in_flight", "gauge",
+            "OLS requests currently holding a concurrency slot", labels,
+            stats["in_flight"],
+        )
+        yield Sample(
+            "ols_concurrency_backoffs_total", "counter",
+            "Times the concurrency limit was cut after an overload signal", labels,
+            stats["backoffs"],
+        )
+
+    retrier = retry.get_retrier()
+    for endpoint, stats in (retrier.stats() if retrier else {}).items():
+        labels = {"endpoint": endpoint}
+        for name in ("retries", "hedges", "hedge_wins"):
+            yield Sample(
+                f"ols_{name}_total", "counter",
+                f"OLS request {name.replace('_', ' ')}", labels, stats[name],
+            )
+
+    for mode, stats in singleflight.stats().items():
+        yield Sample(
+            "ols_coalesced_requests_total", "counter",
+            "Calls answered by an identical request already in flight",
+            {"mode": mode}, stats["shared"],
+        )
+
+    controller = admission.get_controller()
+    if controller is not None:
+        stats = controller.stats()
+        yield Sample(
+            "ols_tool_calls_running", "gauge", "Tool calls currently executing", {},
+            stats["running"],
+        )
+        yield Sample(
+            "ols_tool_calls_queued", "gauge", "Tool calls waiting for a slot", {},
+            stats["queued"],
+        )
+        yield Sample(
+            "ols_tool_calls_rejected_total", "counter",
+            "Tool calls refused because the server was full or draining", {},
+            stats["rejected"],
+        )
+
+
+def default_registry() -> Registry:
+    """Build a registry with the standard metrics and client stats collectors."""
+    registry = Registry()
+    registry.add_collector(_client_samples)
+    return registry
+
+
+_registry = default_registry()
+
+
+def get_registry() -> Registry:
+    """Return the shared metrics registry."""
+    return _registry
+
+
+def set_registry(registry: Registry) -> None:
+    """Install the registry every metric is recorded in."""
+    global _registry
+    _registry = registry
+
+
+def inc(name: str, amount: float = 1.0, **labels: Any) -> None:
+    """Add amount to a counter of the shared registry."""
+    _registry.inc(name, amount, **labels)
+
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    """Add an observation to a histogram of the shared registry."""
+    _registry.observe(name, value, **labels)
+
+
+def snapshot() -> dict[str, list[dict[str, Any]]]:
+    """Return every metric of the shared registry as plain data."""
+    return _registry.snapshot()
+
+
+def render_prometheus() -> str:
+    """Return every metric of the shared registry in Prometheus text format."""
+    return _registry.render()
+
+
+@contextmanager
+def track_request(url: str) -> Iterator[RequestProbe]:
+    """
+    Time one request to url and count it with its status and body size.
+
+    Requests that end without a recorded response count with status "error".
+    """
+    endpoint = endpoint_for(url)
+    probe = RequestProbe()
+    started = time.perf_counter()
+    try:
+        yield probe
+    finally:
+        elapsed = time.perf_counter() - started
+        response = probe.response
+        status = "error" if response is None else str(response.status_code)
+        registry = _registry
+        registry.inc("ols_http_requests_total", endpoint=endpoint, status=status)
+        registry.observe(
+            "ols_http_request_duration_seconds", elapsed, endpoint=endpoint
+        )
+        if response is not None:
+            registry.inc(
+                "ols_http_response_bytes_total", len(response.content),
+                endpoint=endpoint,
+            )
+
+
+def instrument_tool(
+    fn: Callable[..., Awaitable[T]], name: str
+) -> Callable[..., Awaitable[T]]:
+    """
+    Wrap an async tool so every call is timed and counted by outcome.
+
+    The outcome is "ok", "error", "deadline_exceeded" when the call ran out
+    of time, whether it failed or returned partial results, or "rejected"
+    when the server was too busy to admit it.
+    """
+
+    @functools.wraps(fn)
+    async def instrumented(*args: Any, **kwargs: Any) -> T:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with deadline.collect_cutoffs() as cutoffs:
+                result = await fn(*args, **kwargs)
+            outcome = "deadline_exceeded" if cutoffs else "ok"
+            return result
+        except deadline.DeadlineExceeded:
+            outcome = "deadline_exceeded"
+            raise
+        except admission.ServerBusy:
+            outcome = "rejected"
+            raise
+        finally:
+            registry = _registry
+            registry.observe(
+                "ols_tool_duration_seconds", time.perf_counter() - started, tool=name
+            )
+            registry.inc("ols_tool_calls_total", tool=name, outcome=outcome)
+
+    return instrumented
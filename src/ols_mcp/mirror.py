@@ -0,0 +1,569 @@
+################################################################################
+# ols_mcp/mirror.py
+# This module contains the local SQLite FTS5 mirror of selected ontologies that
+# answers searches restricted to those ontologies without contacting OLS
+################################################################################
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .disk_cache import default_cache_path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ontologies (
+    ontology_id TEXT PRIMARY KEY,
+    term_count INTEGER NOT NULL,
+    mirrored_at REAL NOT NULL,
+    version TEXT,
+    updated TEXT,
+    loaded TEXT
+);
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    ontology_id TEXT NOT NULL,
+    label TEXT,
+    is_obsolete INTEGER NOT NULL,
+    document TEXT NOT NULL,
+    has_children INTEGER NOT NULL DEFAULT 0,
+    is_root INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS terms_ontology ON terms (ontology_id);
+CREATE TABLE IF NOT EXISTS names (
+    term_id INTEGER NOT NULL,
+    ontology_id TEXT NOT NULL,
+    name TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS names_lookup ON names (ontology_id, name);
+CREATE INDEX IF NOT EXISTS names_term ON names (term_id);
+CREATE TABLE IF NOT EXISTS crawls (
+    ontology_id TEXT PRIMARY KEY,
+    version TEXT,
+    updated TEXT,
+    loaded TEXT,
+    page_size INTEGER NOT NULL,
+    next_page INTEGER NOT NULL,
+    started_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS staged_terms (
+    ontology_id TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    term TEXT NOT NULL,
+    PRIMARY KEY (ontology_id, page, position)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS terms_fts USING fts5(
+    label, synonyms, description, identifiers,
+    tokenize = "unicode61 remove_diacritics 2"
+);
+"""
+
+# Columns added after the first release of the mirror file format
+_ADDED_COLUMNS = {
+    "ontologies": {"version": "TEXT", "updated": "TEXT", "loaded": "TEXT"},
+    "terms": {
+        "has_children": "INTEGER NOT NULL DEFAULT 0",
+        "is_root": "INTEGER NOT NULL DEFAULT 0",
+    },
+}
+
+# bm25 column weights for label, synonyms, description and identifiers
+_RANK = "bm25(terms_fts, 20.0, 5.0, 1.0, 10.0)"
+
+# Terms inserted per batch while loading an ontology
+_BATCH_SIZE = 1000
+
+# The fields of an OLS /search document, which mirrored results reproduce
+_DOCUMENT_FIELDS = (
+    "iri",
+    "short_form",
+    "obo_id",
+    "label",
+    "description",
+    "ontology_name",
+    "ontology_prefix",
+)
+
+
+# The fields of a /terms entry the mirror indexes; crawls stage only these
+_TERM_FIELDS = (
+    *_DOCUMENT_FIELDS,
+    "synonyms",
+    "is_obsolete",
+    "has_children",
+    "is_root",
+)
+
+
+class OntologyState(NamedTuple):
+    """What OLS reports about an ontology's load; any change means it changed."""
+
+    version: str | None = None
+    updated: str | None = None
+    loaded: str | None = None
+
+    @classmethod
+    def from_details(cls, details: dict[str, Any]) -> "OntologyState":
+        """Build the state from an api.get_ontology_details() response."""
+        return cls(
+            details.get("config", {}).get("version"),
+            details.get("updated"),
+            details.get("loaded"),
+        )
+
+
+class Crawl(NamedTuple):
+    """An unfinished crawl: the ontology state it started from and where to resume."""
+
+    state: OntologyState
+    page_size: int
+    next_page: int
+
+
+def default_mirror_path() -> Path:
+    """Return the default location of the mirror file, next to the cache."""
+    return default_cache_path().with_name("mirror.sqlite3")
+
+
+def _search_document(ontology_id: str, term: dict[str, Any]) -> dict[str, Any]:
+    document = {field: term.get(field) for field in _DOCUMENT_FIELDS}
+    document["id"] = f"{ontology_id}:class:{term.get('short_form')}"
+    document["description"] = term.get("description") or []
+    document["ontology_name"] = document["ontology_name"] or ontology_id
+    document["type"] = "class"
+    return document
+
+
+def _match_expression(query: str) -> str | None:
+    # Every word must match, as a prefix so "mito" finds "mitochondrion";
+    # quoting keeps FTS5 operators in the query from being interpreted
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class OntologyMirror:
+    """
+    Full-text index of the terms of selected ontologies in one SQLite file.
+
+    Terms are loaded from OLS /terms pages (see api.mirror_ontology) and
+    searched with FTS5, ranking label and identifier matches above synonym
+    and description matches. Loading an ontology replaces its previous copy
+    in a single transaction, so searches never see a half-loaded ontology.
+    Like DiskCache, the file runs in WAL mode with one connection per thread
+    and per process.
+    """
+
+    def __init__(self, path: str | Path, clock: Callable[[], float] = time.time):
+        self.path = Path(path)
+        self._clock = clock
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connect()
+        connection.executescript(_SCHEMA)
+        for table, added in _ADDED_COLUMNS.items():
+            columns = {
+                row[1] for row in connection.execute(f"PRAGMA table_info({table})")
+            }
+            for column, column_type in added.items():
+                if column not in columns:
+                    connection.execute(
+                        f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"
+                    )
+
+    def ontologies(self) -> list[str]:
+        """Return the IDs of the mirrored ontologies."""
+        rows = self._connect().execute(
+            "SELECT ontology_id FROM ontologies ORDER BY ontology_id"
+        )
+        return [ontology_id for (ontology_id,) in rows]
+
+    def covers(self, ontologies: Sequence[str] | None) -> bool:
+        """
+        Return whether a search over the given ontologies can be answered locally.
+
+        A search across all of OLS (no ontologies given) never can.
+        """
+        if not ontologies:
+            return False
+        wanted = {ontology.lower() for ontology in ontologies}
+        return wanted <= set(self.ontologies())
+
+    def load(
+        self,
+        ontology_id: str,
+        terms: Iterable[dict[str, Any]],
+        state: OntologyState | None = None,
+    ) -> int:
+        """
+        Replace the mirrored copy of an ontology with the given terms.
+
+        Args:
+            ontology_id: The ID of the ontology (e.g., 'go', 'uberon')
+            terms: Raw term dictionaries as returned by OLS /terms pages;
+                consumed lazily, so a streaming iterator keeps memory flat
+            state: The OLS version/updated/loaded values the terms came from,
+                recorded so a later sync can tell whether they changed
+
+        Returns:
+            The number of terms stored.
+        """
+        ontology_id = ontology_id.lower()
+        with self._transaction() as connection:
+            return self._replace(connection, ontology_id, terms, state)
+
+    def state(self, ontology_id: str) -> OntologyState | None:
+        """Return the recorded OLS state of a mirrored ontology, if mirrored."""
+        row = self._connect().execute(
+            "SELECT version, updated, loaded FROM ontologies WHERE ontology_id = ?",
+            (ontology_id.lower(),),
+        ).fetchone()
+        return OntologyState(*row) if row is not None else None
+
+    def crawl(self, ontology_id: str) -> Crawl | None:
+        """Return the unfinished crawl of an ontology, if there is one."""
+        row = self._connect().execute(
+            "SELECT version, updated, loaded, page_size, next_page FROM crawls "
+            "WHERE ontology_id = ?",
+            (ontology_id.lower(),),
+        ).fetchone()
+        if row is None:
+            return None
+        return Crawl(OntologyState(*row[:3]), row[3], row[4])
+
+    def crawls(self) -> list[str]:
+        """Return the IDs of ontologies with an unfinished crawl."""
+        rows = self._connect().execute(
+            "SELECT ontology_id FROM crawls ORDER BY ontology_id"
+        )
+        return [ontology_id for (ontology_id,) in rows]
+
+    def start_crawl(
+        self, ontology_id: str, state: OntologyState, page_size: int
+    ) -> None:
+        """Begin a fresh crawl, discarding any pages staged by an earlier one."""
+        ontology_id = ontology_id.lower()
+        with self._transaction() as connection:
+            connection.execute(
+                "DELETE FROM staged_terms WHERE ontology_id = ?", (ontology_id,)
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO crawls (ontology_id, version, updated, "
+                "loaded, page_size, next_page, started_at) "
+                "VALUES (?, ?, ?, ?, ?, 0, ?)",
+                (ontology_id, *state, page_size, self._clock()),
+            )
+
+    def stage_page(
+        self, ontology_id: str, page: int, terms: Sequence[dict[str, Any]]
+    ) -> None:
+        """
+        Durably record one crawled page and advance the crawl past it.
+
+        Only the fields the mirror indexes are kept, so staging a large
+        ontology costs a fraction of the raw OLS responses.
+        """
+        ontology_id = ontology_id.lower()
+        with self._transaction() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO staged_terms (ontology_id, page, position, "
+                "term) VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        ontology_id,
+                        page,
+                        position,
+                        json.dumps({field: term.get(field) for field in _TERM_FIELDS}),
+                    )
+                    for position, term in enumerate(terms)
+                ],
+            )
+            connection.execute(
+                "UPDATE crawls SET next_page = ? WHERE ontology_id = ?",
+                (page + 1, ontology_id),
+            )
+
+    def finish_crawl(self, ontology_id: str) -> int:
+        """
+        Swap the staged pages of a crawl in as the mirrored copy of the ontology.
+
+        Returns:
+            The number of terms stored.
+        """
+        ontology_id = ontology_id.lower()
+        crawl = self.crawl(ontology_id)
+        if crawl is None:
+            raise LookupError(f"No crawl of {ontology_id} in progress")
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT term FROM staged_terms WHERE ontology_id = ? "
+                "ORDER BY page, position",
+                (ontology_id,),
+            )
+            terms = (json.loads(term) for (term,) in rows)
+            count = self._replace(connection, ontology_id, terms, crawl.state)
+            connection.execute(
+                "DELETE FROM staged_terms WHERE ontology_id = ?", (ontology_id,)
+            )
+            connection.execute(
+                "DELETE FROM crawls WHERE ontology_id = ?", (ontology_id,)
+            )
+        return count
+
+    def remove(self, ontology_id: str) -> None:
+        """Drop an ontology, and any unfinished crawl of it, from the mirror."""
+        ontology_id = ontology_id.lower()
+        with self._transaction() as connection:
+            self._delete(connection, ontology_id)
+            connection.execute(
+                "DELETE FROM staged_terms WHERE ontology_id = ?", (ontology_id,)
+            )
+            connection.execute(
+                "DELETE FROM crawls WHERE ontology_id = ?", (ontology_id,)
+            )
+
+    def search(
+        self,
+        query: str,
+        ontologies: Sequence[str],
+        max_results: int = 20,
+        exact: bool = False,
+    ) -> list[dict[str, Any]]:
+        """
+        Search the mirrored terms of the given ontologies.
+
+        Args:
+            query: The search term
+            ontologies: Mirrored ontology IDs to search within
+            max_results: Maximum number of results to return
+            exact: If True, only match whole labels, synonyms or identifiers
+                (case-insensitively), as OLS does for exact searches
+
+        Returns:
+            Search results in the same form as OLS /search documents.
+            Obsolete terms are left out, as OLS does by default.
+        """
+        ontology_ids = [ontology.lower() for ontology in ontologies]
+        placeholders = ", ".join("?" * len(ontology_ids))
+        connection = self._connect()
+
+        if exact:
+            rows = connection.execute(
+                f"SELECT document FROM terms WHERE is_obsolete = 0 AND id IN ("
+                f"SELECT term_id FROM names WHERE ontology_id IN ({placeholders}) "
+                f"AND name = ?) ORDER BY label = ? COLLATE NOCASE DESC, id LIMIT ?",
+                (*ontology_ids, query.strip(), query.strip(), max_results),
+            )
+        else:
+            expression = _match_expression(query)
+            if expression is None:
+                return []
+            rows = connection.execute(
+                f"SELECT terms.document FROM terms_fts "
+                f"JOIN terms ON terms.id = terms_fts.rowid "
+                f"WHERE terms_fts MATCH ? AND terms.is_obsolete = 0 "
+                f"AND terms.ontology_id IN ({placeholders}) "
+                f"ORDER BY terms.label = ? COLLATE NOCASE DESC, {_RANK} LIMIT ?",
+                (expression, *ontology_ids, query.strip(), max_results),
+            )
+        return [json.loads(document) for (document,) in rows]
+
+    def iter_terms(self, ontology_id: str) -> Iterator[dict[str, Any]]:
+        """
+        Stream the mirrored terms of an ontology in OLS order.
+
+        Yields:
+            Term dictionaries with the fields the mirror keeps: the /search
+            document fields plus synonyms, is_obsolete, has_children and
+            is_root.
+        """
+        rows = self._connect().execute(
+            "SELECT terms.document, terms_fts.synonyms, terms.is_obsolete, "
+            "terms.has_children, terms.is_root FROM terms "
+            "JOIN terms_fts ON terms_fts.rowid = terms.id "
+            "WHERE terms.ontology_id = ? ORDER BY terms.id",
+            (ontology_id.lower(),),
+        )
+        for document, synonyms, is_obsolete, has_children, is_root in rows:
+            term = json.loads(document)
+            term["synonyms"] = synonyms.split("\n") if synonyms else []
+            term["is_obsolete"] = bool(is_obsolete)
+            term["has_children"] = bool(has_children)
+            term["is_root"] = bool(is_root)
+            yield term
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return the mirrored ontologies with their term counts, load times and
+        recorded OLS version/updated/loaded values.
+        """
+        rows = self._connect().execute(
+            "SELECT ontology_id, term_count, mirrored_at, version, updated, loaded "
+            "FROM ontologies ORDER BY ontology_id"
+        )
+        return {
+            ontology_id: {
+                "terms": term_count,
+                "mirrored_at": mirrored_at,
+                **OntologyState(version, updated, loaded)._asdict(),
+            }
+            for ontology_id, term_count, mirrored_at, version, updated, loaded in rows
+        }
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _replace(
+        self,
+        connection: sqlite3.Connection,
+        ontology_id: str,
+        terms: Iterable[dict[str, Any]],
+        state: OntologyState | None,
+    ) -> int:
+        self._delete(connection, ontology_id)
+        count = 0
+        iterator = iter(terms)
+        while batch := list(islice(iterator, _BATCH_SIZE)):
+            self._insert(connection, ontology_id, batch)
+            count += len(batch)
+        connection.execute(
+            "INSERT OR REPLACE INTO ontologies (ontology_id, term_count, "
+            "mirrored_at, version, updated, loaded) VALUES (?, ?, ?, ?, ?, ?)",
+            (ontology_id, count, self._clock(), *(state or OntologyState())),
+        )
+        return count
+
+    def _delete(self, connection: sqlite3.Connection, ontology_id: str) -> None:
+        connection.execute(
+            "DELETE FROM terms_fts WHERE rowid IN "
+            "(SELECT id FROM terms WHERE ontology_id = ?)",
+            (ontology_id,),
+        )
+        connection.execute("DELETE FROM names WHERE ontology_id = ?", (ontology_id,))
+        connection.execute("DELETE FROM terms WHERE ontology_id = ?", (ontology_id,))
+        connection.execute(
+            "DELETE FROM ontologies WHERE ontology_id = ?", (ontology_id,)
+        )
+
+    def _insert(
+        self,
+        connection: sqlite3.Connection,
+        ontology_id: str,
+        terms: list[dict[str, Any]],
+    ) -> None:
+        for term in terms:
+            document = _search_document(ontology_id, term)
+            cursor = connection.execute(
+                "INSERT INTO terms (ontology_id, label, is_obsolete, has_children, "
+                "is_root, document) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    ontology_id,
+                    term.get("label"),
+                    bool(term.get("is_obsolete")),
+                    bool(term.get("has_children")),
+                    bool(term.get("is_root")),
+                    json.dumps(document),
+                ),
+            )
+            term_id = cursor.lastrowid
+            synonyms = term.get("synonyms") or []
+            identifiers = [
+                term[field]
+                for field in ("obo_id", "short_form", "iri")
+                if term.get(field)
+            ]
+            connection.execute(
+                "INSERT INTO terms_fts (rowid, label, synonyms, description, "
+                "identifiers) VALUES (?, ?, ?, ?, ?)",
+                (
+                    term_id,
+                    term.get("label") or "",
+                    "\n".join(synonyms),
+                    "\n".join(document["description"]),
+                    " ".join(identifiers),
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO names (term_id, ontology_id, name) VALUES (?, ?, ?)",
+                [
+                    (term_id, ontology_id, name)
+                    for name in _names(term.get("label"), synonyms, identifiers)
+                ],
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # SQLite connections must not cross a fork; leave the parent's alone
+            self._local = threading.local()
+            self._pid = os.getpid()
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+
+def _names(
+    label: str | None, synonyms: list[str], identifiers: list[str]
+) -> Iterator[str]:
+    # Each distinct name a term can be found by in an exact search
+    seen: set[str] = set()
+    for name in (label, *synonyms, *identifiers):
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            yield name
+
+
+_mirror: OntologyMirror | None = None
+
+
+def get_mirror() -> OntologyMirror | None:
+    """Return the shared ontology mirror, or None when no mirror is in use."""
+    return _mirror
+
+
+def set_mirror(mirror: OntologyMirror | None) -> None:
+    """Install an ontology mirror for every search; None disables it."""
+    global _mirror
+    _mirror = mirror
+
+
+def configure(path: str | Path | None = None) -> OntologyMirror:
+    """
+    Open (creating if needed) a mirror file and install it as the shared mirror.
+
+    Args:
+        path: SQLite file holding the mirror (default: default_mirror_path())
+
+    Returns:
+        The newly installed mirror.
+    """
+    mirror = OntologyMirror(path or default_mirror_path())
+    set_mirror(mirror)
+    return mirror
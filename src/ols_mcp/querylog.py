@@ -0,0 +1,293 @@
+################################################################################
+# ols_mcp/querylog.py
+# This module contains the query log: every successful tool call is appended
+# to it in a canonical form, and a warm-up replays the most frequent entries
+# into the response cache so the first calls after a restart are cache hits
+################################################################################
+import asyncio
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, TypeVar
+
+from .disk_cache import default_cache_path
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; rotation is then only thread-safe
+    fcntl = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
+# Arguments that change how long a call may take, not what it asks OLS for
+IGNORED_ARGUMENTS = frozenset({"timeout"})
+
+# Queries replayed by a warm-up, and how many run at once
+DEFAULT_TOP = 100
+DEFAULT_CONCURRENCY = 4
+
+
+def default_query_log_path() -> Path:
+    """Return the default location of the query log, next to the response cache."""
+    return default_cache_path().parent / "queries.jsonl"
+
+
+def canonical_arguments(
+    signature: inspect.Signature, args: tuple, kwargs: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Return a tool call's arguments by name, with defaults filled in.
+
+    Calls that differ only in how they spelled the same request (positional
+    or keyword, a default passed explicitly or left out) get equal results.
+    """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return {
+        name: value
+        for name, value in bound.arguments.items()
+        if name not in IGNORED_ARGUMENTS
+    }
+
+
+class QueryLog:
+    """
+    Append-only log of tool calls, one JSON object per line.
+
+    Each line is written with a single append, so several server processes
+    can share one file. Once it grows past max_bytes it is renamed to a
+    ".1" file, replacing the previous one, and a new file is started; both
+    are read when counting queries. Processes rotate one at a time under a
+    lock on a ".lock" file next to the log.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = 8 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.recorded = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rotated_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".1")
+
+    @property
+    def lock_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".lock")
+
+    def record(self, tool: str, arguments: dict[str, Any]) -> None:
+        """Append a call; a log that cannot be written is skipped, not raised."""
+        line = json.dumps(
+            {"tool": tool, "arguments": arguments},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as log:
+                    log.write(line + "\n")
+                    size = log.tell()
+                if size > self.max_bytes:
+                    self._rotate()
+                self.recorded += 1
+            except OSError:
+                self.errors += 1
+
+    def _rotate(self) -> None:
+        with open(self.lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            # Another process may have rotated since this one saw the size;
+            # rotating again would replace its ".1" file with a nearly empty one
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                return
+            if size > self.max_bytes:
+                os.replace(self.path, self.rotated_path)
+
+    def lines(self) -> Iterator[str]:
+        """Yield the logged calls as written, oldest first."""
+        for path in (self.rotated_path, self.path):
+            try:
+                with open(path, encoding="utf-8") as log:
+                    yield from (line.rstrip("\n") for line in log if line.strip())
+            except FileNotFoundError:
+                continue
+
+    def top(self, count: int = DEFAULT_TOP) -> list[tuple[str, dict[str, Any], int]]:
+        """
+        Return the most frequent calls in the log.
+
+        Returns:
+            Up to count (tool, arguments, calls) tuples, most frequent first;
+            lines that are not valid entries are left out.
+        """
+        queries: list[tuple[str, dict[str, Any], int]] = []
+        for line, calls in Counter(self.lines()).most_common():
+            if len(queries) >= count:
+                break
+            try:
+                entry = json.loads(line)
+                queries.append((entry["tool"], dict(entry["arguments"]), calls))
+            except (ValueError, KeyError, TypeError):
+                continue
+        return queries
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "recorded": self.recorded,
+            "errors": self.errors,
+        }
+
+
+_log: QueryLog | None = None
+
+
+def get_log() -> QueryLog | None:
+    """Return the log tool calls are recorded to, or None when recording is off."""
+    return _log
+
+
+def set_log(log: QueryLog | None) -> None:
+    """Install a query log; None stops recording."""
+    global _log
+    _log = log
+
+
+def configure(path: str | Path | None = None) -> QueryLog:
+    """
+    Record tool calls to the log at path (default: next to the response cache).
+
+    Returns:
+        The newly installed log.
+    """
+    log = QueryLog(path or default_query_log_path())
+    set_log(log)
+    return log
+
+
+def record_tool(
+    fn: Callable[..., Awaitable[T]], name: str
+) -> Callable[..., Awaitable[T]]:
+    """
+    Wrap an async tool so every call that returns is added to the query log.
+
+    The line is written from a worker thread, keeping file I/O off the event
+    loop.
+    """
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    async def recorded(*args: Any, **kwargs: Any) -> T:
+        result = await fn(*args, **kwargs)
+        log = _log
+        if log is not None:
+            arguments = canonical_arguments(signature, args, kwargs)
+            await asyncio.to_thread(log.record, name, arguments)
+        return result
+
+    return recorded
+
+
+def warm(
+    log: QueryLog,
+    tools: Mapping[str, Callable[..., Any]],
+    top: int = DEFAULT_TOP,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> dict[str, Any]:
+    """
+    Replay the most frequent logged calls so their responses get cached.
+
+    The calls go through the sync tools on a pool of threads, and so through
+    the response cache, request coalescing and the OLS rate limits like any
+    other call; responses still fresh in the cache are not fetched again.
+
+    Args:
+        log: The log to read
+        tools: Sync tool functions by the name they are logged under
+        top: How many of the most frequent calls to replay
+        concurrency: Calls replayed at once
+
+    Returns:
+        The number of calls replayed, of those that failed (including calls
+        to tools that no longer exist or with arguments they no longer
+        take), and the seconds the warm-up took.
+    """
+    started = time.perf_counter()
+    queries = log.top(top)
+
+    def replay(tool: str, arguments: dict[str, Any]) -> None:
+        tools[tool](**arguments)
+
+    failed = 0
+    with ThreadPoolExecutor(max(concurrency, 1), "ols-warmup") as pool:
+        futures = [
+            pool.submit(replay, tool, arguments) for tool, arguments, _ in queries
+        ]
+        for future in futures:
+            if future.exception() is not None:
+                failed += 1
+    return {
+        "queries": len(queries),
+        "failed": failed,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+class Warmer:
+    """
+    Runs warm() in a background thread at start-up, then every interval.
+
+    report is called with the result of every warm-up.
+    """
+
+    def __init__(
+        self,
+        log: QueryLog,
+        tools: Mapping[str, Callable[..., Any]],
+        top: int = DEFAULT_TOP,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        interval: float | None = None,
+        report: Callable[[dict[str, Any]], None] | None = None,
+    ):
+        self.log = log
+        self.tools = tools
+        self.top = top
+        self.concurrency = concurrency
+        self.interval = interval
+        self.report = report
+        self.runs = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="ols-warmer", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Skip any further warm-up; one already running finishes within timeout."""
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            result = warm(self.log, self.tools, self.top, self.concurrency)
+            self.runs += 1
+            if self.report is not None:
+                self.report(result)
+            if not self.interval or self._stopped.wait(self.interval):
+                return
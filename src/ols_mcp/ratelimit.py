@@ -0,0 +1,442 @@
+################################################################################
+# ols_mcp/ratelimit.py
+# This module contains the client-side throttling shared by every request in
+# ols_mcp/api.py: a token bucket caps the request rate and an AIMD limit adapts
+# the number of concurrent requests, both per endpoint family; the buckets can
+# live in shared memory so forked server workers draw from one budget
+################################################################################
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator, Mapping
+from contextlib import AbstractContextManager, asynccontextmanager, contextmanager
+from dataclasses import dataclass, replace
+from typing import Any
+
+from . import deadline
+from .client import endpoint_for
+
+
+@dataclass(frozen=True)
+class EndpointLimits:
+    """
+    Throttling settings for one endpoint family (see client.endpoint_for).
+
+    Attributes:
+        rate: Sustained requests per second
+        burst: Requests that may be sent back to back after a quiet period
+        initial_concurrency: Concurrent requests allowed at start-up
+        min_concurrency: Floor the concurrency limit never backs off below
+        max_concurrency: Ceiling the concurrency limit never grows above
+        latency_target: Seconds above which a response counts as a sign of
+            overload, like a 429 or 5xx
+        backoff: Factor the concurrency limit is multiplied by on overload
+        cooldown: Seconds after a back-off during which further overload
+            signals (from requests already in flight) are ignored
+    """
+
+    rate: float = 10.0
+    burst: int = 20
+    initial_concurrency: int = 4
+    min_concurrency: int = 1
+    max_concurrency: int = 16
+    latency_target: float = 3.0
+    backoff: float = 0.5
+    cooldown: float = 1.0
+
+
+# Searches and term pages are cheap for OLS; llm_similar runs an embedding
+# query per request and is throttled harder
+DEFAULT_LIMITS: dict[str, EndpointLimits] = {
+    "search": EndpointLimits(rate=10.0, burst=20, latency_target=2.0),
+    "terms": EndpointLimits(rate=20.0, burst=40, latency_target=3.0),
+    "ontology": EndpointLimits(rate=10.0, burst=20, latency_target=2.0),
+    "similar": EndpointLimits(
+        rate=4.0, burst=8, initial_concurrency=2, max_concurrency=8,
+        latency_target=5.0,
+    ),
+    "other": EndpointLimits(rate=10.0, burst=20),
+}
+
+
+def is_overload(status_code: int | None) -> bool:
+    """Return whether a response status asks the client to slow down."""
+    return status_code is None or status_code == 429 or status_code >= 500
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that hands out send times instead of blocking.
+
+    reserve() takes a token (going into debt when the bucket is empty) and
+    returns how long the caller must wait before sending, so the same bucket
+    serves threads (time.sleep) and coroutines (asyncio.sleep).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock: AbstractContextManager[Any] = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in shared memory behind a process lock.
+
+    Processes forked after the bucket is created (the workers started by
+    ols-mcp --workers) all draw from the same tokens, so together they stay
+    within one rate. The clock must be comparable across processes, as
+    time.monotonic is.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._state = multiprocessing.RawArray("d", 2)
+        super().__init__(rate, burst, clock)
+        self._lock = multiprocessing.Lock()
+
+    @property
+    def _tokens(self) -> float:
+        return self._state[0]
+
+    @_tokens.setter
+    def _tokens(self, value: float) -> None:
+        self._state[0] = value
+
+    @property
+    def _updated(self) -> float:
+        return self._state[1]
+
+    @_updated.setter
+    def _updated(self, value: float) -> None:
+        self._state[1] = value
+
+
+class AdaptiveConcurrency:
+    """
+    Concurrency limit adjusted by additive-increase/multiplicative-decrease.
+
+    Every healthy response raises the limit by 1/limit (about one slot per
+    round of requests); a 429, 5xx, transport error or slow response cuts it
+    by the back-off factor, at most once per cooldown. Threads and coroutines
+    on any event loop share the same slots.
+    """
+
+    def __init__(
+        self,
+        limits: EndpointLimits,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limits = limits
+        self._clock = clock
+        self._limit = float(limits.initial_concurrency)
+        self._in_flight = 0
+        self._last_backoff = float("-inf")
+        self._backoffs = 0
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @property
+    def limit(self) -> int:
+        """The number of requests currently allowed in flight."""
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        """
+        Block until a slot is free and take it.
+
+        Raises:
+            deadline.DeadlineExceeded: If the caller's time budget runs out first
+        """
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                deadline.check()
+                self._condition.wait(deadline.remaining())
+            self._in_flight += 1
+
+    async def acquire_async(self) -> None:
+        """Async counterpart of acquire."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._in_flight < int(self._limit):
+                    self._in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                async with asyncio.timeout(deadline.remaining()):
+                    await waiter
+            except TimeoutError:
+                raise deadline.DeadlineExceeded(
+                    "Time budget exhausted waiting for a request slot"
+                ) from None
+            finally:
+                with self._lock:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    def release(self, overloaded: bool) -> None:
+        """
+        Give a slot back and adapt the limit to how the request went.
+
+        Args:
+            overloaded: Whether the response signalled overload (429, 5xx,
+                transport error or latency above the target)
+        """
+        limits = self.limits
+        with self._condition:
+            self._in_flight -= 1
+            now = self._clock()
+            if overloaded:
+                if now - self._last_backoff >= limits.cooldown:
+                    self._limit = max(
+                        float(limits.min_concurrency), self._limit * limits.backoff
+                    )
+                    self._last_backoff = now
+                    self._backoffs += 1
+            else:
+                self._limit = min(
+                    float(limits.max_concurrency), self._limit + 1 / self._limit
+                )
+            # Waiters re-check the limit themselves, so wake all of them
+            self._condition.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the current limit, requests in flight and back-offs so far."""
+        with self._lock:
+            return {
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "backoffs": self._backoffs,
+            }
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class Permit:
+    """A granted request; record its response status before releasing it."""
+
+    def __init__(self):
+        self.status_code: int | None = None
+
+    def record(self, status_code: int) -> None:
+        """Record the HTTP status the request got."""
+        self.status_code = status_code
+
+
+def _token_delay(bucket: TokenBucket) -> float:
+    delay = bucket.reserve()
+    if not deadline.allows(delay):
+        raise deadline.DeadlineExceeded(
+            "Time budget exhausted waiting for the rate limit"
+        )
+    return delay
+
+
+class EndpointLimiter:
+    """The token bucket and adaptive concurrency limit of one endpoint family."""
+
+    def __init__(
+        self,
+        limits: EndpointLimits,
+        clock: Callable[[], float] = time.monotonic,
+        bucket: TokenBucket | None = None,
+    ):
+        self.limits = limits
+        self._clock = clock
+        self.bucket = bucket or TokenBucket(limits.rate, limits.burst, clock)
+        self.concurrency = AdaptiveConcurrency(limits, clock)
+
+    @contextmanager
+    def request(self) -> Iterator[Permit]:
+        """Hold a slot and a token for the duration of one request."""
+        self.concurrency.acquire()
+        try:
+            time.sleep(_token_delay(self.bucket))
+        except BaseException:
+            self.concurrency.release(overloaded=False)
+            raise
+        with self._measure() as permit:
+            yield permit
+
+    @asynccontextmanager
+    async def request_async(self) -> AsyncIterator[Permit]:
+        """Async counterpart of request."""
+        await self.concurrency.acquire_async()
+        try:
+            await asyncio.sleep(_token_delay(self.bucket))
+        except BaseException:
+            self.concurrency.release(overloaded=False)
+            raise
+        with self._measure() as permit:
+            yield permit
+
+    @contextmanager
+    def _measure(self) -> Iterator[Permit]:
+        permit = Permit()
+        started = self._clock()
+        overloaded = True
+        try:
+            yield permit
+            overloaded = (
+                is_overload(permit.status_code)
+                or self._clock() - started > self.limits.latency_target
+            )
+        except (asyncio.CancelledError, deadline.DeadlineExceeded):
+            # Abandoned by the caller; says nothing about OLS health
+            overloaded = False
+            raise
+        except Exception:
+            # Neither does a timeout the caller's own deadline shortened
+            overloaded = not deadline.expired()
+            raise
+        finally:
+            self.concurrency.release(overloaded)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the concurrency counters and the configured rate."""
+        return {**self.concurrency.stats(), "rate": self.limits.rate}
+
+
+class RateLimiter:
+    """
+    Per-endpoint limiters for every OLS request, created on first use.
+
+    A shared limiter creates every endpoint family's limiter up front with a
+    SharedTokenBucket, so processes forked from this one share its request
+    rates; concurrency limits stay per process.
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[str, EndpointLimits] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        shared: bool = False,
+    ):
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.shared = shared
+        self._clock = clock
+        self._limiters: dict[str, EndpointLimiter] = {}
+        self._lock = threading.Lock()
+        if shared:
+            for endpoint, endpoint_limits in self.limits.items():
+                bucket = SharedTokenBucket(
+                    endpoint_limits.rate, endpoint_limits.burst, clock
+                )
+                self._limiters[endpoint] = EndpointLimiter(
+                    endpoint_limits, clock, bucket
+                )
+
+    def for_url(self, url: str) -> EndpointLimiter:
+        """Return the limiter of the endpoint family a URL belongs to."""
+        endpoint = endpoint_for(url)
+        with self._lock:
+            limiter = self._limiters.get(endpoint)
+            if limiter is None:
+                limits = self.limits.get(endpoint, self.limits["other"])
+                limiter = self._limiters[endpoint] = EndpointLimiter(
+                    limits, self._clock
+                )
+            return limiter
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return the stats of every endpoint family used so far."""
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {endpoint: limiter.stats() for endpoint, limiter in limiters.items()}
+
+
+_limiter: RateLimiter | None = RateLimiter()
+
+
+def get_limiter() -> RateLimiter | None:
+    """Return the shared rate limiter, or None when throttling is disabled."""
+    return _limiter
+
+
+def set_limiter(limiter: RateLimiter | None) -> None:
+    """Install a rate limiter for every API call; None disables throttling."""
+    global _limiter
+    _limiter = limiter
+
+
+def configure(
+    *, shared: bool = False, **overrides: EndpointLimits | Mapping[str, Any]
+) -> RateLimiter:
+    """
+    Replace the shared rate limiter with one using the given per-endpoint limits.
+
+    Args:
+        shared: Keep the token buckets in shared memory so that worker
+            processes forked afterwards share one request rate
+        **overrides: Limits keyed by endpoint family ("search", "terms",
+            "ontology", "similar" or "other"), either as EndpointLimits or as
+            a mapping of fields to change on the defaults, e.g.
+            configure(similar={"rate": 2.0})
+
+    Returns:
+        The newly installed limiter.
+    """
+    limits = {}
+    for endpoint, override in overrides.items():
+        if not isinstance(override, EndpointLimits):
+            base = DEFAULT_LIMITS.get(endpoint, DEFAULT_LIMITS["other"])
+            override = replace(base, **override)
+        limits[endpoint] = override
+    limiter = RateLimiter(limits, shared=shared)
+    set_limiter(limiter)
+    return limiter
+
+
+@contextmanager
+def request(url: str) -> Iterator[Permit]:
+    """Throttle one sync request to url with the shared limiter, if any."""
+    limiter = get_limiter()
+    if limiter is None:
+        yield Permit()
+        return
+    with limiter.for_url(url).request() as permit:
+        yield permit
+
+
+@asynccontextmanager
+async def request_async(url: str) -> AsyncIterator[Permit]:
+    """Throttle one async request to url with the shared limiter, if any."""
+    limiter = get_limiter()
+    if limiter is None:
+        yield Permit()
+        return
+    async with limiter.for_url(url).request_async() as permit:
+        yield permit
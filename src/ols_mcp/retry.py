@@ -0,0 +1,398 @@
+################################################################################
+# ols_mcp/retry.py
+# This module contains the retry and hedging policy applied to every OLS
+# request made by ols_mcp/api.py: transient failures are retried with jittered
+# exponential backoff, and slow requests can be hedged with a duplicate
+################################################################################
+import asyncio
+import contextvars
+import email.utils
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import Any, Protocol, TypeVar
+
+import httpx
+
+from . import deadline
+from .client import endpoint_for
+
+
+class _Response(Protocol):
+    """What retries need from a requests or httpx response."""
+
+    @property
+    def status_code(self) -> int: ...
+
+
+R = TypeVar("R", bound=_Response)
+
+# Responses worth asking for again: timeouts, throttling and server errors
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def retry_errors() -> tuple[type[Exception], ...]:
+    """
+    Return the failures before any response arrived that are worth retrying.
+
+    Every OLS call is an idempotent GET, so resending it is always safe.
+    requests is imported here rather than at start-up, since only the sync
+    API uses it; an except clause evaluates this only once a call has failed.
+    """
+    import requests
+
+    return (requests.ConnectionError, requests.Timeout, httpx.TransportError)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry and hedging settings for one endpoint family (see client.endpoint_for).
+
+    Attributes:
+        max_attempts: Requests sent at most, the first one included
+        backoff_base: Upper bound in seconds of the first jittered wait; it
+            doubles with every further retry
+        backoff_max: Upper bound in seconds of any jittered wait
+        max_retry_after: Longest Retry-After in seconds worth waiting for;
+            a response asking for a longer pause is returned as-is
+        statuses: HTTP statuses that are retried
+        hedge: Whether to send a duplicate request when the first one is slower
+            than usual, and use whichever answers first
+        hedge_quantile: Latency quantile of recent responses after which the
+            duplicate is sent
+        hedge_delay: Seconds to wait before hedging until enough latencies
+            have been observed
+        hedge_min_delay: Lower bound in seconds of the hedging delay
+        hedge_min_samples: Latencies needed before the quantile is trusted
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 10.0
+    max_retry_after: float = 30.0
+    statuses: frozenset[int] = RETRY_STATUSES
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_delay: float = 1.0
+    hedge_min_delay: float = 0.05
+    hedge_min_samples: int = 20
+
+
+def retry_after(response: Any) -> float | None:
+    """
+    Return the pause in seconds a response's Retry-After header asks for.
+
+    Args:
+        response: A requests or httpx response
+
+    Returns:
+        The pause, or None when the header is missing or malformed.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class LatencyTracker:
+    """Thread-safe window of the most recent response latencies."""
+
+    def __init__(self, size: int = 500):
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Add one latency to the window."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float, min_samples: int = 1) -> float | None:
+        """Return the q-quantile of the window, or None below min_samples."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < max(min_samples, 1):
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+_hedge_executor: ThreadPoolExecutor | None = None
+_hedge_lock = threading.Lock()
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(
+                max_workers=32, thread_name_prefix="ols-hedge"
+            )
+        return _hedge_executor
+
+
+class EndpointRetrier:
+    """Applies one RetryPolicy and keeps the latencies its hedging relies on."""
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self.latencies = LatencyTracker()
+        self._lock = threading.Lock()
+        self._counts = {"attempts": 0, "retries": 0, "hedges": 0, "hedge_wins": 0}
+
+    def call(self, attempt: Callable[[], R]) -> R:
+        """
+        Send a request, retrying transient failures under the policy.
+
+        Args:
+            attempt: Sends the request once and returns the response
+
+        Returns:
+            The first response that is not retried; it may still be an error
+            response once the attempts are used up.
+        """
+        for number in range(1, max(self.policy.max_attempts, 1) + 1):
+            last = number >= self.policy.max_attempts
+            try:
+                response = self._attempt(attempt)
+            except retry_errors():
+                delay = None if last else self.backoff(number)
+                # A retry that cannot finish within the time budget is pointless
+                if delay is None or not deadline.allows(delay):
+                    raise
+            else:
+                delay = None if last else self._retry_delay(number, response)
+                if delay is None or not deadline.allows(delay):
+                    return response
+            self._count("retries")
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def call_async(self, attempt: Callable[[], Awaitable[R]]) -> R:
+        """Async counterpart of call."""
+        for number in range(1, max(self.policy.max_attempts, 1) + 1):
+            last = number >= self.policy.max_attempts
+            try:
+                response = await self._attempt_async(attempt)
+            except retry_errors():
+                delay = None if last else self.backoff(number)
+                # A retry that cannot finish within the time budget is pointless
+                if delay is None or not deadline.allows(delay):
+                    raise
+            else:
+                delay = None if last else self._retry_delay(number, response)
+                if delay is None or not deadline.allows(delay):
+                    return response
+            self._count("retries")
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def backoff(self, number: int) -> float:
+        """Return the jittered wait after the given failed attempt (1-based)."""
+        ceiling = min(
+            self.policy.backoff_max, self.policy.backoff_base * 2 ** (number - 1)
+        )
+        # Full jitter keeps clients that failed together from retrying together
+        return random.uniform(0, ceiling)
+
+    def hedge_delay(self) -> float:
+        """Return how long to wait for a request before sending a duplicate."""
+        policy = self.policy
+        quantile = self.latencies.quantile(
+            policy.hedge_quantile, policy.hedge_min_samples
+        )
+        if quantile is None:
+            return policy.hedge_delay
+        return max(policy.hedge_min_delay, quantile)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the attempt, retry and hedge counters and the hedging delay."""
+        with self._lock:
+            counts = dict(self._counts)
+        return {**counts, "hedge_delay": self.hedge_delay()}
+
+    def _retry_delay(self, number: int, response: Any) -> float | None:
+        if response.status_code not in self.policy.statuses:
+            return None
+        delay = self.backoff(number)
+        pause = retry_after(response)
+        if pause is not None:
+            if pause > self.policy.max_retry_after:
+                return None
+            delay = max(delay, pause)
+        return delay
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def _timed(self, attempt: Callable[[], R]) -> R:
+        self._count("attempts")
+        started = time.monotonic()
+        response = attempt()
+        if response.status_code < 500:
+            self.latencies.record(time.monotonic() - started)
+        return response
+
+    async def _timed_async(self, attempt: Callable[[], Awaitable[R]]) -> R:
+        self._count("attempts")
+        started = time.monotonic()
+        response = await attempt()
+        if response.status_code < 500:
+            self.latencies.record(time.monotonic() - started)
+        return response
+
+    def _attempt(self, attempt: Callable[[], R]) -> R:
+        if not self.policy.hedge:
+            return self._timed(attempt)
+
+        executor = _get_hedge_executor()
+        context = contextvars.copy_context()
+        primary = executor.submit(context.copy().run, self._timed, attempt)
+        if wait([primary], timeout=self.hedge_delay()).done:
+            return primary.result()
+
+        self._count("hedges")
+        backup = executor.submit(context.copy().run, self._timed, attempt)
+        pending: set[Future] = {primary, backup}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        self._count("hedge_wins")
+                    # The slower request finishes in the background unused
+                    return future.result()
+        return primary.result()
+
+    async def _attempt_async(self, attempt: Callable[[], Awaitable[R]]) -> R:
+        if not self.policy.hedge:
+            return await self._timed_async(attempt)
+
+        primary = asyncio.ensure_future(self._timed_async(attempt))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay())
+            if done:
+                return primary.result()
+
+            self._count("hedges")
+            backup = asyncio.ensure_future(self._timed_async(attempt))
+            tasks.append(backup)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self._count("hedge_wins")
+                        return task.result()
+            return primary.result()
+        finally:
+            # Unlike threads, the losing request can be abandoned outright
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class Retrier:
+    """Per-endpoint retriers for every OLS request, created on first use."""
+
+    def __init__(
+        self,
+        default: RetryPolicy | None = None,
+        policies: Mapping[str, RetryPolicy] | None = None,
+    ):
+        self.default = default or RetryPolicy()
+        self.policies = dict(policies or {})
+        self._retriers: dict[str, EndpointRetrier] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> EndpointRetrier:
+        """Return the retrier of the endpoint family a URL belongs to."""
+        endpoint = endpoint_for(url)
+        with self._lock:
+            retrier = self._retriers.get(endpoint)
+            if retrier is None:
+                policy = self.policies.get(endpoint, self.default)
+                retrier = self._retriers[endpoint] = EndpointRetrier(policy)
+            return retrier
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return the stats of every endpoint family used so far."""
+        with self._lock:
+            retriers = dict(self._retriers)
+        return {endpoint: retrier.stats() for endpoint, retrier in retriers.items()}
+
+
+_retrier: Retrier | None = Retrier()
+
+
+def get_retrier() -> Retrier | None:
+    """Return the shared retrier, or None when every request is sent once."""
+    return _retrier
+
+
+def set_retrier(retrier: Retrier | None) -> None:
+    """Install a retrier for every API call; None disables retries and hedging."""
+    global _retrier
+    _retrier = retrier
+
+
+def configure(
+    default: RetryPolicy | None = None, **overrides: RetryPolicy | Mapping[str, Any]
+) -> Retrier:
+    """
+    Replace the shared retrier with one using the given policies.
+
+    Args:
+        default: Policy for endpoint families without an override
+        **overrides: Policies keyed by endpoint family ("search", "terms",
+            "ontology", "similar" or "other"), either as RetryPolicy or as a
+            mapping of fields to change on the default, e.g.
+            configure(similar={"hedge": True})
+
+    Returns:
+        The newly installed retrier.
+    """
+    default = default or RetryPolicy()
+    policies = {
+        endpoint: (
+            override
+            if isinstance(override, RetryPolicy)
+            else replace(default, **override)
+        )
+        for endpoint, override in overrides.items()
+    }
+    retrier = Retrier(default, policies)
+    set_retrier(retrier)
+    return retrier
+
+
+def call(url: str, attempt: Callable[[], R]) -> R:
+    """Send a sync request to url under the shared retrier, if any."""
+    retrier = get_retrier()
+    if retrier is None:
+        return attempt()
+    return retrier.for_url(url).call(attempt)
+
+
+async def call_async(url: str, attempt: Callable[[], Awaitable[R]]) -> R:
+    """Send an async request to url under the shared retrier, if any."""
+    retrier = get_retrier()
+    if retrier is None:
+        return await attempt()
+    return await retrier.for_url(url).call_async(attempt)
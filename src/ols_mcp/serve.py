@@ -0,0 +1,231 @@
+################################################################################
+# ols_mcp/serve.py
+# This module runs the MCP server over the streamable HTTP transport with a
+# graceful drain: on SIGTERM/SIGINT it stops accepting connections, refuses new
+# tool calls and lets the admitted ones finish before the process exits; with
+# several workers, a supervisor forks them onto one listening socket
+################################################################################
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from collections.abc import Callable
+from types import FrameType
+
+import uvicorn
+from starlette.types import ASGIApp
+
+from . import admission, metrics
+
+# Log alongside uvicorn so drain progress shows up with its shutdown messages
+logger = logging.getLogger("uvicorn.error")
+
+# Whole seconds connections get to send their last responses once the drain
+# is over; uvicorn takes its graceful-shutdown timeout as an int
+CLOSE_TIMEOUT = 5
+
+# Seconds the supervisor waits before replacing a worker that died
+RESTART_DELAY = 1.0
+
+# Seconds between the supervisor's checks for workers that exited
+POLL_INTERVAL = 0.1
+
+
+class DrainingServer(uvicorn.Server):
+    """A uvicorn server that drains admitted tool calls before shutting down."""
+
+    def __init__(self, config: uvicorn.Config, drain_timeout: float | None = 30.0):
+        super().__init__(config)
+        self.drain_timeout = drain_timeout
+
+    async def shutdown(self, sockets: list[socket.socket] | None = None) -> None:
+        # Stop accepting connections first, so no new work arrives during the drain
+        for server in self.servers:
+            server.close()
+        controller = admission.get_controller()
+        if controller is not None and not self.force_exit:
+            stats = controller.stats()
+            logger.info(
+                "Draining %d running and %d queued tool calls",
+                stats["running"],
+                stats["queued"],
+            )
+            if not await controller.drain(self.drain_timeout):
+                logger.warning(
+                    "Drain timeout exceeded with %d tool calls still running",
+                    controller.running,
+                )
+        await super().shutdown(sockets)
+
+
+def serve_http(
+    app: ASGIApp,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    drain_timeout: float | None = 30.0,
+    log_level: str = "info",
+) -> None:
+    """
+    Serve an ASGI app (the FastMCP HTTP app) until SIGINT/SIGTERM, then drain.
+
+    Args:
+        app: The application to serve
+        host: Interface to listen on
+        port: Port to listen on
+        drain_timeout: Seconds admitted tool calls get to finish at shutdown;
+            None waits for them however long they take
+        log_level: uvicorn log level
+    """
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        log_level=log_level,
+        timeout_graceful_shutdown=CLOSE_TIMEOUT,
+    )
+    DrainingServer(config, drain_timeout).run()
+
+
+class WorkerPool:
+    """
+    Forks workers and keeps them running until the pool is told to stop.
+
+    A worker that exits while the pool is running is replaced. SIGTERM or
+    SIGINT sent to the supervisor is passed on to every worker as SIGTERM, so
+    each drains like a single server would; the supervisor returns once they
+    have all exited.
+    """
+
+    def __init__(self, target: Callable[[int], None], workers: int):
+        self.target = target
+        self.workers = workers
+        self.stopping = False
+        self._children: dict[int, int] = {}
+
+    def run(self) -> None:
+        """Start the workers and supervise them until they have all exited."""
+        previous = {
+            sig: signal.signal(sig, self._handle_exit)
+            for sig in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            for index in range(self.workers):
+                if not self.stopping:
+                    self._spawn(index)
+            while self._children:
+                # Poll rather than block in os.wait(): a signal delivered to
+                # another thread would not interrupt it
+                pid, status = os.waitpid(-1, os.WNOHANG)
+                if pid == 0:
+                    time.sleep(POLL_INTERVAL)
+                    continue
+                index = self._children.pop(pid, -1)
+                if index < 0 or self.stopping:
+                    continue
+                logger.warning(
+                    "Worker %d (pid %d) exited with status %d; restarting it",
+                    index,
+                    pid,
+                    os.waitstatus_to_exitcode(status),
+                )
+                time.sleep(RESTART_DELAY)
+                if not self.stopping:
+                    self._spawn(index)
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def stop(self) -> None:
+        """Stop replacing workers and ask the running ones to drain and exit."""
+        self.stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        self.stop()
+
+    def _spawn(self, index: int) -> None:
+        # Hold back stop signals until the new worker is recorded, or stop()
+        # could miss it
+        signals = {signal.SIGINT, signal.SIGTERM}
+        signal.pthread_sigmask(signal.SIG_BLOCK, signals)
+        pid = os.fork()
+        if pid:
+            self._children[pid] = index
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, signals)
+            return
+        # In the worker: never return into the supervisor's code
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, signals)
+        code = 0
+        try:
+            self.target(index)
+        except KeyboardInterrupt:
+            pass
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+
+def serve_workers(
+    app_factory: Callable[[], ASGIApp],
+    workers: int,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    drain_timeout: float | None = 30.0,
+    log_level: str = "info",
+) -> None:
+    """
+    Serve an ASGI app from several forked worker processes on one port.
+
+    The socket is bound before the workers are forked and each worker accepts
+    connections from it, so the kernel spreads clients across them. Module
+    state configured before the call (cache, rate limiter, admission limits)
+    is inherited by every worker; each builds its own app by calling
+    app_factory. Every metric a worker exports at /metrics carries a worker
+    label with its index. Needs os.fork, so POSIX only.
+
+    Args:
+        app_factory: Returns the application a worker serves
+        workers: Number of worker processes
+        host: Interface to listen on
+        port: Port to listen on
+        drain_timeout: Seconds each worker's admitted tool calls get to
+            finish at shutdown
+        log_level: uvicorn log level
+    """
+    if not hasattr(os, "fork"):
+        raise RuntimeError("Serving with several workers needs os.fork (POSIX)")
+    sock = uvicorn.Config(
+        app_factory, host=host, port=port, log_level=log_level
+    ).bind_socket()
+
+    def run_worker(index: int) -> None:
+        # Each worker counts from zero rather than repeating what the
+        # supervisor recorded (the warm-up), under a label of its own
+        registry = metrics.default_registry()
+        registry.set_constant_labels(worker=index)
+        metrics.set_registry(registry)
+        worker_config = uvicorn.Config(
+            app_factory(),
+            log_level=log_level,
+            timeout_graceful_shutdown=CLOSE_TIMEOUT,
+        )
+        DrainingServer(worker_config, drain_timeout).run(sockets=[sock])
+
+    logger.info("Starting %d workers", workers)
+    try:
+        WorkerPool(run_worker, workers).run()
+    finally:
+        sock.close()
@@ -0,0 +1,196 @@
+################################################################################
+# ols_mcp/singleflight.py
+# This module contains the request coalescing used by ols_mcp/api.py: callers
+# asking for the same OLS resource while a request for it is in flight wait for
+# that request instead of issuing their own
+################################################################################
+import asyncio
+import threading
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Future, wait
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from . import deadline
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key across threads.
+
+    The first caller for a key runs the call; callers arriving while it is
+    running block until it finishes and receive the same result object (or
+    exception). Shared results must therefore be treated as read-only.
+
+    Each waiting caller gives up at its own deadline. When the call fails
+    only because the caller running it ran out of time, a waiting caller
+    with time left runs the call again instead of sharing that failure.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+        self._calls_made = 0
+        self._shared = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """
+        Run fn for key, or wait for the identical call already in flight.
+
+        Args:
+            key: Identifies the call, e.g. a key built with cache.cache_key()
+            fn: Performs the call
+
+        Returns:
+            The result of fn, possibly produced for another caller.
+
+        Raises:
+            DeadlineExceeded: When the caller's deadline passes first
+        """
+        while True:
+            with self._lock:
+                shared = self._calls.get(key)
+                if shared is None:
+                    future: Future = Future()
+                    self._calls[key] = future
+                    self._calls_made += 1
+                else:
+                    self._shared += 1
+
+            if shared is None:
+                return self._lead(key, future, fn)
+
+            done, _ = wait([shared], timeout=deadline.remaining())
+            if not done:
+                raise deadline.DeadlineExceeded(
+                    "Time budget exhausted before OLS answered"
+                )
+            try:
+                return shared.result()
+            except deadline.DeadlineExceeded:
+                if deadline.expired():
+                    raise
+
+    def _lead(self, key: str, future: Future, fn: Callable[[], T]) -> T:
+        # The call is forgotten before its outcome is published, so a caller
+        # that retries after the outcome never finds the finished call again
+        try:
+            result = fn()
+        except BaseException as error:
+            self._forget(key)
+            future.set_exception(error)
+            raise
+        self._forget(key)
+        future.set_result(result)
+        return result
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            del self._calls[key]
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of calls made, calls coalesced and calls in flight."""
+        with self._lock:
+            return {
+                "calls": self._calls_made,
+                "shared": self._shared,
+                "in_flight": len(self._calls),
+            }
+
+
+@dataclass
+class _AsyncCall:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent awaits with the same key on one event loop.
+
+    The call runs as its own task, so one caller being cancelled does not
+    cancel the request other callers are waiting for; once every caller has
+    gone, the request is cancelled too.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, _AsyncCall] = {}
+        self._calls_made = 0
+        self._shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """Async counterpart of SingleFlight.do."""
+        loop = asyncio.get_running_loop()
+        while True:
+            call = self._calls.get(key)
+            # Tasks are bound to their loop; another loop starts its own call
+            leader = (
+                call is None or call.task.done() or call.task.get_loop() is not loop
+            )
+            if call is None or leader:
+                call = self._calls[key] = _AsyncCall(loop.create_task(fn()))
+                call.task.add_done_callback(lambda task: self._forget(key, task))
+                self._calls_made += 1
+            else:
+                self._shared += 1
+
+            try:
+                return await self._wait(call)
+            except deadline.DeadlineExceeded:
+                if leader or deadline.expired() or not call.task.done():
+                    raise
+
+    async def _wait(self, call: _AsyncCall) -> Any:
+        call.waiters += 1
+        try:
+            async with asyncio.timeout(deadline.remaining()):
+                return await asyncio.shield(call.task)
+        except TimeoutError:
+            if call.task.done():
+                raise
+            raise deadline.DeadlineExceeded(
+                "Time budget exhausted before OLS answered"
+            ) from None
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+                # Let the cancellation land so no request outlives its callers
+                await asyncio.wait({call.task})
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of calls made, calls coalesced and calls in flight."""
+        return {
+            "calls": self._calls_made,
+            "shared": self._shared,
+            "in_flight": len(self._calls),
+        }
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        call = self._calls.get(key)
+        if call is not None and call.task is task:
+            del self._calls[key]
+        # Retrieve the outcome so an unawaited failure is not logged
+        if not task.cancelled():
+            task.exception()
+
+
+_group = SingleFlight()
+_async_group = AsyncSingleFlight()
+
+
+def get_group() -> SingleFlight:
+    """Return the group that coalesces the sync API calls."""
+    return _group
+
+
+def get_async_group() -> AsyncSingleFlight:
+    """Return the group that coalesces the async API calls."""
+    return _async_group
+
+
+def stats() -> dict[str, Any]:
+    """Return the counters of the sync and async groups."""
+    return {"sync": _group.stats(), "async": _async_group.stats()}
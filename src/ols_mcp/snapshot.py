@@ -0,0 +1,379 @@
+################################################################################
+# ols_mcp/snapshot.py
+# This module contains the compact, memory-mapped snapshot format for mirrored
+# ontology terms: fixed-width columns of string references and flags over a
+# shared UTF-8 string heap, queried in place without building per-term dicts
+################################################################################
+import bisect
+import json
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, Literal
+
+from .disk_cache import default_cache_path
+from .mirror import OntologyMirror, OntologyState
+
+MAGIC = b"OLSSNAP\x01"
+SUFFIX = ".olsnap"
+
+# String reference stored for a missing value
+_NONE = 0xFFFFFFFF
+
+# Bits of the per-term flags column
+_OBSOLETE = 1
+_HAS_CHILDREN = 2
+_IS_ROOT = 4
+
+# Per-term string columns, each holding one heap reference per term
+_STRING_COLUMNS = ("iri", "short_form", "obo_id", "label", "description")
+
+# Sorted permutations of term numbers used for exact identifier lookups
+_ID_INDEXES = ("iri", "short_form", "obo_id")
+
+# The on-disk integers are little-endian; reading casts them in place
+_BYTEORDER: Literal["little", "big"] = "little"
+
+
+def default_snapshot_dir() -> Path:
+    """Return the default directory for snapshot files, next to the cache."""
+    return default_cache_path().with_name("snapshots")
+
+
+def snapshot_path(directory: str | Path, ontology_id: str) -> Path:
+    """Return the snapshot file of an ontology inside a snapshot directory."""
+    return Path(directory) / f"{ontology_id.lower()}{SUFFIX}"
+
+
+class _Heap:
+    """Accumulates strings for the heap while a snapshot is written."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("I", [0])
+        self.values: list[str] = []
+
+    def add(self, value: str | None) -> int:
+        if value is None:
+            return _NONE
+        self.data += value.encode("utf-8")
+        if len(self.data) > _NONE:
+            raise ValueError("Snapshot string heap exceeds 4 GiB")
+        self.offsets.append(len(self.data))
+        self.values.append(value)
+        return len(self.values) - 1
+
+
+def _description(term: dict[str, Any]) -> str | None:
+    description = term.get("description")
+    if isinstance(description, list):
+        return "\n".join(description) if description else None
+    return description
+
+
+def write_snapshot(
+    path: str | Path,
+    ontology_id: str,
+    terms: Iterable[dict[str, Any]],
+    state: OntologyState | None = None,
+) -> int:
+    """
+    Write a snapshot of an ontology's terms.
+
+    The file is written next to its destination and renamed into place, so
+    processes that have the previous snapshot mapped keep a consistent view.
+
+    Args:
+        path: Destination file
+        ontology_id: The ID of the ontology (e.g., 'go', 'ncbitaxon')
+        terms: Term dictionaries as returned by OLS /terms pages or
+            OntologyMirror.iter_terms()
+        state: The OLS version/updated/loaded values the terms came from
+
+    Returns:
+        The number of terms written.
+    """
+    heap = _Heap()
+    columns = {name: array("I") for name in _STRING_COLUMNS}
+    flags = array("B")
+    synonym_offsets = array("I", [0])
+    synonyms = array("I")
+    ontology_prefix = None
+
+    for term in terms:
+        for name in _STRING_COLUMNS:
+            value = _description(term) if name == "description" else term.get(name)
+            columns[name].append(heap.add(value))
+        for synonym in filter(None, term.get("synonyms") or []):
+            synonyms.append(heap.add(synonym))
+        synonym_offsets.append(len(synonyms))
+        flags.append(
+            (_OBSOLETE if term.get("is_obsolete") else 0)
+            | (_HAS_CHILDREN if term.get("has_children") else 0)
+            | (_IS_ROOT if term.get("is_root") else 0)
+        )
+        ontology_prefix = ontology_prefix or term.get("ontology_prefix")
+
+    count = len(flags)
+    values = heap.values
+    sections: dict[str, array | bytes] = {
+        **columns,
+        "flags": flags,
+        "synonym_offsets": synonym_offsets,
+        "synonyms": synonyms,
+        "string_offsets": heap.offsets,
+    }
+    for name in _ID_INDEXES:
+        column = columns[name]
+        present = [number for number in range(count) if column[number] != _NONE]
+        present.sort(key=lambda number: values[column[number]])
+        sections[f"{name}_index"] = array("I", present)
+    sections["heap"] = bytes(heap.data)
+
+    header: dict[str, Any] = {
+        "ontology_id": ontology_id.lower(),
+        "ontology_prefix": ontology_prefix,
+        "state": (state or OntologyState())._asdict(),
+        "terms": count,
+        "byteorder": _BYTEORDER,
+        "sections": {},
+    }
+    # Section offsets depend on the header length, which depends on the
+    # offsets; lay the sections out after a header padded to a fixed size
+    layout = []
+    for name, section in sections.items():
+        typecode = section.typecode if isinstance(section, array) else "B"
+        itemsize = section.itemsize if isinstance(section, array) else 1
+        layout.append((name, typecode, len(section), itemsize))
+    header_size = _header_size(header, layout)
+    offset = header_size
+    for name, typecode, length, itemsize in layout:
+        header["sections"][name] = [offset, length, typecode]
+        offset = _align(offset + length * itemsize)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            encoded = json.dumps(header).encode("utf-8")
+            handle.write(MAGIC)
+            handle.write(len(encoded).to_bytes(4, _BYTEORDER))
+            handle.write(encoded)
+            handle.write(b"\0" * (header_size - len(MAGIC) - 4 - len(encoded)))
+            for section in sections.values():
+                if isinstance(section, array) and sys.byteorder != _BYTEORDER:
+                    section = array(section.typecode, section)
+                    section.byteswap()
+                data = section.tobytes() if isinstance(section, array) else section
+                handle.write(data)
+                handle.write(b"\0" * (_align(len(data)) - len(data)))
+        os.replace(temp_name, path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+    return count
+
+
+def snapshot_from_mirror(
+    store: OntologyMirror, ontology_id: str, directory: str | Path | None = None
+) -> Path:
+    """
+    Write the snapshot of a mirrored ontology into a snapshot directory.
+
+    Args:
+        store: The mirror holding the ontology
+        ontology_id: The ID of a mirrored ontology
+        directory: Snapshot directory (default: default_snapshot_dir())
+
+    Returns:
+        The path of the written snapshot.
+    """
+    state = store.state(ontology_id)
+    if state is None:
+        raise LookupError(f"{ontology_id} is not mirrored")
+    path = snapshot_path(directory or default_snapshot_dir(), ontology_id)
+    write_snapshot(path, ontology_id, store.iter_terms(ontology_id), state)
+    return path
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _header_size(header: dict[str, Any], layout: list[tuple]) -> int:
+    # Size the header with worst-case offsets so the real ones always fit
+    sections = {name: [2**63, length, typecode] for name, typecode, length, _ in layout}
+    encoded = json.dumps({**header, "sections": sections}).encode("utf-8")
+    return _align(len(MAGIC) + 4 + len(encoded))
+
+
+class Snapshot:
+    """
+    A read-only, memory-mapped ontology snapshot.
+
+    Opening a snapshot maps the file and parses only its small JSON header,
+    so it is near-instant regardless of size. Columns are read in place
+    through memoryviews, and several processes mapping the same file share
+    its pages through the OS page cache. Term dictionaries are built only
+    for the terms a query returns.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+        try:
+            if buffer[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{self.path} is not an ontology snapshot")
+            length = int.from_bytes(buffer[len(MAGIC) : len(MAGIC) + 4], _BYTEORDER)
+            start = len(MAGIC) + 4
+            header = json.loads(bytes(buffer[start : start + length]))
+            if header["byteorder"] != sys.byteorder:
+                raise ValueError(f"{self.path} was written with another byte order")
+        except BaseException:
+            buffer.release()
+            self._mmap.close()
+            raise
+
+        self.ontology_id: str = header["ontology_id"]
+        self.ontology_prefix: str | None = header["ontology_prefix"]
+        self.state = OntologyState(**header["state"])
+        self._count: int = header["terms"]
+        self._buffer = buffer
+        self._sections: dict[str, memoryview] = {}
+        for name, (offset, count, typecode) in header["sections"].items():
+            itemsize = array(typecode).itemsize
+            view = buffer[offset : offset + count * itemsize]
+            self._sections[name] = view if typecode == "B" else view.cast(typecode)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def string(self, ref: int) -> str | None:
+        """Decode one string from the heap."""
+        if ref == _NONE:
+            return None
+        offsets = self._sections["string_offsets"]
+        return str(self._sections["heap"][offsets[ref] : offsets[ref + 1]], "utf-8")
+
+    def term(self, number: int) -> dict[str, Any]:
+        """
+        Build the dictionary for one term.
+
+        Returns:
+            A term dictionary with the fields of an OLS /terms entry that
+            tools._simplify_term reads.
+        """
+        if not 0 <= number < self._count:
+            raise IndexError(number)
+        sections = self._sections
+        description = self.string(sections["description"][number])
+        start, end = sections["synonym_offsets"][number : number + 2]
+        flags = sections["flags"][number]
+        short_form = self.string(sections["short_form"][number])
+        return {
+            "id": f"{self.ontology_id}:class:{short_form}",
+            "iri": self.string(sections["iri"][number]),
+            "short_form": short_form,
+            "obo_id": self.string(sections["obo_id"][number]),
+            "label": self.string(sections["label"][number]),
+            "description": description.split("\n") if description else [],
+            "synonyms": [self.string(ref) for ref in sections["synonyms"][start:end]],
+            "ontology_name": self.ontology_id,
+            "ontology_prefix": self.ontology_prefix,
+            "type": "class",
+            "is_obsolete": bool(flags & _OBSOLETE),
+            "has_children": bool(flags & _HAS_CHILDREN),
+            "is_root": bool(flags & _IS_ROOT),
+        }
+
+    def terms(self, limit: int | None = None) -> Iterator[dict[str, Any]]:
+        """Yield terms in OLS order, building each dictionary on demand."""
+        stop = self._count if limit is None else min(limit, self._count)
+        for number in range(stop):
+            yield self.term(number)
+
+    def find(
+        self,
+        iri: str | None = None,
+        short_form: str | None = None,
+        obo_id: str | None = None,
+    ) -> int | None:
+        """
+        Find a term by exact IRI, short form or OBO ID with a binary search.
+
+        Returns:
+            The term number, or None when no term matches every given value.
+        """
+        wanted = {"iri": iri, "short_form": short_form, "obo_id": obo_id}
+        given = {name: value for name, value in wanted.items() if value}
+        if not given:
+            return None
+        name, value = next(iter(given.items()))
+        column = self._sections[name]
+        index = self._sections[f"{name}_index"]
+        position = bisect.bisect_left(
+            # Only terms with a value are indexed, so no key is ever None
+            index, value, key=lambda number: self.string(column[number]) or ""
+        )
+        if position == len(index) or self.string(column[index[position]]) != value:
+            return None
+        number = index[position]
+        for other, other_value in given.items():
+            if self.string(self._sections[other][number]) != other_value:
+                return None
+        return number
+
+    def close(self) -> None:
+        """Unmap the file; terms already returned stay valid."""
+        for view in self._sections.values():
+            view.release()
+        self._sections = {}
+        self._buffer.release()
+        self._mmap.close()
+
+
+_snapshots: dict[str, Snapshot] = {}
+
+
+def get_snapshot(ontology_id: str) -> Snapshot | None:
+    """Return the open snapshot of an ontology, if one is loaded."""
+    return _snapshots.get(ontology_id.lower())
+
+
+def get_snapshots() -> dict[str, Snapshot]:
+    """Return every open snapshot keyed by ontology ID."""
+    return dict(_snapshots)
+
+
+def set_snapshots(snapshots: dict[str, Snapshot]) -> None:
+    """Install the snapshots used by every API call; an empty dict disables them."""
+    global _snapshots
+    _snapshots = {
+        ontology_id.lower(): snapshot for ontology_id, snapshot in snapshots.items()
+    }
+
+
+def configure(directory: str | Path | None = None) -> dict[str, Snapshot]:
+    """
+    Map every snapshot file in a directory and install them.
+
+    Args:
+        directory: Directory of *.olsnap files (default: default_snapshot_dir())
+
+    Returns:
+        The newly installed snapshots keyed by ontology ID.
+    """
+    directory = Path(directory or default_snapshot_dir())
+    snapshots = {}
+    for path in sorted(directory.glob(f"*{SUFFIX}")):
+        snapshot = Snapshot(path)
+        snapshots[snapshot.ontology_id] = snapshot
+    set_snapshots(snapshots)
+    return snapshots
@@ -3,21 +3,140 @@
 # This module contains tools that consume the generic API wrapper functions in
 # ols_mcp/api.py and constrain/transform them based on use cases/applications
 ################################################################################
+from contextlib import aclosing
 from typing import Any
 
+from . import deadline, tracing
 from .api import (
     get_ontology_details,
-    get_ontology_terms,
+    get_ontology_details_async,
     get_similar_terms,
+    get_similar_terms_async,
+    is_failed_entry,
+    iter_ontology_terms,
+    iter_ontology_terms_async,
+    resolve_terms,
+    resolve_terms_async,
     search_ontologies,
+    search_ontologies_async,
+    search_ontologies_many,
+    search_ontologies_many_async,
 )
 
 
+def _split_ontologies(ontologies: str | None) -> list[str] | None:
+    if not ontologies:
+        return None
+    return [ont.strip() for ont in ontologies.split(",")]
+
+
+def _simplify_search_result(result: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": result.get("id"),
+        "iri": result.get("iri"),
+        "short_form": result.get("short_form"),
+        "obo_id": result.get("obo_id"),
+        "label": result.get("label"),
+        "description": result.get("description", []),
+        "ontology_name": result.get("ontology_name"),
+        "ontology_prefix": result.get("ontology_prefix"),
+        "type": result.get("type"),
+    }
+
+
+def _simplify_search_results(
+    results: list[dict[str, Any]] | dict[str, str],
+) -> list[dict[str, Any]] | dict[str, str]:
+    # A search that failed keeps its error entry, the only dict in the mapping
+    if isinstance(results, dict):
+        return results
+    return [_simplify_search_result(result) for result in results]
+
+
+def _simplify_ontology(details: dict[str, Any]) -> dict[str, Any]:
+    config = details.get("config", {})
+    return {
+        "id": details.get("ontologyId"),
+        "title": config.get("title"),
+        "description": config.get("description"),
+        "version": config.get("version"),
+        "homepage": config.get("homepage"),
+        "status": details.get("status"),
+        "number_of_terms": details.get("numberOfTerms"),
+        "number_of_properties": details.get("numberOfProperties"),
+        "number_of_individuals": details.get("numberOfIndividuals"),
+        "languages": config.get("preferredLanguage"),
+        "created": details.get("created"),
+        "updated": details.get("updated"),
+        "loaded": details.get("loaded"),
+        "file_location": config.get("fileLocation"),
+        "base_uris": config.get("baseUris", []),
+    }
+
+
+def _simplify_term(term: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": term.get("id"),
+        "iri": term.get("iri"),
+        "short_form": term.get("short_form"),
+        "obo_id": term.get("obo_id"),
+        "label": term.get("label"),
+        "description": term.get("description", []),
+        "synonyms": term.get("synonyms", []),
+        "ontology_name": term.get("ontology_name"),
+        "ontology_prefix": term.get("ontology_prefix"),
+        "type": term.get("type"),
+        "is_obsolete": term.get("is_obsolete", False),
+        "has_children": term.get("has_children", False),
+        "is_root": term.get("is_root", False),
+    }
+
+
+def _simplify_resolved(term: dict[str, Any] | None) -> dict[str, Any] | None:
+    # Unknown identifiers stay None and failed lookups keep their error entry
+    if term is None or is_failed_entry(term):
+        return term
+    return _simplify_term(term)
+
+
+def _simplify_similar_term(term: dict[str, Any]) -> dict[str, Any]:
+    definition = ""
+    definitions = term.get("definition") or []
+    if len(definitions) > 0:
+        if isinstance(definitions[0], str):
+            definition = definitions[0]
+        elif isinstance(definitions[0], dict):
+            definition = definitions[0].get("value", "")
+    labels = term.get("label") or []
+    return {
+        "id": term.get("curie", ""),
+        "iri": term.get("iri", ""),
+        "label": labels[0] if len(labels) > 0 else "",
+        "definition": definition,
+        "score": term.get("score", -999)
+    }
+
+
+def _simplify_similar_terms(terms: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    simplified = [_simplify_similar_term(term) for term in terms]
+    # A list the deadline cut short stays marked as such once simplified
+    if isinstance(terms, deadline.PartialList):
+        return deadline.PartialList(simplified)
+    return simplified
+
+
+def _report_terms_cutoff(found: list[dict[str, Any]], ontology_id: str) -> None:
+    deadline.report_cutoff(
+        f"Time budget ran out after {len(found)} terms were fetched from {ontology_id}"
+    )
+
+
 def search_all_ontologies(
     query: str,
     ontologies: str | None = None,
     max_results: int = 20,
     exact: bool = False,
+    timeout: float | None = None,
 ) -> list[dict[str, Any]]:
     """
     Search across all ontologies in the Ontology Lookup Service (OLS).
@@ -28,74 +147,148 @@ def search_all_ontologies(
             within (e.g., "go,uberon")
         max_results (int): Maximum number of results to return (default: 20)
         exact (bool): Whether to perform exact matching (default: False)
+        timeout (float, optional): Seconds to wait for OLS before giving up
+            (default: the server's --tool-timeout)
 
     Returns:
         List[Dict[str, Any]]: List of search results containing term information
     """
-    ontology_list = None
-    if ontologies:
-        ontology_list = [ont.strip() for ont in ontologies.split(",")]
-
-    results = search_ontologies(
-        query=query,
-        ontologies=ontology_list,
-        max_results=max_results,
-        exact=exact,
-        verbose=True,
-    )
+    with deadline.budget(timeout):
+        results = search_ontologies(
+            query=query,
+            ontologies=_split_ontologies(ontologies),
+            max_results=max_results,
+            exact=exact,
+            verbose=True,
+        )
 
     # Simplify the results for easier consumption
-    simplified_results = []
-    for result in results:
-        simplified = {
-            "id": result.get("id"),
-            "iri": result.get("iri"),
-            "short_form": result.get("short_form"),
-            "obo_id": result.get("obo_id"),
-            "label": result.get("label"),
-            "description": result.get("description", []),
-            "ontology_name": result.get("ontology_name"),
-            "ontology_prefix": result.get("ontology_prefix"),
-            "type": result.get("type"),
+    with tracing.span("ols.simplify", **{"ols.results": len(results)}):
+        return [_simplify_search_result(result) for result in results]
+
+
+async def search_all_ontologies_async(
+    query: str,
+    ontologies: str | None = None,
+    max_results: int = 20,
+    exact: bool = False,
+    timeout: float | None = None,
+) -> list[dict[str, Any]]:
+    """Async variant of search_all_ontologies; takes the same arguments."""
+    async with deadline.budget_async(timeout):
+        results = await search_ontologies_async(
+            query=query,
+            ontologies=_split_ontologies(ontologies),
+            max_results=max_results,
+            exact=exact,
+            verbose=False,
+        )
+
+    with tracing.span("ols.simplify", **{"ols.results": len(results)}):
+        return [_simplify_search_result(result) for result in results]
+
+
+def search_all_ontologies_batch(
+    queries: list[str],
+    ontologies: str | None = None,
+    max_results: int = 20,
+    exact: bool = False,
+    timeout: float | None = None,
+) -> dict[str, list[dict[str, Any]] | dict[str, str]]:
+    """
+    Search the Ontology Lookup Service (OLS) for many terms in one call.
+
+    Use this instead of calling search_all_ontologies repeatedly, e.g. for
+    every entity mentioned in a document.
+
+    Args:
+        queries (List[str]): The search terms to look for; duplicates are
+            searched once
+        ontologies (str, optional): Comma-separated list of ontology IDs to search
+            within (e.g., "go,uberon"), applied to every query
+        max_results (int): Maximum number of results per query (default: 20)
+        exact (bool): Whether to perform exact matching (default: False)
+        timeout (float, optional): Seconds to spend searching (default: the
+            server's --tool-timeout)
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: Search results keyed by query, each in
+            the same form as search_all_ontologies returns; a query whose
+            search failed maps to {"error": "request_failed", "message": ...}
+            instead, and one still unanswered when the timeout ran out to
+            {"error": "deadline_exceeded", "message": ...}
+    """
+    with deadline.budget(timeout):
+        results = search_ontologies_many(
+            queries,
+            ontologies=_split_ontologies(ontologies),
+            max_results=max_results,
+            exact=exact,
+        )
+
+    with tracing.span("ols.simplify", **{"ols.results": len(results)}):
+        return {
+            query: _simplify_search_results(query_results)
+            for query, query_results in results.items()
         }
-        simplified_results.append(simplified)
 
-    return simplified_results
+
+async def search_all_ontologies_batch_async(
+    queries: list[str],
+    ontologies: str | None = None,
+    max_results: int = 20,
+    exact: bool = False,
+    timeout: float | None = None,
+) -> dict[str, list[dict[str, Any]] | dict[str, str]]:
+    """Async variant of search_all_ontologies_batch; takes the same arguments."""
+    async with deadline.budget_async(timeout):
+        results = await search_ontologies_many_async(
+            queries,
+            ontologies=_split_ontologies(ontologies),
+            max_results=max_results,
+            exact=exact,
+        )
+
+    with tracing.span("ols.simplify", **{"ols.results": len(results)}):
+        return {
+            query: _simplify_search_results(query_results)
+            for query, query_results in results.items()
+        }
 
 
-def get_ontology_info(ontology_id: str) -> dict[str, Any]:
+def get_ontology_info(
+    ontology_id: str, timeout: float | None = None
+) -> dict[str, Any]:
     """
     Get detailed information about a specific ontology.
 
     Args:
         ontology_id (str): The ID of the ontology (e.g., 'go', 'uberon', 'chebi')
+        timeout (float, optional): Seconds to wait for OLS before giving up
+            (default: the server's --tool-timeout)
 
     Returns:
         Dict[str, Any]: Dictionary containing detailed ontology information
     """
-    details = get_ontology_details(ontology_id=ontology_id, verbose=True)
+    with deadline.budget(timeout):
+        details = get_ontology_details(ontology_id=ontology_id, verbose=True)
 
     # Extract key information for easier consumption
-    config = details.get("config", {})
-    simplified = {
-        "id": details.get("ontologyId"),
-        "title": config.get("title"),
-        "description": config.get("description"),
-        "version": config.get("version"),
-        "homepage": config.get("homepage"),
-        "status": details.get("status"),
-        "number_of_terms": details.get("numberOfTerms"),
-        "number_of_properties": details.get("numberOfProperties"),
-        "number_of_individuals": details.get("numberOfIndividuals"),
-        "languages": config.get("preferredLanguage"),
-        "created": details.get("created"),
-        "updated": details.get("updated"),
-        "loaded": details.get("loaded"),
-        "file_location": config.get("fileLocation"),
-        "base_uris": config.get("baseUris", []),
-    }
+    with tracing.span("ols.simplify", **{"ols.results": 1}):
+        return _simplify_ontology(details)
 
-    return simplified
+
+async def get_ontology_info_async(
+    ontology_id: str, timeout: float | None = None
+) -> dict[str, Any]:
+    """Async variant of get_ontology_info; takes the same arguments."""
+    async with deadline.budget_async(timeout):
+        details = await get_ontology_details_async(
+            ontology_id=ontology_id, verbose=False
+        )
+
+    with tracing.span("ols.simplify", **{"ols.results": 1}):
+        return _simplify_ontology(details)
 
 
 def get_terms_from_ontology(
@@ -104,6 +297,7 @@ def get_terms_from_ontology(
     iri: str | None = None,
     short_form: str | None = None,
     obo_id: str | None = None,
+    timeout: float | None = None,
 ) -> list[dict[str, Any]]:
     """
     Get classes/terms from a specific ontology.
@@ -114,46 +308,117 @@ def get_terms_from_ontology(
         iri (str, optional): Filter by specific IRI
         short_form (str, optional): Filter by short form
         obo_id (str, optional): Filter by OBO ID
+        timeout (float, optional): Seconds to spend fetching terms; when they
+            run out, the terms found so far are returned and the result is
+            flagged as cut off (default: the server's --tool-timeout)
 
     Returns:
-        List[Dict[str, Any]]: List of terms from the ontology
+        List[Dict[str, Any]]: List of terms from the ontology; a
+            deadline.PartialList when the timeout cut it short
     """
-    terms = get_ontology_terms(
-        ontology_id=ontology_id,
-        max_results=max_results,
-        iri=iri,
-        short_form=short_form,
-        obo_id=obo_id,
-        verbose=True,
-    )
+    found: list[dict[str, Any]] = []
+    try:
+        with deadline.budget(timeout):
+            terms = iter_ontology_terms(
+                ontology_id=ontology_id,
+                max_results=max_results,
+                iri=iri,
+                short_form=short_form,
+                obo_id=obo_id,
+                verbose=True,
+            )
+            # Simplify each term as it streams in so only the slim copies are kept
+            for term in terms:
+                found.append(_simplify_term(term))
+    except deadline.DeadlineExceeded:
+        _report_terms_cutoff(found, ontology_id)
+        return deadline.PartialList(found)
 
-    # Simplify the results for easier consumption
-    simplified_terms = []
-    for term in terms:
-        simplified = {
-            "id": term.get("id"),
-            "iri": term.get("iri"),
-            "short_form": term.get("short_form"),
-            "obo_id": term.get("obo_id"),
-            "label": term.get("label"),
-            "description": term.get("description", []),
-            "synonyms": term.get("synonyms", []),
-            "ontology_name": term.get("ontology_name"),
-            "ontology_prefix": term.get("ontology_prefix"),
-            "type": term.get("type"),
-            "is_obsolete": term.get("is_obsolete", False),
-            "has_children": term.get("has_children", False),
-            "is_root": term.get("is_root", False),
+    return found
+
+
+async def get_terms_from_ontology_async(
+    ontology_id: str,
+    max_results: int = 20,
+    iri: str | None = None,
+    short_form: str | None = None,
+    obo_id: str | None = None,
+    timeout: float | None = None,
+) -> list[dict[str, Any]]:
+    """Async variant of get_terms_from_ontology; takes the same arguments."""
+    found: list[dict[str, Any]] = []
+    try:
+        async with deadline.budget_async(timeout):
+            terms = iter_ontology_terms_async(
+                ontology_id=ontology_id,
+                max_results=max_results,
+                iri=iri,
+                short_form=short_form,
+                obo_id=obo_id,
+                verbose=False,
+            )
+            async with aclosing(terms):
+                async for term in terms:
+                    found.append(_simplify_term(term))
+    except deadline.DeadlineExceeded:
+        _report_terms_cutoff(found, ontology_id)
+        return deadline.PartialList(found)
+
+    return found
+
+
+def resolve_ontology_terms(
+    identifiers: list[str], timeout: float | None = None
+) -> dict[str, dict[str, Any] | None]:
+    """
+    Look up many ontology terms at once by OBO ID, short form or IRI.
+
+    Use this to ground a list of identifiers (e.g. 'GO:0008150',
+    'UBERON_0002107' or 'http://purl.obolibrary.org/obo/CHEBI_15377') in one
+    call instead of calling get_terms_from_ontology for each.
+
+    Args:
+        identifiers (List[str]): Term identifiers in any mix of supported forms
+        timeout (float, optional): Seconds to spend resolving (default: the
+            server's --tool-timeout)
+
+    Returns:
+        Dict[str, Optional[Dict[str, Any]]]: Each identifier mapped to its term,
+            to null when OLS has no such term, to
+            {"error": "request_failed", "message": ...} when its lookup failed,
+            or to {"error": "deadline_exceeded", "message": ...} when the
+            timeout ran out before it was looked up
+    """
+    with deadline.budget(timeout):
+        resolved = resolve_terms(identifiers)
+
+    with tracing.span("ols.simplify", **{"ols.results": len(resolved)}):
+        return {
+            identifier: _simplify_resolved(term)
+            for identifier, term in resolved.items()
+        }
+
+
+async def resolve_ontology_terms_async(
+    identifiers: list[str], timeout: float | None = None
+) -> dict[str, dict[str, Any] | None]:
+    """Async variant of resolve_ontology_terms; takes the same arguments."""
+    async with deadline.budget_async(timeout):
+        resolved = await resolve_terms_async(identifiers)
+
+    with tracing.span("ols.simplify", **{"ols.results": len(resolved)}):
+        return {
+            identifier: _simplify_resolved(term)
+            for identifier, term in resolved.items()
         }
-        simplified_terms.append(simplified)
 
-    return simplified_terms
 
 def get_similar_ontology_terms(
     ontology_iri: str,
     ontology: str,
     max_results: int = 20,
-    page_size: int = 20
+    page_size: int = 20,
+    timeout: float | None = None,
 ):
     """Get similar ontology terms by llm embedding similarity.
 
@@ -162,27 +427,33 @@ def get_similar_ontology_terms(
         ontology (str): The name of the ontology (e.g., 'go', 'uberon')
         max_results (int, optional): Maximum number of results. Defaults to 20.
         page_size (int, optional): Number of results to return per page. Defaults to 20.
+        timeout (float, optional): Seconds to spend fetching; when they run
+            out, the terms found so far are returned and the result is
+            flagged as cut off. Defaults to the server's --tool-timeout.
 
     Returns:
-        list[dict[str, Any]]: A list of dictionaries containing similar ontology terms.
+        list[dict[str, Any]]: A list of dictionaries containing similar ontology terms;
+            a deadline.PartialList when the timeout cut it short.
     """
-    terms = get_similar_terms(iri=ontology_iri, ontology=ontology,
-                              max_results=max_results,
-                              page_size=page_size, verbose=False)
-    simplified_terms = []
-    for term in terms:
-        definition = ""
-        if len(term.get("definition", [])) > 0:
-            if isinstance(term.get("definition")[0], str):
-                definition = term.get("definition")[0]
-            elif isinstance(term.get("definition")[0], dict):
-                definition = term.get("definition")[0].get("value", "")
-        simplified = {
-            "id": term.get("curie", ""),
-            "iri": term.get("iri", ""),
-            "label": term.get("label")[0] if len(term.get("label")) > 0 else "",
-            "definition": definition,
-            "score": term.get("score", -999)
-        }
-        simplified_terms.append(simplified)
-    return simplified_terms
+    with deadline.budget(timeout):
+        terms = get_similar_terms(iri=ontology_iri, ontology=ontology,
+                                  max_results=max_results,
+                                  page_size=page_size, verbose=False)
+    with tracing.span("ols.simplify", **{"ols.results": len(terms)}):
+        return _simplify_similar_terms(terms)
+
+
+async def get_similar_ontology_terms_async(
+    ontology_iri: str,
+    ontology: str,
+    max_results: int = 20,
+    page_size: int = 20,
+    timeout: float | None = None,
+):
+    """Async variant of get_similar_ontology_terms; takes the same arguments."""
+    async with deadline.budget_async(timeout):
+        terms = await get_similar_terms_async(iri=ontology_iri, ontology=ontology,
+                                              max_results=max_results,
+                                              page_size=page_size, verbose=False)
+    with tracing.span("ols.simplify", **{"ols.results": len(terms)}):
+        return _simplify_similar_terms(terms)
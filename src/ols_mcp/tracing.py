@@ -0,0 +1,322 @@
+################################################################################
+# ols_mcp/tracing.py
+# This module contains the optional tracing hooks: spans around tool calls,
+# OLS requests, HTTP attempts, JSON decoding and result simplification. Tracing
+# is a no-op unless a recording tracer (console/file exporter) or the
+# OpenTelemetry adapter is installed
+################################################################################
+import functools
+import json
+import re
+import secrets
+import sys
+import threading
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import Any, Literal, Protocol, TextIO, TypeVar
+
+from . import __version__, deadline
+
+T = TypeVar("T")
+
+# /ontologies/{id}/... in OLS v1 and v2 URLs
+_ONTOLOGY_IN_PATH = re.compile(r"/ontologies/([^/?#]+)")
+
+
+class Span(Protocol):
+    """The subset of the OpenTelemetry span API the package uses."""
+
+    def set_attribute(self, key: str, value: Any) -> None: ...
+
+    def set_attributes(self, attributes: Mapping[str, Any]) -> None: ...
+
+    def record_exception(self, exception: BaseException) -> None: ...
+
+
+class Tracer(Protocol):
+    """Starts spans; start_span returns a context manager yielding the span."""
+
+    def start_span(self, name: str, attributes: Mapping[str, Any]) -> Any: ...
+
+
+class _NoOpSpan:
+    """A span that records nothing and is its own context manager."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Mapping[str, Any]) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def __enter__(self) -> "_NoOpSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> Literal[False]:
+        return False
+
+
+_NOOP_SPAN = _NoOpSpan()
+
+
+class NoOpTracer:
+    """The default tracer: every span is the same do-nothing object."""
+
+    def start_span(self, name: str, attributes: Mapping[str, Any]) -> _NoOpSpan:
+        return _NOOP_SPAN
+
+
+class Exporter(Protocol):
+    """Receives every finished span of a RecordingTracer as a dictionary."""
+
+    def export(self, span: dict[str, Any]) -> None: ...
+
+
+class ConsoleExporter:
+    """
+    Writes finished spans as JSON lines to a stream (stderr by default).
+
+    stdout is left alone because the stdio MCP transport owns it.
+    """
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def export(self, span: dict[str, Any]) -> None:
+        line = json.dumps(span, default=str)
+        with self._lock:
+            print(line, file=self.stream or sys.stderr, flush=True)
+
+
+class FileExporter:
+    """Appends finished spans as JSON lines to a file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, span: dict[str, Any]) -> None:
+        line = json.dumps(span, default=str)
+        with self._lock, self.path.open("a", encoding="utf-8") as output:
+            output.write(line + "\n")
+
+
+class InMemoryExporter:
+    """Keeps finished spans in a list, e.g. for tests."""
+
+    def __init__(self):
+        self.spans: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: dict[str, Any]) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+
+_current_span: ContextVar["RecordedSpan | None"] = ContextVar(
+    "ols_mcp_span", default=None
+)
+
+
+class RecordedSpan:
+    """A span of a RecordingTracer; exported when its block ends."""
+
+    def __init__(
+        self,
+        exporter: Exporter,
+        name: str,
+        attributes: Mapping[str, Any],
+    ):
+        self.exporter = exporter
+        self.name = name
+        self.attributes = {
+            key: value for key, value in attributes.items() if value is not None
+        }
+        self.events: list[dict[str, Any]] = []
+        self.status = "ok"
+        self.parent = _current_span.get()
+        self.trace_id: str = (
+            self.parent.trace_id if self.parent else secrets.token_hex(16)
+        )
+        self.span_id = secrets.token_hex(8)
+        self._start = 0.0
+        self._start_wall = 0.0
+        self._token: Token[RecordedSpan | None] | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: Mapping[str, Any]) -> None:
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.status = "error"
+        self.events.append({
+            "name": "exception",
+            "exception.type": type(exception).__name__,
+            "exception.message": str(exception),
+        })
+
+    def __enter__(self) -> "RecordedSpan":
+        self._start_wall = time.time()
+        self._start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(
+        self, exc_type: Any, exc: BaseException | None, tb: Any
+    ) -> Literal[False]:
+        duration = time.perf_counter() - self._start
+        if self._token is not None:
+            _current_span.reset(self._token)
+        if exc is not None:
+            self.record_exception(exc)
+        self.exporter.export({
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "start": self._start_wall,
+            "duration_ms": round(duration * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+            "events": self.events,
+        })
+        return False
+
+
+class RecordingTracer:
+    """
+    Minimal in-process tracer handing finished spans to an exporter.
+
+    Parent spans are tracked in a context variable, so spans opened in page
+    fetching threads and async tasks nest under the call that started them.
+    """
+
+    def __init__(self, exporter: Exporter):
+        self.exporter = exporter
+
+    def start_span(self, name: str, attributes: Mapping[str, Any]) -> RecordedSpan:
+        return RecordedSpan(self.exporter, name, attributes)
+
+
+class OpenTelemetryTracer:
+    """Sends spans to OpenTelemetry; needs the opentelemetry-api package."""
+
+    def __init__(self, tracer: Any = None):
+        if tracer is None:
+            try:
+                from opentelemetry import trace
+            except ImportError as error:
+                raise ImportError(
+                    "OpenTelemetry tracing needs the opentelemetry-api package; "
+                    "install ols-mcp[otel]"
+                ) from error
+            tracer = trace.get_tracer("ols_mcp", __version__)
+        self._tracer = tracer
+
+    def start_span(self, name: str, attributes: Mapping[str, Any]) -> Any:
+        return self._tracer.start_as_current_span(
+            name,
+            attributes={
+                key: value for key, value in attributes.items() if value is not None
+            },
+        )
+
+
+_tracer: Tracer = NoOpTracer()
+
+
+def get_tracer() -> Tracer:
+    """Return the tracer every span is started with."""
+    return _tracer
+
+
+def set_tracer(tracer: Tracer | None) -> None:
+    """Install a tracer; None restores the no-op default."""
+    global _tracer
+    _tracer = tracer if tracer is not None else NoOpTracer()
+
+
+def configure(destination: str | None) -> Tracer:
+    """
+    Install a tracer for a command line destination.
+
+    Args:
+        destination: "console" for JSON lines on stderr, "otel" for
+            OpenTelemetry, a file path for JSON lines appended to that file,
+            or None to turn tracing off
+
+    Returns:
+        The tracer now in effect.
+    """
+    if destination is None:
+        tracer: Tracer = NoOpTracer()
+    elif destination == "console":
+        tracer = RecordingTracer(ConsoleExporter())
+    elif destination == "otel":
+        tracer = OpenTelemetryTracer()
+    else:
+        tracer = RecordingTracer(FileExporter(destination))
+    set_tracer(tracer)
+    return tracer
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """
+    Start a span with the current tracer; use it as a context manager.
+
+    Attributes whose value is None are left out.
+    """
+    return _tracer.start_span(name, attributes)
+
+
+def request_attributes(url: str, params: Mapping[str, Any] | None) -> dict[str, Any]:
+    """Return the span attributes describing a request to an OLS URL."""
+    match = _ONTOLOGY_IN_PATH.search(url)
+    return {
+        "url.full": url,
+        "ols.ontology": match.group(1) if match else None,
+        "ols.page": (params or {}).get("page"),
+    }
+
+
+def trace_tool(
+    fn: Callable[..., Awaitable[T]], name: str
+) -> Callable[..., Awaitable[T]]:
+    """
+    Wrap an async tool so every call is a span that its OLS requests nest under.
+
+    The span records the tool name, the ontology asked about and how many
+    results came back.
+    """
+
+    @functools.wraps(fn)
+    async def traced(*args: Any, **kwargs: Any) -> T:
+        ontology = next(
+            (
+                kwargs[key]
+                for key in ("ontology_id", "ontology", "ontologies")
+                if kwargs.get(key)
+            ),
+            None,
+        )
+        attributes = {"mcp.tool": name, "ols.ontology": ontology}
+        with span("mcp.tool", **attributes) as current:
+            with deadline.collect_cutoffs() as cutoffs:
+                result = await fn(*args, **kwargs)
+            if cutoffs:
+                current.set_attribute("ols.deadline_exceeded", True)
+            if isinstance(result, (list, dict)):
+                current.set_attribute("ols.result_count", len(result))
+            return result
+
+    return traced
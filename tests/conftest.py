@@ -0,0 +1,101 @@
+import pytest
+
+from ols_mcp import (
+    admission,
+    cache,
+    client,
+    deadline,
+    metrics,
+    mirror,
+    querylog,
+    ratelimit,
+    retry,
+    snapshot,
+    tracing,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_response_cache():
+    """Give every test its own empty response cache."""
+    cache.set_cache(cache.ResponseCache())
+    yield
+    cache.set_cache(cache.ResponseCache())
+
+
+@pytest.fixture(autouse=True)
+def default_client_config():
+    """Undo any client reconfiguration (e.g. offline mode) made by a test."""
+    yield
+    if client.get_config() != client.ClientConfig():
+        client.configure(client.ClientConfig())
+
+
+@pytest.fixture(autouse=True)
+def no_ontology_mirror():
+    """Send searches to OLS unless a test installs a mirror itself."""
+    mirror.set_mirror(None)
+    yield
+    mirror.set_mirror(None)
+
+
+@pytest.fixture(autouse=True)
+def no_snapshots():
+    """Fetch terms from OLS unless a test loads snapshots itself."""
+    snapshot.set_snapshots({})
+    yield
+    snapshot.set_snapshots({})
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limiter():
+    """Start every test with default limits and no back-off from earlier tests."""
+    ratelimit.set_limiter(ratelimit.RateLimiter())
+    yield
+    ratelimit.set_limiter(ratelimit.RateLimiter())
+
+
+@pytest.fixture(autouse=True)
+def no_retries():
+    """Surface OLS errors on the first attempt unless a test enables retries."""
+    retry.set_retrier(None)
+    yield
+    retry.set_retrier(None)
+
+
+@pytest.fixture(autouse=True)
+def no_default_budget():
+    """Let tool calls run without a time budget unless a test sets one."""
+    yield
+    deadline.set_default_budget(None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    """Record every test's metrics in an empty registry."""
+    metrics.set_registry(metrics.default_registry())
+    yield
+    metrics.set_registry(metrics.default_registry())
+
+
+@pytest.fixture(autouse=True)
+def no_tracing():
+    """Restore the no-op tracer after tests that install a recording one."""
+    yield
+    tracing.set_tracer(None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_admission():
+    """Admit every tool call unless a test sets limits itself."""
+    admission.set_controller(admission.AdmissionController())
+    yield
+    admission.set_controller(admission.AdmissionController())
+
+
+@pytest.fixture(autouse=True)
+def no_query_log():
+    """Leave tool calls unrecorded unless a test installs a query log."""
+    querylog.set_log(None)
+    yield
+    querylog.set_log(None)
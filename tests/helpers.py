@@ -0,0 +1,32 @@
+import json
+import os
+from collections.abc import Callable
+from typing import Any
+
+import requests
+
+
+def json_response(
+    payload: Any, status_code: int = 200, headers: dict[str, str] | None = None
+) -> requests.Response:
+    """Build a real requests.Response carrying the given JSON payload."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload).encode("utf-8")
+    response.headers["Content-Type"] = "application/json"
+    response.headers.update(headers or {})
+    response.url = "https://www.ebi.ac.uk/ols/api"
+    return response
+
+
+def run_forked(fn: Callable[[], Any]) -> int:
+    """Run fn in a forked child process; return its exit code (1 if it raised)."""
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            fn()
+        except BaseException:
+            code = 1
+        os._exit(code)
+    return os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
@@ -0,0 +1,245 @@
+import asyncio
+import os
+import signal
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from ols_mcp import admission, cache, client, metrics, ratelimit
+from ols_mcp.admission import AdmissionController, AdmissionLimits, ServerBusy
+from ols_mcp.main import main, mcp
+from ols_mcp.serve import DrainingServer, WorkerPool
+
+
+def controller(max_concurrent=1, max_queue=1, queue_timeout=5.0):
+    return AdmissionController(
+        AdmissionLimits(max_concurrent, max_queue, queue_timeout)
+    )
+
+
+class TestAdmissionController(unittest.IsolatedAsyncioTestCase):
+
+    async def test_queued_calls_run_in_arrival_order(self):
+        limiter = controller(max_concurrent=1, max_queue=2)
+        order = []
+
+        async def call(name):
+            await limiter.acquire()
+            try:
+                order.append(name)
+                await asyncio.sleep(0.01)
+            finally:
+                limiter.release()
+
+        await asyncio.gather(call("a"), call("b"), call("c"))
+
+        self.assertEqual(order, ["a", "b", "c"])
+        self.assertEqual(limiter.stats()["admitted"], 3)
+        self.assertFalse(limiter.busy)
+
+    async def test_full_queue_refuses_at_once(self):
+        limiter = controller(max_concurrent=1, max_queue=1)
+        await limiter.acquire()
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        started = time.monotonic()
+        with self.assertRaises(ServerBusy):
+            await limiter.acquire()
+        self.assertLess(time.monotonic() - started, 0.05)
+
+        limiter.release()
+        await queued
+        self.assertEqual((limiter.running, limiter.queued, limiter.rejected), (1, 0, 1))
+
+    async def test_queue_timeout_and_cancellation_give_up_the_place(self):
+        limiter = controller(max_concurrent=1, max_queue=2, queue_timeout=0.05)
+        await limiter.acquire()
+        cancelled = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        with self.assertRaises(ServerBusy):
+            await limiter.acquire()
+
+        self.assertEqual(limiter.queued, 0)
+        limiter.release()
+        self.assertEqual(limiter.running, 0)
+
+    async def test_drain_waits_for_admitted_calls_and_refuses_new_ones(self):
+        limiter = controller(max_concurrent=1, max_queue=1)
+        finished = []
+
+        async def call(delay):
+            await limiter.acquire()
+            try:
+                await asyncio.sleep(delay)
+                finished.append(delay)
+            finally:
+                limiter.release()
+
+        calls = [asyncio.create_task(call(0.05)), asyncio.create_task(call(0.01))]
+        await asyncio.sleep(0)
+
+        drained = asyncio.create_task(limiter.drain(timeout=1.0))
+        await asyncio.sleep(0)
+        with self.assertRaises(ServerBusy):
+            await limiter.acquire()
+
+        self.assertTrue(await drained)
+        await asyncio.gather(*calls)
+        self.assertEqual(finished, [0.05, 0.01])
+
+    async def test_drain_gives_up_after_its_timeout(self):
+        limiter = controller()
+        await limiter.acquire()
+
+        self.assertFalse(await limiter.drain(timeout=0.01))
+
+    async def test_rejected_tool_calls_are_counted(self):
+        admission.set_controller(controller(max_concurrent=1, max_queue=0))
+        release = asyncio.Event()
+
+        async def tool():
+            await release.wait()
+            return []
+
+        instrumented = metrics.instrument_tool(admission.limit_tool(tool), "search")
+        running = asyncio.create_task(instrumented())
+        await asyncio.sleep(0)
+        with self.assertRaises(ServerBusy):
+            await instrumented()
+        release.set()
+        await running
+
+        calls = metrics.snapshot()["ols_tool_calls_total"]
+        outcomes = {entry["labels"]["outcome"]: entry["value"] for entry in calls}
+        self.assertEqual(outcomes, {"ok": 1, "rejected": 1})
+        rejected = metrics.snapshot()["ols_tool_calls_rejected_total"][0]
+        self.assertEqual(rejected["value"], 1)
+
+
+class TestHttpServing(unittest.TestCase):
+
+    def test_health_route_reports_draining(self):
+        with TestClient(mcp.http_app()) as http:
+            self.assertEqual(http.get("/health").json()["status"], "ok")
+            admission.get_controller().close()
+            response = http.get("/health")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "draining")
+
+    @patch("ols_mcp.main.serve.serve_http")
+    @patch("ols_mcp.main.mcp.run")
+    def test_http_transport_options(self, mock_run, mock_serve):
+        main([
+            "--no-disk-cache", "--transport", "http", "--host", "0.0.0.0",
+            "--port", "9000", "--max-concurrent-calls", "8", "--max-queue", "16",
+            "--drain-timeout", "5",
+        ])
+
+        mock_run.assert_not_called()
+        kwargs = mock_serve.call_args.kwargs
+        self.assertEqual((kwargs["host"], kwargs["port"]), ("0.0.0.0", 9000))
+        self.assertEqual(kwargs["drain_timeout"], 5.0)
+        limits = admission.get_controller().limits
+        self.assertEqual((limits.max_concurrent, limits.max_queue), (8, 16))
+
+        main(["--no-disk-cache", "--max-concurrent-calls", "0"])
+        self.assertIsNone(admission.get_controller().limits.max_concurrent)
+        mock_run.assert_called_once()
+
+    @patch("ols_mcp.main.serve.serve_workers")
+    @patch("ols_mcp.main.serve.serve_http")
+    def test_workers_share_the_cache_and_rate_limits(self, mock_serve, mock_workers):
+        with tempfile.TemporaryDirectory() as tmp:
+            main([
+                "--cache-path", f"{tmp}/responses.sqlite3", "--transport", "http",
+                "--workers", "4", "--ols-url", "http://127.0.0.1:9999/ols/api",
+            ])
+
+        mock_serve.assert_not_called()
+        factory = mock_workers.call_args.args[0]
+        self.assertEqual(factory.keywords, {"stateless_http": True})
+        self.assertEqual(mock_workers.call_args.kwargs["workers"], 4)
+        self.assertTrue(ratelimit.get_limiter().shared)
+        shared_cache = cache.get_cache()
+        self.assertEqual(shared_cache.max_entries, cache.DEFAULT_MAX_ENTRIES // 4)
+        self.assertIsNotNone(shared_cache.backend)
+        self.assertEqual(client.get_config().base_url, "http://127.0.0.1:9999/ols/api")
+
+        with self.assertRaises(SystemExit):
+            main(["--no-disk-cache", "--workers", "2"])
+
+    def test_worker_pool_passes_sigterm_to_its_workers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+
+            def worker(index):
+                Path(tmp, str(index)).touch()
+                while len(os.listdir(tmp)) < 2:
+                    time.sleep(0.01)
+                if index == 0:
+                    os.kill(os.getppid(), signal.SIGTERM)
+                time.sleep(10)
+
+            started = time.monotonic()
+            WorkerPool(worker, workers=2).run()
+            elapsed = time.monotonic() - started
+            self.assertEqual(sorted(os.listdir(tmp)), ["0", "1"])
+
+        self.assertLess(elapsed, 5)
+        self.assertIs(signal.getsignal(signal.SIGTERM), signal.SIG_DFL)
+
+    def test_shutdown_drains_running_calls(self):
+        limiter = admission.get_controller()
+
+        async def slow(request):
+            await limiter.acquire()
+            try:
+                await asyncio.sleep(0.3)
+            finally:
+                limiter.release()
+            return PlainTextResponse("done")
+
+        app = Starlette(routes=[Route("/slow", slow)])
+        server = DrainingServer(
+            uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"),
+            drain_timeout=5.0,
+        )
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+
+        responses = []
+        request = threading.Thread(
+            target=lambda: responses.append(
+                httpx.get(f"http://127.0.0.1:{port}/slow", timeout=5)
+            )
+        )
+        request.start()
+        while not limiter.busy:
+            time.sleep(0.01)
+        server.should_exit = True
+        thread.join(timeout=5)
+        request.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(responses[0].text, "done")
+        self.assertTrue(limiter.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
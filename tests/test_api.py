@@ -1,21 +1,40 @@
+import asyncio
+import threading
+import time
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
+import httpx
+import requests
+
+from ols_mcp import client
 from ols_mcp.api import (
     get_ontology_details,
+    get_ontology_details_async,
     get_ontology_terms,
+    get_ontology_terms_async,
     get_similar_terms,
+    get_similar_terms_async,
+    iter_ontology_terms,
+    iter_ontology_terms_async,
+    parse_term_identifier,
+    resolve_terms,
+    resolve_terms_async,
     search_ontologies,
+    search_ontologies_async,
+    search_ontologies_many,
+    search_ontologies_many_async,
 )
+from tests.helpers import json_response
 
 
 class TestOLSAPI(unittest.TestCase):
 
-    @patch("ols_mcp.api.requests.get")
-    def test_search_ontologies(self, mock_get):
+    @patch("ols_mcp.client.get_session")
+    def test_search_ontologies(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
         # Mock response
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response = json_response({
             "response": {
                 "docs": [
                     {
@@ -34,8 +53,7 @@ class TestOLSAPI(unittest.TestCase):
                     }
                 ]
             }
-        }
-        mock_response.raise_for_status.return_value = None
+        })
         mock_get.return_value = mock_response
 
         # Test the function
@@ -53,11 +71,11 @@ class TestOLSAPI(unittest.TestCase):
         self.assertIn("q", kwargs["params"])
         self.assertEqual(kwargs["params"]["q"], "biological process")
 
-    @patch("ols_mcp.api.requests.get")
-    def test_get_ontology_details(self, mock_get):
+    @patch("ols_mcp.client.get_session")
+    def test_get_ontology_details(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
         # Mock response
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response = json_response({
             "ontologyId": "go",
             "status": "LOADED",
             "numberOfTerms": 47000,
@@ -73,8 +91,7 @@ class TestOLSAPI(unittest.TestCase):
                 "homepage": "http://geneontology.org/",
                 "preferredLanguage": "en",
             },
-        }
-        mock_response.raise_for_status.return_value = None
+        })
         mock_get.return_value = mock_response
 
         # Test the function
@@ -86,13 +103,18 @@ class TestOLSAPI(unittest.TestCase):
         self.assertEqual(result["config"]["title"], "Gene Ontology")
 
         # Check that the API was called correctly
-        mock_get.assert_called_once_with("https://www.ebi.ac.uk/ols/api/ontologies/go")
+        mock_get.assert_called_once_with(
+            "https://www.ebi.ac.uk/ols/api/ontologies/go",
+            params=None,
+            headers={},
+            timeout=(5.0, 30.0),
+        )
 
-    @patch("ols_mcp.api.requests.get")
-    def test_get_ontology_terms(self, mock_get):
+    @patch("ols_mcp.client.get_session")
+    def test_get_ontology_terms(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
         # Mock response
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response = json_response({
             "_embedded": {
                 "terms": [
                     {
@@ -115,8 +137,7 @@ class TestOLSAPI(unittest.TestCase):
                 ]
             },
             "page": {"number": 0, "totalPages": 1},
-        }
-        mock_response.raise_for_status.return_value = None
+        })
         mock_get.return_value = mock_response
 
         # Test the function
@@ -133,11 +154,11 @@ class TestOLSAPI(unittest.TestCase):
         args, kwargs = mock_get.call_args
         self.assertEqual(args[0], "https://www.ebi.ac.uk/ols/api/ontologies/go/terms")
 
-    @patch("ols_mcp.api.requests.get")
-    def test_get_similar_terms(self, mock_get):
+    @patch("ols_mcp.client.get_session")
+    def test_get_similar_terms(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
         # Mock response
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response = json_response({
             "elements": [{
             "appearsIn" : [ "clo", "upa", "stato", "xpo", "gallont", "peco", "envo", "fbbt", "po", "rbo", "hp", "gaz", "omrse", "cteno", "eupath", "hcao", "vsao", "poro", "geno", "plana", "msio", "oae", "phipo", "hba", "dpo", "oostt", "caro", "cl", "mro", "efo", "obib", "omit", "idomal", "fovt", "ado", "ro", "pcl", "psdo", "cco", "opl", "uberon", "rexo", "planp", "ohd", "one", "ppo", "eco", "vbo", "genepio", "sepio", "foodon", "ceph", "chiro", "omp", "mp", "go", "cido", "iceo", "wbbt", "htn", "dhba", "mpio", "zp", "bao", "aism", "ino", "pso", "mfmo", "to", "pco", "dideo", "wbls", "upheno", "bmont", "ecto", "dron", "ohmi", "ecao", "gecko", "bcio", "cmpo", "fbbi", "maxo", "bspo", "ecocore", "swo", "pato", "covoc", "pride", "ido", "agro", "omiabis", "mondo", "ohpi", "mco", "obcs", "fypo", "apollo_sv", "ons", "fbdv", "wbphenotype", "obi", "vo", "pr", "reto", "ogsf", "nbo", "oba", "ontoneo", "tao", "idocovid19", "flopo", "ncro", "epio", "bcgo", "micro", "gexo", "cob", "slso", "gsso" ],
             "curie" : "GO:0008150",
@@ -264,8 +285,7 @@ class TestOLSAPI(unittest.TestCase):
             "page": 0,
             "number": 0,
             "totalPages": 1,
-        }
-        mock_response.raise_for_status.return_value = None
+        })
         mock_get.return_value = mock_response
 
         # Test the function
@@ -282,6 +302,496 @@ class TestOLSAPI(unittest.TestCase):
         args, kwargs = mock_get.call_args
         self.assertIn(args[0], "https://www.ebi.ac.uk/ols/api/v2/ontologies/go/classes/http%253A%252F%252Fpurl.obolibrary.org%252Fobo%252FGO_0008150/llm_similar")
 
+class TestOLSAPIPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.pages_requested = []
+
+    def fake_get(self, url, params=None, **kwargs):
+        page = params["page"]
+        with self.lock:
+            self.pages_requested.append(page)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        # Later pages answer first so reassembly order is exercised
+        time.sleep(0.02 * (10 - page) / 10)
+        with self.lock:
+            self.in_flight -= 1
+        size = params["size"]
+        response = json_response({
+            "_embedded": {"terms": [{"id": f"T{page}.{i}"} for i in range(size)]},
+            "page": {"number": page, "totalPages": 10},
+        })
+        return response
+
+    @patch("ols_mcp.client.get_session")
+    def test_get_ontology_terms_prefetches_pages_in_order(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = self.fake_get
+
+        results = get_ontology_terms("go", max_results=25, page_size=5, concurrency=3)
+
+        self.assertEqual(len(results), 25)
+        self.assertEqual(
+            [term["id"] for term in results],
+            [f"T{page}.{i}" for page in range(5) for i in range(5)],
+        )
+        self.assertEqual(sorted(self.pages_requested), [0, 1, 2, 3, 4])
+        self.assertGreater(self.peak, 1)
+        self.assertLessEqual(self.peak, 3)
+
+    @patch("ols_mcp.client.get_session")
+    def test_get_ontology_terms_stops_at_total_pages(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = self.fake_get
+
+        results = get_ontology_terms("go", max_results=500, page_size=5)
+
+        self.assertEqual(len(results), 50)
+        self.assertEqual(sorted(self.pages_requested), list(range(10)))
+
+    @patch("ols_mcp.client.get_session")
+    def test_get_ontology_terms_serial_when_concurrency_is_one(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = self.fake_get
+
+        results = get_ontology_terms("go", max_results=12, page_size=4, concurrency=1)
+
+        self.assertEqual(len(results), 12)
+        self.assertEqual(self.pages_requested, [0, 1, 2])
+        self.assertEqual(self.peak, 1)
+
+
+    @patch("ols_mcp.client.get_session")
+    def test_iter_ontology_terms_reads_ahead_a_bounded_window(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = self.fake_get
+
+        terms = iter_ontology_terms("go", page_size=5, concurrency=2)
+        first_pages = [next(terms)["id"] for _ in range(10)]
+        time.sleep(0.05)
+        requested_early = len(self.pages_requested)
+        rest = list(terms)
+
+        self.assertEqual(first_pages[-1], "T1.4")
+        # Page 0, the page being read and at most two pages ahead of it
+        self.assertLessEqual(requested_early, 4)
+        self.assertEqual(len(first_pages) + len(rest), 50)
+        self.assertEqual(rest[-1]["id"], "T9.4")
+
+    @patch("ols_mcp.client.get_session")
+    def test_iter_ontology_terms_stops_requesting_when_closed(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = self.fake_get
+
+        terms = iter_ontology_terms("go", page_size=5, concurrency=2)
+        next(terms)
+        terms.close()
+        time.sleep(0.05)
+
+        self.assertLessEqual(len(self.pages_requested), 3)
+
+    @patch("ols_mcp.client.get_session")
+    def test_get_similar_terms_merges_pages_by_rank(self, mock_get_session):
+        def fake_get(url, params=None, **kwargs):
+            page, size = params["page"], params["size"]
+            time.sleep(0.01 * (4 - page))
+            response = json_response({
+                "elements": [
+                    {"curie": f"X:{page * size + i}", "score": 0.9 - (page * size + i) / 100}
+                    for i in range(size)
+                ],
+                "page": page,
+                "totalPages": 4,
+            })
+            return response
+
+        mock_get_session.return_value.get.side_effect = fake_get
+
+        results = get_similar_terms(
+            "http://purl.obolibrary.org/obo/GO_0008150", "go", max_results=10, page_size=3
+        )
+
+        scores = [term["score"] for term in results]
+        self.assertEqual(len(results), 10)
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(mock_get_session.return_value.get.call_count, 4)
+
+
+class TestOLSAPIBatchSearch(unittest.TestCase):
+
+    @patch("ols_mcp.client.get_session")
+    def test_search_ontologies_many_dedupes_and_keys_by_query(self, mock_get_session):
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def fake_get(url, params=None, **kwargs):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.02)
+            with lock:
+                state["in_flight"] -= 1
+            return json_response({"response": {"docs": [{"label": params["q"]}]}})
+
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = fake_get
+        queries = ["heart", "liver", "heart", "lung", "kidney", "liver"]
+
+        results = search_ontologies_many(queries, ontologies=["uberon"], concurrency=2)
+
+        self.assertEqual(list(results), ["heart", "liver", "lung", "kidney"])
+        self.assertEqual(results["lung"], [{"label": "lung"}])
+        self.assertEqual(mock_get.call_count, 4)
+        self.assertEqual(state["peak"], 2)
+        self.assertTrue(
+            all(call.kwargs["params"]["ontology"] == "uberon" for call in mock_get.call_args_list)
+        )
+
+    def test_search_ontologies_many_empty(self):
+        self.assertEqual(search_ontologies_many([]), {})
+
+    @patch("ols_mcp.client.get_session")
+    def test_search_ontologies_many_keeps_results_when_one_search_fails(
+        self, mock_get_session
+    ):
+        def fake_get(url, params=None, **kwargs):
+            if params["q"] == "liver":
+                return json_response({}, status_code=500)
+            if params["q"] == "lung":
+                raise requests.ConnectionError("connection refused")
+            return json_response({"response": {"docs": [{"label": params["q"]}]}})
+
+        mock_get_session.return_value.get.side_effect = fake_get
+
+        results = search_ontologies_many(["heart", "liver", "lung"])
+
+        self.assertEqual(results["heart"], [{"label": "heart"}])
+        self.assertEqual(results["liver"]["error"], "request_failed")
+        self.assertIn("HTTPError", results["liver"]["message"])
+        self.assertEqual(
+            results["lung"],
+            {"error": "request_failed", "message": "ConnectionError: connection refused"},
+        )
+
+
+class TestOLSAPIResolveTerms(unittest.TestCase):
+
+    def test_parse_term_identifier(self):
+        expected = ("go", "short_form", "GO_0008150")
+        self.assertEqual(parse_term_identifier("GO:0008150"), expected)
+        self.assertEqual(parse_term_identifier("GO_0008150"), expected)
+        self.assertEqual(
+            parse_term_identifier("http://purl.obolibrary.org/obo/GO_0008150"), expected
+        )
+        self.assertEqual(
+            parse_term_identifier("http://www.ebi.ac.uk/efo/EFO_0000001"),
+            (None, "iri", "http://www.ebi.ac.uk/efo/EFO_0000001"),
+        )
+        self.assertIsNone(parse_term_identifier("not a term"))
+
+    @patch("ols_mcp.client.get_session")
+    def test_resolve_terms_shares_lookups_and_marks_missing(self, mock_get_session):
+        def fake_get(url, params=None, **kwargs):
+            if url.endswith("/ols/api/terms"):
+                return json_response(
+                    {
+                        "_embedded": {
+                            "terms": [
+                                {"iri": params["iri"], "ontology_name": "importer"},
+                                {
+                                    "iri": params["iri"],
+                                    "ontology_name": "efo",
+                                    "is_defining_ontology": True,
+                                },
+                            ]
+                        }
+                    }
+                )
+            if params["short_form"] == "GO_9999999":
+                return json_response({"error": "Not Found"}, status_code=404)
+            return json_response(
+                {"_embedded": {"terms": [{"short_form": params["short_form"]}]}}
+            )
+
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = fake_get
+        efo = "http://www.ebi.ac.uk/efo/EFO_0000001"
+        identifiers = [
+            "GO:0008150",
+            "http://purl.obolibrary.org/obo/GO_0008150",
+            "GO:9999999",
+            efo,
+            "???",
+            "GO:0008150",
+        ]
+
+        results = resolve_terms(identifiers)
+
+        self.assertEqual(list(results), identifiers[:5])
+        self.assertEqual(results["GO:0008150"], {"short_form": "GO_0008150"})
+        self.assertIs(
+            results["http://purl.obolibrary.org/obo/GO_0008150"], results["GO:0008150"]
+        )
+        self.assertIsNone(results["GO:9999999"])
+        self.assertIsNone(results["???"])
+        self.assertEqual(results[efo]["ontology_name"], "efo")
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch("ols_mcp.client.get_session")
+    def test_resolve_terms_marks_failed_lookups(self, mock_get_session):
+        def fake_get(url, params=None, **kwargs):
+            if params["short_form"] == "GO_0008150":
+                return json_response({}, status_code=500)
+            if params["short_form"] == "HP_0000001":
+                raise requests.ConnectionError("connection refused")
+            return json_response({"_embedded": {"terms": [{"short_form": "CL_0000000"}]}})
+
+        mock_get_session.return_value.get.side_effect = fake_get
+
+        results = resolve_terms(["GO:0008150", "HP:0000001", "CL:0000000"])
+
+        self.assertEqual(results["GO:0008150"]["error"], "request_failed")
+        self.assertIn("HTTPError", results["GO:0008150"]["message"])
+        self.assertEqual(
+            results["HP:0000001"],
+            {"error": "request_failed", "message": "ConnectionError: connection refused"},
+        )
+        self.assertEqual(results["CL:0000000"], {"short_form": "CL_0000000"})
+
+
+class TestOLSAPIAsync(unittest.IsolatedAsyncioTestCase):
+
+    def install(self, handler):
+        self.requests = []
+
+        def record(request):
+            self.requests.append(request)
+            return handler(request)
+
+        client.set_async_client(
+            httpx.AsyncClient(transport=httpx.MockTransport(record))
+        )
+
+    async def asyncTearDown(self):
+        await client.aclose()
+
+    async def test_search_ontologies_async(self):
+        self.install(
+            lambda request: httpx.Response(
+                200, json={"response": {"docs": [{"id": "GO:0008150"}]}}
+            )
+        )
+
+        results = await search_ontologies_async(
+            "biological process", ontologies=["go", "uberon"], max_results=1
+        )
+
+        self.assertEqual(results, [{"id": "GO:0008150"}])
+        url = self.requests[0].url
+        self.assertEqual(url.path, "/ols/api/search")
+        self.assertEqual(url.params["q"], "biological process")
+        self.assertEqual(url.params["ontology"], "go,uberon")
+
+    async def test_search_ontologies_many_async(self):
+        self.install(
+            lambda request: httpx.Response(
+                200, json={"response": {"docs": [{"label": request.url.params["q"]}]}}
+            )
+        )
+
+        results = await search_ontologies_many_async(["a", "b", "a"], exact=True)
+
+        self.assertEqual(results, {"a": [{"label": "a"}], "b": [{"label": "b"}]})
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_search_ontologies_many_async_keeps_results_when_one_search_fails(
+        self,
+    ):
+        def handler(request):
+            if request.url.params["q"] == "b":
+                return httpx.Response(503, json={})
+            return httpx.Response(
+                200, json={"response": {"docs": [{"label": request.url.params["q"]}]}}
+            )
+
+        self.install(handler)
+
+        results = await search_ontologies_many_async(["a", "b", "c"])
+
+        self.assertEqual(results["a"], [{"label": "a"}])
+        self.assertEqual(results["c"], [{"label": "c"}])
+        self.assertEqual(results["b"]["error"], "request_failed")
+        self.assertIn("HTTPStatusError", results["b"]["message"])
+
+    async def test_resolve_terms_async(self):
+        def handler(request):
+            if request.url.params["short_form"] == "GO_0008150":
+                return httpx.Response(
+                    200, json={"_embedded": {"terms": [{"obo_id": "GO:0008150"}]}}
+                )
+            return httpx.Response(404, json={})
+
+        self.install(handler)
+
+        results = await resolve_terms_async(["GO:0008150", "GO_0008150", "HP:0000001"])
+
+        self.assertEqual(results["GO_0008150"], {"obo_id": "GO:0008150"})
+        self.assertIsNone(results["HP:0000001"])
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.requests[0].url.path, "/ols/api/ontologies/go/terms")
+
+    async def test_resolve_terms_async_marks_failed_lookups(self):
+        def handler(request):
+            if request.url.params["short_form"] == "GO_0008150":
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(
+                200, json={"_embedded": {"terms": [{"obo_id": "HP:0000001"}]}}
+            )
+
+        self.install(handler)
+
+        results = await resolve_terms_async(["GO:0008150", "HP:0000001"])
+
+        self.assertEqual(
+            results["GO:0008150"],
+            {"error": "request_failed", "message": "ConnectError: connection refused"},
+        )
+        self.assertEqual(results["HP:0000001"], {"obo_id": "HP:0000001"})
+
+    async def test_get_ontology_details_async(self):
+        self.install(lambda request: httpx.Response(200, json={"ontologyId": "go"}))
+
+        result = await get_ontology_details_async("go")
+
+        self.assertEqual(result["ontologyId"], "go")
+        self.assertEqual(
+            str(self.requests[0].url), "https://www.ebi.ac.uk/ols/api/ontologies/go"
+        )
+
+    async def test_get_ontology_terms_async_pages(self):
+        def handler(request):
+            page = int(request.url.params["page"])
+            return httpx.Response(
+                200,
+                json={
+                    "_embedded": {"terms": [{"id": f"T{page}a"}, {"id": f"T{page}b"}]},
+                    "page": {"number": page, "totalPages": 3},
+                },
+            )
+
+        self.install(handler)
+
+        results = await get_ontology_terms_async("go", max_results=5, page_size=2)
+
+        self.assertEqual(
+            [term["id"] for term in results], ["T0a", "T0b", "T1a", "T1b", "T2a"]
+        )
+        self.assertEqual(len(self.requests), 3)
+
+    async def test_iter_ontology_terms_async_streams_all_pages(self):
+        def handler(request):
+            page = int(request.url.params["page"])
+            return httpx.Response(
+                200,
+                json={
+                    "_embedded": {"terms": [{"id": f"T{page}.{i}"} for i in range(3)]},
+                    "page": {"number": page, "totalPages": 4},
+                },
+            )
+
+        self.install(handler)
+
+        terms = [term["id"] async for term in iter_ontology_terms_async("go", page_size=3)]
+
+        self.assertEqual(len(terms), 12)
+        self.assertEqual(terms[:4], ["T0.0", "T0.1", "T0.2", "T1.0"])
+        self.assertEqual(len(self.requests), 4)
+
+    async def test_get_ontology_terms_async_bounded_concurrency(self):
+        state = {"in_flight": 0, "peak": 0}
+
+        async def handler(request):
+            page = int(request.url.params["page"])
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.01 * (8 - page))
+            state["in_flight"] -= 1
+            return httpx.Response(
+                200,
+                json={
+                    "_embedded": {"terms": [{"id": f"T{page}"}]},
+                    "page": {"number": page, "totalPages": 8},
+                },
+            )
+
+        self.install(handler)
+
+        results = await get_ontology_terms_async(
+            "go", max_results=8, page_size=1, concurrency=3
+        )
+
+        self.assertEqual([term["id"] for term in results], [f"T{p}" for p in range(8)])
+        self.assertEqual(state["peak"], 3)
+
+    async def test_get_ontology_terms_async_raises_for_status(self):
+        self.install(lambda request: httpx.Response(404, json={}))
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            await get_ontology_terms_async("nonexistent")
+
+    async def test_get_similar_terms_async_cancels_unneeded_pages(self):
+        cancelled = []
+        release = asyncio.Event()
+
+        async def handler(request):
+            page = int(request.url.params["page"])
+            if page >= 2:
+                try:
+                    await release.wait()
+                except asyncio.CancelledError:
+                    cancelled.append(page)
+                    raise
+            # OLS occasionally returns more elements than requested
+            elements = [{"curie": f"X:{page}{i}", "score": 0.5} for i in range(4)]
+            return httpx.Response(
+                200,
+                json={"elements": elements, "page": {"number": page, "totalPages": 5}},
+            )
+
+        self.install(handler)
+
+        results = await get_similar_terms_async(
+            "http://purl.obolibrary.org/obo/GO_0008150",
+            "go",
+            max_results=8,
+            page_size=2,
+        )
+
+        self.assertEqual(len(results), 8)
+        self.assertEqual(sorted(cancelled), [2, 3])
+
+    async def test_get_similar_terms_async_integer_page(self):
+        self.install(
+            lambda request: httpx.Response(
+                200,
+                json={
+                    "elements": [
+                        {"curie": "GO:0008150", "score": 1.0},
+                        {"curie": "BAO:0000264", "score": 0.9},
+                    ],
+                    "page": 0,
+                    "totalPages": 1,
+                },
+            )
+        )
+
+        results = await get_similar_terms_async(
+            "http://purl.obolibrary.org/obo/GO_0008150", "GO"
+        )
+
+        self.assertEqual([term["curie"] for term in results], ["BAO:0000264"])
+        self.assertIn("/v2/ontologies/go/classes/", self.requests[0].url.path)
+
+
 def test_reality():
     assert 1 == 1
 
@@ -0,0 +1,199 @@
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from benchmarks.compare import compare, compare_files
+from benchmarks.fake_ols import FakeOLS, FakeOLSConfig
+from benchmarks.loadtest import LoadSettings, parse_mix, run_load
+from benchmarks.run import Settings, percentile, run_benchmarks, save_results
+from benchmarks.scaling import ScalingSettings, run_scaling
+from benchmarks.startup import StartupSettings, run_startup
+from ols_mcp import api, client, deadline
+
+
+def stats(p50: float, throughput: float, requests: float = 1.0) -> dict:
+    return {
+        "p50_ms": p50,
+        "p95_ms": p50 * 2,
+        "throughput": throughput,
+        "requests_per_call": requests,
+        "errors": 0,
+    }
+
+
+class TestFakeOLS(unittest.TestCase):
+
+    def setUp(self):
+        config = FakeOLSConfig(latency=0.0, terms_per_ontology=45, similar_results=30)
+        self.server = FakeOLS(config).start()
+        self.addCleanup(self.server.stop)
+        client.configure(base_url=self.server.base_url)
+
+    def test_api_functions_run_against_the_stand_in(self):
+        terms = api.get_ontology_terms("go", max_results=None, page_size=20)
+        self.assertEqual(len(terms), 45)
+        self.assertEqual(terms[0]["obo_id"], "GO:0000000")
+        self.assertEqual(self.server.requests, 3)
+
+        self.assertEqual(api.get_ontology_details("go")["ontologyId"], "go")
+        self.assertEqual(len(api.search_ontologies("cell", max_results=5)), 5)
+        similar = api.get_similar_terms(
+            "http://purl.obolibrary.org/obo/GO_0000001", "go", max_results=25,
+            page_size=10,
+        )
+        self.assertEqual(len(similar), 25)
+        resolved = api.resolve_terms(["GO:0000007", "http://example.org/efo/EFO_3"])
+        self.assertEqual(resolved["GO:0000007"]["short_form"], "GO_0000007")
+        self.assertEqual(
+            resolved["http://example.org/efo/EFO_3"]["ontology_name"], "efo"
+        )
+
+    def test_recorded_responses_replace_synthetic_ones(self):
+        self.server.recordings = {"/ontologies/go": {"ontologyId": "recorded"}}
+
+        self.assertEqual(api.get_ontology_details("go")["ontologyId"], "recorded")
+
+
+class TestRunner(unittest.TestCase):
+
+    def test_results_are_measured_and_stored(self):
+        settings = Settings(iterations=3, warmup=1, latency=0.0, pages=2, page_size=5)
+
+        results = run_benchmarks(settings, only=["api.get_ontology_terms"])
+
+        self.assertEqual(
+            set(results), {"api.get_ontology_terms", "api.get_ontology_terms_async"}
+        )
+        for result in results.values():
+            self.assertEqual((result["calls"], result["errors"]), (3, 0))
+            self.assertEqual(result["requests_per_call"], 2.0)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+        self.assertNotIn("127.0.0.1", client.get_config().base_url)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = save_results(results, settings, "branch", Path(tmp))
+            document = json.loads(path.read_text())
+        self.assertEqual(document["settings"]["pages"], 2)
+        self.assertIn("commit", document["git"])
+
+    def test_percentile_interpolates(self):
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0, 5.0], 0.5), 3.0)
+        self.assertAlmostEqual(percentile([1.0, 2.0], 0.95), 1.95)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+
+class TestCompare(unittest.TestCase):
+
+    def test_regressions_beyond_the_threshold(self):
+        baseline = {"a": stats(10, 100), "b": stats(10, 100), "c": stats(10, 100)}
+        current = {
+            "a": stats(10.5, 98),
+            "b": stats(15, 60),
+            "c": stats(10, 100, requests=2.0),
+            "new": stats(1, 1),
+        }
+
+        changes = {change.name: change for change in compare(baseline, current)}
+
+        self.assertEqual(set(changes), {"a", "b", "c"})
+        self.assertEqual(changes["a"].regressions, ())
+        self.assertEqual(
+            changes["b"].regressions, ("p50_ms", "p95_ms", "throughput")
+        )
+        self.assertEqual(changes["c"].regressions, ("requests_per_call",))
+
+    def test_compare_files_exit_status(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for label, p50 in (("main", 10), ("branch", 20)):
+                path = Path(tmp) / f"{label}.json"
+                path.write_text(json.dumps({
+                    "label": label, "settings": {}, "results": {"a": stats(p50, 100)}
+                }))
+                paths.append(path)
+
+            with redirect_stdout(io.StringIO()) as output:
+                self.assertEqual(compare_files(paths[0], paths[1], 0.1), 1)
+                self.assertEqual(compare_files(paths[0], paths[0], 0.1), 0)
+        self.assertIn("1 of 1 cases regressed", output.getvalue())
+
+
+class TestLoadTest(unittest.TestCase):
+
+    def test_parse_mix(self):
+        self.assertEqual(
+            parse_mix("search_all_ontologies=3, get_ontology_info"),
+            {"search_all_ontologies": 3.0, "get_ontology_info": 1.0},
+        )
+        with self.assertRaises(ValueError):
+            parse_mix("get_ontology_info=0")
+
+    def test_sessions_drive_the_server(self):
+        for transport in ("memory", "http"):
+            with self.subTest(transport=transport):
+                settings = LoadSettings(
+                    sessions=3, rate=40, duration=0.5, transport=transport,
+                    interval=0.2, latency=0.0, jitter=0.0, pages=2, page_size=5,
+                )
+                timeline = []
+
+                summary = run_load(settings, progress=timeline.append)
+
+                self.assertEqual(summary["offered"], 20)
+                self.assertEqual(summary["completed"], 20)
+                self.assertEqual(summary["errors"], 0, summary["error_types"])
+                self.assertLessEqual(set(summary["tools"]), set(settings.mix))
+                self.assertGreater(summary["p99_ms"], 0)
+                self.assertEqual(timeline, summary["timeline"])
+                self.assertGreater(summary["rss_peak_mb"], 0)
+        self.assertIsNone(deadline.get_default_budget())
+
+    def test_closed_loop_sends_the_next_call_when_one_returns(self):
+        settings = LoadSettings(
+            sessions=2, rate=0, duration=0.3, latency=0.0, jitter=0.0, pages=1,
+            page_size=5,
+        )
+
+        summary = run_load(settings)
+
+        self.assertGreater(summary["completed"], settings.sessions)
+        self.assertEqual(summary["completed"], summary["offered"])
+        self.assertEqual(summary["errors"], 0, summary["error_types"])
+
+
+class TestScaling(unittest.TestCase):
+
+    def test_workers_serve_a_warm_shared_cache(self):
+        settings = ScalingSettings(
+            workers=(2,), drivers=1, sessions=2, duration=0.5, warmup=0.5,
+            distinct=2, latency=0.0, pages=1, page_size=5,
+        )
+
+        results = run_scaling(settings)
+
+        result = results["workers-2"]
+        self.assertEqual(result["errors"], 0)
+        self.assertGreater(result["calls"], 0)
+        self.assertGreater(result["warmup_requests"], 0)
+        self.assertLess(result["requests_per_call"], 0.5)
+        self.assertEqual((result["speedup"], result["efficiency"]), (1.0, 1.0))
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_sessions_are_timed_cold_and_through_the_launcher(self):
+        results = run_startup(StartupSettings(runs=1, warmup=0))
+
+        self.assertEqual(set(results), {"stdio", "launcher"})
+        for result in results.values():
+            self.assertEqual((result["runs"], result["errors"]), (1, 0))
+            self.assertGreater(result["p50_ms"], result["ready_p50_ms"])
+            # Every session starts with an empty cache, so its call reaches OLS
+            self.assertEqual(result["requests_per_call"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
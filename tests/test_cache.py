@@ -0,0 +1,247 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+import httpx
+import requests
+
+from ols_mcp import cache, client
+from ols_mcp.api import (
+    get_ontology_details,
+    get_ontology_details_async,
+    search_ontologies,
+)
+from tests.helpers import json_response
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCacheKey(unittest.TestCase):
+
+    def test_parameter_order_and_bool_spelling_do_not_matter(self):
+        self.assertEqual(
+            cache.cache_key("https://WWW.EBI.AC.UK/ols/api/search", {"q": "x", "exact": True}),
+            cache.cache_key("https://www.ebi.ac.uk/ols/api/search", {"exact": "true", "q": "x"}),
+        )
+
+    def test_none_parameters_are_ignored(self):
+        self.assertEqual(
+            cache.cache_key("https://www.ebi.ac.uk/ols/api/search", {"q": "x", "ontology": None}),
+            cache.cache_key("https://www.ebi.ac.uk/ols/api/search?q=x"),
+        )
+
+    def test_different_values_differ(self):
+        self.assertNotEqual(
+            cache.cache_key("https://www.ebi.ac.uk/ols/api/search", {"q": "x"}),
+            cache.cache_key("https://www.ebi.ac.uk/ols/api/search", {"q": "y"}),
+        )
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_entries_expire_after_ttl(self):
+        store = cache.ResponseCache(clock=self.clock)
+        store.set("a", b"{}", ttl=10)
+
+        self.assertEqual(store.get("a"), b"{}")
+        self.clock.now += 10
+        self.assertIsNone(store.get("a"))
+
+        stats = store.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["expirations"]), (1, 1, 1))
+
+    def test_evicts_least_recently_used_by_count(self):
+        store = cache.ResponseCache(max_entries=2, clock=self.clock)
+        store.set("a", b"1", ttl=60)
+        store.set("b", b"2", ttl=60)
+        store.get("a")
+        store.set("c", b"3", ttl=60)
+
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(store.get("a"), b"1")
+        self.assertEqual(store.get("c"), b"3")
+        self.assertEqual(store.stats()["evictions"], 1)
+
+    def test_evicts_by_byte_size(self):
+        store = cache.ResponseCache(max_bytes=10, clock=self.clock)
+        store.set("a", b"12345", ttl=60)
+        store.set("b", b"12345", ttl=60)
+        store.set("c", b"123", ttl=60)
+
+        self.assertEqual(len(store), 2)
+        self.assertIsNone(store.get("a"))
+        self.assertEqual(store.stats()["bytes"], 8)
+
+    def test_oversized_bodies_are_not_cached(self):
+        store = cache.ResponseCache(max_bytes=4, clock=self.clock)
+        store.set("a", b"12345", ttl=60)
+
+        self.assertEqual(len(store), 0)
+
+    def test_ttl_follows_endpoint(self):
+        store = cache.ResponseCache(ttls={"search": 1})
+
+        self.assertEqual(store.ttl_for("https://www.ebi.ac.uk/ols/api/search"), 1)
+        self.assertEqual(
+            store.ttl_for("https://www.ebi.ac.uk/ols/api/ontologies/go"),
+            cache.DEFAULT_TTLS["ontology"],
+        )
+
+
+class TestCachedAPI(unittest.TestCase):
+
+    @patch("ols_mcp.client.get_session")
+    def test_repeated_calls_hit_the_cache(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = lambda *args, **kwargs: json_response({"ontologyId": "go"})
+
+        first = get_ontology_details("go")
+        first["ontologyId"] = "mutated"
+        second = get_ontology_details("go")
+
+        self.assertEqual(second["ontologyId"], "go")
+        mock_get.assert_called_once()
+        self.assertEqual(cache.get_cache().stats()["hits"], 1)
+
+    @patch("ols_mcp.client.get_session")
+    def test_use_cache_false_bypasses_the_cache(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = lambda *args, **kwargs: json_response({"response": {"docs": []}})
+
+        search_ontologies("apoptosis")
+        search_ontologies("apoptosis", use_cache=False)
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("ols_mcp.client.get_session")
+    def test_errors_are_not_cached(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = [
+            json_response({}, status_code=503),
+            json_response({"ontologyId": "go"}),
+        ]
+
+        with self.assertRaises(requests.HTTPError):
+            get_ontology_details("go")
+        self.assertEqual(get_ontology_details("go")["ontologyId"], "go")
+
+
+class TestConditionalRequests(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        cache.set_cache(cache.ResponseCache(clock=self.clock, ttls={"ontology": 60}))
+
+    @patch("ols_mcp.client.get_session")
+    def test_expired_entry_is_revalidated_with_validators(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = [
+            json_response(
+                {"ontologyId": "go", "version": "1"},
+                headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+            ),
+            json_response(None, status_code=304),
+        ]
+
+        get_ontology_details("go")
+        self.clock.now += 61
+        result = get_ontology_details("go")
+
+        self.assertEqual(result["version"], "1")
+        self.assertEqual(
+            mock_get.call_args.kwargs["headers"],
+            {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"},
+        )
+        self.assertEqual(cache.get_cache().stats()["revalidations"], 1)
+
+        # The 304 made the entry fresh again
+        get_ontology_details("go")
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("ols_mcp.client.get_session")
+    def test_changed_resource_replaces_the_entry(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = [
+            json_response({"version": "1"}, headers={"ETag": '"v1"'}),
+            json_response({"version": "2"}, headers={"ETag": '"v2"'}),
+            json_response(None, status_code=304),
+        ]
+
+        get_ontology_details("go")
+        self.clock.now += 61
+        self.assertEqual(get_ontology_details("go")["version"], "2")
+        self.clock.now += 61
+        self.assertEqual(get_ontology_details("go")["version"], "2")
+
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {"If-None-Match": '"v2"'})
+
+    @patch("ols_mcp.client.get_session")
+    def test_fresh_requests_carry_no_validators(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.return_value = json_response({"version": "1"}, headers={"ETag": '"v1"'})
+
+        get_ontology_details("go")
+
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {})
+
+
+class TestConditionalRequestsAsync(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncTearDown(self):
+        await client.aclose()
+
+    async def test_304_reuses_cached_body(self):
+        clock = FakeClock()
+        cache.set_cache(cache.ResponseCache(clock=clock, ttls={"ontology": 60}))
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"version": "1"}, headers={"ETag": '"v1"'})
+
+        client.set_async_client(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+        await get_ontology_details_async("go")
+        clock.now += 61
+        result = await get_ontology_details_async("go")
+
+        self.assertEqual(result, {"version": "1"})
+        self.assertEqual(seen, [None, '"v1"'])
+
+    async def test_cache_is_not_read_or_written_on_the_event_loop(self):
+        loop_thread = threading.get_ident()
+        threads = []
+
+        class RecordingCache(cache.ResponseCache):
+            def lookup(self, key):
+                threads.append(threading.get_ident())
+                return super().lookup(key)
+
+            def set(self, *args, **kwargs):
+                threads.append(threading.get_ident())
+                super().set(*args, **kwargs)
+
+        cache.set_cache(RecordingCache())
+        client.set_async_client(httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+        ))
+
+        await get_ontology_details_async("go")
+
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(loop_thread, threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import subprocess
+import sys
+import unittest
+from unittest.mock import Mock
+
+import requests
+
+from ols_mcp import client
+from ols_mcp.api import get_ontology_details
+from tests.helpers import json_response
+
+
+class TestOLSClient(unittest.TestCase):
+
+    def tearDown(self):
+        client.configure(client.ClientConfig())
+
+    def test_session_is_shared(self):
+        self.assertIs(client.get_session(), client.get_session())
+
+    def test_pool_settings_applied_to_adapters(self):
+        client.configure(pool_connections=2, pool_maxsize=7, pool_block=True)
+        adapter = client.get_session().get_adapter("https://www.ebi.ac.uk")
+
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertTrue(adapter._pool_block)
+
+    def test_headers_follow_config(self):
+        session = client.build_session(
+            client.ClientConfig(keep_alive=False, compression=False)
+        )
+
+        self.assertEqual(session.headers["Connection"], "close")
+        self.assertEqual(session.headers["Accept-Encoding"], "identity")
+
+        session = client.build_session(client.ClientConfig())
+        self.assertEqual(session.headers["Connection"], "keep-alive")
+        self.assertIn("gzip", session.headers["Accept-Encoding"])
+
+    def test_configure_rebuilds_session(self):
+        first = client.get_session()
+        client.configure(read_timeout=1.0)
+
+        self.assertIsNot(client.get_session(), first)
+        self.assertEqual(client.get_config().timeout, (5.0, 1.0))
+
+    def test_set_session_is_used_by_api(self):
+        mock_session = Mock(spec=requests.Session)
+        mock_session.get.return_value = json_response({"ontologyId": "go"})
+        client.configure(connect_timeout=2.0, read_timeout=3.0)
+        client.set_session(mock_session)
+
+        result = get_ontology_details("go")
+
+        self.assertEqual(result["ontologyId"], "go")
+        mock_session.get.assert_called_once_with(
+            "https://www.ebi.ac.uk/ols/api/ontologies/go",
+            params=None,
+            headers={},
+            timeout=(2.0, 3.0),
+        )
+
+    def test_server_import_leaves_requests_unloaded(self):
+        # The MCP server only uses the async client; requests loads on first use
+        script = "import sys, ols_mcp.main; print('requests' in sys.modules)"
+        output = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        ).stdout
+
+        self.assertEqual(output.strip(), "False")
+
+    def test_async_clients_share_one_ssl_context(self):
+        first = client.build_async_client(client.get_config())
+        second = client.build_async_client(client.get_config())
+
+        self.assertIs(
+            first._transport._pool._ssl_context, second._transport._pool._ssl_context
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
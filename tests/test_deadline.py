@@ -0,0 +1,213 @@
+import asyncio
+import json
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+import requests
+from fastmcp import Client
+
+from ols_mcp import client, deadline, retry
+from ols_mcp.main import mcp
+from ols_mcp.retry import RetryPolicy
+from ols_mcp.tools import (
+    get_ontology_info,
+    get_terms_from_ontology,
+    get_terms_from_ontology_async,
+    resolve_ontology_terms,
+    search_all_ontologies_batch_async,
+)
+from tests.helpers import json_response
+
+
+def terms_page(page: int) -> dict:
+    return {
+        "_embedded": {
+            "terms": [{"id": f"GO:{page}{i:03d}"} for i in range(20)]
+        },
+        "page": {"number": page, "totalPages": 3},
+    }
+
+
+class TestBudget(unittest.TestCase):
+
+    def test_inner_budget_never_extends_the_outer_one(self):
+        self.assertIsNone(deadline.remaining())
+        with deadline.budget(0.5):
+            with deadline.budget(60):
+                self.assertLessEqual(deadline.remaining(), 0.5)
+            with deadline.budget(0.1):
+                self.assertLessEqual(deadline.remaining(), 0.1)
+        self.assertIsNone(deadline.remaining())
+
+    def test_default_budget_applies_when_none_is_given(self):
+        deadline.set_default_budget(2.0)
+        with deadline.budget():
+            self.assertGreater(deadline.remaining(), 1.0)
+        with deadline.budget(0.5):
+            self.assertLessEqual(deadline.remaining(), 0.5)
+
+    def test_clip_shortens_timeouts_and_fails_once_expired(self):
+        self.assertEqual(deadline.clip((5.0, 30.0)), (5.0, 30.0))
+        with deadline.budget(1.0):
+            connect, read = deadline.clip((5.0, 30.0))
+            self.assertLessEqual(max(connect, read), 1.0)
+        with deadline.budget(0.0):
+            with self.assertRaises(deadline.DeadlineExceeded):
+                deadline.clip((5.0, 30.0))
+
+
+class TestToolDeadlines(unittest.TestCase):
+
+    @patch("ols_mcp.client.get_session")
+    def test_terms_are_returned_partially_when_time_runs_out(self, mock_get_session):
+        def fake_get(url, params=None, timeout=None, **kwargs):
+            if params.get("page", 0) == 0:
+                return json_response(terms_page(0))
+            # Later pages stall until the (clipped) read timeout fires
+            time.sleep(min(timeout[1], 5))
+            raise requests.ReadTimeout("stalled")
+
+        mock_get_session.return_value.get.side_effect = fake_get
+        started = time.monotonic()
+
+        with deadline.collect_cutoffs() as cutoffs:
+            result = get_terms_from_ontology("go", max_results=60, timeout=0.3)
+
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertEqual(len(result), 20)
+        self.assertIsInstance(result, deadline.PartialList)
+        self.assertEqual(
+            cutoffs, ["Time budget ran out after 20 terms were fetched from go"]
+        )
+
+    @patch("ols_mcp.client.get_session")
+    def test_batch_lookups_keep_what_finished_in_time(self, mock_get_session):
+        def fake_get(url, params=None, timeout=None, **kwargs):
+            if params.get("short_form") == "GO_0008150":
+                return json_response({"_embedded": {"terms": [{"label": "bp"}]}})
+            time.sleep(min(timeout[1], 5))
+            raise requests.ReadTimeout("stalled")
+
+        mock_get_session.return_value.get.side_effect = fake_get
+
+        with deadline.collect_cutoffs() as cutoffs:
+            result = resolve_ontology_terms(
+                ["GO:0008150", "GO:0005739"], timeout=0.3
+            )
+
+        self.assertEqual(result["GO:0008150"]["label"], "bp")
+        self.assertEqual(result["GO:0005739"]["error"], "deadline_exceeded")
+        self.assertEqual(
+            cutoffs, ["Time budget ran out before 1 of 2 lookups finished"]
+        )
+
+    # Pin the jitter, which could otherwise pick a wait short enough to fit
+    @patch("ols_mcp.retry.random.uniform", return_value=5.0)
+    @patch("ols_mcp.client.get_session")
+    def test_retries_stop_when_the_backoff_would_overrun(
+        self, mock_get_session, mock_uniform
+    ):
+        retry.configure(RetryPolicy(backoff_base=10.0))
+        mock_get = mock_get_session.return_value.get
+        mock_get.return_value = json_response({}, 503)
+
+        with self.assertRaises(requests.HTTPError):
+            get_ontology_info("go", timeout=0.5)
+        mock_get.assert_called_once()
+
+
+class TestToolDeadlinesAsync(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncTearDown(self):
+        await client.aclose()
+
+    async def test_terms_are_returned_partially_when_time_runs_out(self):
+        async def handler(request):
+            page = int(request.url.params.get("page", 0))
+            if page > 0:
+                await asyncio.sleep(5)
+            return httpx.Response(200, json=terms_page(page))
+
+        client.set_async_client(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        started = time.monotonic()
+
+        with deadline.collect_cutoffs() as cutoffs:
+            result = await get_terms_from_ontology_async(
+                "go", max_results=60, timeout=0.3
+            )
+
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertEqual(len(result), 20)
+        self.assertIsInstance(result, deadline.PartialList)
+        self.assertEqual(len(cutoffs), 1)
+
+    async def test_mcp_clients_are_warned_about_cut_off_results(self):
+        async def handler(request):
+            page = int(request.url.params.get("page", 0))
+            if page > 0:
+                await asyncio.sleep(5)
+            return httpx.Response(200, json=terms_page(page))
+
+        client.set_async_client(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        warnings = []
+
+        async def log_handler(message):
+            warnings.append((message.level, message.data))
+
+        async with Client(mcp, log_handler=log_handler) as session:
+            result = await session.call_tool(
+                "get_terms_from_ontology",
+                {"ontology_id": "go", "max_results": 60, "timeout": 0.3},
+            )
+
+        self.assertEqual(len(json.loads(result.content[0].text)), 20)
+        self.assertEqual(
+            result.content[1].text,
+            "Time budget ran out after 20 terms were fetched from go",
+        )
+        self.assertTrue(result.structured_content["deadline_exceeded"])
+        self.assertEqual(len(result.data), 20)
+        self.assertEqual(warnings, [
+            ("warning", "Time budget ran out after 20 terms were fetched from go"),
+        ])
+
+    async def test_complete_results_are_not_flagged(self):
+        async def handler(request):
+            return httpx.Response(200, json=terms_page(0))
+
+        client.set_async_client(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+        async with Client(mcp) as session:
+            result = await session.call_tool(
+                "get_terms_from_ontology", {"ontology_id": "go", "max_results": 5}
+            )
+
+        self.assertEqual(len(result.content), 1)
+        self.assertNotIn("deadline_exceeded", result.structured_content)
+
+    async def test_batch_searches_keep_what_finished_in_time(self):
+        async def handler(request):
+            if request.url.params["q"] == "slow":
+                # Honour the clipped read timeout like a real transport
+                await asyncio.sleep(request.extensions["timeout"]["read"])
+                raise httpx.ReadTimeout("stalled", request=request)
+            return httpx.Response(200, json={"response": {"docs": [{"label": "x"}]}})
+
+        client.set_async_client(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+        with deadline.collect_cutoffs() as cutoffs:
+            result = await search_all_ontologies_batch_async(
+                ["fast", "slow"], timeout=0.3
+            )
+
+        self.assertEqual([hit["label"] for hit in result["fast"]], ["x"])
+        self.assertEqual(result["slow"]["error"], "deadline_exceeded")
+        self.assertEqual(
+            cutoffs, ["Time budget ran out before 1 of 2 searches finished"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
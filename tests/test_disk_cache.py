@@ -0,0 +1,248 @@
+import sqlite3
+import tempfile
+import threading
+import unittest
+import zlib
+from pathlib import Path
+from unittest.mock import patch
+
+from ols_mcp import cache, client, metrics
+from ols_mcp.api import get_ontology_details, get_ontology_details_async
+from ols_mcp.disk_cache import DiskCache, default_cache_path
+from tests.helpers import json_response, run_forked
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "nested" / "responses.sqlite3"
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_is_compressed(self):
+        store = DiskCache(self.path, clock=self.clock)
+        body = b'{"terms": "' + b"x" * 10_000 + b'"}'
+        store.set("k", body, ttl=60)
+
+        self.assertEqual(store.get("k")[:2], (body, self.clock.now + 60))
+        self.assertLess(store.stats()["bytes"], len(body) / 10)
+
+    def test_expired_entries_only_returned_when_stale_allowed(self):
+        store = DiskCache(self.path, clock=self.clock)
+        store.set("k", b"{}", ttl=60)
+        self.clock.now += 61
+
+        self.assertIsNone(store.get("k"))
+        self.assertEqual(store.get("k", allow_stale=True)[0], b"{}")
+
+    def test_evicts_least_recently_read(self):
+        store = DiskCache(
+            self.path, max_bytes=70, compress_level=0, clock=self.clock, touch_interval=0
+        )
+        for key in ("a", "b", "c"):
+            self.clock.now += 1
+            store.set(key, b"0123456789", ttl=60)
+        self.clock.now += 1
+        store.get("a")
+        self.clock.now += 1
+        store.set("d", b"0123456789", ttl=60)
+
+        self.assertIsNotNone(store.get("a"))
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(store.stats()["entries"], 3)
+
+    def test_stats_follow_every_write(self):
+        store = DiskCache(self.path, compress_level=0, clock=self.clock)
+        store.set("a", b"0123456789", ttl=60)
+        store.set("b", b"0123456789", ttl=60)
+        store.set("a", b"01234", ttl=60)
+        store.delete("b")
+        stored_size = len(zlib.compress(b"01234", 0))
+
+        self.assertEqual(store.stats()["entries"], 1)
+        self.assertEqual(store.stats()["bytes"], stored_size)
+        store.clear()
+        self.assertEqual(store.stats()["entries"], 0)
+        self.assertEqual(store.stats()["bytes"], 0)
+
+    def test_totals_are_seeded_from_existing_entries(self):
+        self.path.parent.mkdir(parents=True)
+        with sqlite3.connect(self.path) as connection:
+            connection.execute(
+                "CREATE TABLE responses (key TEXT PRIMARY KEY, body BLOB NOT NULL, "
+                "stored_size INTEGER NOT NULL, expires_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL, etag TEXT, last_modified TEXT)"
+            )
+            connection.execute(
+                "INSERT INTO responses VALUES ('k', x'00', 40, 0, 0, NULL, NULL)"
+            )
+
+        store = DiskCache(self.path, clock=self.clock)
+
+        self.assertEqual(store.stats()["entries"], 1)
+        self.assertEqual(store.stats()["bytes"], 40)
+
+    def test_reads_record_their_time_at_most_once_per_interval(self):
+        store = DiskCache(self.path, clock=self.clock, touch_interval=60)
+        store.set("k", b"{}", ttl=3600)
+        stored_at = self.clock.now
+
+        def accessed_at():
+            with sqlite3.connect(self.path) as connection:
+                return connection.execute("SELECT accessed_at FROM responses").fetchone()[0]
+
+        self.clock.now += 30
+        store.get("k")
+        self.assertEqual(accessed_at(), stored_at)
+        self.clock.now += 30
+        store.get("k")
+        self.assertEqual(accessed_at(), self.clock.now)
+
+    def test_shared_between_instances(self):
+        writer = DiskCache(self.path, clock=self.clock)
+        reader = DiskCache(self.path, clock=self.clock)
+        writer.set("k", b"shared", ttl=60)
+
+        self.assertEqual(reader.get("k")[0], b"shared")
+        with sqlite3.connect(self.path) as connection:
+            (mode,) = connection.execute("PRAGMA journal_mode").fetchone()
+        self.assertEqual(mode, "wal")
+
+    def test_forked_process_opens_its_own_connection(self):
+        store = DiskCache(self.path, clock=self.clock)
+        store.set("parent", b"1", ttl=60)
+
+        def write_from_child():
+            assert store.get("parent").body == b"1"
+            store.set("child", b"2", ttl=60)
+
+        self.assertEqual(run_forked(write_from_child), 0)
+        self.assertEqual(store.get("child").body, b"2")
+        self.assertEqual(store.get("parent").body, b"1")
+
+    def test_validators_and_touch(self):
+        store = DiskCache(self.path, clock=self.clock)
+        store.set("k", b"{}", ttl=60, etag='"v1"', last_modified="yesterday")
+        self.clock.now += 61
+        store.touch("k", ttl=60)
+
+        stored = store.get("k")
+        self.assertEqual(stored.etag, '"v1"')
+        self.assertEqual(stored.last_modified, "yesterday")
+        self.assertEqual(stored.expires_at, self.clock.now + 60)
+
+    def test_upgrades_files_without_validator_columns(self):
+        self.path.parent.mkdir(parents=True)
+        with sqlite3.connect(self.path) as connection:
+            connection.execute(
+                "CREATE TABLE responses (key TEXT PRIMARY KEY, body BLOB NOT NULL, "
+                "stored_size INTEGER NOT NULL, expires_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL)"
+            )
+
+        store = DiskCache(self.path, clock=self.clock)
+        store.set("k", b"{}", ttl=60, etag='"v1"')
+
+        self.assertEqual(store.get("k").etag, '"v1"')
+
+    def test_default_path_honours_environment(self):
+        with patch.dict("os.environ", {"OLS_MCP_CACHE_DIR": self.tmp.name}):
+            self.assertEqual(default_cache_path(), Path(self.tmp.name) / "responses.sqlite3")
+
+
+class TestPersistentResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "responses.sqlite3"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @patch("ols_mcp.client.get_session")
+    def test_survives_a_restart(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.return_value = json_response({"ontologyId": "go"})
+        cache.configure(disk_path=self.path)
+        get_ontology_details("go")
+
+        # A fresh process starts with an empty memory cache over the same file
+        restarted = cache.configure(disk_path=self.path)
+        self.assertEqual(get_ontology_details("go")["ontologyId"], "go")
+
+        mock_get.assert_called_once()
+        self.assertEqual(restarted.stats()["disk_hits"], 1)
+
+    @patch("ols_mcp.client.get_session")
+    def test_offline_mode_serves_stale_entries_and_fails_fast(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.return_value = json_response({"ontologyId": "go"})
+        cache.configure(disk_path=self.path, ttls={"ontology": 0.001})
+        get_ontology_details("go")
+
+        cache.configure(disk_path=self.path)
+        client.configure(offline=True)
+
+        self.assertEqual(get_ontology_details("go")["ontologyId"], "go")
+        with self.assertRaises(cache.OfflineCacheMiss):
+            get_ontology_details("uberon")
+        mock_get.assert_called_once()
+
+    @patch("ols_mcp.client.get_session")
+    def test_metrics_scrapes_leave_the_disk_alone(self, mock_get_session):
+        mock_get_session.return_value.get.return_value = json_response({})
+        cache.configure(disk_path=self.path)
+        get_ontology_details("go")
+
+        with patch.object(DiskCache, "stats") as disk_stats:
+            metrics.render_prometheus()
+        disk_stats.assert_not_called()
+
+
+class TestOfflineAsync(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "responses.sqlite3"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @patch("ols_mcp.client.get_session")
+    async def test_offline_reads_run_off_the_event_loop(self, mock_get_session):
+        mock_get_session.return_value.get.return_value = json_response(
+            {"ontologyId": "go"}
+        )
+        cache.configure(disk_path=self.path)
+        get_ontology_details("go")
+        client.configure(offline=True)
+        loop_thread = threading.get_ident()
+        read_from = []
+        original_get = DiskCache.get
+
+        def recording_get(store, *args, **kwargs):
+            read_from.append(threading.get_ident())
+            return original_get(store, *args, **kwargs)
+
+        cache.configure(disk_path=self.path)
+        with patch.object(DiskCache, "get", recording_get):
+            details = await get_ontology_details_async("go")
+
+        self.assertEqual(details["ontologyId"], "go")
+        self.assertTrue(read_from)
+        self.assertNotIn(loop_thread, read_from)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from ols_mcp import launcher
+from ols_mcp.launcher import LauncherDaemon
+
+
+def shout() -> int:
+    sys.stdout.write(sys.stdin.readline().upper())
+    return 3
+
+
+class TestLauncher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "launcher.sock"
+
+    def start_daemon(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                LauncherDaemon(self.path, session=shout).serve()
+            finally:
+                os._exit(0)
+
+        def stop():
+            os.kill(pid, signal.SIGTERM)
+            os.waitpid(pid, 0)
+
+        self.addCleanup(stop)
+        while not launcher._is_listening(self.path):
+            time.sleep(0.01)
+        return pid
+
+    def launch(self) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [sys.executable, "-m", "ols_mcp.launcher"],
+            input="hello\n",
+            capture_output=True,
+            text=True,
+            timeout=30,
+            env={**os.environ, launcher.SOCKET_ENV: str(self.path)},
+        )
+
+    def test_sessions_run_in_the_daemon_on_the_callers_stdio(self):
+        self.start_daemon()
+
+        first, second = self.launch(), self.launch()
+
+        self.assertEqual((first.stdout, first.returncode), ("HELLO\n", 3))
+        self.assertEqual((second.stdout, second.returncode), ("HELLO\n", 3))
+
+    def test_socket_is_private_to_the_daemons_user(self):
+        self.start_daemon()
+
+        self.assertEqual(self.path.stat().st_mode & 0o777, 0o600)
+
+    @unittest.skipUnless(hasattr(socket, "SO_PEERCRED"), "needs SO_PEERCRED")
+    def test_connections_from_other_users_are_refused(self):
+        with patch.object(launcher, "_peer_uid", return_value=os.getuid() + 1):
+            self.start_daemon()
+
+        refused = self.launch()
+
+        # Depending on when the daemon hangs up, the launcher either reports
+        # a failed session or serves the session itself; the daemon never does
+        self.assertNotIn("HELLO", refused.stdout)
+        self.assertNotEqual(refused.returncode, 3)
+
+    def test_a_second_daemon_refuses_the_socket_in_use(self):
+        self.start_daemon()
+
+        with self.assertRaises(RuntimeError):
+            LauncherDaemon(self.path, session=shout).serve()
+
+    def test_stale_socket_is_replaced_and_removed_on_exit(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as crashed:
+            crashed.bind(str(self.path))
+        self.assertTrue(self.path.exists())
+
+        pid = self.start_daemon()
+        self.assertEqual(self.launch().stdout, "HELLO\n")
+
+        os.kill(pid, signal.SIGTERM)
+        while self.path.exists():
+            time.sleep(0.01)
+
+    @patch("ols_mcp.main.main")
+    def test_without_a_daemon_the_launcher_serves_itself(self, mock_main):
+        with patch.dict(os.environ, {launcher.SOCKET_ENV: str(self.path)}):
+            launcher.main(["--no-disk-cache"])
+
+        mock_main.assert_called_once_with(["--no-disk-cache"])
+
+
+if __name__ == "__main__":
+    unittest.main()
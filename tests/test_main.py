@@ -0,0 +1,180 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from ols_mcp import cache, client, deadline, mirror, querylog, retry, snapshot
+from ols_mcp.main import main
+
+
+class TestMain(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "responses.sqlite3"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @patch("ols_mcp.main.mcp.run")
+    def test_default_enables_disk_cache(self, mock_run):
+        main(["--cache-path", str(self.path), "--disk-cache-max-mb", "8"])
+
+        backend = cache.get_cache().backend
+        self.assertEqual(backend.path, self.path)
+        self.assertEqual(backend.max_bytes, 8 * 1024 * 1024)
+        self.assertFalse(client.get_config().offline)
+        mock_run.assert_called_once()
+
+    @patch("ols_mcp.main.mcp.run")
+    def test_offline_flag(self, mock_run):
+        main(["--offline", "--cache-path", str(self.path)])
+
+        self.assertTrue(client.get_config().offline)
+
+    @patch("ols_mcp.main.mcp.run")
+    def test_retry_and_timeout_options(self, mock_run):
+        main(["--no-disk-cache", "--max-attempts", "5", "--hedge"])
+
+        policy = retry.get_retrier().default
+        self.assertEqual(policy.max_attempts, 5)
+        self.assertTrue(policy.hedge)
+        self.assertEqual(deadline.get_default_budget(), 30.0)
+
+        main(["--no-disk-cache", "--tool-timeout", "0"])
+        self.assertIsNone(deadline.get_default_budget())
+
+    @patch("ols_mcp.main.mcp.run")
+    def test_offline_requires_disk_cache(self, mock_run):
+        with self.assertRaises(SystemExit):
+            main(["--offline", "--no-disk-cache"])
+        mock_run.assert_not_called()
+
+    @patch("ols_mcp.main.api.mirror_ontology", return_value=3)
+    @patch("ols_mcp.main.mcp.run")
+    def test_mirror_command_crawls_and_exits(self, mock_run, mock_mirror):
+        mirror_path = Path(self.tmp.name) / "mirror.sqlite3"
+
+        main([
+            "--cache-path", str(self.path), "--mirror-path", str(mirror_path),
+            "mirror", "go", "uberon", "--page-size", "100",
+        ])
+
+        self.assertEqual(mirror.get_mirror().path, mirror_path)
+        self.assertEqual(
+            [call.args for call in mock_mirror.call_args_list], [("go",), ("uberon",)]
+        )
+        self.assertEqual(mock_mirror.call_args.kwargs["page_size"], 100)
+        mock_run.assert_not_called()
+
+    @patch("ols_mcp.main.api.sync_ontology")
+    @patch("ols_mcp.main.mcp.run")
+    def test_sync_command_defaults_to_mirrored_ontologies(self, mock_run, mock_sync):
+        mirror_path = Path(self.tmp.name) / "mirror.sqlite3"
+        store = mirror.configure(mirror_path)
+        store.load("uberon", [])
+        store.start_crawl("go", mirror.OntologyState(), page_size=500)
+        mock_sync.return_value = {"ontology": "go", "status": "unchanged", "terms": 0}
+
+        main([
+            "--cache-path", str(self.path), "--mirror-path", str(mirror_path),
+            "sync", "--force",
+        ])
+
+        self.assertEqual(
+            [call.args for call in mock_sync.call_args_list], [("go",), ("uberon",)]
+        )
+        self.assertTrue(mock_sync.call_args.kwargs["force"])
+        mock_run.assert_not_called()
+
+    @patch("ols_mcp.main.mcp.run")
+    def test_snapshot_command_and_startup_mapping(self, mock_run):
+        mirror_path = Path(self.tmp.name) / "mirror.sqlite3"
+        snapshot_dir = Path(self.tmp.name) / "snapshots"
+        mirror.configure(mirror_path).load("go", [{"short_form": "GO_0008150"}])
+        args = [
+            "--cache-path", str(self.path), "--mirror-path", str(mirror_path),
+            "--snapshot-dir", str(snapshot_dir),
+        ]
+
+        main([*args, "snapshot"])
+        mock_run.assert_not_called()
+        self.assertTrue((snapshot_dir / "go.olsnap").exists())
+
+        main(args)
+        self.assertEqual(list(snapshot.get_snapshots()), ["go"])
+        self.assertEqual(snapshot.get_snapshot("go").find(short_form="GO_0008150"), 0)
+        snapshot.get_snapshot("go").close()
+
+        main([*args, "--no-snapshots"])
+        self.assertEqual(snapshot.get_snapshots(), {})
+
+    @patch("ols_mcp.main.mcp.run")
+    def test_server_uses_existing_mirror_only(self, mock_run):
+        mirror_path = Path(self.tmp.name) / "mirror.sqlite3"
+        args = ["--cache-path", str(self.path), "--mirror-path", str(mirror_path)]
+
+        main(args)
+        self.assertIsNone(mirror.get_mirror())
+
+        mirror.configure(mirror_path).close()
+        main(args)
+        self.assertEqual(mirror.get_mirror().path, mirror_path)
+
+        main([*args, "--no-mirror"])
+        self.assertIsNone(mirror.get_mirror())
+
+    @patch("ols_mcp.main.querylog.warm", return_value={
+        "queries": 2, "failed": 0, "seconds": 0.1,
+    })
+    @patch("ols_mcp.main.querylog.Warmer")
+    @patch("ols_mcp.main.mcp.run")
+    def test_query_log_and_warm_up_options(self, mock_run, mock_warmer, mock_warm):
+        log_path = Path(self.tmp.name) / "queries.jsonl"
+        args = ["--cache-path", str(self.path), "--query-log", str(log_path)]
+
+        main(args)
+        self.assertIsNone(querylog.get_log())
+        mock_warmer.assert_not_called()
+
+        main([
+            *args, "--record-queries", "--warm", "20", "--warm-interval", "600",
+            "--warm-concurrency", "2",
+        ])
+        self.assertEqual(querylog.get_log().path, log_path)
+        log, tools = mock_warmer.call_args.args
+        self.assertEqual(log.path, log_path)
+        self.assertIn("search_all_ontologies", tools)
+        kwargs = mock_warmer.call_args.kwargs
+        self.assertEqual(
+            (kwargs["top"], kwargs["concurrency"], kwargs["interval"]), (20, 2, 600.0)
+        )
+        mock_warmer.return_value.start.assert_called_once()
+        mock_warmer.return_value.stop.assert_called_once()
+
+        main([*args, "warm", "--top", "5"])
+        self.assertEqual(mock_warm.call_args.kwargs["top"], 5)
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch("ols_mcp.main.serve.serve_workers")
+    def test_forking_servers_warm_up_before_they_fork(self, mock_workers):
+        order = []
+        mock_workers.side_effect = lambda *args, **kwargs: order.append("fork")
+        args = [
+            "--cache-path", str(self.path), "--transport", "http", "--workers", "2",
+            "--warm", "10",
+        ]
+
+        with patch("ols_mcp.main.querylog.warm") as mock_warm:
+            mock_warm.side_effect = lambda *args, **kwargs: order.append("warm") or {
+                "queries": 0, "failed": 0, "seconds": 0.0,
+            }
+            main(args)
+
+        self.assertEqual(order, ["warm", "fork"])
+        with self.assertRaises(SystemExit):
+            main([*args, "--warm-interval", "600"])
+
+
+if __name__ == "__main__":
+    unittest.main()
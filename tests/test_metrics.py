@@ -0,0 +1,152 @@
+import unittest
+from unittest.mock import patch
+
+import requests
+from starlette.testclient import TestClient
+
+from ols_mcp import deadline, metrics
+from ols_mcp.api import get_ontology_details, get_ontology_terms
+from ols_mcp.main import mcp
+from ols_mcp.metrics import Histogram, Registry
+from tests.helpers import json_response
+
+
+def series(name: str, **labels) -> dict:
+    for entry in metrics.snapshot().get(name, []):
+        if entry["labels"] == labels:
+            return entry
+    raise AssertionError(f"no {name} series with labels {labels}")
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_quantiles_interpolate_within_buckets(self):
+        histogram = Histogram((1.0, 2.0, 4.0))
+        for value in (0.5, 1.5, 1.5, 3.0, 10.0):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["count"], 5)
+        self.assertEqual(snapshot["sum"], 16.5)
+        self.assertEqual(snapshot["buckets"], {"1": 1, "2": 3, "4": 4, "+Inf": 5})
+        self.assertAlmostEqual(histogram.quantile(0.5), 1.75)
+        self.assertEqual(histogram.quantile(0.99), 4.0)
+        self.assertIsNone(Histogram((1.0,)).quantile(0.5))
+
+
+class TestRegistry(unittest.TestCase):
+
+    def test_prometheus_text_format(self):
+        registry = Registry()
+        registry.inc("ols_tool_calls_total", tool="search", outcome="ok")
+        registry.inc("ols_tool_calls_total", tool="search", outcome="ok")
+        registry.observe("ols_tool_duration_seconds", 0.02, tool="search")
+        registry.add_collector(
+            lambda: [metrics.Sample("ols_up", "gauge", "Up", {"x": 'a"b'}, 1)]
+        )
+
+        text = registry.render()
+
+        self.assertIn("# TYPE ols_tool_calls_total counter", text)
+        self.assertIn('ols_tool_calls_total{outcome="ok",tool="search"} 2', text)
+        self.assertIn(
+            'ols_tool_duration_seconds_bucket{tool="search",le="0.01"} 0', text
+        )
+        self.assertIn(
+            'ols_tool_duration_seconds_bucket{tool="search",le="0.025"} 1', text
+        )
+        self.assertIn('ols_tool_duration_seconds_count{tool="search"} 1', text)
+        self.assertIn('ols_up{x="a\\"b"} 1', text)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_constant_labels_mark_every_series(self):
+        registry = Registry()
+        registry.set_constant_labels(worker=2)
+        registry.inc("ols_tool_calls_total", tool="search", outcome="ok")
+        registry.observe("ols_tool_duration_seconds", 0.02, tool="search")
+        registry.add_collector(lambda: [metrics.Sample("ols_up", "gauge", "Up", {}, 1)])
+
+        text = registry.render()
+
+        self.assertIn(
+            'ols_tool_calls_total{outcome="ok",tool="search",worker="2"} 1', text
+        )
+        self.assertIn(
+            'ols_tool_duration_seconds_bucket{tool="search",worker="2",le="0.025"} 1',
+            text,
+        )
+        self.assertIn('ols_up{worker="2"} 1', text)
+        calls = registry.snapshot()["ols_tool_calls_total"][0]
+        self.assertEqual(calls["labels"]["worker"], "2")
+
+
+class TestInstrumentation(unittest.IsolatedAsyncioTestCase):
+
+    @patch("ols_mcp.client.get_session")
+    def test_requests_are_timed_and_counted(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = [
+            json_response({"ontologyId": "go"}),
+            json_response({}, 503),
+        ]
+
+        get_ontology_details("go")
+        with self.assertRaises(requests.HTTPError):
+            get_ontology_details("uberon")
+
+        ok = series("ols_http_requests_total", endpoint="ontology", status="200")
+        failed = series("ols_http_requests_total", endpoint="ontology", status="503")
+        self.assertEqual((ok["value"], failed["value"]), (1, 1))
+        duration = series("ols_http_request_duration_seconds", endpoint="ontology")
+        self.assertEqual(duration["count"], 2)
+        self.assertGreater(
+            series("ols_http_response_bytes_total", endpoint="ontology")["value"], 0
+        )
+        self.assertEqual(series("ols_cache_misses_total")["value"], 2)
+
+    @patch("ols_mcp.client.get_session")
+    def test_pagination_depth_is_recorded(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = (
+            lambda url, params=None, **kwargs: json_response({
+                "_embedded": {"terms": [{"id": params.get("page", 0)}]},
+                "page": {"number": params.get("page", 0), "totalPages": 3},
+            })
+        )
+
+        get_ontology_terms("go", max_results=3, page_size=1)
+
+        pages = series("ols_pagination_pages", endpoint="terms")
+        self.assertEqual((pages["count"], pages["sum"]), (1, 3))
+
+    async def test_tool_outcomes(self):
+        async def partial():
+            deadline.report_cutoff("Time budget ran out after 0 terms")
+            return []
+
+        async def failing():
+            raise deadline.DeadlineExceeded("late")
+
+        await metrics.instrument_tool(partial, "terms")()
+        with self.assertRaises(deadline.DeadlineExceeded):
+            await metrics.instrument_tool(failing, "info")()
+
+        for tool in ("terms", "info"):
+            calls = series(
+                "ols_tool_calls_total", tool=tool, outcome="deadline_exceeded"
+            )
+            self.assertEqual(calls["value"], 1)
+        self.assertEqual(series("ols_tool_duration_seconds", tool="info")["count"], 1)
+
+    def test_metrics_route(self):
+        metrics.inc("ols_tool_calls_total", tool="search", outcome="ok")
+
+        with TestClient(mcp.http_app()) as http:
+            response = http.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn('ols_tool_calls_total{outcome="ok",tool="search"} 1', response.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,241 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import requests
+
+from ols_mcp import mirror
+from ols_mcp.api import (
+    mirror_ontology,
+    search_ontologies,
+    search_ontologies_async,
+    sync_ontology,
+)
+from ols_mcp.mirror import OntologyMirror, OntologyState
+from tests.helpers import json_response
+
+GO_TERMS = [
+    {
+        "iri": "http://purl.obolibrary.org/obo/GO_0005739",
+        "short_form": "GO_0005739",
+        "obo_id": "GO:0005739",
+        "label": "mitochondrion",
+        "description": ["A semiautonomous, self replicating organelle."],
+        "synonyms": ["mitochondria"],
+        "ontology_name": "go",
+        "ontology_prefix": "GO",
+    },
+    {
+        "iri": "http://purl.obolibrary.org/obo/GO_0007005",
+        "short_form": "GO_0007005",
+        "obo_id": "GO:0007005",
+        "label": "mitochondrion organization",
+        "description": ["A process that is carried out at the cellular level."],
+        "synonyms": [],
+        "ontology_name": "go",
+        "ontology_prefix": "GO",
+    },
+    {
+        "iri": "http://purl.obolibrary.org/obo/GO_0000001",
+        "short_form": "GO_0000001",
+        "obo_id": "GO:0000001",
+        "label": "mitochondrion inheritance",
+        "description": ["OBSOLETE."],
+        "is_obsolete": True,
+        "ontology_name": "go",
+        "ontology_prefix": "GO",
+    },
+    {
+        "iri": "http://purl.obolibrary.org/obo/GO_0008150",
+        "short_form": "GO_0008150",
+        "obo_id": "GO:0008150",
+        "label": "biological_process",
+        "description": ["A biological process is the execution of a program."],
+        "synonyms": ["physiological process"],
+        "ontology_name": "go",
+        "ontology_prefix": "GO",
+    },
+]
+
+
+class TestOntologyMirror(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = OntologyMirror(Path(self.tmp.name) / "mirror.sqlite3")
+        self.store.load("GO", iter(GO_TERMS))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_search_ranks_label_matches_and_skips_obsolete(self):
+        results = self.store.search("mitochondrion", ["go"])
+
+        self.assertEqual(
+            [result["obo_id"] for result in results], ["GO:0005739", "GO:0007005"]
+        )
+        self.assertEqual(results[0]["id"], "go:class:GO_0005739")
+        self.assertEqual(results[0]["type"], "class")
+        self.assertEqual(set(results[0]), {
+            "id", "iri", "short_form", "obo_id", "label", "description",
+            "ontology_name", "ontology_prefix", "type",
+        })
+
+    def test_search_matches_prefixes_synonyms_and_identifiers(self):
+        self.assertEqual(self.store.search("mito org", ["go"])[0]["obo_id"], "GO:0007005")
+        self.assertEqual(
+            self.store.search("physiological", ["go"])[0]["obo_id"], "GO:0008150"
+        )
+        self.assertEqual(self.store.search("GO:0008150", ["go"])[0]["label"], "biological_process")
+        self.assertEqual(self.store.search('"AND* (', ["go"]), [])
+
+    def test_exact_search_matches_whole_names_only(self):
+        self.assertEqual(
+            [r["obo_id"] for r in self.store.search("Mitochondria", ["go"], exact=True)],
+            ["GO:0005739"],
+        )
+        self.assertEqual(self.store.search("mito", ["go"], exact=True), [])
+
+    def test_reload_replaces_previous_terms(self):
+        self.assertEqual(self.store.load("go", GO_TERMS[3:]), 1)
+
+        self.assertEqual(self.store.search("mitochondrion", ["go"]), [])
+        self.assertEqual(self.store.stats()["go"]["terms"], 1)
+
+    def test_covers_only_fully_mirrored_searches(self):
+        self.assertTrue(self.store.covers(["GO"]))
+        self.assertFalse(self.store.covers(["go", "uberon"]))
+        self.assertFalse(self.store.covers(None))
+
+        self.store.remove("go")
+        self.assertFalse(self.store.covers(["go"]))
+
+
+class TestMirroredSearch(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = mirror.configure(Path(self.tmp.name) / "mirror.sqlite3")
+
+    def tearDown(self):
+        mirror.set_mirror(None)
+        self.store.close()
+        self.tmp.cleanup()
+
+    def fake_ols(self, version="2024-01-01", fail_page=None):
+        """Serve GO_TERMS two per page, optionally failing once on one page."""
+        self.term_pages = []
+
+        def fake_get(url, params=None, **kwargs):
+            nonlocal fail_page
+            if url.endswith("/ontologies/go"):
+                return json_response({
+                    "ontologyId": "go",
+                    "config": {"version": version},
+                    "updated": "2024-01-02T00:00:00",
+                    "loaded": "2024-01-02T00:00:00",
+                })
+            page = params["page"]
+            self.term_pages.append(page)
+            if page == fail_page:
+                fail_page = None
+                return json_response({}, status_code=503)
+            return json_response({
+                "_embedded": {"terms": GO_TERMS[page * 2 : page * 2 + 2]},
+                "page": {"number": page, "totalPages": 2},
+            })
+
+        return fake_get
+
+    @patch("ols_mcp.client.get_session")
+    def test_mirror_ontology_crawls_all_pages(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = self.fake_ols()
+
+        self.assertEqual(mirror_ontology("go", page_size=2), 4)
+        self.assertEqual(self.term_pages, [0, 1])
+        self.assertEqual(mock_get.call_args.kwargs["params"]["size"], 2)
+        self.assertEqual(
+            self.store.state("go"),
+            OntologyState("2024-01-01", "2024-01-02T00:00:00", "2024-01-02T00:00:00"),
+        )
+        self.assertEqual(self.store.crawls(), [])
+
+    @patch("ols_mcp.client.get_session")
+    def test_sync_skips_unchanged_and_recrawls_changed(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = self.fake_ols()
+        self.assertEqual(sync_ontology("go", page_size=2)["status"], "added")
+
+        self.term_pages.clear()
+        result = sync_ontology("go", page_size=2)
+        self.assertEqual(result, {"ontology": "go", "status": "unchanged", "terms": 4})
+        self.assertEqual(self.term_pages, [])
+
+        mock_get.side_effect = self.fake_ols(version="2024-02-01")
+        self.assertEqual(sync_ontology("go", page_size=2)["status"], "updated")
+        self.assertEqual(self.term_pages, [0, 1])
+        self.assertEqual(self.store.state("go").version, "2024-02-01")
+
+    @patch("ols_mcp.client.get_session")
+    def test_sync_resumes_interrupted_crawl(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        self.store.load("go", GO_TERMS[:1])
+        mock_get.side_effect = self.fake_ols(fail_page=1)
+
+        with self.assertRaises(requests.HTTPError):
+            sync_ontology("go", page_size=2, concurrency=1)
+        # The old copy keeps serving searches while the crawl is unfinished
+        self.assertEqual(self.store.stats()["go"]["terms"], 1)
+        self.assertEqual(self.store.crawl("go").next_page, 1)
+
+        mock_get.side_effect = self.fake_ols()
+        result = sync_ontology("go", page_size=2)
+
+        self.assertEqual(result["status"], "resumed")
+        self.assertEqual(result["terms"], 4)
+        self.assertEqual(self.term_pages, [1])
+        self.assertIsNone(self.store.crawl("go"))
+
+    @patch("ols_mcp.client.get_session")
+    async def test_search_uses_mirror_only_for_mirrored_ontologies(self, mock_get_session):
+        self.store.load("go", GO_TERMS)
+        mock_get = mock_get_session.return_value.get
+        mock_get.return_value = json_response({"response": {"docs": [{"label": "heart"}]}})
+
+        local = search_ontologies("biological process", ontologies=["go"])
+        local_async = await search_ontologies_async("biological process", ontologies=["go"])
+        mock_get.assert_not_called()
+        self.assertEqual(local[0]["obo_id"], "GO:0008150")
+        self.assertEqual(local_async, local)
+
+        remote = search_ontologies("heart", ontologies=["go", "uberon"])
+        self.assertEqual(remote, [{"label": "heart"}])
+        search_ontologies("heart")
+        self.assertEqual(mock_get.call_count, 2)
+
+    async def test_async_search_queries_the_mirror_off_the_event_loop(self):
+        self.store.load("go", GO_TERMS)
+        loop_thread = threading.get_ident()
+        searched_from = []
+        original_search = type(self.store).search
+
+        def recording_search(store, *args, **kwargs):
+            searched_from.append(threading.get_ident())
+            return original_search(store, *args, **kwargs)
+
+        with patch.object(type(self.store), "search", recording_search):
+            results = await search_ontologies_async(
+                "biological process", ontologies=["go"]
+            )
+
+        self.assertEqual(results[0]["obo_id"], "GO:0008150")
+        self.assertEqual(len(searched_from), 1)
+        self.assertNotEqual(searched_from[0], loop_thread)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import asyncio
+import io
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks.fake_ols import FakeOLS, FakeOLSConfig
+from ols_mcp import client, querylog, tools
+from ols_mcp.querylog import QueryLog, Warmer
+
+
+async def search(query: str, ontology: str | None = None, rows: int = 10,
+                 timeout: float | None = None) -> list:
+    if query == "fail":
+        raise RuntimeError("OLS is down")
+    return []
+
+
+class TestQueryLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.log = QueryLog(Path(self.tmp.name) / "logs" / "queries.jsonl")
+
+    def test_equivalent_calls_are_recorded_alike(self):
+        querylog.set_log(self.log)
+        recorded = querylog.record_tool(search, "search")
+
+        asyncio.run(recorded("cell"))
+        asyncio.run(recorded(query="cell", rows=10, timeout=5))
+        asyncio.run(recorded("cell", "go"))
+        with self.assertRaises(RuntimeError):
+            asyncio.run(recorded("fail"))
+
+        self.assertEqual(self.log.top(), [
+            ("search", {"query": "cell", "ontology": None, "rows": 10}, 2),
+            ("search", {"query": "cell", "ontology": "go", "rows": 10}, 1),
+        ])
+        self.assertEqual(self.log.stats()["recorded"], 3)
+
+    def test_nothing_is_recorded_without_a_log(self):
+        asyncio.run(querylog.record_tool(search, "search")("cell"))
+
+        self.assertFalse(self.log.path.exists())
+
+    def test_top_reads_the_rotated_file_and_skips_bad_lines(self):
+        self.log.max_bytes = 200
+        for query in ["a", "b", "b", "c", "c", "c"]:
+            self.log.record("search", {"query": query})
+        with open(self.log.path, "a") as log:
+            log.write("not json\n{\"tool\": \"search\"}\n")
+
+        self.assertTrue(self.log.rotated_path.exists())
+        self.assertEqual(
+            [(arguments["query"], calls) for _, arguments, calls in self.log.top(2)],
+            [("c", 3), ("b", 2)],
+        )
+
+    def test_a_log_rotated_by_another_process_is_not_rotated_again(self):
+        self.log.max_bytes = 200
+        other = QueryLog(self.log.path, max_bytes=200)
+        while not self.log.rotated_path.exists():
+            self.log.record("search", {"query": "cell"})
+        rotated = self.log.rotated_path.read_text()
+
+        # The other process saw the file over the limit before it was rotated
+        other._rotate()
+
+        self.assertEqual(self.log.rotated_path.read_text(), rotated)
+
+    def test_calls_are_written_off_the_event_loop(self):
+        querylog.set_log(self.log)
+        written_from = []
+        original_record = QueryLog.record
+
+        def recording_record(log, *args):
+            written_from.append(threading.get_ident())
+            original_record(log, *args)
+
+        async def call():
+            with patch.object(QueryLog, "record", recording_record):
+                await querylog.record_tool(search, "search")("cell")
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(call())
+
+        self.assertEqual(len(written_from), 1)
+        self.assertNotEqual(written_from[0], loop_thread)
+        self.assertEqual(self.log.stats()["recorded"], 1)
+
+    def test_unwritable_log_does_not_fail_the_call(self):
+        Path(self.tmp.name, "file").touch()
+        log = QueryLog(Path(self.tmp.name) / "file" / "queries.jsonl")
+
+        log.record("search", {"query": "cell"})
+
+        self.assertEqual((log.recorded, log.errors), (0, 1))
+
+
+class TestWarmUp(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.log = QueryLog(Path(self.tmp.name) / "queries.jsonl")
+
+    def test_most_frequent_calls_are_replayed_concurrently(self):
+        for query in ["a", "b", "b", "c", "c", "c", "gone"]:
+            self.log.record("search", {"query": query})
+        self.log.record("removed_tool", {})
+        running, peak, replayed = set(), [0], []
+        lock = threading.Lock()
+
+        def replay_search(query):
+            with lock:
+                running.add(query)
+                peak[0] = max(peak[0], len(running))
+            time.sleep(0.05)
+            with lock:
+                running.discard(query)
+                replayed.append(query)
+            if query == "gone":
+                raise RuntimeError("no such term")
+
+        result = querylog.warm(
+            self.log, {"search": replay_search}, top=10, concurrency=3
+        )
+
+        self.assertEqual(sorted(replayed), ["a", "b", "c", "gone"])
+        self.assertEqual((result["queries"], result["failed"]), (5, 2))
+        self.assertEqual(peak[0], 3)
+
+    def test_warm_up_fills_the_cache_the_server_reads(self):
+        self.log.record("get_ontology_info", {"ontology_id": "go"})
+        with FakeOLS(FakeOLSConfig()) as ols:
+            client.configure(base_url=ols.base_url)
+
+            result = querylog.warm(
+                self.log, {"get_ontology_info": tools.get_ontology_info}
+            )
+            warmed = ols.requests
+            info = asyncio.run(tools.get_ontology_info_async("go"))
+
+        self.assertEqual(result["failed"], 0)
+        self.assertEqual(warmed, 1)
+        self.assertEqual(ols.requests, 1)
+        self.assertEqual(info["id"], "go")
+
+    def test_warm_up_writes_nothing_to_stdout(self):
+        # stdout carries the stdio transport while a background warm-up runs
+        self.log.record("get_ontology_info", {"ontology_id": "go"})
+        stdout = io.StringIO()
+        with FakeOLS(FakeOLSConfig()) as ols, redirect_stdout(stdout):
+            client.configure(base_url=ols.base_url)
+            result = querylog.warm(
+                self.log, {"get_ontology_info": tools.get_ontology_info}
+            )
+
+        self.assertEqual(result["failed"], 0)
+        self.assertEqual(stdout.getvalue(), "")
+
+    def test_warmer_repeats_until_stopped(self):
+        self.log.record("search", {"query": "cell"})
+        results = []
+        warmer = Warmer(
+            self.log, {"search": lambda query: None}, interval=0.01,
+            report=results.append,
+        )
+
+        warmer.start()
+        while warmer.runs < 3:
+            time.sleep(0.01)
+        warmer.stop(timeout=5)
+        runs = warmer.runs
+        time.sleep(0.05)
+
+        self.assertEqual(warmer.runs, runs)
+        self.assertEqual(results[0]["queries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import httpx
+import requests
+
+from ols_mcp import client, deadline, ratelimit
+from ols_mcp.api import get_ontology_details, search_ontologies_async
+from ols_mcp.ratelimit import (
+    AdaptiveConcurrency,
+    EndpointLimiter,
+    EndpointLimits,
+    RateLimiter,
+    SharedTokenBucket,
+    TokenBucket,
+)
+from tests.helpers import json_response, run_forked
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_is_free_then_requests_are_spaced_by_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10.0, burst=3, clock=clock)
+
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+        self.assertAlmostEqual(bucket.reserve(), 0.2)
+
+        clock.now = 10.0
+        # Refill is capped at the burst size
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertGreater(bucket.reserve(), 0.0)
+
+
+class TestSharedTokenBucket(unittest.TestCase):
+
+    def test_forked_processes_draw_from_one_bucket(self):
+        bucket = SharedTokenBucket(rate=1.0, burst=3)
+
+        def drain_burst():
+            assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+        self.assertEqual(run_forked(drain_burst), 0)
+        self.assertGreater(bucket.reserve(), 0.5)
+
+    def test_shared_limiter_creates_every_endpoint_up_front(self):
+        limiter = ratelimit.configure(shared=True, similar={"rate": 2.0})
+
+        self.assertEqual(set(limiter.stats()), set(ratelimit.DEFAULT_LIMITS))
+        similar = limiter.for_url(
+            "https://www.ebi.ac.uk/ols/api/terms/x/llm_similar"
+        )
+        self.assertIsInstance(similar.bucket, SharedTokenBucket)
+        self.assertEqual(similar.bucket.rate, 2.0)
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limits = EndpointLimits(
+            initial_concurrency=4, min_concurrency=1, max_concurrency=6, cooldown=1.0
+        )
+        self.concurrency = AdaptiveConcurrency(self.limits, self.clock)
+
+    def test_healthy_responses_increase_the_limit_up_to_the_maximum(self):
+        for _ in range(5):
+            self.concurrency.acquire()
+            self.concurrency.release(overloaded=False)
+        self.assertEqual(self.concurrency.limit, 5)
+
+        for _ in range(100):
+            self.concurrency.acquire()
+            self.concurrency.release(overloaded=False)
+        self.assertEqual(self.concurrency.limit, 6)
+
+    def test_overload_halves_the_limit_once_per_cooldown(self):
+        for _ in range(3):
+            self.concurrency.acquire()
+            self.concurrency.release(overloaded=True)
+        self.assertEqual(self.concurrency.limit, 2)
+
+        self.clock.now = 1.5
+        for _ in range(3):
+            self.concurrency.acquire()
+            self.concurrency.release(overloaded=True)
+        self.assertEqual(self.concurrency.limit, 1)
+
+        self.clock.now = 3.0
+        self.concurrency.acquire()
+        self.concurrency.release(overloaded=True)
+        self.assertEqual(self.concurrency.limit, 1)
+        self.assertEqual(self.concurrency.stats()["backoffs"], 3)
+
+    def test_threads_wait_for_a_free_slot(self):
+        concurrency = AdaptiveConcurrency(EndpointLimits(initial_concurrency=2))
+        lock = threading.Lock()
+        running = peak = 0
+
+        def work():
+            nonlocal running, peak
+            concurrency.acquire()
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            concurrency.release(overloaded=True)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: work(), range(8)))
+
+        self.assertLessEqual(peak, 2)
+        self.assertEqual(concurrency.stats()["in_flight"], 0)
+
+
+class TestEndpointLimiter(unittest.TestCase):
+
+    def test_slow_and_failed_requests_count_as_overload(self):
+        clock = FakeClock()
+        limiter = EndpointLimiter(EndpointLimits(latency_target=1.0, cooldown=0.0), clock)
+
+        with limiter.request() as permit:
+            clock.now += 2.0
+            permit.record(200)
+        self.assertEqual(limiter.concurrency.limit, 2)
+
+        with limiter.request() as permit:
+            permit.record(503)
+        self.assertEqual(limiter.concurrency.limit, 1)
+
+        with self.assertRaises(ConnectionError):
+            with limiter.request():
+                raise ConnectionError("reset")
+        self.assertEqual(limiter.stats()["backoffs"], 3)
+
+    def test_requests_cut_off_by_the_callers_deadline_are_not_overload(self):
+        limiter = EndpointLimiter(EndpointLimits(cooldown=0.0), FakeClock())
+
+        with self.assertRaises(deadline.DeadlineExceeded):
+            with limiter.request():
+                raise deadline.DeadlineExceeded("late")
+        with deadline.budget(0.05):
+            with self.assertRaises(requests.ReadTimeout):
+                with limiter.request():
+                    time.sleep(0.06)
+                    raise requests.ReadTimeout("clipped to the deadline")
+
+        self.assertEqual(limiter.stats()["backoffs"], 0)
+
+    def test_endpoints_have_separate_limiters(self):
+        limiter = ratelimit.configure(similar={"rate": 1.0})
+
+        search = limiter.for_url("https://www.ebi.ac.uk/ols/api/search")
+        similar = limiter.for_url(
+            "https://www.ebi.ac.uk/ols4/api/v2/ontologies/go/entities/x/llm_similar"
+        )
+
+        self.assertIsNot(search, similar)
+        self.assertEqual(similar.limits.rate, 1.0)
+        self.assertEqual(similar.limits.burst, ratelimit.DEFAULT_LIMITS["similar"].burst)
+        self.assertIs(ratelimit.get_limiter(), limiter)
+
+
+class TestThrottledAPI(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncTearDown(self):
+        await client.aclose()
+
+    @patch("ols_mcp.client.get_session")
+    def test_server_errors_back_off_the_endpoint(self, mock_get_session):
+        limiter = RateLimiter()
+        ratelimit.set_limiter(limiter)
+        mock_get_session.return_value.get.return_value = json_response({}, 503)
+
+        with self.assertRaises(requests.HTTPError):
+            get_ontology_details("go")
+
+        stats = limiter.stats()["ontology"]
+        self.assertEqual(stats["limit"], 2)
+        self.assertEqual(stats["in_flight"], 0)
+
+    async def test_async_requests_respect_the_concurrency_limit(self):
+        ratelimit.configure(
+            search=EndpointLimits(initial_concurrency=2, max_concurrency=2)
+        )
+        running = peak = 0
+
+        async def handler(request):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return httpx.Response(200, json={"response": {"docs": []}})
+
+        client.set_async_client(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+        await asyncio.gather(
+            *(search_ontologies_async(f"query {i}") for i in range(6))
+        )
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(ratelimit.get_limiter().stats()["search"]["in_flight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
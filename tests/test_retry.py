@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+import requests
+
+from ols_mcp import client, retry
+from ols_mcp.api import get_ontology_details, get_ontology_details_async
+from ols_mcp.retry import EndpointRetrier, LatencyTracker, RetryPolicy
+from tests.helpers import json_response
+
+# Retries without waiting, so the tests only check what is sent
+FAST = RetryPolicy(backoff_base=0.0)
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_backoff_is_jittered_and_capped(self):
+        retrier = EndpointRetrier(RetryPolicy(backoff_base=1.0, backoff_max=3.0))
+
+        for number, ceiling in [(1, 1.0), (2, 2.0), (3, 3.0), (8, 3.0)]:
+            delays = [retrier.backoff(number) for _ in range(50)]
+            self.assertTrue(all(0 <= delay <= ceiling for delay in delays))
+            self.assertGreater(len(set(delays)), 1)
+
+    def test_retry_after_accepts_seconds_and_dates(self):
+        self.assertEqual(
+            retry.retry_after(json_response({}, 429, {"Retry-After": "7"})), 7.0
+        )
+        date = json_response({}, 429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        self.assertEqual(retry.retry_after(date), 0.0)
+        self.assertIsNone(retry.retry_after(json_response({}, 429)))
+        self.assertIsNone(
+            retry.retry_after(json_response({}, 429, {"Retry-After": "soon"}))
+        )
+
+    def test_latency_quantile_needs_enough_samples(self):
+        tracker = LatencyTracker()
+        for value in range(1, 101):
+            tracker.record(value / 100)
+
+        self.assertEqual(tracker.quantile(0.95), 0.96)
+        self.assertIsNone(tracker.quantile(0.95, min_samples=200))
+
+
+class TestRetries(unittest.TestCase):
+
+    def setUp(self):
+        retry.configure(FAST)
+
+    @patch("ols_mcp.client.get_session")
+    def test_server_errors_are_retried(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = [
+            json_response({}, 503),
+            json_response({}, 429, {"Retry-After": "0"}),
+            json_response({"ontologyId": "go"}),
+        ]
+
+        self.assertEqual(get_ontology_details("go")["ontologyId"], "go")
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(retry.get_retrier().stats()["ontology"]["retries"], 2)
+
+    @patch("ols_mcp.client.get_session")
+    def test_gives_up_after_max_attempts(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = lambda *args, **kwargs: json_response({}, 502)
+
+        with self.assertRaises(requests.HTTPError):
+            get_ontology_details("go")
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch("ols_mcp.client.get_session")
+    def test_timeouts_are_retried_but_client_errors_are_not(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = [
+            requests.ReadTimeout("stalled"),
+            json_response({}, 404),
+        ]
+
+        with self.assertRaises(requests.HTTPError):
+            get_ontology_details("go")
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("ols_mcp.client.get_session")
+    def test_long_retry_after_is_not_waited_for(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.return_value = json_response({}, 429, {"Retry-After": "3600"})
+
+        with self.assertRaises(requests.HTTPError):
+            get_ontology_details("go")
+        mock_get.assert_called_once()
+
+    @patch("ols_mcp.client.get_session")
+    def test_slow_request_is_hedged(self, mock_get_session):
+        retry.configure(RetryPolicy(hedge=True, hedge_delay=0.02))
+        stalled = threading.Event()
+        calls = 0
+
+        def fake_get(url, params=None, **kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                stalled.wait(1)
+                return json_response({"ontologyId": "slow"})
+            return json_response({"ontologyId": "go"})
+
+        mock_get_session.return_value.get.side_effect = fake_get
+        started = time.monotonic()
+        result = get_ontology_details("go")
+        stalled.set()
+
+        self.assertEqual(result["ontologyId"], "go")
+        self.assertLess(time.monotonic() - started, 0.5)
+        stats = retry.get_retrier().stats()["ontology"]
+        self.assertEqual((stats["hedges"], stats["hedge_wins"]), (1, 1))
+
+
+class TestRetriesAsync(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncTearDown(self):
+        await client.aclose()
+
+    async def test_transport_errors_are_retried(self):
+        retry.configure(FAST)
+        calls = 0
+
+        def handler(request):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise httpx.ConnectError("refused", request=request)
+            if calls == 2:
+                return httpx.Response(500, json={})
+            return httpx.Response(200, json={"ontologyId": "go"})
+
+        client.set_async_client(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+        result = await get_ontology_details_async("go")
+
+        self.assertEqual(result["ontologyId"], "go")
+        self.assertEqual(calls, 3)
+
+    async def test_hedged_loser_is_cancelled(self):
+        retry.configure(RetryPolicy(hedge=True, hedge_delay=0.02))
+        cancelled = []
+        calls = 0
+
+        async def handler(request):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+            return httpx.Response(200, json={"ontologyId": "go"})
+
+        client.set_async_client(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+        result = await asyncio.wait_for(get_ontology_details_async("go"), 1)
+
+        self.assertEqual(result["ontologyId"], "go")
+        self.assertEqual(cancelled, [True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import httpx
+
+from ols_mcp import client, deadline
+from ols_mcp.api import get_ontology_details, get_ontology_details_async
+from ols_mcp.singleflight import AsyncSingleFlight, SingleFlight
+from tests.helpers import json_response
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_share_one_result(self):
+        group = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def slow():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return {"value": 1}
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            first = executor.submit(group.do, "k", slow)
+            started.wait()
+            rest = [executor.submit(group.do, "k", slow) for _ in range(4)]
+            results = [first.result()] + [future.result() for future in rest]
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(group.stats(), {"calls": 1, "shared": 4, "in_flight": 0})
+
+    def test_errors_are_shared_and_later_calls_retry(self):
+        group = SingleFlight()
+        started = threading.Event()
+
+        def failing():
+            started.set()
+            time.sleep(0.05)
+            raise ValueError("boom")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(group.do, "k", failing)
+            started.wait()
+            second = executor.submit(group.do, "k", failing)
+            for future in (first, second):
+                with self.assertRaises(ValueError):
+                    future.result()
+
+        self.assertEqual(group.do("k", lambda: "fresh"), "fresh")
+
+    def test_waiting_caller_gives_up_at_its_own_deadline(self):
+        group = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "done"
+
+        def impatient():
+            with deadline.budget(0.05):
+                return group.do("k", slow)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(group.do, "k", slow)
+            started.wait()
+            with self.assertRaises(deadline.DeadlineExceeded):
+                executor.submit(impatient).result()
+            release.set()
+            self.assertEqual(leader.result(), "done")
+
+    def test_leaders_deadline_is_not_shared(self):
+        group = SingleFlight()
+        started = threading.Event()
+        calls = []
+
+        def call():
+            calls.append(1)
+            if len(calls) == 1:
+                started.set()
+                time.sleep(0.05)
+                raise deadline.DeadlineExceeded("leader ran out of time")
+            return "fresh"
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(group.do, "k", call)
+            started.wait()
+            follower = executor.submit(group.do, "k", call)
+            with self.assertRaises(deadline.DeadlineExceeded):
+                leader.result()
+            self.assertEqual(follower.result(), "fresh")
+
+        self.assertEqual(len(calls), 2)
+
+    @patch("ols_mcp.client.get_session")
+    def test_api_coalesces_identical_requests(self, mock_get_session):
+        def slow_get(url, params=None, **kwargs):
+            time.sleep(0.05)
+            return json_response({"ontologyId": "go"})
+
+        mock_get = mock_get_session.return_value.get
+        mock_get.side_effect = slow_get
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(lambda _: get_ontology_details("go", use_cache=False), range(4))
+            )
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertTrue(all(result["ontologyId"] == "go" for result in results))
+
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncTearDown(self):
+        await client.aclose()
+
+    async def test_api_coalesces_identical_requests(self):
+        requests_seen = []
+
+        async def handler(request):
+            requests_seen.append(request)
+            await asyncio.sleep(0.02)
+            return httpx.Response(200, json={"ontologyId": "go"})
+
+        client.set_async_client(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+        results = await asyncio.gather(
+            *(get_ontology_details_async("go", use_cache=False) for _ in range(5))
+        )
+
+        self.assertEqual(len(requests_seen), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    async def test_cancelling_one_waiter_keeps_the_call(self):
+        group = AsyncSingleFlight()
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(group.do("k", call))
+        second = asyncio.create_task(group.do("k", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual(await second, "done")
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+
+    async def test_waiting_caller_gives_up_at_its_own_deadline(self):
+        group = AsyncSingleFlight()
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "done"
+
+        async def impatient():
+            with deadline.budget(0.05):
+                return await group.do("k", call)
+
+        leader = asyncio.create_task(group.do("k", call))
+        await asyncio.sleep(0)
+        with self.assertRaises(deadline.DeadlineExceeded):
+            await impatient()
+        release.set()
+
+        self.assertEqual(await leader, "done")
+
+    async def test_leaders_deadline_is_not_shared(self):
+        group = AsyncSingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(0.02)
+                raise deadline.DeadlineExceeded("leader ran out of time")
+            return "fresh"
+
+        leader = asyncio.create_task(group.do("k", call))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(group.do("k", call))
+
+        with self.assertRaises(deadline.DeadlineExceeded):
+            await leader
+        self.assertEqual(await follower, "fresh")
+        self.assertEqual(len(calls), 2)
+
+    async def test_call_is_cancelled_once_every_waiter_leaves(self):
+        group = AsyncSingleFlight()
+        cancelled = asyncio.Event()
+
+        async def call():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.create_task(group.do("k", call))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+
+        self.assertTrue(cancelled.is_set())
+        self.assertEqual(group.stats()["in_flight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from ols_mcp import snapshot
+from ols_mcp.api import get_ontology_terms, resolve_terms
+from ols_mcp.mirror import OntologyMirror, OntologyState
+from ols_mcp.snapshot import Snapshot, snapshot_from_mirror, write_snapshot
+from tests.helpers import json_response
+from tests.test_mirror import GO_TERMS
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "go.olsnap"
+        self.state = OntologyState("2024-01-01", "2024-01-02", "2024-01-02")
+        self.assertEqual(write_snapshot(self.path, "GO", GO_TERMS, self.state), 4)
+        self.snapshot = Snapshot(self.path)
+
+    def tearDown(self):
+        self.snapshot.close()
+        self.tmp.cleanup()
+
+    def test_terms_round_trip_in_order(self):
+        self.assertEqual(len(self.snapshot), 4)
+        self.assertEqual(self.snapshot.ontology_id, "go")
+        self.assertEqual(self.snapshot.state, self.state)
+
+        term = self.snapshot.term(0)
+        self.assertEqual(term["id"], "go:class:GO_0005739")
+        self.assertEqual(term["obo_id"], "GO:0005739")
+        self.assertEqual(term["synonyms"], ["mitochondria"])
+        self.assertEqual(term["description"], GO_TERMS[0]["description"])
+        self.assertEqual(term["ontology_prefix"], "GO")
+        self.assertFalse(term["is_obsolete"])
+        self.assertTrue(self.snapshot.term(2)["is_obsolete"])
+        self.assertEqual(
+            [term["label"] for term in self.snapshot.terms(2)],
+            ["mitochondrion", "mitochondrion organization"],
+        )
+        with self.assertRaises(IndexError):
+            self.snapshot.term(4)
+
+    def test_find_by_identifier(self):
+        self.assertEqual(self.snapshot.find(short_form="GO_0008150"), 3)
+        self.assertEqual(self.snapshot.find(obo_id="GO:0007005"), 1)
+        self.assertEqual(
+            self.snapshot.find(iri="http://purl.obolibrary.org/obo/GO_0005739"), 0
+        )
+        self.assertIsNone(self.snapshot.find(short_form="GO_9999999"))
+        self.assertIsNone(self.snapshot.find(short_form="GO_0008150", obo_id="GO:1"))
+        self.assertIsNone(self.snapshot.find())
+
+    def test_rejects_other_files(self):
+        other = Path(self.tmp.name) / "other.olsnap"
+        other.write_bytes(b"not a snapshot at all")
+
+        with self.assertRaises(ValueError):
+            Snapshot(other)
+
+    def test_snapshot_from_mirror(self):
+        store = OntologyMirror(Path(self.tmp.name) / "mirror.sqlite3")
+        store.load("go", GO_TERMS, self.state)
+        directory = Path(self.tmp.name) / "snapshots"
+
+        path = snapshot_from_mirror(store, "go", directory)
+        store.close()
+
+        mapped = Snapshot(path)
+        self.assertEqual(mapped.term(3)["synonyms"], ["physiological process"])
+        self.assertEqual(mapped.state, self.state)
+        mapped.close()
+
+
+class TestSnapshotLookups(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        write_snapshot(Path(self.tmp.name) / "go.olsnap", "go", GO_TERMS)
+        snapshot.configure(self.tmp.name)
+
+    def tearDown(self):
+        for mapped in snapshot.get_snapshots().values():
+            mapped.close()
+        snapshot.set_snapshots({})
+        self.tmp.cleanup()
+
+    @patch("ols_mcp.client.get_session")
+    def test_term_lookups_use_snapshot(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+
+        self.assertEqual(len(get_ontology_terms("go", max_results=3)), 3)
+        terms = get_ontology_terms("go", obo_id="GO:0008150")
+        resolved = resolve_terms(["GO:0005739", "GO:9999999"])
+
+        mock_get.assert_not_called()
+        self.assertEqual(terms[0]["label"], "biological_process")
+        self.assertEqual(resolved["GO:0005739"]["label"], "mitochondrion")
+        self.assertIsNone(resolved["GO:9999999"])
+
+    @patch("ols_mcp.client.get_session")
+    def test_bypassing_cache_or_other_ontologies_ask_ols(self, mock_get_session):
+        mock_get = mock_get_session.return_value.get
+        mock_get.return_value = json_response({"_embedded": {"terms": []}})
+
+        get_ontology_terms("go", use_cache=False)
+        get_ontology_terms("uberon")
+
+        self.assertEqual(mock_get.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
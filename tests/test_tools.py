@@ -1,12 +1,19 @@
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, patch
 
 from ols_mcp.tools import (
     get_ontology_info,
+    get_ontology_info_async,
     get_similar_ontology_terms,
     get_terms_from_ontology,
+    get_terms_from_ontology_async,
+    resolve_ontology_terms,
     search_all_ontologies,
+    search_all_ontologies_async,
+    search_all_ontologies_batch,
+    search_all_ontologies_batch_async,
 )
+from tests.helpers import json_response
 
 
 class TestOLSTools(unittest.TestCase):
@@ -242,7 +249,7 @@ class TestOLSTools(unittest.TestCase):
         }
         self.assertEqual(result, expected_result)
 
-    @patch("ols_mcp.tools.get_ontology_terms")
+    @patch("ols_mcp.tools.iter_ontology_terms")
     def test_get_terms_from_ontology_basic(self, mock_get_terms):
         """Test basic get_terms_from_ontology functionality."""
         # Mock the API response
@@ -298,7 +305,7 @@ class TestOLSTools(unittest.TestCase):
         # Verify extra fields are filtered out
         self.assertNotIn("extra_field", result[0])
 
-    @patch("ols_mcp.tools.get_ontology_terms")
+    @patch("ols_mcp.tools.iter_ontology_terms")
     def test_get_terms_from_ontology_with_filters(self, mock_get_terms):
         """Test get_terms_from_ontology with filter parameters."""
         mock_get_terms.return_value = []
@@ -322,7 +329,7 @@ class TestOLSTools(unittest.TestCase):
             verbose=True,
         )
 
-    @patch("ols_mcp.tools.get_ontology_terms")
+    @patch("ols_mcp.tools.iter_ontology_terms")
     def test_get_terms_from_ontology_handles_missing_fields(self, mock_get_terms):
         """Test get_terms_from_ontology handles missing fields gracefully."""
         # Mock response with missing fields
@@ -355,12 +362,12 @@ class TestOLSTools(unittest.TestCase):
         self.assertEqual(result[0], expected_result)
 
 
-    @patch("ols_mcp.api.requests.get")
-    def test_get_similar_terms_for_ontology_id(self, mock_get_terms):
+    @patch("ols_mcp.client.get_session")
+    def test_get_similar_terms_for_ontology_id(self, mock_get_session):
         """Test get_similar_terms_for_ontology_id"""
+        mock_get_terms = mock_get_session.return_value.get
         # Mock response with missing fields
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response = json_response({
             "elements": [{
             "appearsIn" : [ "clo", "upa", "stato", "xpo", "gallont", "peco", "envo", "fbbt", "po", "rbo", "hp", "gaz", "omrse", "cteno", "eupath", "hcao", "vsao", "poro", "geno", "plana", "msio", "oae", "phipo", "hba", "dpo", "oostt", "caro", "cl", "mro", "efo", "obib", "omit", "idomal", "fovt", "ado", "ro", "pcl", "psdo", "cco", "opl", "uberon", "rexo", "planp", "ohd", "one", "ppo", "eco", "vbo", "genepio", "sepio", "foodon", "ceph", "chiro", "omp", "mp", "go", "cido", "iceo", "wbbt", "htn", "dhba", "mpio", "zp", "bao", "aism", "ino", "pso", "mfmo", "to", "pco", "dideo", "wbls", "upheno", "bmont", "ecto", "dron", "ohmi", "ecao", "gecko", "bcio", "cmpo", "fbbi", "maxo", "bspo", "ecocore", "swo", "pato", "covoc", "pride", "ido", "agro", "omiabis", "mondo", "ohpi", "mco", "obcs", "fypo", "apollo_sv", "ons", "fbdv", "wbphenotype", "obi", "vo", "pr", "reto", "ogsf", "nbo", "oba", "ontoneo", "tao", "idocovid19", "flopo", "ncro", "epio", "bcgo", "micro", "gexo", "cob", "slso", "gsso" ],
             "curie" : "GO:0008150",
@@ -457,8 +464,7 @@ class TestOLSTools(unittest.TestCase):
                 "http://www.w3.org/2000/01/rdf-schema#subClassOf" : "http://www.bioassayontology.org/bao#BAO_0003114"
             }],
             "page": {"number": 0, "totalPages": 1}
-        }
-        mock_get_terms.raise_for_status.return_value = None
+        })
         mock_get_terms.return_value = mock_response
         result = get_similar_ontology_terms("http://purl.obolibrary.org/obo/GO_0008150", "GO")
 
@@ -473,5 +479,109 @@ class TestOLSTools(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result, expected_result)
 
+    @patch("ols_mcp.tools.search_ontologies_many")
+    def test_search_all_ontologies_batch(self, mock_search_many):
+        mock_search_many.return_value = {
+            "apoptosis": [{"id": "GO:0006915", "label": "apoptotic process", "extra": 1}],
+            "unknownterm": [],
+        }
+
+        result = search_all_ontologies_batch(
+            ["apoptosis", "unknownterm"], ontologies="go, hp", max_results=3
+        )
+
+        mock_search_many.assert_called_once_with(
+            ["apoptosis", "unknownterm"], ontologies=["go", "hp"], max_results=3, exact=False
+        )
+        self.assertEqual(result["unknownterm"], [])
+        self.assertEqual(result["apoptosis"][0]["label"], "apoptotic process")
+        self.assertNotIn("extra", result["apoptosis"][0])
+
+    @patch("ols_mcp.tools.search_ontologies_many")
+    def test_search_all_ontologies_batch_keeps_failed_searches(self, mock_search_many):
+        failed = {"error": "request_failed", "message": "HTTPError: 500"}
+        mock_search_many.return_value = {"apoptosis": [{"id": "GO:0006915"}], "heart": failed}
+
+        result = search_all_ontologies_batch(["apoptosis", "heart"])
+
+        self.assertEqual(result["apoptosis"][0]["id"], "GO:0006915")
+        self.assertEqual(result["heart"], failed)
+
+    @patch("ols_mcp.tools.resolve_terms")
+    def test_resolve_ontology_terms(self, mock_resolve):
+        mock_resolve.return_value = {
+            "GO:0008150": {"obo_id": "GO:0008150", "label": "biological_process", "extra": 1},
+            "GO:9999999": None,
+        }
+
+        result = resolve_ontology_terms(["GO:0008150", "GO:9999999"])
+
+        mock_resolve.assert_called_once_with(["GO:0008150", "GO:9999999"])
+        self.assertEqual(result["GO:0008150"]["label"], "biological_process")
+        self.assertNotIn("extra", result["GO:0008150"])
+        self.assertIsNone(result["GO:9999999"])
+
+    @patch("ols_mcp.tools.resolve_terms")
+    def test_resolve_ontology_terms_keeps_failed_lookups(self, mock_resolve):
+        failed = {"error": "request_failed", "message": "HTTPError: 500"}
+        mock_resolve.return_value = {"GO:0008150": failed}
+
+        result = resolve_ontology_terms(["GO:0008150"])
+
+        self.assertEqual(result["GO:0008150"], failed)
+
+
+class TestOLSToolsAsync(unittest.IsolatedAsyncioTestCase):
+    """The async tools must return exactly what their sync twins return."""
+
+    @patch("ols_mcp.tools.search_ontologies_async", new_callable=AsyncMock)
+    async def test_search_all_ontologies_async(self, mock_search):
+        mock_search.return_value = [{"id": "GO:0008150", "label": "biological_process"}]
+
+        result = await search_all_ontologies_async("process", ontologies="go, uberon")
+
+        mock_search.assert_awaited_once_with(
+            query="process",
+            ontologies=["go", "uberon"],
+            max_results=20,
+            exact=False,
+            verbose=False,
+        )
+        with patch("ols_mcp.tools.search_ontologies", return_value=mock_search.return_value):
+            self.assertEqual(result, search_all_ontologies("process", ontologies="go, uberon"))
+
+    @patch("ols_mcp.tools.search_ontologies_many_async", new_callable=AsyncMock)
+    async def test_search_all_ontologies_batch_async(self, mock_search_many):
+        mock_search_many.return_value = {"heart": [{"id": "UBERON:0000948"}]}
+
+        result = await search_all_ontologies_batch_async(["heart", "heart"])
+
+        self.assertEqual(result["heart"][0]["id"], "UBERON:0000948")
+        self.assertEqual(mock_search_many.await_args.args[0], ["heart", "heart"])
+
+    @patch("ols_mcp.tools.get_ontology_details_async", new_callable=AsyncMock)
+    async def test_get_ontology_info_async(self, mock_details):
+        mock_details.return_value = {"ontologyId": "go", "config": {"title": "Gene Ontology"}}
+
+        result = await get_ontology_info_async("go")
+
+        self.assertEqual(result["id"], "go")
+        self.assertEqual(result["title"], "Gene Ontology")
+        self.assertEqual(result["base_uris"], [])
+
+    @patch("ols_mcp.tools.iter_ontology_terms_async")
+    async def test_get_terms_from_ontology_async(self, mock_terms):
+        async def stream(**kwargs):
+            yield {"id": "GO:0008150", "obo_id": "GO:0008150"}
+
+        mock_terms.side_effect = stream
+
+        result = await get_terms_from_ontology_async("go", obo_id="GO:0008150")
+
+        self.assertEqual(result[0]["obo_id"], "GO:0008150")
+        self.assertFalse(result[0]["is_obsolete"])
+        self.assertEqual(mock_terms.call_args.kwargs["obo_id"], "GO:0008150")
+
+
 if __name__ == "__main__":
     unittest.main()
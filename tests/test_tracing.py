@@ -0,0 +1,151 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+from ols_mcp import client, tracing
+from ols_mcp.api import get_ontology_details, get_ontology_terms
+from ols_mcp.main import main
+from ols_mcp.tools import get_ontology_info_async
+from ols_mcp.tracing import InMemoryExporter, RecordingTracer
+from tests.helpers import json_response
+
+
+def record_spans() -> InMemoryExporter:
+    exporter = InMemoryExporter()
+    tracing.set_tracer(RecordingTracer(exporter))
+    return exporter
+
+
+def named(exporter: InMemoryExporter, name: str) -> list[dict]:
+    return [span for span in exporter.spans if span["name"] == name]
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_no_op_by_default(self):
+        self.assertIsInstance(tracing.get_tracer(), tracing.NoOpTracer)
+        with tracing.span("anything", key="value") as span:
+            span.set_attribute("more", 1)
+
+    def test_spans_nest_and_record_errors(self):
+        exporter = record_spans()
+
+        with self.assertRaises(ValueError):
+            with tracing.span("outer", skipped=None):
+                with tracing.span("inner", **{"ols.page": 2}):
+                    raise ValueError("boom")
+
+        inner, outer = exporter.spans
+        self.assertEqual(inner["parent_id"], outer["span_id"])
+        self.assertEqual(inner["trace_id"], outer["trace_id"])
+        self.assertIsNone(outer["parent_id"])
+        self.assertEqual(inner["attributes"], {"ols.page": 2})
+        self.assertEqual(outer["attributes"], {})
+        self.assertEqual(outer["status"], "error")
+        self.assertEqual(outer["events"][0]["exception.type"], "ValueError")
+
+    def test_file_exporter_writes_json_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "traces" / "spans.jsonl"
+            tracing.configure(str(path))
+
+            with tracing.span("one"):
+                pass
+            with tracing.span("two"):
+                pass
+
+            lines = path.read_text().splitlines()
+        self.assertEqual([json.loads(line)["name"] for line in lines], ["one", "two"])
+
+    @patch("ols_mcp.main.mcp.run")
+    def test_trace_option(self, mock_run):
+        main(["--no-disk-cache", "--trace", "console"])
+        self.assertIsInstance(tracing.get_tracer(), RecordingTracer)
+
+        main(["--no-disk-cache"])
+        self.assertIsInstance(tracing.get_tracer(), tracing.NoOpTracer)
+
+
+class TestRequestSpans(unittest.TestCase):
+
+    @patch("ols_mcp.client.get_session")
+    def test_request_http_and_decode_spans(self, mock_get_session):
+        mock_get_session.return_value.get.return_value = json_response(
+            {"ontologyId": "go"}
+        )
+        exporter = record_spans()
+
+        get_ontology_details("go")
+        get_ontology_details("go")
+
+        first, second = named(exporter, "ols.request")
+        self.assertEqual(first["attributes"]["ols.ontology"], "go")
+        self.assertEqual(first["attributes"]["ols.cache"], "miss")
+        self.assertEqual(second["attributes"]["ols.cache"], "hit")
+        (http,) = named(exporter, "ols.http")
+        self.assertEqual(http["parent_id"], first["span_id"])
+        self.assertEqual(http["attributes"]["http.response.status_code"], 200)
+        decodes = named(exporter, "ols.decode")
+        self.assertEqual(
+            [span["parent_id"] for span in decodes],
+            [first["span_id"], second["span_id"]],
+        )
+        self.assertGreater(decodes[0]["attributes"]["ols.bytes"], 0)
+
+    @patch("ols_mcp.client.get_session")
+    def test_page_fetches_in_threads_nest_under_the_caller(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = (
+            lambda url, params=None, **kwargs: json_response({
+                "_embedded": {"terms": [{"id": params.get("page", 0)}]},
+                "page": {"number": params.get("page", 0), "totalPages": 3},
+            })
+        )
+        exporter = record_spans()
+
+        with tracing.span("caller") as caller:
+            get_ontology_terms("go", max_results=3, page_size=1)
+
+        requests_ = named(exporter, "ols.request")
+        self.assertEqual(
+            sorted(span["attributes"].get("ols.page", 0) for span in requests_),
+            [0, 1, 2],
+        )
+        self.assertTrue(
+            all(span["parent_id"] == caller.span_id for span in requests_)
+        )
+
+
+class TestToolSpans(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncTearDown(self):
+        await client.aclose()
+
+    async def test_tool_span_is_the_root_of_its_requests(self):
+        client.set_async_client(httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"ontologyId": "go"})
+        )))
+        exporter = record_spans()
+
+        tool = tracing.trace_tool(get_ontology_info_async, "get_ontology_info")
+        await tool(ontology_id="go")
+
+        (root,) = named(exporter, "mcp.tool")
+        self.assertIsNone(root["parent_id"])
+        self.assertEqual(root["attributes"]["mcp.tool"], "get_ontology_info")
+        self.assertEqual(root["attributes"]["ols.ontology"], "go")
+        (request,) = named(exporter, "ols.request")
+        (simplify,) = named(exporter, "ols.simplify")
+        self.assertEqual(request["parent_id"], root["span_id"])
+        self.assertEqual(simplify["parent_id"], root["span_id"])
+        self.assertEqual(named(exporter, "ols.http")[0]["parent_id"], request["span_id"])
+        self.assertEqual(
+            {span["trace_id"] for span in exporter.spans}, {root["trace_id"]}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()